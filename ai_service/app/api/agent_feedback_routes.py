@@ -2,7 +2,7 @@
 API endpoints for agent feedback on model predictions
 """
 import logging
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional, List, Any
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.encoders import jsonable_encoder
@@ -55,6 +55,8 @@ class FeedbackStatisticsResponse(BaseModel):
     """Response model for feedback statistics"""
     period_days: int
     tasks: dict
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
 
 
 # API Endpoints
@@ -154,19 +156,30 @@ async def get_call_feedback(
 async def get_feedback_statistics(
     task: Optional[str] = None,
     days: int = 30,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
     db: Session = Depends(get_db)
 ):
     """
     Get feedback statistics for monitoring model performance.
+    Served from the daily rollups, including today's partial counts.
     
     - **task**: Optional task filter
     - **days**: Number of days to look back (default: 30)
+    - **start_date** / **end_date**: Explicit day range (YYYY-MM-DD), overrides days
     """
+    if end_date is not None and start_date is None:
+        raise HTTPException(status_code=400, detail="end_date requires start_date")
+    if start_date is not None and end_date is not None and end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+
     try:
         statistics = FeedbackRepository.get_feedback_statistics(
             db=db,
             task=task,
-            days=days
+            days=days,
+            start_date=start_date,
+            end_date=end_date
         )
         
         if 'error' in statistics:
@@ -181,6 +194,12 @@ async def get_feedback_statistics(
         raise HTTPException(status_code=500, detail="Failed to get statistics")
 
 
+def _write_behind_stats() -> Optional[dict]:
+    from ..services.enhanced_notification_service import enhanced_notification_service
+    buffer = enhanced_notification_service.feedback_buffer
+    return buffer.get_stats() if buffer is not None else None
+
+
 @router.get("/health")
 async def health_check(db: Session = Depends(get_db)):
     """
@@ -207,6 +226,7 @@ async def health_check(db: Session = Depends(get_db)):
             "total_feedback_entries": total_feedback,
             "rated_entries": rated_feedback,
             "rating_coverage": round(rated_feedback / total_feedback * 100, 2) if total_feedback > 0 else 0,
+            "write_behind": _write_behind_stats(),
             "timestamp": datetime.now().isoformat()
         }
         
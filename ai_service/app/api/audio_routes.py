@@ -1,7 +1,7 @@
 # app/api/audio_routes.py (Updated for Celery)
 import asyncio
 import json
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, WebSocket, WebSocketDisconnect
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, Dict
@@ -14,6 +14,7 @@ from ..celery_app import celery_app
 from ..core.celery_monitor import celery_monitor
 from ..config.settings import redis_task_client
 from ..core.streaming import audio_streaming
+from ..core.progress_hub import progress_hub
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/audio", tags=["audio"])
@@ -251,6 +252,53 @@ async def get_active_tasks():
         logger.error(f"Error getting active tasks: {e}")
         return {"active_tasks": [], "total_active": 0, "error": str(e), "note": "Monitoring may be temporarily unavailable during heavy load"}
 
+@router.get("/task/{task_id}/stream")
+async def stream_task_progress(task_id: str, timeout: int = 600):
+    """
+    Server-sent progress updates for an already submitted task.
+
+    Clients that connect after the task started first receive its recent
+    updates (replayed from Redis), then live ones.
+    """
+    async def progress_events():
+        updates = audio_streaming.subscribe_to_task(task_id, timeout=timeout)
+        try:
+            async for update in updates:
+                yield f"data: {json.dumps(update)}\n\n"
+        finally:
+            # Release the client's hub queue as soon as the client goes away
+            await updates.aclose()
+    
+    return StreamingResponse(
+        progress_events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+            "X-Stream-Type": "progress-hub" if progress_hub.is_active() else "redis-pubsub",
+        }
+    )
+
+@router.websocket("/task/{task_id}/ws")
+async def websocket_task_progress(websocket: WebSocket, task_id: str):
+    """WebSocket progress updates for a task (same stream as the SSE endpoint)"""
+    await websocket.accept()
+    updates = audio_streaming.subscribe_to_task(task_id)
+    try:
+        async for update in updates:
+            await websocket.send_json(update)
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.info(f"🔌 Progress WebSocket closed by client for task {task_id}")
+    finally:
+        await updates.aclose()
+
+@router.get("/streams/status")
+async def get_progress_streams_status():
+    """Connected progress stream clients and fan-out counters"""
+    return progress_hub.get_stats()
+
 @router.delete("/task/{task_id}")
 async def cancel_task(task_id: str):
     """Cancel a Celery task"""
@@ -263,62 +311,46 @@ async def cancel_task(task_id: str):
 
 @router.get("/queue/status")
 async def get_queue_status():
-    """Get overall queue status from Celery"""
+    """Get overall queue status from the cached Celery cluster state"""
     try:
-        inspect = celery_app.control.inspect(timeout=5.0)
-        
-        # Get stats from all workers
-        stats = None
-        for attempt in range(3):
-            try:
-                stats = inspect.stats()
-                if stats:
-                    break
-                await asyncio.sleep(2 ** attempt)  # 1s, 2s, 4s backoff
-            except Exception as e:
-                logger.warning(f"Inspection attempt {attempt + 1} failed: {e}")
-                if attempt == 2:  # Last attempt
-                    # Fallback to basic status
-                    return {
-                        "status": "inspection_timeout",
-                        "message": "Workers busy - monitoring temporarily unavailable",
-                        "workers": "unknown",
-                        "note": "This is normal during heavy processing"
-                    }
-        active = inspect.active()
-        scheduled = inspect.scheduled()
-        reserved = inspect.reserved()
+        state = celery_monitor.get_cluster_state()
+        workers = [w for w in state["workers"] if w["status"] != "offline"]
         
-        if not stats:
+        if not workers:
             return {
                 "status": "no_workers",
                 "message": "No Celery workers are running",
-                "workers": 0
+                "workers": 0,
+                "cache": state["freshness"]
             }
         
-        total_active = sum(len(tasks) for tasks in active.values()) if active else 0
-        total_scheduled = sum(len(tasks) for tasks in scheduled.values()) if scheduled else 0
-        total_reserved = sum(len(tasks) for tasks in reserved.values()) if reserved else 0
-        
+        active_by_worker = state["inspect"]["active"] or {}
         worker_info = []
-        for worker_name, worker_stats in stats.items():
+        for worker in workers:
+            current_load = worker["active"]
+            if current_load is None:
+                current_load = len(active_by_worker.get(worker["name"], []))
             worker_info.append({
-                "name": worker_name,
-                "status": "online",
-                "total_tasks": worker_stats.get("total", {}),
-                "current_load": len(active.get(worker_name, [])) if active else 0
+                "name": worker["name"],
+                "status": worker["status"],
+                "total_tasks": worker["total_tasks"],
+                "current_load": current_load
             })
         
+        tasks = state["tasks"]
         return {
             "status": "healthy",
-            "workers": len(stats),
+            "workers": len(workers),
             "worker_info": worker_info,
             "queue_stats": {
-                "active_tasks": total_active,
-                "scheduled_tasks": total_scheduled,
-                "reserved_tasks": total_reserved,
-                "total_pending": total_active + total_scheduled + total_reserved
-            }
+                "active_tasks": tasks["active"],
+                "scheduled_tasks": tasks["scheduled"],
+                "reserved_tasks": tasks["reserved"],
+                "queued_tasks": tasks["queued"],
+                "queue_lengths": state["queue_lengths"],
+                "total_pending": tasks["active"] + tasks["scheduled"] + tasks["reserved"] + tasks["queued"]
+            },
+            "cache": state["freshness"]
         }
         
     except Exception as e:
@@ -336,26 +368,23 @@ async def get_worker_status():
         # Get from event monitor
         worker_stats = celery_monitor.get_worker_stats()
         
-        # Get from Celery inspection (with timeout)
-        inspect = celery_app.control.inspect(timeout=2.0)
-        try:
-            celery_stats = inspect.stats()
-            active_tasks = inspect.active()
-        except Exception as e:
-            celery_stats = None
-            active_tasks = None
-            logger.info(f"Worker inspection timeout (normal during processing): {e}")
+        # Last background inspection, cached (no broadcast per request)
+        state = celery_monitor.get_cluster_state()
+        inspect_snapshot = state["inspect"]
         
         return {
             "event_monitoring": worker_stats,
             "celery_inspection": {
-                "available": celery_stats is not None,
-                "stats": celery_stats,
-                "active": active_tasks
+                "available": inspect_snapshot["stats"] is not None,
+                "stats": inspect_snapshot["stats"],
+                "active": inspect_snapshot["active"]
             },
+            "workers": state["workers"],
+            "cache": state["freshness"],
             "explanation": {
                 "offline_during_processing": "Normal - workers can't respond to pings during GPU-intensive tasks",
-                "monitoring_reliability": "Event monitoring is more reliable than inspection during processing"
+                "monitoring_reliability": "Event monitoring is more reliable than inspection during processing",
+                "unresponsive": "No heartbeat recently and not seen by the last inspection - usually busy with a task"
             }
         }
         
@@ -37,6 +37,7 @@ class ChunkPrediction(BaseModel):
 
 class ClassifierRequest(BaseModel):
     narrative: str
+    use_cache: bool = True  # Set False to bypass the model result cache
 
 
 class ClassifierResponse(BaseModel):
@@ -144,6 +145,7 @@ async def classify_narrative(request: ClassifierRequest):
 
         task = classifier_classify_task.apply_async(
             args=[request.narrative],
+            kwargs={'use_cache': request.use_cache},
             queue='model_processing'
         )
 
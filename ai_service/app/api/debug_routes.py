@@ -0,0 +1,46 @@
+"""
+API endpoints for inspecting pipeline traces
+"""
+from collections import OrderedDict
+from fastapi import APIRouter, HTTPException
+from typing import Dict, Any, List
+import logging
+
+from ..core.tracing import tracer, summarize_trace
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/debug", tags=["Debug"])
+
+
+@router.get("/traces")
+async def get_tracing_status():
+    """Tracer configuration and span counters for this process"""
+    return tracer.get_stats()
+
+
+@router.get("/traces/{call_id}")
+async def get_call_trace(call_id: str):
+    """Every recorded span of a call, grouped by trace, with the time spent per stage"""
+    try:
+        spans = tracer.get_trace(call_id)
+    except Exception as e:
+        logger.error(f"❌ Failed to load trace for call {call_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to load trace")
+
+    if not spans:
+        raise HTTPException(status_code=404, detail=f"No spans recorded for call {call_id}")
+
+    traces: Dict[str, List[Dict[str, Any]]] = OrderedDict()
+    for span in spans:
+        traces.setdefault(span.trace_id, []).append(span.to_dict())
+
+    return {
+        "call_id": call_id,
+        "span_count": len(spans),
+        "trace_count": len(traces),
+        "services": sorted({span.service for span in spans}),
+        "duration_ms": round((max(s.end_time or s.start_time for s in spans) - spans[0].start_time) * 1000, 3),
+        "stages": summarize_trace(spans),
+        "traces": [{"trace_id": trace_id, "spans": trace_spans} for trace_id, trace_spans in traces.items()],
+    }
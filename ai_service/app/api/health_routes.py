@@ -1,10 +1,12 @@
 from fastapi import APIRouter, HTTPException
+import asyncio
 import logging
 from datetime import datetime
 
-from ..celery_app import celery_app
 from app.core.celery_monitor import celery_monitor
 
+from ..celery_app import celery_app
+
 from ..core.resource_manager import resource_manager
 from ..model_scripts.model_loader import model_loader
 from ..config.settings import settings
@@ -92,45 +94,54 @@ async def models_health():
     mode = get_execution_mode()
     
     if is_api_server_mode():
-        # API Server mode - check Celery workers for model status
+        # API Server mode - model status published by workers, read from the cluster-state cache
         try:
-            # Check if Celery is responsive
-            inspect = celery_app.control.inspect(timeout=5.0)
-            active_workers = inspect.active()
+            state = celery_monitor.get_cluster_state()
+            online_workers = [w["name"] for w in state["workers"] if w["status"] == "online"]
+            worker_health = {
+                name: status for name, status in state["worker_models"].items()
+                if name in online_workers
+            }
             
-            if not active_workers:
+            if not online_workers:
                 return {
                     "timestamp": datetime.now().isoformat(),
                     "mode": mode,
                     "status": "unhealthy",
                     "reason": "No Celery workers available",
                     "celery_workers": [],
-                    "models": {}
+                    "models": {},
+                    "cache": state["freshness"]
                 }
             
-            # Check models on workers using our health check task
-            from ..tasks.health_tasks import health_check_models
-            task = health_check_models.delay()
-            worker_health = task.get(timeout=10)
+            if not worker_health:
+                return {
+                    "timestamp": datetime.now().isoformat(),
+                    "mode": mode,
+                    "status": "unknown",
+                    "reason": "Workers have not published model status yet",
+                    "celery_workers": online_workers,
+                    "models": {},
+                    "cache": state["freshness"]
+                }
             
+            # A model is available if any online worker has it loaded
+            model_names = ["qa", "classifier", "ner", "summarizer", "translator", "whisper"]
             return {
                 "timestamp": datetime.now().isoformat(),
                 "mode": mode,
                 "status": "healthy",
-                "celery_workers": list(active_workers.keys()),
+                "celery_workers": online_workers,
                 "worker_model_status": worker_health,
                 "models": {
-                    "qa": worker_health["models_loaded"]["qa"],
-                    "classifier": worker_health["models_loaded"]["classifier"],
-                    "ner": worker_health["models_loaded"]["ner"],
-                    "summarizer": worker_health["models_loaded"]["summarizer"],
-                    "translator": worker_health["models_loaded"]["translator"],
-                    "whisper": worker_health["models_loaded"]["whisper"]
+                    name: any(h.get("models_loaded", {}).get(name, False) for h in worker_health.values())
+                    for name in model_names
                 },
                 "summary": {
-                    "total_ready_models": worker_health["total_ready_models"],
-                    "worker_host": worker_health["worker_host"]
-                }
+                    "total_ready_models": max(h.get("total_ready_models", 0) for h in worker_health.values()),
+                    "worker_host": [h.get("worker_host") for h in worker_health.values()]
+                },
+                "cache": state["freshness"]
             }
             
         except Exception as e:
@@ -169,6 +180,37 @@ async def models_health():
             "details": model_status
         }
 
+@router.post("/models/{model_name}/reload")
+async def reload_model(model_name: str):
+    """Reload a model and invalidate its cached results, on every worker in API server mode"""
+    if model_name not in model_loader.model_status:
+        raise HTTPException(status_code=404, detail=f"Unknown model: {model_name}")
+
+    if not is_api_server_mode():
+        try:
+            ready = await asyncio.to_thread(model_loader.reload_model, model_name)
+        except Exception as e:
+            logger.error(f"❌ Failed to reload {model_name}: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to reload {model_name}")
+        return {"model": model_name, "mode": get_execution_mode(), "ready": ready}
+
+    try:
+        replies = await asyncio.to_thread(
+            celery_app.control.broadcast,
+            "reload_model",
+            arguments={"model_name": model_name},
+            reply=True,
+            timeout=settings.model_reload_timeout_seconds
+        )
+    except Exception as e:
+        logger.error(f"❌ Failed to broadcast reload of {model_name}: {e}")
+        raise HTTPException(status_code=503, detail="Could not reach the Celery workers")
+
+    workers = {name: reply for worker_reply in replies or [] for name, reply in worker_reply.items()}
+    if not workers:
+        raise HTTPException(status_code=503, detail=f"No worker replied to the reload of {model_name}")
+    return {"model": model_name, "mode": get_execution_mode(), "workers": workers}
+
 @router.get("/capabilities")
 async def system_capabilities():
     """Get ML system capabilities"""
@@ -191,7 +233,7 @@ async def get_celery_status():
             "error": str(e)
         }
     
-    # Try to ping Celery workers
+    # Workers as seen by heartbeats and the last background inspect (no broadcast per request)
     celery_workers = {
         "available": False,
         "count": 0,
@@ -200,30 +242,22 @@ async def get_celery_status():
     }
     
     try:
-        inspect = celery_app.control.inspect(timeout=3.0)
-        worker_stats = inspect.stats()
-        worker_ping = inspect.ping()
-        
-        if worker_stats and worker_ping:
-            celery_workers.update({
-                "available": True,
-                "count": len(worker_stats),
-                "worker_names": list(worker_stats.keys()),
-                "ping_response": worker_ping,
-                "worker_stats": worker_stats
-            })
-        elif worker_ping:  # Ping works but no stats
-            celery_workers.update({
-                "available": True,
-                "count": len(worker_ping),
-                "worker_names": list(worker_ping.keys()),
-                "ping_response": worker_ping,
-                "note": "Workers responding but stats unavailable"
-            })
+        state = celery_monitor.get_cluster_state()
+        online = [w["name"] for w in state["workers"] if w["status"] == "online"]
+        celery_workers.update({
+            "available": bool(online),
+            "count": len(online),
+            "worker_names": online,
+            "workers": state["workers"],
+            "worker_stats": state["inspect"]["stats"],
+            "cache": state["freshness"]
+        })
+        if state["inspect"]["error"]:
+            celery_workers["error"] = state["inspect"]["error"]
             
     except Exception as e:
         celery_workers["error"] = str(e)
-        logger.warning(f"Celery worker inspection failed: {e}")
+        logger.warning(f"Celery cluster state unavailable: {e}")
     
     # IMPROVED STATUS LOGIC
     overall_status = "healthy"
@@ -18,6 +18,7 @@ router = APIRouter(prefix="/ner", tags=["ner"])
 class NERRequest(BaseModel):
     text: str
     flat: bool = True  # Return flat list by default
+    use_cache: bool = True  # Set False to bypass the model result cache
 
 
 class NEREntity(BaseModel):
@@ -127,6 +128,7 @@ async def extract_entities(request: NERRequest):
         # Submit task to Celery
         task = ner_extract_task.apply_async(
             args=[request.text, request.flat],
+            kwargs={'use_cache': request.use_cache},
             queue='model_processing'
         )
 
@@ -8,6 +8,7 @@ import logging
 from datetime import datetime
 
 from ..core.notification_manager import notification_manager, NotificationMode
+from ..services.enhanced_notification_service import enhanced_notification_service
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +32,8 @@ async def get_notification_status():
         status = notification_manager.get_status()
         return {
             "timestamp": datetime.now().isoformat(),
-            "notification_system": status
+            "notification_system": status,
+            "delivery": enhanced_notification_service.get_delivery_stats()
         }
     except Exception as e:
         logger.error(f"❌ Failed to get notification status: {e}")
@@ -211,6 +213,7 @@ async def get_notification_types():
         progress_types = [
             NotificationType.STREAMING_CALL_START,
             NotificationType.STREAMING_TRANSCRIPTION_SEGMENT,
+            NotificationType.STREAMING_TRANSCRIPTION_INTERIM,
             NotificationType.STREAMING_TRANSLATION_PROGRESS,
             NotificationType.STREAMING_PROCESSING_UPDATE
         ]
@@ -17,6 +17,7 @@ class QARequest(BaseModel):
     transcript: str = Field(..., min_length=10)
     threshold: Optional[float] = Field(None, ge=0.0, le=1.0)
     return_raw: bool = Field(False)
+    use_cache: bool = Field(True, description="Set False to bypass the model result cache")
 
 
 class SubmetricResult(BaseModel):
@@ -73,6 +74,7 @@ async def evaluate_transcript(request: QARequest):
     try:
         task = qa_evaluate_task.apply_async(
             args=[request.transcript, request.threshold, request.return_raw],
+            kwargs={'use_cache': request.use_cache},
             queue='model_processing'
         )
         
@@ -16,6 +16,7 @@ router = APIRouter(prefix="/summarizer", tags=["summarizer"])
 class SummarizationRequest(BaseModel):
     text: str
     max_length: int = 256
+    use_cache: bool = True  # Set False to bypass the model result cache
 
 
 class SummarizationResponse(BaseModel):
@@ -63,6 +64,7 @@ async def summarize_text_endpoint(request: SummarizationRequest):
     try:
         task = summarization_summarize_task.apply_async(
             args=[request.text, request.max_length],
+            kwargs={'use_cache': request.use_cache},
             queue='model_processing'
         )
         
@@ -15,6 +15,7 @@ router = APIRouter(prefix="/translate", tags=["translation"])
 
 class TranslationRequest(BaseModel):
     text: str
+    use_cache: bool = True  # Set False to bypass the model result cache
 
 
 class TranslationResponse(BaseModel):
@@ -60,6 +61,7 @@ async def translate_text(request: TranslationRequest):
     try:
         task = translation_translate_task.apply_async(
             args=[request.text],
+            kwargs={'use_cache': request.use_cache},
             queue='model_processing'
         )
         
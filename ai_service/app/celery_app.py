@@ -9,18 +9,10 @@ import logging
 @setup_logging.connect
 def configure_celery_logging(**kwargs):
     """Configure Celery worker logging with PII sanitization"""
-    from app.security import PIISanitizingFilter
+    from app.core.logging_pipeline import configure_service_logging
 
-    # Setup basic logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-
-    # Add PII filter to root logger
-    pii_filter = PIISanitizingFilter()
-    for handler in logging.getLogger().handlers:
-        handler.addFilter(pii_filter)
+    # Sanitizing and writing run on a listener thread, off the task's path
+    configure_service_logging(logging.INFO)
 
     logging.getLogger(__name__).info("Celery worker logging configured with PII sanitization")
 
@@ -70,6 +62,7 @@ celery_app.conf.update(
         'process_audio_task': {'queue': 'model_processing'},
         'process_audio_quick_task': {'queue': 'model_processing'},
         'process_streaming_audio_task': {'queue': 'model_processing'},
+        'process_streaming_interim_task': {'queue': 'model_processing'},
 
         # Individual model tasks - use SHORT names matching task decorators
         'ner_extract_task': {'queue': 'model_processing'},
@@ -100,4 +93,9 @@ celery_app.conf.update(
     # Do NOT use these - they cause serialization issues:
     # task_always_eager=False,
     # task_store_eager_result=False,
-)
\ No newline at end of file
+)
+
+# Carry pipeline traces through task messages (queue wait, worker stages)
+from app.core.tracing import install_celery_hooks
+
+install_celery_hooks()
\ No newline at end of file
@@ -55,6 +55,62 @@ class Settings(BaseSettings):
         description="Database connection URL (SQLite, PostgreSQL, etc.)"
     )
 
+    db_pool_size: int = Field(
+        default=10,
+        ge=1,
+        description="Connections kept open per engine (ignored for SQLite)"
+    )
+
+    db_max_overflow: int = Field(
+        default=20,
+        ge=0,
+        description="Extra connections allowed above db_pool_size under load (ignored for SQLite)"
+    )
+
+    db_pool_timeout: float = Field(
+        default=10.0,
+        gt=0,
+        description="Seconds to wait for a pooled connection before failing"
+    )
+
+    db_pool_recycle: int = Field(
+        default=1800,
+        description="Recycle connections older than this many seconds (-1 disables)"
+    )
+
+    db_async_enabled: bool = Field(
+        default=True,
+        description="Use an async engine (aiosqlite/asyncpg/aiomysql) for writes from the API event loop"
+    )
+
+    feedback_write_behind_enabled: bool = Field(
+        default=True,
+        description="Buffer initial feedback rows in the API process and write them in batches across calls"
+    )
+
+    feedback_flush_interval: float = Field(
+        default=0.25,
+        gt=0,
+        description="Seconds between write-behind flushes of buffered feedback rows"
+    )
+
+    feedback_flush_max_rows: int = Field(
+        default=500,
+        ge=1,
+        description="Flush early once this many feedback rows are buffered"
+    )
+
+    feedback_buffer_max_rows: int = Field(
+        default=5000,
+        ge=1,
+        description="Buffered feedback rows above which producers wait for a flush"
+    )
+
+    feedback_stats_use_rollups: bool = Field(
+        default=False,
+        description="Serve feedback statistics from feedback_daily_rollup instead of scanning agent_feedback; enable only after backfilling them with scripts/backfill_feedback_rollups.py"
+    )
+
     # ============================================================================
     # APPLICATION SETTINGS
     # ============================================================================
@@ -86,6 +142,45 @@ class Settings(BaseSettings):
         description="Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)"
     )
 
+    # ============================================================================
+    # LOGGING PIPELINE
+    # ============================================================================
+
+    log_queue_enabled: bool = Field(
+        default=True,
+        description="Sanitize, format and write logs on a background listener thread"
+    )
+
+    log_file: Optional[str] = Field(
+        default=None,
+        description="Also write logs to this file (stderr only when unset)"
+    )
+
+    log_queue_size: int = Field(
+        default=10000,
+        ge=1,
+        description="Maximum log records waiting for the listener thread"
+    )
+
+    log_queue_batch_size: int = Field(
+        default=512,
+        ge=1,
+        description="Maximum log records written per flush"
+    )
+
+    log_queue_debug_drop_threshold: float = Field(
+        default=0.8,
+        gt=0,
+        le=1,
+        description="Queue fill fraction above which DEBUG records are dropped"
+    )
+
+    log_queue_block_timeout: float = Field(
+        default=0.5,
+        ge=0,
+        description="Seconds a logging call waits for space in a full queue before dropping the record"
+    )
+
     # ============================================================================
     # RESOURCE MANAGEMENT
     # ============================================================================
@@ -136,6 +231,90 @@ class Settings(BaseSettings):
         description="Ollama model name for insights generation"
     )
 
+    model_load_concurrency: int = Field(
+        default=3,
+        ge=1,
+        description="Number of models loaded concurrently at startup"
+    )
+
+    deferred_models: str = Field(
+        default="",
+        description="Comma-separated models loaded on the first task that needs them instead of at startup ('all' defers every model)"
+    )
+
+    model_weights_mmap: bool = Field(
+        default=True,
+        description="Remap CPU model weights onto mmapped safetensors files so worker processes share them"
+    )
+
+    model_warmup_on_load: bool = Field(
+        default=False,
+        description="Run one inference after loading each model and record its warmup latency (adds one inference per model to worker startup)"
+    )
+
+    model_reload_timeout_seconds: float = Field(
+        default=300.0,
+        gt=0.0,
+        description="How long POST /health/models/{model_name}/reload waits for the workers to finish reloading"
+    )
+
+    shared_encoder_inference: bool = Field(
+        default=True,
+        description="Run the classifier and QA heads on one DistilBERT tokenization (and one encoder pass when their weights match)"
+    )
+
+    onnx_backend_models: str = Field(
+        default="",
+        description="Comma-separated models (classifier, qa, ner) run on ONNX Runtime instead of PyTorch on CPU ('all' selects every supported model)"
+    )
+
+    onnx_cache_dir: str = Field(
+        default="",
+        description="Directory for cached ONNX exports, keyed by weights hash (empty = <models_path>/onnx)"
+    )
+
+    onnx_intra_op_threads: int = Field(
+        default=0,
+        ge=0,
+        description="ONNX Runtime intra-op threads per session (0 = physical CPU cores)"
+    )
+
+    ner_batch_size: int = Field(
+        default=16,
+        ge=1,
+        description="Texts per NER batch (spaCy nlp.pipe / Hugging Face pipeline batch size)"
+    )
+
+    ner_batch_max_wait_ms: float = Field(
+        default=10.0,
+        ge=0.0,
+        description="How long the NER micro-batcher waits for more streaming windows from other calls before running a batch (Celery worker requests never wait)"
+    )
+
+    ner_spacy_n_process: int = Field(
+        default=1,
+        ge=1,
+        description="Processes for spaCy nlp.pipe on large batches (1 = in-process)"
+    )
+
+    summarization_batch_size: int = Field(
+        default=8,
+        ge=1,
+        description="Chunk summaries generated per padded batch in hierarchical summarization"
+    )
+
+    summarization_max_generated_tokens: int = Field(
+        default=2048,
+        ge=64,
+        description="Upper bound on tokens generated across all map, reduce and final passes of one summary"
+    )
+
+    summarization_max_reduce_levels: int = Field(
+        default=3,
+        ge=0,
+        description="Maximum reduce passes over chunk summaries before falling back to extractive merging"
+    )
+
     # ============================================================================
     # SECURITY & DATA RETENTION
     # ============================================================================
@@ -167,6 +346,73 @@ class Settings(BaseSettings):
         description="Memory usage percentage threshold for alerts"
     )
 
+    celery_state_cache_enabled: bool = Field(
+        default=True,
+        description="Serve health and queue endpoints from a background-refreshed Celery cluster-state cache; when off, each request inspects the workers"
+    )
+
+    celery_inspect_interval: float = Field(
+        default=30.0,
+        ge=5.0,
+        description="Seconds between background Celery inspect broadcasts"
+    )
+
+    celery_inspect_timeout: float = Field(
+        default=2.0,
+        gt=0,
+        description="Seconds to wait for worker replies to a background inspect"
+    )
+
+    celery_queue_sample_interval: float = Field(
+        default=5.0,
+        ge=0.5,
+        description="Seconds between broker queue length (LLEN) samples"
+    )
+
+    celery_monitored_queues: str = Field(
+        default="model_processing",
+        description="Comma-separated broker queues whose lengths are sampled"
+    )
+
+    celery_state_stale_after: float = Field(
+        default=60.0,
+        gt=0,
+        description="Seconds after which cached worker state is reported as stale"
+    )
+
+    tracing_enabled: bool = Field(
+        default=True,
+        description="Record per-stage spans from the audio socket to the agent notification"
+    )
+
+    tracing_ring_buffer_size: int = Field(
+        default=20000,
+        ge=100,
+        description="Finished spans kept in memory per process for /debug/traces"
+    )
+
+    tracing_redis_export: bool = Field(
+        default=False,
+        description="Share spans through Redis so /debug/traces shows the Celery workers' spans (one Redis write per finished trace)"
+    )
+
+    tracing_redis_max_spans_per_call: int = Field(
+        default=2000,
+        ge=10,
+        description="Most recent spans kept in Redis per call"
+    )
+
+    tracing_redis_ttl_seconds: int = Field(
+        default=86400,
+        ge=60,
+        description="Seconds a call's spans are kept in Redis"
+    )
+
+    tracing_otlp_file: str = Field(
+        default="",
+        description="Append spans to this file as OTLP/JSON export requests (empty = disabled)"
+    )
+
     # ============================================================================
     # FILE PATHS
     # ============================================================================
@@ -329,6 +575,107 @@ class Settings(BaseSettings):
         description="Interval in seconds for streaming classification updates"
     )
 
+    progress_hub_enabled: bool = Field(
+        default=True,
+        description="Serve SSE/WebSocket progress streams from one shared Redis pattern subscription"
+    )
+
+    progress_client_queue_size: int = Field(
+        default=100,
+        ge=1,
+        description="Updates buffered per progress stream client before the oldest are dropped"
+    )
+
+    progress_hub_max_clients: int = Field(
+        default=1000,
+        ge=1,
+        description="Maximum concurrent progress stream clients per API process"
+    )
+
+    progress_replay_max_events: int = Field(
+        default=200,
+        ge=0,
+        description="Progress updates kept per task (capped Redis Stream) for clients that join late; 0 disables replay"
+    )
+
+    progress_replay_ttl: int = Field(
+        default=3600,
+        ge=60,
+        description="Seconds a task's progress replay stream is kept after its last update"
+    )
+
+    streaming_adaptive_windows: bool = Field(
+        default=True,
+        description="Cut live call audio into adaptive windows at pauses instead of fixed 5-second windows"
+    )
+
+    streaming_min_window_seconds: float = Field(
+        default=2.0,
+        ge=0.5,
+        description="Shortest live transcription window in seconds"
+    )
+
+    streaming_max_window_seconds: float = Field(
+        default=8.0,
+        ge=1.0,
+        le=30.0,
+        description="Longest live transcription window; cut at the quietest point once reached"
+    )
+
+    streaming_window_overlap_seconds: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=1.0,
+        description="Audio repeated at the start of each window after the first (0 disables overlap)"
+    )
+
+    streaming_silence_rms: float = Field(
+        default=0.01,
+        gt=0.0,
+        description="RMS level (full scale = 1.0) of a 20ms frame below which a window may be cut"
+    )
+
+    streaming_target_latency_seconds: float = Field(
+        default=6.0,
+        ge=1.0,
+        description="End-to-end latency (window start to transcript) the window controller aims for"
+    )
+
+    streaming_queue_high_watermark: int = Field(
+        default=4,
+        ge=1,
+        description="Queued worker tasks at which the window controller widens windows"
+    )
+
+    streaming_interim_enabled: bool = Field(
+        default=False,
+        description="Send interim (is_final=false) greedy transcripts of the window still being recorded"
+    )
+
+    streaming_interim_interval_seconds: float = Field(
+        default=1.0,
+        ge=0.5,
+        description="New audio in the current window between interim transcripts"
+    )
+
+    streaming_interim_max_age_seconds: float = Field(
+        default=2.0,
+        ge=0.5,
+        description="Interim decodes still queued after this long are discarded unexecuted"
+    )
+
+    streaming_reduced_encoder_context: bool = Field(
+        default=False,
+        description="Encode only the audio present in a live window (rounded up to a bucket) instead of padding it to 30 seconds"
+    )
+
+    streaming_encoder_bucket_seconds: float = Field(
+        default=2.0,
+        ge=0.1,
+        le=30.0,
+        description="Bucket the reduced-context encoder input length is rounded up to"
+    )
+
 
     # ============================================================================
     # PROCESSING MODE CONFIGURATION
@@ -534,6 +881,51 @@ class Settings(BaseSettings):
         description="SCP connection timeout in seconds"
     )
 
+    scp_port: int = Field(
+        default=22,
+        description="SSH port on the recording server"
+    )
+
+    scp_use_connection_pool: bool = Field(
+        default=True,
+        description="Download recordings over pooled persistent SFTP connections instead of one scp process per call"
+    )
+
+    scp_pool_max_connections: int = Field(
+        default=4,
+        ge=1,
+        le=32,
+        description="Maximum persistent SSH connections held to the recording server"
+    )
+
+    scp_max_parallel_downloads: int = Field(
+        default=4,
+        ge=1,
+        description="Maximum recordings downloaded concurrently"
+    )
+
+    scp_download_retries: int = Field(
+        default=3,
+        ge=0,
+        description="Retries for transient download failures"
+    )
+
+    scp_retry_base_delay: float = Field(
+        default=0.5,
+        gt=0,
+        description="Base delay in seconds for jittered exponential retry backoff"
+    )
+
+    scp_prefetch_on_call_end: bool = Field(
+        default=True,
+        description="Start downloading the recording as soon as a call ends"
+    )
+
+    scp_known_hosts_file: Optional[str] = Field(
+        default=None,
+        description="known_hosts file for host key verification (unset disables verification, like StrictHostKeyChecking=no)"
+    )
+
     # ============================================================================
     # AGENT NOTIFICATION CONFIGURATION
     # ============================================================================
@@ -607,6 +999,87 @@ class Settings(BaseSettings):
         description="Authentication token for notification endpoints"
     )
 
+    # ============================================================================
+    # NOTIFICATION DELIVERY QUEUE
+    # ============================================================================
+
+    enable_notification_queue: bool = Field(
+        default=True,
+        description="Deliver notifications from background sender tasks instead of inline"
+    )
+
+    notification_sender_count: int = Field(
+        default=4,
+        ge=1,
+        le=64,
+        description="Number of sender tasks; each call is pinned to one sender to keep its order"
+    )
+
+    notification_queue_max_size: int = Field(
+        default=1000,
+        ge=10,
+        description="Maximum queued notifications per sender before streaming updates are dropped"
+    )
+
+    notification_queue_redis_backed: bool = Field(
+        default=False,
+        description="Journal queued notifications in Redis so they survive an API restart"
+    )
+
+    notification_queue_redis_key: str = Field(
+        default="notification_outbox",
+        description="Redis hash used as the notification journal"
+    )
+
+    notification_http2: bool = Field(
+        default=False,
+        description="Use HTTP/2 for notification delivery (requires the h2 package)"
+    )
+
+    notification_max_keepalive_connections: int = Field(
+        default=10,
+        ge=1,
+        description="Keep-alive connections held open to the notification endpoint"
+    )
+
+    notification_payload_log_batch_size: int = Field(
+        default=100,
+        ge=1,
+        description="Maximum payload log entries written per batch"
+    )
+
+    notification_payload_log_flush_interval: float = Field(
+        default=0.5,
+        gt=0,
+        description="Seconds between payload log flushes"
+    )
+
+    # ============================================================================
+    # MODEL RESULT CACHE
+    # ============================================================================
+
+    enable_model_result_cache: bool = Field(
+        default=True,
+        description="Cache model task results keyed by normalized text, model version and parameters"
+    )
+
+    model_result_cache_max_entries: int = Field(
+        default=1024,
+        ge=1,
+        description="Maximum results held in each worker's in-process LRU"
+    )
+
+    model_result_cache_ttl_seconds: int = Field(
+        default=86400,
+        ge=1,
+        description="TTL for results stored in the shared Redis tier"
+    )
+
+    model_result_cache_use_redis: bool = Field(
+        default=True,
+        description="Share cached results between workers through Redis"
+    )
+
     # ============================================================================
     # ASTERISK SERVER CONFIGURATION
     # ============================================================================
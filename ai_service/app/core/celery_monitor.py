@@ -1,35 +1,135 @@
 # app/core/celery_monitor.py
+"""
+Celery event monitoring and cluster-state cache
+
+Health and queue endpoints read cluster state from memory instead of
+broadcasting `inspect` calls per request. The cache is fed by:
+
+- the Celery event stream (task and worker events, heartbeats)
+- a low-frequency background `inspect` (stats/active/scheduled/reserved)
+- a queue-length sampler that runs LLEN on the broker queues
+- model status snapshots each worker publishes to the broker Redis
+
+Every part of the snapshot carries the time it was last refreshed so
+callers can tell how stale it is. With CELERY_STATE_CACHE_ENABLED=false
+nothing refreshes in the background, and each get_cluster_state() call
+inspects the workers and samples the broker itself, as the endpoints did
+per request before the cache existed.
+"""
 import threading
 import logging
 import time
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 from celery.events import EventReceiver
 from ..celery_app import celery_app
 
 logger = logging.getLogger(__name__)
 
+# Redis hash on the broker holding each worker's model status (field = hostname)
+WORKER_MODELS_KEY = "celery_worker_models"
+
+# Kombu's Redis transport keeps prioritized messages in "<queue>\x06\x16<priority>" lists
+PRIORITY_QUEUE_SUFFIXES = ("", "\x06\x163", "\x06\x166", "\x06\x169")
+
+# Kombu's Redis transport keeps delivered-but-unacknowledged messages in this hash
+UNACKED_KEY = "unacked"
+
+_broker_client = None
+
+
+def get_broker_redis():
+    """Redis client for the Celery broker database (created on first use)"""
+    global _broker_client
+    if _broker_client is None:
+        import redis
+        _broker_client = redis.Redis.from_url(celery_app.conf.broker_url, decode_responses=True)
+    return _broker_client
+
+
+def publish_worker_models(hostname: str, status: Dict[str, Any]) -> bool:
+    """
+    Publish a worker's model status for API servers to read.
+
+    Called by workers after startup and after loading deferred models, so
+    `/health/models` does not need to dispatch a task to find out.
+
+    Args:
+        hostname: Celery node name (e.g. "celery@host"), as used by inspect and events
+        status: Output of health_tasks.build_model_status
+    """
+    import json
+    try:
+        status = dict(status, published_at=time.time())
+        get_broker_redis().hset(WORKER_MODELS_KEY, hostname, json.dumps(status))
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️ Could not publish worker model status: {e}")
+        return False
+
+
+def _freshness(updated_at: Optional[float], max_age: float) -> Dict[str, Any]:
+    """Staleness info for one part of the cluster-state snapshot"""
+    if updated_at is None:
+        return {"updated_at": None, "age_seconds": None, "stale": True}
+    age = max(time.time() - updated_at, 0.0)
+    return {
+        "updated_at": datetime.fromtimestamp(updated_at).isoformat(),
+        "age_seconds": round(age, 1),
+        "stale": age > max_age
+    }
+
+
+def _count_tasks(by_worker: Optional[Dict[str, List]]) -> int:
+    return sum(len(tasks) for tasks in by_worker.values()) if by_worker else 0
+
+
 class CeleryEventMonitor:
     def __init__(self):
         self.active_tasks = {}
         self.worker_stats = {}
         self.monitoring_thread = None
         self.is_monitoring = False
-        
+
+        # Cluster-state cache
+        self.events_updated_at: Optional[float] = None
+        self.inspect_snapshot: Dict[str, Any] = {
+            "stats": None, "active": None, "scheduled": None, "reserved": None, "error": None
+        }
+        self.inspect_updated_at: Optional[float] = None
+        self.queue_lengths: Dict[str, int] = {}
+        self.unacked_tasks: Optional[int] = None
+        self.queues_updated_at: Optional[float] = None
+        self.worker_models: Dict[str, Dict[str, Any]] = {}
+        self.models_updated_at: Optional[float] = None
+        self.task_runtimes: Dict[str, float] = {}
+        self.refresh_thread = None
+        self._stop_refresh = threading.Event()
+
+        from ..config.settings import settings
+        self.cache_enabled = settings.celery_state_cache_enabled
+        self.inspect_interval = settings.celery_inspect_interval
+        self.inspect_timeout = settings.celery_inspect_timeout
+        self.sample_interval = settings.celery_queue_sample_interval
+        self.stale_after = settings.celery_state_stale_after
+        self.monitored_queues = [
+            queue.strip() for queue in settings.celery_monitored_queues.split(",") if queue.strip()
+        ]
+
     def start_monitoring(self):
         """Start monitoring in background thread with resilient reconnection"""
         if self.monitoring_thread and self.monitoring_thread.is_alive():
             logger.info("Event monitoring already running")
             return
-            
+
         def monitor_worker():
             retry_interval = 5  # Start with 5 seconds
             max_retry_interval = 60  # Max 1 minute between retries
-            
+
             while True:
                 try:
                     logger.info("🔄 Attempting to connect to Celery events...")
-                    
+
                     def on_task_started(event):
                         self.active_tasks[event['uuid']] = {
                             'task_id': event['uuid'],
@@ -38,22 +138,27 @@ class CeleryEventMonitor:
                             'started': datetime.fromtimestamp(event['timestamp']).isoformat(),
                             'args': event.get('args', [])
                         }
+                        self.events_updated_at = time.time()
                         logger.info(f"📋 Task started: {event.get('name', 'unknown')} ({event['uuid'][:8]})")
-                    
+
                     def on_task_succeeded(event):
                         task_info = self.active_tasks.pop(event['uuid'], {})
+                        self.events_updated_at = time.time()
+                        if event.get('runtime') is not None:
+                            self.record_task_runtime(task_info.get('name', 'unknown'), event['runtime'])
                         logger.info(f"✅ Task completed: {task_info.get('name', 'unknown')} ({event['uuid'][:8]})")
-                    
+
                     def on_task_failed(event):
                         task_info = self.active_tasks.pop(event['uuid'], {})
+                        self.events_updated_at = time.time()
                         logger.warning(f"❌ Task failed: {task_info.get('name', 'unknown')} ({event['uuid'][:8]})")
-                    
+
                     def on_worker_heartbeat(event):
-                        self.worker_stats[event['hostname']] = {
-                            'last_heartbeat': datetime.fromtimestamp(event['timestamp']).isoformat(),
-                            'status': 'online'
-                        }
-                    
+                        self.record_worker_event(event, 'online')
+
+                    def on_worker_offline(event):
+                        self.record_worker_event(event, 'offline')
+
                     # Attempt connection
                     with celery_app.connection() as connection:
                         receiver = EventReceiver(
@@ -63,35 +168,255 @@ class CeleryEventMonitor:
                                 'task-succeeded': on_task_succeeded,
                                 'task-failed': on_task_failed,
                                 'worker-heartbeat': on_worker_heartbeat,
+                                'worker-online': on_worker_heartbeat,
+                                'worker-offline': on_worker_offline,
                             }
                         )
-                        
+
                         logger.info("✅ Connected to Celery events - monitoring active")
                         self.is_monitoring = True
                         retry_interval = 5  # Reset retry interval on success
-                        
+
                         # This blocks until connection fails
                         receiver.capture(limit=None, timeout=None, wakeup=True)
-                        
+
                 except (KeyboardInterrupt, SystemExit):
                     logger.info("🛑 Event monitoring stopped by user")
                     self.is_monitoring = False
                     break
-                    
+
                 except Exception as e:
                     self.is_monitoring = False
                     logger.warning(f"⚠️ Celery event connection failed: {e}")
                     logger.info(f"🔄 Retrying in {retry_interval} seconds... (make sure Celery worker is running)")
-                    
+
                     time.sleep(retry_interval)
-                    
+
                     # Exponential backoff with max limit
                     retry_interval = min(retry_interval * 1.5, max_retry_interval)
-        
+
         self.monitoring_thread = threading.Thread(target=monitor_worker, daemon=True)
         self.monitoring_thread.start()
         logger.info("🔄 Celery event monitoring thread started (will connect when worker available)")
-    
+
+    def record_task_runtime(self, name: str, runtime: float, alpha: float = 0.2):
+        """Fold a task's runtime (from its task-succeeded event) into a per-task EWMA"""
+        previous = self.task_runtimes.get(name)
+        self.task_runtimes[name] = runtime if previous is None else previous + alpha * (runtime - previous)
+
+    def record_worker_event(self, event: Dict[str, Any], status: str):
+        """Update the cached state of a worker from a heartbeat/online/offline event"""
+        self.worker_stats[event['hostname']] = {
+            'last_heartbeat': datetime.fromtimestamp(event['timestamp']).isoformat(),
+            'status': status,
+            'heartbeat_ts': event['timestamp'],
+            'active': event.get('active'),
+            'processed': event.get('processed'),
+            'loadavg': event.get('loadavg'),
+        }
+        self.events_updated_at = time.time()
+
+    # ------------------------------------------------------------------
+    # Background refresh (low-frequency inspect + queue lengths)
+    # ------------------------------------------------------------------
+
+    def start_state_refresh(self):
+        """Start the background thread that refreshes inspect data and queue lengths"""
+        if self.refresh_thread and self.refresh_thread.is_alive():
+            logger.info("Cluster state refresh already running")
+            return
+
+        self._stop_refresh.clear()
+        self.refresh_thread = threading.Thread(
+            target=self._refresh_loop, name="celery-state-refresh", daemon=True
+        )
+        self.refresh_thread.start()
+        logger.info(
+            f"🔄 Cluster state refresh started (inspect every {self.inspect_interval:.0f}s, "
+            f"queues every {self.sample_interval:.0f}s)"
+        )
+
+    def stop_state_refresh(self, timeout: float = 5.0):
+        """Stop the background refresh thread"""
+        self._stop_refresh.set()
+        if self.refresh_thread and self.refresh_thread.is_alive():
+            self.refresh_thread.join(timeout=timeout)
+        self.refresh_thread = None
+
+    def _refresh_loop(self):
+        next_inspect = 0.0
+        while not self._stop_refresh.is_set():
+            self.sample_queue_lengths()
+            self.refresh_worker_models()
+            if time.monotonic() >= next_inspect:
+                self.refresh_inspect()
+                next_inspect = time.monotonic() + self.inspect_interval
+            self._stop_refresh.wait(self.sample_interval)
+
+    def refresh_inspect(self) -> bool:
+        """One broadcast round of inspect calls; keeps the previous snapshot on failure"""
+        try:
+            inspect = celery_app.control.inspect(timeout=self.inspect_timeout)
+            stats = inspect.stats()
+            if stats:
+                snapshot = {
+                    "stats": stats,
+                    "active": inspect.active(),
+                    "scheduled": inspect.scheduled(),
+                    "reserved": inspect.reserved(),
+                    "error": None
+                }
+            else:
+                # No replies: workers are absent or too busy to answer (solo pool)
+                snapshot = {"stats": None, "active": None, "scheduled": None, "reserved": None,
+                            "error": "no_reply"}
+            self.inspect_snapshot = snapshot
+            self.inspect_updated_at = time.time()
+            return stats is not None
+        except Exception as e:
+            self.inspect_snapshot = dict(self.inspect_snapshot, error=str(e))
+            logger.debug(f"Celery inspect refresh failed: {e}")
+            return False
+
+    def sample_queue_lengths(self) -> bool:
+        """LLEN every monitored broker queue (including priority lists) in one round trip"""
+        try:
+            pipe = get_broker_redis().pipeline(transaction=False)
+            for queue in self.monitored_queues:
+                for suffix in PRIORITY_QUEUE_SUFFIXES:
+                    pipe.llen(f"{queue}{suffix}")
+            pipe.hlen(UNACKED_KEY)
+            replies = pipe.execute()
+        except Exception as e:
+            logger.debug(f"Queue length sampling failed: {e}")
+            return False
+
+        step = len(PRIORITY_QUEUE_SUFFIXES)
+        lengths = {
+            queue: sum(int(n or 0) for n in replies[i * step:(i + 1) * step])
+            for i, queue in enumerate(self.monitored_queues)
+        }
+        self.queue_lengths = lengths
+        self.unacked_tasks = int(replies[-1] or 0)
+        self.queues_updated_at = time.time()
+
+        from .metrics import update_queue_metrics
+        for queue, length in lengths.items():
+            update_queue_metrics(queue, length)
+        return True
+
+    def refresh_worker_models(self) -> bool:
+        """Read the model status snapshots workers published to the broker"""
+        import json
+        try:
+            raw = get_broker_redis().hgetall(WORKER_MODELS_KEY)
+        except Exception as e:
+            logger.debug(f"Worker model status refresh failed: {e}")
+            return False
+
+        models = {}
+        for host, value in raw.items():
+            try:
+                models[host] = json.loads(value)
+            except (TypeError, ValueError):
+                continue
+        self.worker_models = models
+        self.models_updated_at = time.time()
+        return True
+
+    # ------------------------------------------------------------------
+    # Readers
+    # ------------------------------------------------------------------
+
+    def get_workers(self) -> List[Dict[str, Any]]:
+        """
+        Known workers merged from events, the last inspect and published model status.
+
+        status is "online" if a heartbeat or the last inspect is recent,
+        "offline" after a worker-offline event and "unresponsive" otherwise
+        (a solo-pool worker sends no heartbeats while it runs a task).
+        """
+        now = time.time()
+        stats = self.inspect_snapshot.get("stats") or {}
+        inspect_fresh = (self.inspect_updated_at is not None
+                         and now - self.inspect_updated_at <= self.stale_after)
+
+        workers = []
+        for name in sorted(set(self.worker_stats) | set(stats) | set(self.worker_models)):
+            event_info = self.worker_stats.get(name, {})
+            heartbeat_ts = event_info.get('heartbeat_ts')
+            heartbeat_age = now - heartbeat_ts if heartbeat_ts is not None else None
+
+            if event_info.get('status') == 'offline':
+                status = 'offline'
+            elif (heartbeat_age is not None and heartbeat_age <= self.stale_after) \
+                    or (inspect_fresh and name in stats):
+                status = 'online'
+            else:
+                status = 'unresponsive'
+
+            workers.append({
+                "name": name,
+                "status": status,
+                "last_heartbeat": event_info.get('last_heartbeat'),
+                "heartbeat_age_seconds": round(heartbeat_age, 1) if heartbeat_age is not None else None,
+                "active": event_info.get('active'),
+                "processed": event_info.get('processed'),
+                "loadavg": event_info.get('loadavg'),
+                "total_tasks": stats.get(name, {}).get("total", {}),
+                "models": self.worker_models.get(name)
+            })
+        return workers
+
+    def refresh_now(self) -> None:
+        """Refresh every cached source in the calling thread"""
+        self.refresh_inspect()
+        self.sample_queue_lengths()
+        self.refresh_worker_models()
+
+    def get_cluster_state(self) -> Dict[str, Any]:
+        """
+        Full cluster snapshot with staleness info for each source.
+
+        Served from the cache when it is enabled; otherwise refreshed on
+        every call, since no background thread keeps it current.
+        """
+        if not self.cache_enabled:
+            self.refresh_now()
+        snapshot = self.inspect_snapshot
+        workers = self.get_workers()
+
+        # Events are live; fall back to the last inspect when they are not connected
+        if self.is_monitoring:
+            active_count = len(self.active_tasks)
+        else:
+            active_count = _count_tasks(snapshot.get("active"))
+
+        return {
+            "workers": workers,
+            "workers_online": sum(1 for worker in workers if worker["status"] == "online"),
+            "tasks": {
+                "active": active_count,
+                "scheduled": _count_tasks(snapshot.get("scheduled")),
+                "reserved": _count_tasks(snapshot.get("reserved")),
+                "queued": sum(self.queue_lengths.values()),
+                "unacked": self.unacked_tasks
+            },
+            "queue_lengths": dict(self.queue_lengths),
+            "inspect": snapshot,
+            "worker_models": dict(self.worker_models),
+            "freshness": self.get_freshness()
+        }
+
+    def get_freshness(self) -> Dict[str, Dict[str, Any]]:
+        """When each source of the cluster state was last refreshed"""
+        return {
+            "events": _freshness(self.events_updated_at, self.stale_after),
+            "inspect": _freshness(self.inspect_updated_at, max(self.stale_after, 2 * self.inspect_interval)),
+            "queues": _freshness(self.queues_updated_at, max(self.stale_after, 2 * self.sample_interval)),
+            "worker_models": _freshness(self.models_updated_at, max(self.stale_after, 2 * self.sample_interval))
+        }
+
     def get_active_tasks(self) -> Dict[str, Any]:
         """Get currently active tasks"""
         return {
@@ -100,7 +425,7 @@ class CeleryEventMonitor:
             "data_source": "celery_events",
             "monitoring_status": "connected" if self.is_monitoring else "waiting_for_worker"
         }
-    
+
     def get_worker_stats(self) -> Dict[str, Any]:
         """Get worker statistics"""
         return {
@@ -108,16 +433,17 @@ class CeleryEventMonitor:
             "total_workers": len(self.worker_stats),
             "monitoring_status": "connected" if self.is_monitoring else "waiting_for_worker"
         }
-    
+
     def get_connection_status(self) -> Dict[str, Any]:
         """Get monitoring connection status"""
         return {
             "is_monitoring": self.is_monitoring,
             "thread_alive": self.monitoring_thread.is_alive() if self.monitoring_thread else False,
+            "refresh_alive": self.refresh_thread.is_alive() if self.refresh_thread else False,
             "active_tasks_count": len(self.active_tasks),
             "workers_seen": len(self.worker_stats),
             "status": "connected" if self.is_monitoring else "waiting_for_celery_worker"
         }
 
 # Global instance
-celery_monitor = CeleryEventMonitor()
\ No newline at end of file
+celery_monitor = CeleryEventMonitor()
@@ -0,0 +1,322 @@
+"""
+Off-thread logging pipeline
+
+Logging calls on the event loop and in Celery tasks only enqueue the record.
+A QueueListener thread runs the PII sanitizing filter, formats the record
+and writes it, flushing each handler once per batch instead of once per
+record. The queue is bounded: when it fills up DEBUG records are dropped
+first, and other records wait briefly before being dropped, so a slow disk
+never stalls the caller indefinitely. Queue depth and dropped records are
+exported as Prometheus metrics.
+"""
+import atexit
+import logging
+import os
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional
+
+from .metrics import record_log_drop, update_log_queue_depth
+
+# Argument types that are safe to format later on the listener thread
+_IMMUTABLE_ARG_TYPES = (str, int, float, bool, bytes, type(None))
+
+
+class _DeferredFlushMixin:
+    """Write without flushing; the listener flushes once per batch"""
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            msg = self.format(record)
+            self.stream.write(msg + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class BatchStreamHandler(_DeferredFlushMixin, logging.StreamHandler):
+    """StreamHandler flushed by the listener after each batch"""
+    pass
+
+
+class BatchFileHandler(_DeferredFlushMixin, logging.FileHandler):
+    """FileHandler flushed by the listener after each batch"""
+
+    def emit(self, record: logging.LogRecord):
+        if self.stream is None:
+            if self.mode != 'w' or not getattr(self, '_closed', False):
+                self.stream = self._open()
+        if self.stream:
+            _DeferredFlushMixin.emit(self, record)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler over a bounded queue that sheds load instead of blocking
+
+    DEBUG (and lower) records are dropped once the queue is more than
+    debug_drop_threshold full. Other records wait up to block_timeout
+    seconds for space and are dropped (and counted) if none frees up.
+    """
+
+    def __init__(self, log_queue: queue.Queue, debug_drop_threshold: float = 0.8,
+                 block_timeout: float = 0.5):
+        super().__init__(log_queue)
+        self.maxsize = log_queue.maxsize
+        self.debug_drop_depth = (
+            int(self.maxsize * debug_drop_threshold) if self.maxsize > 0 else None
+        )
+        self.block_timeout = block_timeout
+        self.enqueued = 0
+        self.dropped: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Keep the record for the listener to format
+
+        Only arguments that could change before the listener gets to them
+        (mutable objects) are rendered into the message here.
+        """
+        if record.args and not self._args_immutable(record.args):
+            try:
+                record.msg = record.getMessage()
+                record.args = None
+            except Exception:
+                pass
+        return record
+
+    @staticmethod
+    def _args_immutable(args) -> bool:
+        values = args.values() if isinstance(args, dict) else args
+        return all(isinstance(value, _IMMUTABLE_ARG_TYPES) for value in values)
+
+    def enqueue(self, record: logging.LogRecord):
+        if (self.debug_drop_depth is not None and record.levelno <= logging.DEBUG
+                and self.queue.qsize() >= self.debug_drop_depth):
+            self._count_drop(record, "debug_shed")
+            return
+
+        try:
+            self.queue.put(record, block=self.block_timeout > 0, timeout=self.block_timeout or None)
+        except queue.Full:
+            self._count_drop(record, "queue_full")
+            return
+
+        with self._lock:
+            self.enqueued += 1
+
+    def _count_drop(self, record: logging.LogRecord, reason: str):
+        with self._lock:
+            self.dropped[record.levelname] = self.dropped.get(record.levelname, 0) + 1
+        record_log_drop(record.levelname, reason)
+
+
+class BatchingQueueListener(QueueListener):
+    """QueueListener that drains records in batches and flushes handlers once per batch"""
+
+    def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler,
+                 batch_size: int = 512, respect_handler_level: bool = True):
+        super().__init__(log_queue, *handlers, respect_handler_level=respect_handler_level)
+        self.batch_size = max(1, batch_size)
+        self.processed = 0
+        self.batches = 0
+
+    def _monitor(self):
+        q = self.queue
+        has_task_done = hasattr(q, 'task_done')
+        stopping = False
+        while not stopping:
+            try:
+                batch = [self.dequeue(True)]
+            except queue.Empty:
+                break
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.dequeue(False))
+                except queue.Empty:
+                    break
+
+            for record in batch:
+                if record is self._sentinel:
+                    stopping = True
+                else:
+                    self.handle(record)
+                if has_task_done:
+                    q.task_done()
+
+            self._flush_handlers()
+            self.processed += len(batch) - (1 if stopping else 0)
+            self.batches += 1
+            update_log_queue_depth(q.qsize())
+
+    def enqueue_sentinel(self):
+        # The listener keeps draining, so wait for room instead of failing on a full queue
+        self.queue.put(self._sentinel)
+
+    def _flush_handlers(self):
+        for handler in self.handlers:
+            try:
+                handler.flush()
+            except Exception:
+                pass
+
+
+class LoggingPipeline:
+    """Root logger wiring: a DroppingQueueHandler feeding a BatchingQueueListener"""
+
+    def __init__(self, queue_handler: DroppingQueueHandler, listener: BatchingQueueListener,
+                 handlers: List[logging.Handler]):
+        self.queue_handler = queue_handler
+        self.listener = listener
+        self.handlers = handlers
+        self._stopped = False
+
+    def stop(self):
+        """Drain the queue and stop the listener thread"""
+        if self._stopped:
+            return
+        self._stopped = True
+        self.listener.stop()
+        logging.getLogger().removeHandler(self.queue_handler)
+        self.listener._flush_handlers()
+
+    def _restart_after_fork(self):
+        """Give a forked child its own queue and listener thread (threads do not survive fork)"""
+        if self._stopped:
+            return
+        log_queue: queue.Queue = queue.Queue(maxsize=self.queue_handler.maxsize)
+        self.queue_handler.queue = log_queue
+        self.queue_handler._lock = threading.Lock()
+        self.listener.queue = log_queue
+        self.listener._thread = None
+        self.listener.start()
+
+    def get_stats(self) -> Dict:
+        """Queue depth and record counters"""
+        return {
+            'queue_depth': self.queue_handler.queue.qsize(),
+            'queue_maxsize': self.queue_handler.maxsize,
+            'records_enqueued': self.queue_handler.enqueued,
+            'records_processed': self.listener.processed,
+            'records_dropped': dict(self.queue_handler.dropped),
+            'batches_written': self.listener.batches,
+        }
+
+
+_pipeline: Optional[LoggingPipeline] = None
+_fork_hook_registered = False
+
+
+def _after_fork_in_child():
+    if _pipeline is not None:
+        _pipeline._restart_after_fork()
+
+
+def setup_logging_pipeline(
+    level: int = logging.INFO,
+    format_string: str = '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    log_file: Optional[str] = None,
+    filters: Optional[List[logging.Filter]] = None,
+    queue_size: int = 10000,
+    batch_size: int = 512,
+    debug_drop_threshold: float = 0.8,
+    block_timeout: float = 0.5,
+) -> LoggingPipeline:
+    """
+    Replace the root logger's handlers with a queue-backed pipeline
+
+    Args:
+        level: Root logger level
+        format_string: Record format
+        log_file: Also write to this file (optional)
+        filters: Filters run on the listener thread (e.g. PIISanitizingFilter)
+        queue_size: Maximum queued records
+        batch_size: Maximum records written per flush
+        debug_drop_threshold: Queue fill fraction above which DEBUG records are dropped
+        block_timeout: Seconds a logging call may wait for space in a full queue
+
+    Returns:
+        The running LoggingPipeline (also stopped automatically at exit)
+    """
+    global _pipeline, _fork_hook_registered
+    if _pipeline is not None:
+        _pipeline.stop()
+
+    formatter = logging.Formatter(format_string)
+    handlers: List[logging.Handler] = [BatchStreamHandler(sys.stderr)]
+    if log_file:
+        handlers.append(BatchFileHandler(log_file))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        for log_filter in filters or []:
+            handler.addFilter(log_filter)
+
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    queue_handler = DroppingQueueHandler(log_queue, debug_drop_threshold, block_timeout)
+    listener = BatchingQueueListener(log_queue, *handlers, batch_size=batch_size)
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    listener.start()
+    _pipeline = LoggingPipeline(queue_handler, listener, handlers)
+    atexit.register(_pipeline.stop)
+    if not _fork_hook_registered and hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=_after_fork_in_child)
+        _fork_hook_registered = True
+    return _pipeline
+
+
+def get_logging_pipeline() -> Optional[LoggingPipeline]:
+    """The pipeline installed by setup_logging_pipeline, if any"""
+    return _pipeline
+
+
+def configure_service_logging(level: Optional[int] = None) -> logging.Filter:
+    """
+    Configure root logging for the API server and Celery workers
+
+    Every record passes through the PII sanitizing filter. With
+    log_queue_enabled the filter, formatting and writes run on the listener
+    thread; otherwise they run synchronously on the logging thread.
+
+    Returns:
+        The PIISanitizingFilter instance
+    """
+    from ..config.settings import settings
+    from ..security import PIISanitizingFilter
+
+    if level is None:
+        level = getattr(logging, settings.log_level)
+    format_string = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    pii_filter = PIISanitizingFilter()
+
+    if settings.log_queue_enabled:
+        setup_logging_pipeline(
+            level=level,
+            format_string=format_string,
+            log_file=settings.log_file,
+            filters=[pii_filter],
+            queue_size=settings.log_queue_size,
+            batch_size=settings.log_queue_batch_size,
+            debug_drop_threshold=settings.log_queue_debug_drop_threshold,
+            block_timeout=settings.log_queue_block_timeout,
+        )
+    else:
+        handlers: List[logging.Handler] = [logging.StreamHandler()]
+        if settings.log_file:
+            handlers.append(logging.FileHandler(settings.log_file))
+        logging.basicConfig(level=level, format=format_string, handlers=handlers)
+
+        # Add PII filter to root logger handlers
+        for handler in logging.getLogger().handlers:
+            handler.addFilter(pii_filter)
+
+    return pii_filter
@@ -5,6 +5,7 @@ Tracks API performance, model processing times, and system health
 import logging
 from prometheus_client import Counter, Histogram, Gauge, Info
 from functools import wraps
+from typing import Optional
 import time
 
 logger = logging.getLogger(__name__)
@@ -69,6 +70,31 @@ model_loaded = Gauge(
     ['model']
 )
 
+# Startup profile of the most recent load of each model
+model_load_duration_seconds = Gauge(
+    'model_load_duration_seconds',
+    'Wall time spent loading a model',
+    ['model']
+)
+
+model_load_peak_rss_bytes = Gauge(
+    'model_load_peak_rss_bytes',
+    'Peak process RSS observed while a model was loading',
+    ['model']
+)
+
+model_mmap_weights_bytes = Gauge(
+    'model_mmap_weights_bytes',
+    'Model weight bytes served from shared mmapped safetensors files',
+    ['model']
+)
+
+model_warmup_seconds = Gauge(
+    'model_warmup_seconds',
+    'Latency of the first inference after a model was loaded',
+    ['model']
+)
+
 # ============================================
 # CELERY METRICS
 # ============================================
@@ -127,6 +153,27 @@ streaming_latency_seconds = Histogram(
     buckets=(0.1, 0.5, 1.0, 2.0, 5.0, 10.0, float('inf'))
 )
 
+# Target live transcription window set by the window controller
+streaming_window_target_seconds = Gauge(
+    'streaming_window_target_seconds',
+    'Target length of live transcription windows in seconds'
+)
+
+# Time from the start of a live window to the first words shown for it (interim or final)
+streaming_time_to_first_word_seconds = Histogram(
+    'streaming_time_to_first_word_seconds',
+    'Seconds from window start to the first transcribed words for that window',
+    ['source'],
+    buckets=(0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, float('inf'))
+)
+
+# Interim (greedy, is_final=false) transcripts: submitted, throttled, sent, empty
+streaming_interim_total = Counter(
+    'streaming_interim_total',
+    'Interim transcript decodes by outcome',
+    ['outcome']
+)
+
 # Audio buffer status
 streaming_buffer_size_bytes = Gauge(
     'streaming_buffer_size_bytes',
@@ -134,6 +181,89 @@ streaming_buffer_size_bytes = Gauge(
     ['session_id']
 )
 
+# Progress stream clients (SSE/WebSocket) attached to the progress hub
+progress_hub_clients = Gauge(
+    'progress_hub_clients',
+    'Progress stream clients connected to this API process'
+)
+
+# Clients that fell behind and had updates dropped from their queue
+progress_hub_lagging_clients = Gauge(
+    'progress_hub_lagging_clients',
+    'Connected progress stream clients that have had updates dropped'
+)
+
+# Progress updates not delivered to a client (queue_full, too_many_clients)
+progress_hub_dropped_total = Counter(
+    'progress_hub_dropped_total',
+    'Progress updates dropped before reaching a stream client',
+    ['reason']
+)
+
+# ============================================
+# NOTIFICATION DELIVERY METRICS
+# ============================================
+
+# Outbound notifications waiting for a sender task
+notification_queue_depth = Gauge(
+    'notification_queue_depth',
+    'Number of outbound notifications waiting in the delivery queue'
+)
+
+# Time from enqueue to final delivery outcome
+notification_delivery_latency_seconds = Histogram(
+    'notification_delivery_latency_seconds',
+    'Outbound notification latency from enqueue to delivery in seconds',
+    ['notification_type', 'status'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, float('inf'))
+)
+
+# Notifications that were never delivered (coalesced, queue full, retries exhausted)
+notification_dropped_total = Counter(
+    'notification_dropped_total',
+    'Outbound notifications dropped before delivery',
+    ['notification_type', 'reason']
+)
+
+# ============================================
+# MODEL RESULT CACHE METRICS
+# ============================================
+
+# Result cache lookups (hit_memory, hit_redis, miss, bypass)
+model_cache_requests_total = Counter(
+    'model_cache_requests_total',
+    'Model result cache lookups',
+    ['model', 'result']
+)
+
+# ============================================
+# NER BATCHING METRICS
+# ============================================
+
+# Texts per NER micro-batch (grouped across calls and windows)
+ner_batch_size = Histogram(
+    'ner_batch_size',
+    'Texts per NER micro-batch',
+    buckets=[1, 2, 4, 8, 16, 32, 64]
+)
+
+# ============================================
+# LOGGING PIPELINE METRICS
+# ============================================
+
+# Records waiting for the logging listener thread
+log_queue_depth = Gauge(
+    'log_queue_depth',
+    'Log records waiting in the logging queue'
+)
+
+# Records dropped under overload (debug_shed, queue_full)
+log_records_dropped_total = Counter(
+    'log_records_dropped_total',
+    'Log records dropped before being written',
+    ['level', 'reason']
+)
+
 # ============================================
 # SYSTEM INFO
 # ============================================
@@ -220,6 +350,16 @@ def update_model_status(model_name: str, loaded: bool):
     model_loaded.labels(model=model_name).set(1 if loaded else 0)
 
 
+def record_model_load_profile(model_name: str, load_seconds: float, peak_rss_bytes: int,
+                              mmap_bytes: int = 0, warmup_seconds: Optional[float] = None):
+    """Record load time, peak RSS, mmapped weight bytes and warmup latency for a model"""
+    model_load_duration_seconds.labels(model=model_name).set(load_seconds)
+    model_load_peak_rss_bytes.labels(model=model_name).set(peak_rss_bytes)
+    model_mmap_weights_bytes.labels(model=model_name).set(mmap_bytes)
+    if warmup_seconds is not None:
+        model_warmup_seconds.labels(model=model_name).set(warmup_seconds)
+
+
 def record_upload_size(endpoint: str, size_bytes: int):
     """Record uploaded file size"""
     api_upload_size_bytes.labels(endpoint=endpoint).observe(size_bytes)
@@ -235,6 +375,69 @@ def record_streaming_latency(session_type: str, latency_seconds: float):
     streaming_latency_seconds.labels(session_type=session_type).observe(latency_seconds)
 
 
+def update_streaming_window_target(window_seconds: float):
+    """Update the window controller's current target window length"""
+    streaming_window_target_seconds.set(window_seconds)
+
+
+def record_time_to_first_word(source: str, seconds: float):
+    """Record time to first word of a live window (source: interim or final)"""
+    streaming_time_to_first_word_seconds.labels(source=source).observe(seconds)
+
+
+def record_interim_transcript(outcome: str):
+    """Record an interim transcript decision or result"""
+    streaming_interim_total.labels(outcome=outcome).inc()
+
+
+def update_progress_hub_clients(connected: int, lagging: int):
+    """Update connected and lagging progress stream client counts"""
+    progress_hub_clients.set(connected)
+    progress_hub_lagging_clients.set(lagging)
+
+
+def record_progress_drop(reason: str, count: int = 1):
+    """Record progress updates that did not reach a stream client"""
+    progress_hub_dropped_total.labels(reason=reason).inc(count)
+
+
+def update_notification_queue_depth(depth: int):
+    """Update outbound notification queue depth"""
+    notification_queue_depth.set(depth)
+
+
+def record_notification_delivery(notification_type: str, status: str, latency_seconds: float):
+    """Record enqueue-to-delivery latency for an outbound notification"""
+    notification_delivery_latency_seconds.labels(
+        notification_type=notification_type, status=status
+    ).observe(latency_seconds)
+
+
+def record_notification_drop(notification_type: str, reason: str):
+    """Record an outbound notification dropped before delivery"""
+    notification_dropped_total.labels(notification_type=notification_type, reason=reason).inc()
+
+
+def record_model_cache_lookup(model_name: str, result: str):
+    """Record a model result cache lookup outcome"""
+    model_cache_requests_total.labels(model=model_name, result=result).inc()
+
+
+def record_ner_batch(size: int):
+    """Record the number of texts in a NER micro-batch"""
+    ner_batch_size.observe(size)
+
+
+def update_log_queue_depth(depth: int):
+    """Update the logging queue depth"""
+    log_queue_depth.set(depth)
+
+
+def record_log_drop(level: str, reason: str):
+    """Record a log record dropped under overload"""
+    log_records_dropped_total.labels(level=level, reason=reason).inc()
+
+
 # ============================================
 # INITIALIZATION
 # ============================================
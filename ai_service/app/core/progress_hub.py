@@ -0,0 +1,353 @@
+# app/core/progress_hub.py
+"""
+Progress Hub
+
+Fans task progress updates out to every SSE and WebSocket client of this API
+process from one shared Redis subscription, instead of one pub/sub connection
+per client per task.
+
+- One pattern subscription (`audio_stream:*`) read by a single reader task.
+  Each message is decoded once and offered to the clients of that task.
+- Every client has a bounded queue. A client that falls behind loses its
+  oldest updates rather than growing memory; it is counted as lagging.
+- Replay: publishers also append each update to a capped Redis Stream per task
+  (see core.streaming), so a client that connects late first receives the
+  recent history and then continues live, without duplicates.
+
+The hub is bound to the event loop it was started on (the API server's).
+"""
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Any, AsyncGenerator, Dict, List, Optional, Set
+
+import redis.asyncio as redis
+
+from ..config.settings import settings, get_redis_url
+from .metrics import update_progress_hub_clients, record_progress_drop
+from .streaming import PROGRESS_CHANNEL_PREFIX, TERMINAL_STEPS, progress_log_key
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressSubscription:
+    """One client's bounded queue of progress updates for a task."""
+
+    def __init__(self, task_id: str, max_queue_size: int):
+        self.task_id = task_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, int(max_queue_size)))
+        self.replayed_ids: Set[str] = set()
+        self.dropped = 0
+
+    @property
+    def lagging(self) -> bool:
+        """True once this client has had updates dropped because it fell behind."""
+        return self.dropped > 0
+
+    def offer(self, update: Optional[Dict[str, Any]]) -> bool:
+        """
+        Queue an update without blocking; drops the oldest queued update when full.
+
+        Returns True if the client just became lagging.
+        """
+        became_lagging = False
+        if self.queue.full():
+            try:
+                self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            became_lagging = not self.lagging
+            self.dropped += 1
+            record_progress_drop("queue_full")
+        self.queue.put_nowait(update)
+        return became_lagging
+
+
+class ProgressHub:
+    """Single Redis pattern subscription fanned out to per-client queues."""
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        client_queue_size: int = 100,
+        max_clients: int = 1000,
+        replay_max_events: int = 200,
+        connect_timeout: float = 5.0,
+    ):
+        self.redis_url = redis_url or get_redis_url()
+        self.client_queue_size = client_queue_size
+        self.max_clients = max_clients
+        self.replay_max_events = replay_max_events
+        self.connect_timeout = connect_timeout
+
+        self._subscriptions: Dict[str, Set[ProgressSubscription]] = {}
+        self._client_count = 0
+        self._lagging_count = 0
+        self._reader: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[redis.Redis] = None
+        self._subscribed: Optional[asyncio.Event] = None
+
+        self.stats = {
+            "messages_received": 0,
+            "messages_fanned_out": 0,
+            "replayed": 0,
+            "dropped_queue_full": 0,
+            "rejected_clients": 0,
+            "reconnects": 0,
+        }
+
+    @classmethod
+    def from_settings(cls) -> "ProgressHub":
+        """Build a hub from the progress stream settings."""
+        return cls(
+            client_queue_size=settings.progress_client_queue_size,
+            max_clients=settings.progress_hub_max_clients,
+            replay_max_events=settings.progress_replay_max_events,
+        )
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Connect to Redis and start the reader task on the running loop."""
+        if self._reader is not None:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._subscribed = asyncio.Event()
+        self._client = redis.from_url(self.redis_url, decode_responses=True)
+        self._reader = asyncio.create_task(self._read(), name="progress-hub-reader")
+        logger.info(
+            f"📡 Progress hub started: pattern {PROGRESS_CHANNEL_PREFIX}*, "
+            f"queue {self.client_queue_size}/client, replay {self.replay_max_events} events"
+        )
+
+    async def stop(self) -> None:
+        """Stop the reader and end every open client stream."""
+        if self._reader is None:
+            return
+
+        self._reader.cancel()
+        await asyncio.gather(self._reader, return_exceptions=True)
+        self._reader = None
+
+        # End open streams: None tells subscribe() the hub went away
+        for subscriptions in list(self._subscriptions.values()):
+            for subscription in subscriptions:
+                subscription.offer(None)
+
+        if self._client is not None:
+            try:
+                await self._client.aclose()
+            except Exception:
+                pass
+            self._client = None
+        logger.info("📴 Progress hub stopped")
+
+    def is_active(self) -> bool:
+        """True when the reader is running on the caller's event loop."""
+        if self._reader is None or self._reader.done():
+            return False
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    # ------------------------------------------------------------------
+    # Reader side
+    # ------------------------------------------------------------------
+
+    async def _read(self) -> None:
+        retry_interval = 1.0
+        while True:
+            pubsub = self._client.pubsub()
+            try:
+                await pubsub.psubscribe(f"{PROGRESS_CHANNEL_PREFIX}*")
+                self._subscribed.set()
+                retry_interval = 1.0
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None and message.get("type") == "pmessage":
+                        self.dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._subscribed.clear()
+                self.stats["reconnects"] += 1
+                logger.warning(f"⚠️ Progress hub subscription lost: {e} - retrying in {retry_interval:.0f}s")
+                await asyncio.sleep(retry_interval)
+                retry_interval = min(retry_interval * 2, 30.0)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    def dispatch(self, channel: str, data: str) -> int:
+        """Decode one published update and offer it to the clients of its task."""
+        self.stats["messages_received"] += 1
+        task_id = channel[len(PROGRESS_CHANNEL_PREFIX):]
+        subscriptions = self._subscriptions.get(task_id)
+        if not subscriptions:
+            return 0
+
+        try:
+            update = json.loads(data)
+        except (TypeError, ValueError) as e:
+            logger.error(f"❌ Invalid JSON in stream for task {task_id}: {e}")
+            update = {
+                "task_id": task_id,
+                "status": "stream_error",
+                "error": "Invalid message format",
+                "timestamp": datetime.now().isoformat()
+            }
+
+        for subscription in subscriptions:
+            if subscription.offer(update):
+                self._lagging_count += 1
+                self._update_metrics()
+        self.stats["messages_fanned_out"] += len(subscriptions)
+        return len(subscriptions)
+
+    # ------------------------------------------------------------------
+    # Client side
+    # ------------------------------------------------------------------
+
+    async def subscribe(
+        self,
+        task_id: str,
+        timeout: float = 600,
+        replay: bool = True
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Yield a task's progress updates: a subscription confirmation, the
+        replayed history (if any), then live updates until a terminal step,
+        the timeout, or hub shutdown.
+        """
+        if self._client_count >= self.max_clients:
+            self.stats["rejected_clients"] += 1
+            record_progress_drop("too_many_clients")
+            yield {
+                "task_id": task_id,
+                "status": "subscription_error",
+                "error": f"Too many progress stream clients ({self.max_clients})",
+                "timestamp": datetime.now().isoformat()
+            }
+            return
+
+        subscription = ProgressSubscription(task_id, self.client_queue_size)
+        self._register(subscription)
+        try:
+            yield {
+                "task_id": task_id,
+                "status": "subscribed",
+                "message": "Subscribed to audio processing stream",
+                "timestamp": datetime.now().isoformat()
+            }
+
+            # Only read history once live updates are flowing into the queue,
+            # so nothing published in between is missed
+            await self._wait_subscribed()
+            if replay:
+                for update in await self.read_history(task_id):
+                    subscription.replayed_ids.add(update.get("event_id"))
+                    self.stats["replayed"] += 1
+                    yield update
+                    if update.get("step") in TERMINAL_STEPS:
+                        return
+
+            deadline = asyncio.get_running_loop().time() + timeout
+            while True:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    logger.warning(f"⏰ Stream timeout for task {task_id} after {timeout}s")
+                    yield {
+                        "task_id": task_id,
+                        "status": "timeout",
+                        "error": f"Stream timeout after {timeout} seconds",
+                        "elapsed_time": timeout,
+                        "timestamp": datetime.now().isoformat()
+                    }
+                    return
+                try:
+                    update = await asyncio.wait_for(subscription.queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    continue
+
+                if update is None:
+                    return  # hub stopped
+                if update.get("event_id") in subscription.replayed_ids:
+                    continue
+                yield update
+                if update.get("step") in TERMINAL_STEPS:
+                    logger.info(f"🏁 Stream ended for task {task_id}: {update.get('step')}")
+                    return
+        finally:
+            self._unregister(subscription)
+
+    async def read_history(self, task_id: str) -> List[Dict[str, Any]]:
+        """Recent updates of a task from its replay stream, oldest first."""
+        if self.replay_max_events <= 0 or self._client is None:
+            return []
+        try:
+            # The log is trimmed approximately and can hold more than replay_max_events
+            # entries; read the newest ones so the terminal step is never cut off
+            entries = await self._client.xrevrange(progress_log_key(task_id), count=self.replay_max_events)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read progress history for task {task_id}: {e}")
+            return []
+
+        history = []
+        for _, fields in reversed(entries):
+            try:
+                history.append(json.loads(fields["data"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+        return history
+
+    async def _wait_subscribed(self) -> None:
+        try:
+            await asyncio.wait_for(self._subscribed.wait(), self.connect_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("⚠️ Progress hub not subscribed yet - live updates may be delayed")
+
+    def _register(self, subscription: ProgressSubscription) -> None:
+        self._subscriptions.setdefault(subscription.task_id, set()).add(subscription)
+        self._client_count += 1
+        self._update_metrics()
+
+    def _unregister(self, subscription: ProgressSubscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.task_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.task_id]
+        self._client_count -= 1
+        if subscription.lagging:
+            self._lagging_count -= 1
+        self.stats["dropped_queue_full"] += subscription.dropped
+        self._update_metrics()
+
+    def _update_metrics(self) -> None:
+        update_progress_hub_clients(self._client_count, self._lagging_count)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Connected clients, tasks being watched and fan-out counters."""
+        return {
+            "running": self._reader is not None and not self._reader.done(),
+            "subscribed": self._subscribed.is_set() if self._subscribed else False,
+            "clients": self._client_count,
+            "lagging_clients": self._lagging_count,
+            "tasks": len(self._subscriptions),
+            "max_clients": self.max_clients,
+            "client_queue_size": self.client_queue_size,
+            "replay_max_events": self.replay_max_events,
+            **self.stats,
+        }
+
+
+# Global instance
+progress_hub = ProgressHub.from_settings()
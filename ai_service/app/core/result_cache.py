@@ -0,0 +1,351 @@
+"""
+Content-addressed result cache for model tasks
+
+Identical text is pushed through the model tasks many times (pre-transcribed
+demo calls, pipeline retries, repeated agent re-submissions). Results are
+cached under a hash of the normalized input text, the model identity and the
+inference parameters, in two tiers:
+
+- an in-process LRU, checked first and free of network round trips
+- Redis with a TTL, shared by every worker
+
+Each model has a generation number stored in Redis. Reloading a model bumps
+its generation, which makes every older entry for that model unreachable on
+all workers without scanning keys. The model identity also carries a weights
+revision (a stat fingerprint of the local weight files, or the cached Hugging
+Face commit), so weights redeployed at the same path get fresh keys even
+without a reload.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..config.settings import settings, get_redis_url
+from .metrics import record_model_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keying: NFC, collapsed whitespace, stripped."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+# Seconds a weights revision is reused before the files are stat'ed again
+REVISION_REFRESH_SECONDS = 5.0
+
+_revisions: Dict[str, Tuple[Optional[str], float]] = {}
+
+
+def _path_fingerprint(path: str) -> Optional[str]:
+    """Hash of the names, sizes and mtimes of the files under a model path."""
+    entries = []
+    if os.path.isfile(path):
+        stat = os.stat(path)
+        entries.append((os.path.basename(path), stat.st_size, stat.st_mtime_ns))
+    else:
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            for name in sorted(files):
+                full_path = os.path.join(root, name)
+                try:
+                    stat = os.stat(full_path)
+                except OSError:
+                    continue
+                entries.append((os.path.relpath(full_path, path), stat.st_size, stat.st_mtime_ns))
+    if not entries:
+        return None
+    return hashlib.sha1(json.dumps(entries).encode("utf-8")).hexdigest()[:12]
+
+
+def _hub_revision(repo_id: str) -> Optional[str]:
+    """Commit of the locally cached Hugging Face snapshot of a repo, if any."""
+    try:
+        from huggingface_hub.constants import HF_HUB_CACHE
+    except ImportError:
+        return None
+    ref = os.path.join(HF_HUB_CACHE, f"models--{repo_id.replace('/', '--')}", "refs", "main")
+    try:
+        with open(ref) as f:
+            return f.read().strip()[:12] or None
+    except OSError:
+        return None
+
+
+def weights_revision(model_info: Dict[str, Any]) -> Optional[str]:
+    """Revision of the weights a model serves: local file fingerprint, else hub commit."""
+    model_path = model_info.get("model_path")
+    repo_id = model_info.get("hf_repo_id")
+    source = model_path if model_path and os.path.exists(model_path) else repo_id
+    if not source:
+        return None
+
+    now = time.monotonic()
+    cached = _revisions.get(source)
+    if cached is not None and now - cached[1] < REVISION_REFRESH_SECONDS:
+        return cached[0]
+
+    try:
+        revision = _path_fingerprint(source) if source == model_path else _hub_revision(source)
+    except OSError as e:
+        logger.debug(f"Could not fingerprint weights at {source}: {e}")
+        revision = None
+    _revisions[source] = (revision, now)
+    return revision
+
+
+def model_version_key(model_info: Optional[Dict[str, Any]]) -> str:
+    """Stable model identity taken from a model's get_model_info(), including the weights revision."""
+    if not isinstance(model_info, dict):
+        return "unknown"
+    details = model_info.get("details") or {}
+    parts = [
+        model_info.get("hf_repo_id") or model_info.get("model_path") or "unknown",
+        details.get("model_backend") if isinstance(details, dict) else None,
+        weights_revision(model_info),
+    ]
+    return "|".join(str(part) for part in parts if part)
+
+
+class ModelResultCache:
+    """Two-tier (LRU + Redis) cache for model task results."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_entries: int = 1024,
+        ttl_seconds: int = 86400,
+        use_redis: bool = True,
+        namespace: str = "model_cache",
+        generation_refresh_seconds: float = 5.0,
+        redis_retry_seconds: float = 30.0,
+    ):
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.use_redis = use_redis
+        self.namespace = namespace
+        self.generation_refresh_seconds = generation_refresh_seconds
+        self.redis_retry_seconds = redis_retry_seconds
+
+        self._local: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+        self._redis_down_until = 0.0
+        self._generations: Dict[str, Tuple[int, float]] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def make_key(self, model: str, model_version: str, text: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Content hash of normalized text, model identity and inference parameters."""
+        material = json.dumps(
+            {
+                "model": model,
+                "version": model_version,
+                "text": normalize_text(text),
+                "params": params or {},
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get_or_compute(
+        self,
+        model: str,
+        model_version: str,
+        text: str,
+        params: Optional[Dict[str, Any]],
+        compute: Callable[[], Any],
+        use_cache: bool = True,
+    ) -> Tuple[Any, bool]:
+        """
+        Return (result, cache_hit), computing and storing the result on a miss.
+
+        use_cache=False bypasses both lookup and store for this request.
+        """
+        if not self.enabled or not use_cache:
+            self._count(model, "bypass")
+            return compute(), False
+
+        key = self.make_key(model, model_version, text, params)
+        cached = self.get(model, key)
+        if cached is not _MISSING:
+            return cached, True
+
+        result = compute()
+        self.set(model, key, result)
+        return result, False
+
+    def get(self, model: str, key: str) -> Any:
+        """Look up a key, returning the module sentinel _MISSING on a miss."""
+        full_key = self._full_key(model, key)
+
+        with self._lock:
+            raw = self._local.get(full_key)
+            if raw is not None:
+                self._local.move_to_end(full_key)
+        if raw is not None:
+            self._count(model, "hit_memory")
+            return json.loads(raw)
+
+        client = self._get_redis()
+        if client is not None:
+            try:
+                raw = client.get(full_key)
+            except Exception as e:
+                self._mark_redis_down(e)
+                raw = None
+            if raw is not None:
+                self._store_local(full_key, raw)
+                self._count(model, "hit_redis")
+                return json.loads(raw)
+
+        self._count(model, "miss")
+        return _MISSING
+
+    def set(self, model: str, key: str, value: Any) -> bool:
+        """Store a JSON-serializable result in both tiers."""
+        try:
+            raw = json.dumps(value, ensure_ascii=False)
+        except (TypeError, ValueError):
+            logger.debug(f"Result for {model} is not JSON-serializable - not cached")
+            return False
+
+        full_key = self._full_key(model, key)
+        self._store_local(full_key, raw)
+
+        client = self._get_redis()
+        if client is not None:
+            try:
+                client.set(full_key, raw, ex=self.ttl_seconds)
+            except Exception as e:
+                self._mark_redis_down(e)
+        return True
+
+    def invalidate_model(self, model: str) -> None:
+        """Drop every cached result for a model, locally and on all workers."""
+        prefix = f"{self.namespace}:{model}:"
+        with self._lock:
+            for full_key in [k for k in self._local if k.startswith(prefix)]:
+                del self._local[full_key]
+            self._generations.pop(model, None)
+
+        client = self._get_redis()
+        if client is not None:
+            try:
+                client.incr(self._generation_key(model))
+            except Exception as e:
+                self._mark_redis_down(e)
+        logger.info(f"🧹 Result cache invalidated for {model}")
+
+    def clear(self) -> None:
+        """Clear the in-process tier and statistics."""
+        with self._lock:
+            self._local.clear()
+            self._generations.clear()
+            self.stats.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-model hit/miss counts and tier status."""
+        with self._lock:
+            local_entries = len(self._local)
+        per_model = {}
+        for model, counts in self.stats.items():
+            hits = counts.get("hit_memory", 0) + counts.get("hit_redis", 0)
+            lookups = hits + counts.get("miss", 0)
+            per_model[model] = {
+                **counts,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            }
+        return {
+            "enabled": self.enabled,
+            "local_entries": local_entries,
+            "max_entries": self.max_entries,
+            "redis_enabled": self.use_redis,
+            "redis_available": self._redis is not None and time.monotonic() >= self._redis_down_until,
+            "ttl_seconds": self.ttl_seconds,
+            "models": per_model,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _full_key(self, model: str, key: str) -> str:
+        return f"{self.namespace}:{model}:g{self._generation(model)}:{key}"
+
+    def _generation_key(self, model: str) -> str:
+        return f"{self.namespace}:generation:{model}"
+
+    def _generation(self, model: str) -> int:
+        now = time.monotonic()
+        cached = self._generations.get(model)
+        if cached is not None and now - cached[1] < self.generation_refresh_seconds:
+            return cached[0]
+
+        generation = cached[0] if cached is not None else 0
+        client = self._get_redis()
+        if client is not None:
+            try:
+                generation = int(client.get(self._generation_key(model)) or 0)
+            except Exception as e:
+                self._mark_redis_down(e)
+        self._generations[model] = (generation, now)
+        return generation
+
+    def _store_local(self, full_key: str, raw: str) -> None:
+        with self._lock:
+            self._local[full_key] = raw
+            self._local.move_to_end(full_key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def _get_redis(self):
+        if not self.use_redis or time.monotonic() < self._redis_down_until:
+            return None
+        if self._redis is None:
+            try:
+                import redis
+                self._redis = redis.from_url(
+                    get_redis_url(),
+                    decode_responses=True,
+                    socket_connect_timeout=1,
+                    socket_timeout=1,
+                )
+            except Exception as e:
+                self._mark_redis_down(e)
+                return None
+        return self._redis
+
+    def _mark_redis_down(self, error: Exception) -> None:
+        if time.monotonic() >= self._redis_down_until:
+            logger.warning(f"⚠️ Result cache Redis tier unavailable, using memory only for "
+                           f"{self.redis_retry_seconds:.0f}s: {error}")
+        self._redis_down_until = time.monotonic() + self.redis_retry_seconds
+
+    def _count(self, model: str, result: str) -> None:
+        counts = self.stats.setdefault(model, {})
+        counts[result] = counts.get(result, 0) + 1
+        record_model_cache_lookup(model, result)
+
+
+# Global cache instance used by the model tasks
+model_result_cache = ModelResultCache(
+    enabled=settings.enable_model_result_cache,
+    max_entries=settings.model_result_cache_max_entries,
+    ttl_seconds=settings.model_result_cache_ttl_seconds,
+    use_redis=settings.model_result_cache_use_redis,
+)
@@ -2,13 +2,72 @@
 import json
 import asyncio
 import logging
+import uuid
 from typing import Dict, Any, Optional, AsyncGenerator
 from datetime import datetime
 import redis.asyncio as redis
-from ..config.settings import get_redis_url
+from ..config.settings import get_redis_url, settings
 
 logger = logging.getLogger(__name__)
 
+# Live updates go out on a pub/sub channel per task; the most recent ones are
+# also kept in a capped Redis Stream per task so late subscribers can replay them
+PROGRESS_CHANNEL_PREFIX = "audio_stream:"
+PROGRESS_LOG_PREFIX = "audio_stream_log:"
+TERMINAL_STEPS = ("completed", "failed", "cancelled")
+
+
+def progress_log_key(task_id: str) -> str:
+    """Redis Stream holding the recent progress updates of a task"""
+    return f"{PROGRESS_LOG_PREFIX}{task_id}"
+
+
+def new_progress_update(task_id: str, step: str, progress: int, message: str = None,
+                        partial_result: Dict[str, Any] = None,
+                        metadata: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Build a progress update; event_id lets subscribers skip updates they already replayed"""
+    update = {
+        "task_id": task_id,
+        "event_id": uuid.uuid4().hex,
+        "step": step,
+        "progress": progress,
+        "timestamp": datetime.now().isoformat(),
+        "message": message or f"Processing: {step}"
+    }
+
+    if partial_result:
+        update["partial_result"] = partial_result
+
+    if metadata:
+        update["metadata"] = metadata
+
+    return update
+
+
+def queue_progress_log(pipe, task_id: str, payload: str) -> bool:
+    """Queue the replay-stream append (capped XADD + EXPIRE) on a sync or async pipeline"""
+    if settings.progress_replay_max_events <= 0:
+        return False
+    key = progress_log_key(task_id)
+    pipe.xadd(key, {"data": payload}, maxlen=settings.progress_replay_max_events, approximate=True)
+    pipe.expire(key, settings.progress_replay_ttl)
+    return True
+
+
+def publish_progress_sync(redis_client, task_id: str, update: Dict[str, Any]) -> int:
+    """
+    Publish a progress update from synchronous code (Celery workers).
+
+    Appends it to the task's replay stream and publishes it in one round trip.
+    Returns the number of pub/sub subscribers that received it.
+    """
+    payload = json.dumps(update)
+    pipe = redis_client.pipeline(transaction=False)
+    queue_progress_log(pipe, task_id, payload)
+    pipe.publish(f"{PROGRESS_CHANNEL_PREFIX}{task_id}", payload)
+    return pipe.execute()[-1]
+
+
 class AudioStreamingService:
     """Redis pub/sub based streaming service for audio processing"""
     
@@ -41,7 +100,7 @@ class AudioStreamingService:
     
     def get_channel_name(self, task_id: str) -> str:
         """Get Redis channel name for a task"""
-        return f"audio_stream:{task_id}"
+        return f"{PROGRESS_CHANNEL_PREFIX}{task_id}"
     
     async def publish_progress(
         self, 
@@ -57,22 +116,16 @@ class AudioStreamingService:
             redis_client = await self.get_redis_client()
             channel = self.get_channel_name(task_id)
             
-            update = {
-                "task_id": task_id,
-                "step": step,
-                "progress": progress,
-                "timestamp": datetime.now().isoformat(),
-                "message": message or f"Processing: {step}"
-            }
-            
-            if partial_result:
-                update["partial_result"] = partial_result
+            update = new_progress_update(task_id, step, progress, message, partial_result, metadata)
+            payload = json.dumps(update)
             
-            if metadata:
-                update["metadata"] = metadata
+            # Keep it for late subscribers before publishing, so replay never misses it
+            pipe = redis_client.pipeline(transaction=False)
+            if queue_progress_log(pipe, task_id, payload):
+                await pipe.execute()
             
             # Publish to channel
-            subscribers = await redis_client.publish(channel, json.dumps(update))
+            subscribers = await redis_client.publish(channel, payload)
             
             if subscribers > 0:
                 logger.debug(f"📡 Published {step} update for task {task_id} to {subscribers} subscribers")
@@ -189,7 +242,19 @@ class AudioStreamingService:
         task_id: str,
         timeout: int = 600  # 10 minutes
     ) -> AsyncGenerator[Dict[str, Any], None]:
-        """Subscribe to task updates and yield them as they arrive"""
+        """
+        Subscribe to task updates and yield them as they arrive.
+
+        Served by the shared progress hub (with replay of earlier updates) when
+        it runs on this event loop; otherwise opens a pub/sub subscription for
+        this caller alone.
+        """
+        from .progress_hub import progress_hub
+        if progress_hub.is_active():
+            async for update in progress_hub.subscribe(task_id, timeout=timeout):
+                yield update
+            return
+        
         pubsub_client = await self.get_pubsub_client()
         channel = self.get_channel_name(task_id)
         
@@ -217,7 +282,7 @@ class AudioStreamingService:
                         yield update
                         
                         # Break on completion or error
-                        if update.get("step") in ["completed", "failed", "cancelled"]:
+                        if update.get("step") in TERMINAL_STEPS:
                             logger.info(f"🏁 Stream ended for task {task_id}: {update.get('step')}")
                             break
                             
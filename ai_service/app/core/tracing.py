@@ -0,0 +1,527 @@
+"""
+Pipeline Tracing
+
+Lightweight spans that follow a streaming window (or an uploaded file) from
+the socket through the Celery queue and the worker's model stages to the
+outbound notification, so "where did the time go?" can be answered per call.
+
+- A span is opened with `tracer.span(name, call_id=...)`; spans opened inside
+  it (in the same thread or task) become its children. Stages whose start
+  was recorded elsewhere (buffer fill, queue wait) are added with
+  `tracer.record_span(name, start_time, end_time)`.
+- The trace is carried across Celery in the task message headers: the
+  publishing side adds the current trace and span and the enqueue time, and
+  the worker records the queue wait and runs the task under a span that
+  continues the trace.
+- Finished spans go to an in-process ring buffer (served by
+  /debug/traces/{call_id}), optionally to a per-call Redis list so the API
+  can show the worker's spans, and optionally to a file of OTLP/JSON export
+  requests (one per line) that an OpenTelemetry collector can ingest.
+- The global tracer reads its settings on first use, not at import.
+"""
+import contextvars
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Celery message headers carrying the trace
+TRACE_ID_HEADER = "trace_id"
+TRACE_PARENT_HEADER = "trace_parent_id"
+TRACE_CALL_HEADER = "trace_call_id"
+TRACE_ENQUEUED_HEADER = "trace_enqueued_at"
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+def _new_id(n_bytes: int) -> str:
+    return secrets.token_hex(n_bytes)
+
+
+@dataclass
+class Span:
+    """One timed stage of the pipeline."""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    call_id: Optional[str]
+    service: str
+    start_time: float  # epoch seconds
+    end_time: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"
+    error: Optional[str] = None
+    # Set on spans whose parent lives in another process (or was recorded already)
+    remote_parent: bool = False
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_time is None:
+            return None
+        return round((self.end_time - self.start_time) * 1000, 3)
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["duration_ms"] = self.duration_ms
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Span":
+        data = dict(data)
+        data.pop("duration_ms", None)
+        return cls(**data)
+
+
+# ============================================
+# EXPORTERS
+# ============================================
+
+class RingBufferExporter:
+    """The most recent finished spans of this process."""
+
+    def __init__(self, max_spans: int = 20000):
+        self.spans: deque = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]):
+        with self._lock:
+            self.spans.extend(spans)
+
+    def spans_for_call(self, call_id: str) -> List[Span]:
+        with self._lock:
+            return [span for span in self.spans if span.call_id == call_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"spans": len(self.spans), "max_spans": self.spans.maxlen}
+
+
+class RedisSpanExporter:
+    """
+    Per-call span lists in Redis, so the API process can show the spans
+    recorded by Celery workers. Spans without a call_id are not shared.
+    """
+
+    KEY_PREFIX = "trace_spans:"
+
+    def __init__(self, max_spans_per_call: int = 2000, ttl_seconds: int = 86400, redis_client=None):
+        self.max_spans_per_call = max_spans_per_call
+        self.ttl_seconds = ttl_seconds
+        self._redis_client = redis_client
+        self.failures = 0
+
+    @property
+    def redis_client(self):
+        if self._redis_client is not None:
+            return self._redis_client
+        from ..config.settings import redis_task_client
+        return redis_task_client
+
+    def export(self, spans: List[Span]):
+        client = self.redis_client
+        by_call: Dict[str, List[str]] = {}
+        for span in spans:
+            if span.call_id:
+                by_call.setdefault(span.call_id, []).append(json.dumps(span.to_dict(), default=str))
+        if not client or not by_call:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for call_id, payloads in by_call.items():
+                key = f"{self.KEY_PREFIX}{call_id}"
+                pipe.rpush(key, *payloads)
+                pipe.ltrim(key, -self.max_spans_per_call, -1)
+                pipe.expire(key, self.ttl_seconds)
+            pipe.execute()
+        except Exception as e:
+            self.failures += 1
+            logger.debug(f"Failed to export {len(spans)} spans to Redis: {e}")
+
+    def spans_for_call(self, call_id: str) -> List[Span]:
+        client = self.redis_client
+        if not client:
+            return []
+        try:
+            return [Span.from_dict(json.loads(raw)) for raw in client.lrange(f"{self.KEY_PREFIX}{call_id}", 0, -1)]
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to read spans for call {call_id} from Redis: {e}")
+            return []
+
+
+class OTLPFileExporter:
+    """
+    Appends OTLP/JSON ExportTraceServiceRequest objects, one per line, in the
+    format the OpenTelemetry collector's file receiver (otlpjsonfile) reads.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def export(self, spans: List[Span]):
+        by_service: Dict[str, List[Dict[str, Any]]] = {}
+        for span in spans:
+            by_service.setdefault(span.service, []).append(self._otlp_span(span))
+        request = {"resourceSpans": [
+            {
+                "resource": {"attributes": [_otlp_attribute("service.name", service)]},
+                "scopeSpans": [{"scope": {"name": "ai_service.tracing"}, "spans": otlp_spans}],
+            }
+            for service, otlp_spans in by_service.items()
+        ]}
+        line = json.dumps(request, separators=(",", ":"))
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to write {len(spans)} spans to {self.path}: {e}")
+
+    @staticmethod
+    def _otlp_span(span: Span) -> Dict[str, Any]:
+        attributes = dict(span.attributes)
+        if span.call_id:
+            attributes["call_id"] = span.call_id
+        otlp = {
+            # OTLP ids are 16 (trace) and 8 (span) bytes of hex
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(int(span.start_time * 1e9)),
+            "endTimeUnixNano": str(int((span.end_time or span.start_time) * 1e9)),
+            "attributes": [_otlp_attribute(key, value) for key, value in attributes.items()],
+            "status": {"code": 2, "message": span.error or ""} if span.status == "error" else {"code": 1},
+        }
+        if span.parent_id:
+            otlp["parentSpanId"] = span.parent_id
+        return otlp
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+# ============================================
+# TRACER
+# ============================================
+
+def _checked(value: Any, kind: type) -> Any:
+    if not isinstance(value, kind):
+        raise TypeError(f"expected {kind.__name__}, got {type(value).__name__}")
+    return value
+
+
+class Tracer:
+    """Creates spans, carries the trace across Celery and hands finished spans to the exporters."""
+
+    def __init__(self, service_name: str = "ai_service", enabled: bool = True,
+                 ring_buffer: Optional[RingBufferExporter] = None, exporters: Optional[List[Any]] = None,
+                 flush_size: int = 64):
+        self.service_name = service_name
+        self._enabled = enabled
+        self._ring_buffer = ring_buffer or RingBufferExporter()
+        # Batched exporters, written when a local root span ends or flush_size spans are waiting
+        self._exporters = exporters or []
+        self._configured = True
+        self._configure_lock = threading.Lock()
+        self.flush_size = flush_size
+        self._pending: List[Span] = []
+        self._lock = threading.Lock()
+        self.stats = {"spans": 0, "exports": 0, "export_errors": 0}
+
+    @classmethod
+    def from_settings(cls) -> "Tracer":
+        """A tracer that applies the tracing settings on first use, so importing modules reads no settings"""
+        tracer = cls(service_name="api")  # switched to "worker" when a Celery worker starts
+        tracer._configured = False
+        return tracer
+
+    def _ensure_configured(self):
+        if self._configured:
+            return
+        with self._configure_lock:
+            if self._configured:
+                return
+            try:
+                from ..config.settings import settings
+
+                enabled = _checked(settings.tracing_enabled, bool)
+                ring_buffer_size = _checked(settings.tracing_ring_buffer_size, int)
+                otlp_file = _checked(settings.tracing_otlp_file, str)
+                exporters: List[Any] = []
+                if _checked(settings.tracing_redis_export, bool):
+                    exporters.append(RedisSpanExporter(
+                        max_spans_per_call=_checked(settings.tracing_redis_max_spans_per_call, int),
+                        ttl_seconds=_checked(settings.tracing_redis_ttl_seconds, int)
+                    ))
+                if otlp_file:
+                    exporters.append(OTLPFileExporter(otlp_file))
+                self._enabled = enabled
+                self._ring_buffer = RingBufferExporter(ring_buffer_size)
+                self._exporters = exporters
+            except Exception as e:
+                logger.warning(f"⚠️ Invalid tracing settings, tracing to the in-process buffer only: {e}")
+            self._configured = True
+
+    @property
+    def enabled(self) -> bool:
+        self._ensure_configured()
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value: bool):
+        self._ensure_configured()
+        self._enabled = value
+
+    @property
+    def ring_buffer(self) -> RingBufferExporter:
+        self._ensure_configured()
+        return self._ring_buffer
+
+    @property
+    def exporters(self) -> List[Any]:
+        self._ensure_configured()
+        return self._exporters
+
+    # ------------------------------------------------------------------
+    # Spans
+    # ------------------------------------------------------------------
+
+    def current_span(self) -> Optional[Span]:
+        return _current_span.get()
+
+    def _new_span(self, name: str, call_id: Optional[str], attributes: Dict[str, Any],
+                  parent: Optional[Span] = None, trace_id: Optional[str] = None,
+                  parent_id: Optional[str] = None, start_time: Optional[float] = None) -> Span:
+        parent = parent if parent is not None else (None if trace_id else _current_span.get())
+        if parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+            call_id = call_id or parent.call_id
+        return Span(
+            name=name,
+            trace_id=trace_id or _new_id(16),
+            span_id=_new_id(8),
+            parent_id=parent_id,
+            call_id=call_id,
+            service=self.service_name,
+            start_time=time.time() if start_time is None else start_time,
+            attributes={k: v for k, v in attributes.items() if v is not None},
+            remote_parent=parent is None and parent_id is not None,
+        )
+
+    @contextmanager
+    def span(self, name: str, call_id: Optional[str] = None, **attributes) -> Iterator[Optional[Span]]:
+        """Time the enclosed block as a child of the current span (or as a new trace)"""
+        if not self.enabled:
+            yield None
+            return
+        span = self._new_span(name, call_id, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status, span.error = "error", f"{type(e).__name__}: {e}"[:500]
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span)
+
+    def start_span(self, name: str, call_id: Optional[str] = None, trace_id: Optional[str] = None,
+                   parent_id: Optional[str] = None, **attributes) -> Optional[Span]:
+        """
+        Open a span that is ended with end_span() rather than a with block
+
+        With trace_id (and parent_id) the span continues a trace from another
+        process. The span does not become the current span; use activate().
+        """
+        if not self.enabled:
+            return None
+        return self._new_span(name, call_id, attributes, trace_id=trace_id, parent_id=parent_id)
+
+    def activate(self, span: Optional[Span]) -> Optional[contextvars.Token]:
+        """Make span the parent of spans opened from here on; returns a token for deactivate()"""
+        return _current_span.set(span) if span is not None else None
+
+    def deactivate(self, token: Optional[contextvars.Token]):
+        if token is not None:
+            _current_span.reset(token)
+
+    def record_span(self, name: str, start_time: float, end_time: Optional[float] = None,
+                    call_id: Optional[str] = None, trace_id: Optional[str] = None,
+                    parent_id: Optional[str] = None, error: Optional[str] = None, **attributes) -> Optional[Span]:
+        """Add an already-finished stage with explicit (epoch second) timings"""
+        if not self.enabled:
+            return None
+        span = self._new_span(name, call_id, attributes, trace_id=trace_id, parent_id=parent_id,
+                              start_time=start_time)
+        self.end_span(span, end_time=end_time, error=error, flush=False)
+        return span
+
+    def end_span(self, span: Optional[Span], end_time: Optional[float] = None, error: Optional[str] = None,
+                 flush: bool = True):
+        if span is None or span.end_time is not None:
+            return
+        span.end_time = time.time() if end_time is None else max(end_time, span.start_time)
+        if error:
+            span.status, span.error = "error", error[:500]
+        self.stats["spans"] += 1
+        self.ring_buffer.export([span])
+        if not self.exporters:
+            return
+        with self._lock:
+            self._pending.append(span)
+            # A span with no parent in this process closes what this process will add to the trace
+            should_flush = (flush and (span.parent_id is None or span.remote_parent)) or len(self._pending) >= self.flush_size
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        """Hand waiting spans to the batched exporters"""
+        with self._lock:
+            spans, self._pending = self._pending, []
+        if not spans:
+            return
+        for exporter in self.exporters:
+            try:
+                exporter.export(spans)
+                self.stats["exports"] += 1
+            except Exception as e:
+                self.stats["export_errors"] += 1
+                logger.warning(f"⚠️ Span export to {type(exporter).__name__} failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Propagation
+    # ------------------------------------------------------------------
+
+    def inject(self, headers: Dict[str, Any]):
+        """Add the current trace and the enqueue time to outgoing task headers"""
+        span = _current_span.get()
+        if not self.enabled or span is None:
+            return
+        headers[TRACE_ID_HEADER] = span.trace_id
+        headers[TRACE_PARENT_HEADER] = span.span_id
+        headers[TRACE_CALL_HEADER] = span.call_id
+        headers[TRACE_ENQUEUED_HEADER] = time.time()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def get_trace(self, call_id: str) -> List[Span]:
+        """Every known span of a call, from this process and from the shared exporters, by start time"""
+        self.flush()
+        spans: Dict[str, Span] = {span.span_id: span for span in self.ring_buffer.spans_for_call(call_id)}
+        for exporter in self.exporters:
+            if hasattr(exporter, "spans_for_call"):
+                for span in exporter.spans_for_call(call_id):
+                    spans.setdefault(span.span_id, span)
+        return sorted(spans.values(), key=lambda span: span.start_time)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "service": self.service_name,
+            "ring_buffer": self.ring_buffer.get_stats(),
+            "exporters": [type(exporter).__name__ for exporter in self.exporters],
+            "pending": len(self._pending),
+            **self.stats,
+        }
+
+
+def summarize_trace(spans: List[Span]) -> Dict[str, Any]:
+    """Total time per span name, so the slowest stages of a call stand out"""
+    stages: Dict[str, Dict[str, Any]] = {}
+    for span in spans:
+        stage = stages.setdefault(span.name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "errors": 0})
+        duration = span.duration_ms or 0.0
+        stage["count"] += 1
+        stage["total_ms"] = round(stage["total_ms"] + duration, 3)
+        stage["max_ms"] = max(stage["max_ms"], duration)
+        stage["errors"] += span.status == "error"
+    return dict(sorted(stages.items(), key=lambda item: item[1]["total_ms"], reverse=True))
+
+
+# ============================================
+# CELERY PROPAGATION
+# ============================================
+
+_task_spans: Dict[str, tuple] = {}
+
+
+def _header(request, name: str):
+    value = getattr(request, name, None)
+    if value is None and isinstance(getattr(request, "headers", None), dict):
+        value = request.headers.get(name)
+    return value
+
+
+def on_before_task_publish(sender=None, headers=None, **kwargs):
+    if headers is not None:
+        tracer.inject(headers)
+
+
+def on_task_prerun(task_id=None, task=None, kwargs=None, **extra):
+    """Record the queue wait and run the task under a span continuing the publisher's trace"""
+    if not tracer.enabled or task is None:
+        return
+    request = task.request
+    kwargs = kwargs or {}
+    trace_id = _header(request, TRACE_ID_HEADER)
+    parent_id = _header(request, TRACE_PARENT_HEADER)
+    # Tasks that are not part of a call (file uploads) are traced under their task id
+    call_id = _header(request, TRACE_CALL_HEADER) or kwargs.get("call_id") or kwargs.get("connection_id") or task_id
+    enqueued_at = _header(request, TRACE_ENQUEUED_HEADER)
+
+    if trace_id and enqueued_at:
+        queue_wait = tracer.record_span("queue_wait", float(enqueued_at), call_id=call_id,
+                                        trace_id=trace_id, parent_id=parent_id, task=task.name)
+        parent_id = queue_wait.span_id if queue_wait else parent_id
+    span = tracer.start_span(f"task:{task.name}", call_id=call_id, trace_id=trace_id,
+                             parent_id=parent_id if trace_id else None, task_id=task_id)
+    _task_spans[task_id] = (span, tracer.activate(span))
+
+
+def on_task_postrun(task_id=None, state=None, **extra):
+    span, token = _task_spans.pop(task_id, (None, None))
+    if span is None:
+        return
+    tracer.deactivate(token)
+    span.set_attribute("state", state)
+    tracer.end_span(span, error=f"task {state}" if state not in (None, "SUCCESS") else None)
+    tracer.flush()
+
+
+def on_worker_init(**kwargs):
+    tracer.service_name = "worker"
+
+
+def install_celery_hooks():
+    """Propagate traces through the Celery app's task messages (idempotent)"""
+    from celery.signals import before_task_publish, task_postrun, task_prerun, worker_init
+
+    worker_init.connect(on_worker_init, weak=False, dispatch_uid="tracing_worker_init")
+    before_task_publish.connect(on_before_task_publish, weak=False, dispatch_uid="tracing_before_publish")
+    task_prerun.connect(on_task_prerun, weak=False, dispatch_uid="tracing_prerun")
+    task_postrun.connect(on_task_postrun, weak=False, dispatch_uid="tracing_postrun")
+
+
+# Global instance
+tracer = Tracer.from_settings()
@@ -0,0 +1,248 @@
+"""
+Write-behind buffer for initial agent feedback rows
+
+When a call finishes, one unrated feedback row is created per task. Instead
+of a database round trip per call, the API process buffers these rows and a
+background task writes everything buffered every few hundred milliseconds as
+one multi-row upsert in one transaction (see
+FeedbackRepository.bulk_upsert_initial_feedback).
+
+- Writes go through the pooled async engine when its driver is installed,
+  otherwise through a sync session in a worker thread, so the event loop
+  never blocks on the database.
+- The buffer is bounded: producers wait for a flush instead of growing it
+  without limit.
+- A failed write puts its rows back at the front of the buffer and the next
+  flush waits an exponentially growing delay; rows are only dropped after
+  max_retries consecutive failures, or when the buffer overflows.
+- Like NotificationDeliveryQueue it is bound to the loop it was started on;
+  callers on other loops (Celery workers) write directly with write_feedback_rows.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from .repositories.feedback_repository import FeedbackRepository
+from .session import SessionLocal, get_async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+
+RETRY_BACKOFF_MAX_SECONDS = 5.0
+
+
+def write_feedback_rows_sync(rows: List[Dict[str, Any]]) -> int:
+    """Write initial feedback rows in one transaction on a sync session."""
+    db = SessionLocal()
+    try:
+        return FeedbackRepository.bulk_upsert_initial_feedback(db, rows)
+    finally:
+        db.close()
+
+
+async def write_feedback_rows(rows: List[Dict[str, Any]], use_async_engine: bool = True) -> int:
+    """
+    Write initial feedback rows in one transaction without blocking the event loop.
+
+    Args:
+        rows: Row dicts from FeedbackRepository.initial_feedback_row()
+        use_async_engine: Use the pooled async engine if it is available. Only
+            the API server's long-lived loop should pass True.
+
+    Returns:
+        Number of rows inserted
+    """
+    if not rows:
+        return 0
+
+    session_factory = get_async_sessionmaker() if use_async_engine else None
+    if session_factory is not None:
+        async with session_factory() as db:
+            return await FeedbackRepository.async_bulk_upsert_initial_feedback(db, rows)
+    return await asyncio.to_thread(write_feedback_rows_sync, rows)
+
+
+class FeedbackWriteBuffer:
+    """Batches initial feedback rows across calls and writes them periodically."""
+
+    def __init__(self, flush_interval: float = 0.25, flush_max_rows: int = 500,
+                 max_buffered_rows: int = 5000, max_retries: int = 5):
+        self.flush_interval = float(flush_interval)
+        self.flush_max_rows = max(1, int(flush_max_rows))
+        self.max_buffered_rows = max(self.flush_max_rows, int(max_buffered_rows))
+        self.max_retries = max(0, int(max_retries))
+
+        self._rows: List[Dict[str, Any]] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._stopping = False
+        self._failures = 0
+        self._retry_at = 0.0
+
+        self.stats = {
+            "rows_buffered": 0,
+            "rows_inserted": 0,
+            "rows_failed": 0,
+            "flushes": 0,
+            "flush_retries": 0,
+            "producer_waits": 0,
+        }
+
+    @classmethod
+    def from_settings(cls) -> "FeedbackWriteBuffer":
+        """Build a buffer from the feedback write-behind settings."""
+        from ..config.settings import settings
+
+        return cls(
+            flush_interval=settings.feedback_flush_interval,
+            flush_max_rows=settings.feedback_flush_max_rows,
+            max_buffered_rows=settings.feedback_buffer_max_rows,
+        )
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Start the flusher task on the running loop."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="feedback-write-behind")
+        logger.info(
+            f"🗄️ Feedback write-behind started: flush every {self.flush_interval * 1000:.0f}ms "
+            f"or {self.flush_max_rows} rows"
+        )
+
+    async def stop(self) -> None:
+        """Stop the flusher task and write anything still buffered."""
+        if self._task is None:
+            return
+        # Let an in-progress flush finish rather than cancelling it mid-write
+        self._stopping = True
+        self._wakeup.set()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await self.flush(ignore_backoff=True)
+        if self._rows:
+            self.stats["rows_failed"] += len(self._rows)
+            logger.error(f"❌ Dropping {len(self._rows)} feedback rows that could not be written before shutdown")
+            self._rows = []
+        logger.info("🗄️ Feedback write-behind stopped")
+
+    def is_active(self) -> bool:
+        """True when the flusher is running on the caller's event loop."""
+        if self._task is None:
+            return False
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    async def add(self, rows: List[Dict[str, Any]]) -> None:
+        """Buffer rows for the next flush; waits for a flush if the buffer is full."""
+        if not rows:
+            return
+        if len(self._rows) >= self.max_buffered_rows:
+            self.stats["producer_waits"] += 1
+            await self.flush(wait_for_backoff=True)
+
+        self._rows.extend(rows)
+        self.stats["rows_buffered"] += len(rows)
+        if len(self._rows) >= self.flush_max_rows:
+            self._wakeup.set()
+
+    def depth(self) -> int:
+        """Rows waiting for the next flush."""
+        return len(self._rows)
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    async def flush(self, wait_for_backoff: bool = False, ignore_backoff: bool = False) -> int:
+        """
+        Write every buffered row in one transaction. Returns rows inserted.
+
+        While backing off after a failed write, returns 0 without writing
+        unless wait_for_backoff (sleep until the retry is due) or
+        ignore_backoff (write now) is set.
+        """
+        if self._flush_lock is None:
+            return 0
+        async with self._flush_lock:
+            delay = self._retry_at - asyncio.get_running_loop().time()
+            if delay > 0 and not ignore_backoff:
+                if not wait_for_backoff:
+                    return 0
+                await asyncio.sleep(delay)
+
+            rows, self._rows = self._rows, []
+            if not rows:
+                return 0
+            try:
+                inserted = await write_feedback_rows(rows)
+            except Exception as e:
+                self._requeue(rows, e)
+                return 0
+            self._failures = 0
+            self._retry_at = 0.0
+            self.stats["rows_inserted"] += inserted
+            self.stats["flushes"] += 1
+            return inserted
+
+    def _requeue(self, rows: List[Dict[str, Any]], error: Exception) -> None:
+        """Put rows from a failed write back in front of newer ones, or drop them after max_retries."""
+        self._failures += 1
+        if self._failures > self.max_retries:
+            self.stats["rows_failed"] += len(rows)
+            logger.error(
+                f"❌ Dropping {len(rows)} buffered feedback rows after {self._failures} failed writes: {error}"
+            )
+            self._failures = 0
+            self._retry_at = 0.0
+            return
+
+        rows.extend(self._rows)
+        overflow = len(rows) - self.max_buffered_rows
+        if overflow > 0:
+            self.stats["rows_failed"] += overflow
+            logger.error(f"❌ Feedback buffer full while retrying, dropping {overflow} oldest rows")
+            rows = rows[overflow:]
+        self._rows = rows
+
+        backoff = min(self.flush_interval * (2 ** self._failures), RETRY_BACKOFF_MAX_SECONDS)
+        self._retry_at = asyncio.get_running_loop().time() + backoff
+        self.stats["flush_retries"] += 1
+        logger.warning(
+            f"⚠️ Failed to write {len(rows)} buffered feedback rows, retrying in {backoff:.2f}s "
+            f"(attempt {self._failures}/{self.max_retries}): {error}"
+        )
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Buffer depth and row counters."""
+        return {
+            "active": self._task is not None,
+            "buffered": self.depth(),
+            "flush_interval": self.flush_interval,
+            "consecutive_failures": self._failures,
+            **self.stats,
+        }
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Float, Boolean, JSON, Index, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, Float, Boolean, JSON, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from .session import Base
 
@@ -32,3 +32,32 @@ class AgentFeedback(Base):
 
     def __repr__(self):
         return f"<AgentFeedback(call_id={self.call_id}, task={self.task}, feedback={self.feedback})>"
+
+
+class FeedbackDailyRollup(Base):
+    """
+    Per-task, per-day feedback counts maintained alongside agent_feedback.
+    Statistics queries aggregate these rows instead of scanning agent_feedback.
+
+    Ratings are kept as a histogram (one count per rating value) so that a
+    changed rating can be moved between buckets and min/max stay exact.
+    """
+    __tablename__ = "feedback_daily_rollup"
+
+    day = Column(Date, primary_key=True)
+    task = Column(String(50), primary_key=True)
+    total_count = Column(Integer, nullable=False, default=0)
+    rated_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    rating_1_count = Column(Integer, nullable=False, default=0)
+    rating_2_count = Column(Integer, nullable=False, default=0)
+    rating_3_count = Column(Integer, nullable=False, default=0)
+    rating_4_count = Column(Integer, nullable=False, default=0)
+    rating_5_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index('idx_rollup_task_day', 'task', 'day'),
+    )
+
+    def __repr__(self):
+        return f"<FeedbackDailyRollup(day={self.day}, task={self.task}, total={self.total_count})>"
@@ -3,14 +3,20 @@ Repository for Agent Feedback database operations
 """
 import logging
 from typing import Optional, List, Dict, Any
+from sqlalchemy import insert, select, tuple_
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from datetime import datetime
+from datetime import date, datetime, timezone
 
-from ..models import AgentFeedback
+from ...config.settings import settings
+from ..models import AgentFeedback, FeedbackDailyRollup
+from .feedback_rollup_repository import FeedbackRollupRepository
 
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT statement; keeps bound parameters well under driver limits
+BULK_INSERT_CHUNK_ROWS = 500
+
 
 class FeedbackRepository:
     """Handles database operations for agent feedback"""
@@ -51,6 +57,7 @@ class FeedbackRepository:
             )
             
             db.add(feedback)
+            FeedbackRollupRepository.record_inserts(db, {task: 1})
             db.commit()
             db.refresh(feedback)
             
@@ -66,6 +73,166 @@ class FeedbackRepository:
             logger.error(f"❌ Failed to create feedback entry: {e}")
             return None
     
+    @staticmethod
+    def initial_feedback_row(
+        call_id: str,
+        task: str,
+        prediction: Any,
+        processing_mode: str = None,
+        model_version: str = None
+    ) -> Dict[str, Any]:
+        """Column values for an initial (unrated) feedback row"""
+        return {
+            'call_id': call_id,
+            'task': task,
+            'prediction': prediction,
+            'feedback': None,
+            'reason': None,
+            'processing_mode': processing_mode,
+            'model_version': model_version,
+        }
+
+    @staticmethod
+    def build_bulk_insert(dialect_name: str, rows: List[Dict[str, Any]]):
+        """
+        Multi-row INSERT of initial feedback rows that skips existing (call_id, task) pairs.
+
+        Uses ON CONFLICT DO NOTHING on SQLite and PostgreSQL and a no-op
+        ON DUPLICATE KEY UPDATE on MySQL/MariaDB, so rows that already exist
+        (and any agent rating on them) are left untouched.
+
+        Returns:
+            The statement, or None if the dialect has no upsert support
+        """
+        table = AgentFeedback.__table__
+        if dialect_name == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+            return sqlite_insert(table).values(rows).on_conflict_do_nothing(
+                index_elements=['call_id', 'task']
+            )
+        if dialect_name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as pg_insert
+            return pg_insert(table).values(rows).on_conflict_do_nothing(
+                index_elements=['call_id', 'task']
+            )
+        if dialect_name in ('mysql', 'mariadb'):
+            from sqlalchemy.dialects.mysql import insert as mysql_insert
+            stmt = mysql_insert(table).values(rows)
+            return stmt.on_duplicate_key_update(call_id=table.c.call_id)
+        return None
+
+    @staticmethod
+    def _dedupe_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep the first row per (call_id, task); one statement cannot insert a key twice"""
+        unique = {}
+        for row in rows:
+            unique.setdefault((row['call_id'], row['task']), row)
+        return list(unique.values())
+
+    @staticmethod
+    def bulk_upsert_initial_feedback(db: Session, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert initial feedback rows for one or more calls in a single transaction.
+
+        Replaces one add/commit/refresh round trip per task with one INSERT
+        per BULK_INSERT_CHUNK_ROWS rows and one commit. Rows whose
+        (call_id, task) already exists are skipped (uix_call_task). The daily
+        rollups are updated in the same transaction.
+
+        Args:
+            db: Database session
+            rows: Row dicts from initial_feedback_row()
+
+        Returns:
+            Number of rows inserted
+        """
+        rows = FeedbackRepository._dedupe_rows(rows)
+        if not rows:
+            return 0
+
+        try:
+            inserted = FeedbackRepository._insert_rows(db, rows)
+            db.commit()
+
+            logger.info(f"✅ Bulk inserted {inserted}/{len(rows)} initial feedback entries")
+            return inserted
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Failed to bulk insert feedback entries: {e}")
+            raise
+
+    @staticmethod
+    async def async_bulk_upsert_initial_feedback(db, rows: List[Dict[str, Any]]) -> int:
+        """
+        bulk_upsert_initial_feedback for an AsyncSession.
+
+        Args:
+            db: sqlalchemy.ext.asyncio.AsyncSession
+            rows: Row dicts from initial_feedback_row()
+
+        Returns:
+            Number of rows inserted
+        """
+        rows = FeedbackRepository._dedupe_rows(rows)
+        if not rows:
+            return 0
+
+        try:
+            inserted = await db.run_sync(FeedbackRepository._insert_rows, rows)
+            await db.commit()
+
+            logger.info(f"✅ Bulk inserted {inserted}/{len(rows)} initial feedback entries")
+            return inserted
+
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"❌ Failed to bulk insert feedback entries: {e}")
+            raise
+
+    @staticmethod
+    def _insert_rows(db: Session, rows: List[Dict[str, Any]]) -> int:
+        """Insert new rows and count them in the rollups, without committing."""
+        dialect_name = db.get_bind().dialect.name
+        inserted_tasks: List[str] = []
+        for start in range(0, len(rows), BULK_INSERT_CHUNK_ROWS):
+            chunk = rows[start:start + BULK_INSERT_CHUNK_ROWS]
+
+            if dialect_name in ('sqlite', 'postgresql'):
+                # RETURNING reports exactly which rows were new
+                stmt = FeedbackRepository.build_bulk_insert(dialect_name, chunk)
+                result = db.execute(stmt.returning(AgentFeedback.task))
+                inserted_tasks.extend(result.scalars().all())
+                continue
+
+            # No RETURNING (MySQL): look up existing keys first; the upsert still guards races
+            chunk = FeedbackRepository._without_existing(db, chunk)
+            if not chunk:
+                continue
+            stmt = (FeedbackRepository.build_bulk_insert(dialect_name, chunk)
+                    if dialect_name in ('mysql', 'mariadb')
+                    else insert(AgentFeedback.__table__).values(chunk))
+            db.execute(stmt)
+            inserted_tasks.extend(row['task'] for row in chunk)
+
+        task_counts: Dict[str, int] = {}
+        for task in inserted_tasks:
+            task_counts[task] = task_counts.get(task, 0) + 1
+        FeedbackRollupRepository.record_inserts(db, task_counts)
+        return len(inserted_tasks)
+
+    @staticmethod
+    def _without_existing(db: Session, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop rows whose (call_id, task) is already stored (dialects without upsert)"""
+        keys = [(row['call_id'], row['task']) for row in rows]
+        existing = set(
+            db.execute(
+                select(AgentFeedback.call_id, AgentFeedback.task)
+                .where(tuple_(AgentFeedback.call_id, AgentFeedback.task).in_(keys))
+            ).all()
+        )
+        return [row for row in rows if (row['call_id'], row['task']) not in existing]
+
     @staticmethod
     def update_feedback(
         db: Session,
@@ -102,6 +269,11 @@ class FeedbackRepository:
                 logger.warning(f"⚠️ Feedback entry not found: call_id={call_id}, task={task}")
                 return None
             
+            # Move the row between rating buckets of its day's rollup
+            FeedbackRollupRepository.record_rating_change(
+                db, feedback.created_at, task, feedback.feedback, feedback_rating
+            )
+
             # Update feedback
             feedback.feedback = feedback_rating
             feedback.reason = reason
@@ -154,15 +326,28 @@ class FeedbackRepository:
     def get_feedback_statistics(
         db: Session,
         task: Optional[str] = None,
-        days: int = 30
+        days: int = 30,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        use_rollups: Optional[bool] = None
     ) -> Dict[str, Any]:
         """
         Get feedback statistics for monitoring model performance.
+
+        With settings.feedback_stats_use_rollups (off by default; backfill the
+        rollups first) the statistics come from the daily rollups (at most one
+        row per task per day, including today's partial counts) rather than a
+        scan of agent_feedback. Rollups resolve whole UTC days, so `days`
+        covers today plus the previous days-1 days.
         
         Args:
             db: Database session
             task: Optional task filter
-            days: Number of days to look back
+            days: Number of days to look back (ignored when start_date is given)
+            start_date: First day of an explicit range (inclusive)
+            end_date: Last day of an explicit range (inclusive, defaults to today)
+            use_rollups: Read rollups (True) or scan agent_feedback (False);
+                defaults to settings.feedback_stats_use_rollups
             
         Returns:
             Dictionary with statistics
@@ -170,24 +355,42 @@ class FeedbackRepository:
         try:
             from sqlalchemy import func
             from datetime import timedelta
-            
-            query = db.query(
-                AgentFeedback.task,
-                func.count(AgentFeedback.id).label('total_count'),
-                func.count(AgentFeedback.feedback).label('rated_count'),
-                func.avg(AgentFeedback.feedback).label('avg_rating'),
-                func.min(AgentFeedback.feedback).label('min_rating'),
-                func.max(AgentFeedback.feedback).label('max_rating')
-            )
-            
-            # Filter by date
-            cutoff_date = datetime.now() - timedelta(days=days)
-            query = query.filter(AgentFeedback.created_at >= cutoff_date)
+
+            if use_rollups is None:
+                use_rollups = settings.feedback_stats_use_rollups
+            if start_date is not None:
+                end_date = end_date or datetime.now(timezone.utc).date()
+                days = (end_date - start_date).days + 1
+
+            if use_rollups:
+                start_day = start_date or FeedbackRollupRepository.window_start(days)
+                query = FeedbackRollupRepository.statistics_query(db, start_day, end_date)
+                task_column = FeedbackDailyRollup.task
+            else:
+                query = db.query(
+                    AgentFeedback.task,
+                    func.count(AgentFeedback.id).label('total_count'),
+                    func.count(AgentFeedback.feedback).label('rated_count'),
+                    func.avg(AgentFeedback.feedback).label('avg_rating'),
+                    func.min(AgentFeedback.feedback).label('min_rating'),
+                    func.max(AgentFeedback.feedback).label('max_rating')
+                )
+
+                # Filter by date
+                if start_date is not None:
+                    query = query.filter(
+                        AgentFeedback.created_at >= datetime.combine(start_date, datetime.min.time()),
+                        AgentFeedback.created_at < datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+                    )
+                else:
+                    cutoff_date = datetime.now() - timedelta(days=days)
+                    query = query.filter(AgentFeedback.created_at >= cutoff_date)
+                task_column = AgentFeedback.task
             
             if task:
-                query = query.filter(AgentFeedback.task == task)
+                query = query.filter(task_column == task)
             
-            query = query.group_by(AgentFeedback.task)
+            query = query.group_by(task_column)
             
             results = query.all()
             
@@ -195,12 +398,17 @@ class FeedbackRepository:
                 'period_days': days,
                 'tasks': {}
             }
+            if start_date is not None:
+                statistics['start_date'] = start_date.isoformat()
+                statistics['end_date'] = end_date.isoformat()
             
             for row in results:
+                total_count = int(row.total_count or 0)
+                rated_count = int(row.rated_count or 0)
                 statistics['tasks'][row.task] = {
-                    'total_predictions': row.total_count,
-                    'rated_predictions': row.rated_count,
-                    'rating_coverage': round(row.rated_count / row.total_count * 100, 2) if row.total_count > 0 else 0,
+                    'total_predictions': total_count,
+                    'rated_predictions': rated_count,
+                    'rating_coverage': round(rated_count / total_count * 100, 2) if total_count > 0 else 0,
                     'average_rating': round(float(row.avg_rating), 2) if row.avg_rating else None,
                     'min_rating': row.min_rating,
                     'max_rating': row.max_rating
@@ -210,4 +418,4 @@ class FeedbackRepository:
             
         except Exception as e:
             logger.error(f"❌ Failed to get feedback statistics: {e}")
-            return {'error': str(e)}
\ No newline at end of file
+            return {'error': str(e)}
@@ -0,0 +1,225 @@
+"""
+Repository for the per-day agent feedback rollups (feedback_daily_rollup)
+
+FeedbackRepository applies counter deltas here in the same transaction as
+every feedback insert and rating update, so the rollups always include
+today's partial counts. Statistics for any day range then aggregate at most
+one row per task per day instead of scanning agent_feedback.
+
+Rollup days are UTC calendar days computed in Python, the same clock the
+statistics range uses: inserts are counted under today's UTC date, rating
+changes under the UTC date of the row's created_at. The database server's
+time zone never decides the bucket.
+"""
+import logging
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import and_, case, delete, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from ..models import AgentFeedback, FeedbackDailyRollup
+
+logger = logging.getLogger(__name__)
+
+RATING_VALUES = (1, 2, 3, 4, 5)
+RATING_COLUMNS = {rating: f'rating_{rating}_count' for rating in RATING_VALUES}
+COUNTER_COLUMNS = ('total_count', 'rated_count', 'rating_sum') + tuple(RATING_COLUMNS.values())
+
+
+def utc_day(moment: Optional[datetime] = None) -> date:
+    """UTC calendar day of a timestamp (now by default); naive timestamps are taken as UTC"""
+    if moment is None:
+        return datetime.now(timezone.utc).date()
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    return moment.date()
+
+
+class FeedbackRollupRepository:
+    """Maintains and queries feedback_daily_rollup"""
+
+    @staticmethod
+    def build_upsert(dialect_name: str, rows):
+        """
+        Multi-row INSERT that adds counter deltas to existing (day, task) rows.
+
+        Returns:
+            The statement, or None if the dialect has no upsert support
+        """
+        table = FeedbackDailyRollup.__table__
+        if dialect_name in ('sqlite', 'postgresql'):
+            if dialect_name == 'sqlite':
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            stmt = dialect_insert(table).values(rows)
+            return stmt.on_conflict_do_update(
+                index_elements=['day', 'task'],
+                set_={column: table.c[column] + stmt.excluded[column] for column in COUNTER_COLUMNS}
+            )
+        if dialect_name in ('mysql', 'mariadb'):
+            from sqlalchemy.dialects.mysql import insert as mysql_insert
+            stmt = mysql_insert(table).values(rows)
+            return stmt.on_duplicate_key_update(
+                {column: table.c[column] + stmt.inserted[column] for column in COUNTER_COLUMNS}
+            )
+        return None
+
+    @staticmethod
+    def apply_deltas(db: Session, deltas: Dict[Tuple[Any, str], Dict[str, int]]) -> None:
+        """
+        Add counter deltas to rollup rows, creating missing rows. Does not commit.
+
+        Args:
+            db: Database session (the caller's transaction)
+            deltas: {(day, task): {column: delta}} keyed by UTC day
+        """
+        rows = []
+        for (day, task), counters in deltas.items():
+            if not any(counters.values()):
+                continue
+            row = {'day': day, 'task': task}
+            row.update({column: int(counters.get(column, 0)) for column in COUNTER_COLUMNS})
+            rows.append(row)
+        if not rows:
+            return
+
+        stmt = FeedbackRollupRepository.build_upsert(db.get_bind().dialect.name, rows)
+        if stmt is not None:
+            db.execute(stmt)
+            return
+
+        # Dialects without an upsert: update in place, insert the rows that did not exist
+        table = FeedbackDailyRollup.__table__
+        for row in rows:
+            result = db.execute(
+                update(table)
+                .where(and_(table.c.day == row['day'], table.c.task == row['task']))
+                .values({column: table.c[column] + row[column] for column in COUNTER_COLUMNS})
+            )
+            if result.rowcount == 0:
+                db.execute(insert(table).values(row))
+
+    @staticmethod
+    def record_inserts(db: Session, task_counts: Dict[str, int]) -> None:
+        """Count newly created (unrated) feedback rows under today's rollup. Does not commit."""
+        today = utc_day()
+        FeedbackRollupRepository.apply_deltas(db, {
+            (today, task): {'total_count': count}
+            for task, count in Counter(task_counts).items() if count
+        })
+
+    @staticmethod
+    def record_rating_change(
+        db: Session,
+        created_at: Optional[datetime],
+        task: str,
+        old_rating: Optional[int],
+        new_rating: Optional[int]
+    ) -> None:
+        """Move a feedback row between rating buckets of its creation day. Does not commit."""
+        if old_rating == new_rating:
+            return
+
+        counters: Dict[str, int] = Counter()
+        for rating, sign in ((old_rating, -1), (new_rating, 1)):
+            if rating not in RATING_COLUMNS:
+                continue  # unrated
+            counters['rated_count'] += sign
+            counters['rating_sum'] += sign * rating
+            counters[RATING_COLUMNS[rating]] += sign
+
+        day = utc_day(created_at if isinstance(created_at, datetime) else None)
+        FeedbackRollupRepository.apply_deltas(db, {(day, task): counters})
+
+    @staticmethod
+    def window_start(days: int, today: Optional[date] = None) -> date:
+        """First UTC day of a `days`-day window ending today (today counts as one of them)"""
+        today = today or utc_day()
+        return today - timedelta(days=max(days, 1) - 1)
+
+    @staticmethod
+    def statistics_query(db: Session, start_day: date, end_day: Optional[date] = None):
+        """
+        Per-task aggregate over a day range, with the same columns as the
+        agent_feedback scan (task, total_count, rated_count, avg_rating,
+        min_rating, max_rating). Group by FeedbackDailyRollup.task to run it.
+        """
+        table = FeedbackDailyRollup
+        rated = func.sum(table.rated_count)
+        query = db.query(
+            table.task,
+            func.sum(table.total_count).label('total_count'),
+            rated.label('rated_count'),
+            (func.sum(table.rating_sum) * 1.0 / func.nullif(rated, 0)).label('avg_rating'),
+            case(
+                *[(func.sum(getattr(table, RATING_COLUMNS[r])) > 0, literal(r)) for r in RATING_VALUES]
+            ).label('min_rating'),
+            case(
+                *[(func.sum(getattr(table, RATING_COLUMNS[r])) > 0, literal(r)) for r in reversed(RATING_VALUES)]
+            ).label('max_rating'),
+        ).filter(table.day >= start_day)
+
+        if end_day is not None:
+            query = query.filter(table.day <= end_day)
+        return query
+
+    @staticmethod
+    def rebuild(
+        db: Session,
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None
+    ) -> int:
+        """
+        Recompute rollups from agent_feedback for a day range (all days by default).
+
+        Replaces the range's rollup rows with one INSERT ... SELECT ... GROUP BY
+        in a single transaction. Used to backfill existing data and to repair
+        drift.
+
+        Returns:
+            Number of rollup rows written
+        """
+        rollup = FeedbackDailyRollup.__table__
+        created_at = AgentFeedback.created_at
+        if db.get_bind().dialect.name == 'postgresql':
+            # timestamptz converts to the session time zone; bucket by UTC like the live updates
+            created_at = func.timezone('UTC', created_at)
+        day = func.date(created_at)
+
+        source = select(
+            day.label('day'),
+            AgentFeedback.task,
+            func.count(AgentFeedback.id),
+            func.count(AgentFeedback.feedback),
+            func.coalesce(func.sum(AgentFeedback.feedback), 0),
+            *[
+                func.coalesce(func.sum(case((AgentFeedback.feedback == rating, 1), else_=0)), 0)
+                for rating in RATING_VALUES
+            ]
+        )
+        clear = delete(rollup)
+        if start_day is not None:
+            source = source.where(AgentFeedback.created_at >= datetime.combine(start_day, datetime.min.time()))
+            clear = clear.where(rollup.c.day >= start_day)
+        if end_day is not None:
+            next_day = datetime.combine(end_day + timedelta(days=1), datetime.min.time())
+            source = source.where(AgentFeedback.created_at < next_day)
+            clear = clear.where(rollup.c.day <= end_day)
+        source = source.group_by(day, AgentFeedback.task)
+
+        try:
+            db.execute(clear)
+            result = db.execute(
+                insert(rollup).from_select(['day', 'task', *COUNTER_COLUMNS], source)
+            )
+            db.commit()
+            written = max(result.rowcount or 0, 0)
+            logger.info(f"✅ Rebuilt {written} feedback rollup rows")
+            return written
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Failed to rebuild feedback rollups: {e}")
+            raise
@@ -1,5 +1,8 @@
 import logging
+from typing import Any, Dict, Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -7,11 +10,53 @@ from app.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Sync drivers and the async driver used for the same database
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "mysql+mysqldb": "mysql+aiomysql",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+ALREADY_ASYNC_DRIVERS = {"aiosqlite", "aiomysql", "asyncmy", "asyncpg", "psycopg"}
+
+
+def engine_pool_kwargs(database_url: str) -> Dict[str, Any]:
+    """
+    Connection pool options for an engine on database_url
+
+    SQLite uses SQLAlchemy's default single-file pool, so the sizing
+    settings only apply to server databases.
+    """
+    kwargs: Dict[str, Any] = {"pool_pre_ping": True}
+    if make_url(database_url).get_backend_name() != "sqlite":
+        kwargs.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+        )
+    return kwargs
+
+
+def get_async_database_url(database_url: str) -> Optional[str]:
+    """Async driver URL for database_url, or None if there is no known async driver"""
+    url = make_url(database_url)
+    if url.get_driver_name() in ALREADY_ASYNC_DRIVERS:
+        return database_url
+    async_driver = ASYNC_DRIVERS.get(url.drivername)
+    if async_driver is None:
+        return None
+    return url.set(drivername=async_driver).render_as_string(hide_password=False)
+
+
 # Create SQLAlchemy engine - use settings.debug (lowercase)
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
-    echo=settings.debug  # Changed from settings.DEBUG to settings.debug
+    echo=settings.debug,  # Changed from settings.DEBUG to settings.debug
+    **engine_pool_kwargs(settings.DATABASE_URL)
 )
 
 # Create SessionLocal class
@@ -20,6 +65,12 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Create Base class for models
 Base = declarative_base()
 
+# Async engine for the API process, created on first use (see get_async_sessionmaker)
+_async_engine = None
+_async_sessionmaker = None
+_async_unavailable = False
+
+
 def get_db():
     """
     Dependency function to get database session
@@ -30,6 +81,56 @@ def get_db():
     finally:
         db.close()
 
+
+def get_async_sessionmaker():
+    """
+    Session factory bound to the pooled async engine
+
+    The engine's connections belong to the event loop that first uses them,
+    so this is meant for the API server's loop only; Celery workers keep
+    using SessionLocal.
+
+    Returns:
+        An async_sessionmaker, or None if async access is disabled or the
+        async driver for DATABASE_URL is not installed
+    """
+    global _async_engine, _async_sessionmaker, _async_unavailable
+
+    if _async_sessionmaker is not None:
+        return _async_sessionmaker
+    if _async_unavailable or not settings.db_async_enabled:
+        return None
+
+    async_url = get_async_database_url(settings.DATABASE_URL)
+    try:
+        if async_url is None:
+            raise ValueError(f"no async driver known for {make_url(settings.DATABASE_URL).drivername}")
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        _async_engine = create_async_engine(
+            async_url,
+            echo=settings.debug,
+            **engine_pool_kwargs(async_url)
+        )
+        _async_sessionmaker = async_sessionmaker(_async_engine, expire_on_commit=False)
+        logger.info(f"🗄️ Async database engine ready ({_async_engine.dialect.name}+{_async_engine.driver})")
+    except Exception as e:
+        _async_unavailable = True
+        logger.warning(f"⚠️ Async database engine unavailable, using sync sessions in a thread: {e}")
+        return None
+
+    return _async_sessionmaker
+
+
+async def dispose_async_engine():
+    """Close the async engine's pooled connections"""
+    global _async_engine, _async_sessionmaker
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _async_sessionmaker = None
+
+
 def init_db():
     """
     Initialize database tables
@@ -42,4 +143,3 @@ def init_db():
     except Exception as e:
         logger.error(f"Error creating database tables: {e}")
         raise
-
@@ -8,7 +8,7 @@ from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
 from .config.settings import settings
-from .api import health_routes, ner_routes, translator_routes, summarizer_routes, classifier_route, whisper_routes, audio_routes, call_session_routes, qa_route, processing_mode_routes, notification_routes, agent_feedback_routes
+from .api import health_routes, ner_routes, translator_routes, summarizer_routes, classifier_route, whisper_routes, audio_routes, call_session_routes, qa_route, processing_mode_routes, notification_routes, agent_feedback_routes, debug_routes
 from .model_scripts.model_loader import model_loader
 from .core.resource_manager import resource_manager
 from .streaming.tcp_server import AsteriskTCPServer
@@ -26,18 +26,10 @@ if settings.enable_model_loading:
     from .celery_app import celery_app
     from .core.celery_monitor import celery_monitor
 
-# Configure logging with PII sanitization
-from .security import PIISanitizingFilter
+# Configure logging with PII sanitization (sanitized and written off-thread)
+from .core.logging_pipeline import configure_service_logging
 
-logging.basicConfig(
-    level=getattr(logging, settings.log_level),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-
-# Add PII filter to root logger (applies to all handlers)
-pii_filter = PIISanitizingFilter()
-for handler in logging.getLogger().handlers:
-    handler.addFilter(pii_filter)
+pii_filter = configure_service_logging()
 
 logger = logging.getLogger(__name__)
 logger.info("PII sanitization filter enabled for all logging")
@@ -76,17 +68,46 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"❌ Redis initialization error: {e}")
     
-    # API server doesn't need Celery monitoring or model loading
-    if settings.enable_model_loading:
-        logger.info("🔄 Worker mode - loading models and starting Celery monitoring...")
-        
-        # Start Celery event monitoring
+    # Start background notification delivery for this process
+    if settings.enable_notification_queue:
+        try:
+            from .services.enhanced_notification_service import enhanced_notification_service
+            await enhanced_notification_service.start_delivery_queue()
+            logger.info("✅ Notification delivery queue started")
+        except Exception as e:
+            logger.error(f"❌ Notification delivery queue failed to start, sending inline: {e}")
+
+    # Share one Redis subscription among all progress stream clients of this process
+    if settings.progress_hub_enabled:
+        try:
+            from .core.progress_hub import progress_hub
+            await progress_hub.start()
+        except Exception as e:
+            logger.error(f"❌ Progress hub failed to start, streams subscribe individually: {e}")
+
+    # Batch agent feedback row writes across calls for this process
+    if settings.feedback_write_behind_enabled:
+        try:
+            from .services.enhanced_notification_service import enhanced_notification_service
+            await enhanced_notification_service.start_feedback_buffer()
+        except Exception as e:
+            logger.error(f"❌ Feedback write-behind failed to start, writing inline: {e}")
+
+    # Celery event monitoring; with the cluster-state cache enabled the API server
+    # also runs it, so health and queue endpoints are served from memory
+    if settings.enable_model_loading or settings.celery_state_cache_enabled:
         try:
             from .core.celery_monitor import celery_monitor
             celery_monitor.start_monitoring()
             logger.info("✅ Event monitoring started")
+            if settings.celery_state_cache_enabled:
+                celery_monitor.start_state_refresh()
         except Exception as e:
             logger.warning(f"⚠️ Event monitoring failed to start: {e}")
+
+    # API server doesn't need model loading
+    if settings.enable_model_loading:
+        logger.info("🔄 Worker mode - loading models...")
         
         # Initialize models
         logger.info("✅ Model loading enabled - starting model initialization...")
@@ -126,6 +147,47 @@ async def lifespan(app: FastAPI):
             logger.info("🔌 Asterisk TCP listener stopped")
         except Exception as e:
             logger.error(f"❌ Error stopping Asterisk TCP listener: {e}")
+
+    # End open progress streams and drop the shared subscription
+    if settings.progress_hub_enabled:
+        try:
+            from .core.progress_hub import progress_hub
+            await progress_hub.stop()
+        except Exception as e:
+            logger.error(f"❌ Error stopping progress hub: {e}")
+
+    # Drain queued notifications before the loop goes away
+    if settings.enable_notification_queue:
+        try:
+            from .services.enhanced_notification_service import enhanced_notification_service
+            await enhanced_notification_service.stop_delivery_queue()
+        except Exception as e:
+            logger.error(f"❌ Error stopping notification delivery queue: {e}")
+
+    # Write buffered feedback rows and close pooled async DB connections
+    try:
+        from .services.enhanced_notification_service import enhanced_notification_service
+        from .db.session import dispose_async_engine
+        await enhanced_notification_service.stop_feedback_buffer()
+        await dispose_async_engine()
+    except Exception as e:
+        logger.error(f"❌ Error flushing feedback write-behind buffer: {e}")
+
+    # Stop background Celery inspection and queue sampling
+    if settings.celery_state_cache_enabled:
+        try:
+            from .core.celery_monitor import celery_monitor
+            celery_monitor.stop_state_refresh()
+        except Exception as e:
+            logger.error(f"❌ Error stopping Celery cluster-state refresh: {e}")
+
+    # Close persistent recording download connections
+    try:
+        from .utils import close_sftp_pools
+        await close_sftp_pools()
+    except Exception as e:
+        logger.error(f"❌ Error closing SFTP connection pools: {e}")
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.app_name,
@@ -178,6 +240,7 @@ app.include_router(qa_route.router)
 app.include_router(processing_mode_routes.router)
 app.include_router(notification_routes.router)
 app.include_router(agent_feedback_routes.router)
+app.include_router(debug_routes.router)
 
 @app.websocket("/audio/stream")
 async def websocket_audio_stream(websocket: WebSocket):
@@ -242,12 +305,12 @@ async def app_info():
     celery_status = {"status": "not_applicable", "note": "API server mode"}
     if settings.enable_model_loading and 'celery_app' in globals():
         try:
-            inspect = celery_app.control.inspect()
-            stats = inspect.stats()
+            state = celery_monitor.get_cluster_state()
             celery_status = {
-                "workers_online": len(stats) if stats else 0,
+                "workers_online": state["workers_online"],
                 "broker_url": celery_app.conf.broker_url,
-                "status": "healthy" if stats else "no_workers"
+                "status": "healthy" if state["workers_online"] else "no_workers",
+                "cache": state["freshness"]
             }
         except Exception as e:
             celery_status = {
@@ -33,7 +33,10 @@ class MultiTaskDistilBert(DistilBertPreTrainedModel):
             attention_mask=attention_mask,
             return_dict=True
         )
-        hidden_state = distilbert_output.last_hidden_state 
+        return self.heads(distilbert_output.last_hidden_state)
+
+    def heads(self, hidden_state):
+        """Classification heads on the encoder output (used directly when the encoder pass is shared)"""
         pooled_output = hidden_state[:, 0]                 
         pooled_output = self.pre_classifier(pooled_output) 
         pooled_output = nn.ReLU()(pooled_output)           
@@ -61,6 +64,8 @@ class ClassifierModel:
         self.load_time = None
         self.error = None
         self.max_length = 512
+        # ONNX Runtime session when ONNX_BACKEND_MODELS selects the classifier (CPU only)
+        self.onnx_session = None
         
         # Hugging Face repo configuration
         from ..config.settings import settings as _settings
@@ -181,6 +186,7 @@ class ClassifierModel:
             ok = self._load_category_configs_from_hf(self.hf_repo_id)
             if not ok:
                 return False
+            self._enable_onnx_backend()
             self.loaded = True
             return True
         except Exception as e:
@@ -189,6 +195,20 @@ class ClassifierModel:
             self.loaded = False
             return False
     
+    def _enable_onnx_backend(self):
+        """Switch inference to an ONNX Runtime session if configured (CPU only)"""
+        from .onnx_backend import export_onnx, onnx_backend_enabled
+
+        self.onnx_session = None
+        if not onnx_backend_enabled("classifier"):
+            return
+        if self.device.type != "cpu":
+            logger.info(f"📦 ONNX backend is CPU-only, classifier stays on PyTorch ({self.device})")
+            return
+        self.onnx_session = export_onnx(
+            self.model, "classifier", ["main", "sub", "interv", "priority"], lambda logits: logits
+        )
+
     def classify(self, narrative: str, return_top_k_subcategories: bool = True) -> Dict[str, str]:
         """
         Classify case narrative with automatic chunking for long inputs
@@ -234,6 +254,9 @@ class ClassifierModel:
             text: Preprocessed text
             return_top_k: If True, return top 2 subcategories
         """
+        if self.onnx_session is not None:
+            return self._classify_batch_onnx([text], return_top_k)[0]
+
         try:
             inputs = self.tokenizer(
                 text,
@@ -245,66 +268,83 @@ class ClassifierModel:
             
             with torch.no_grad():
                 logits = self.model(**inputs)
-                logits_main, logits_sub, logits_interv, logits_priority = logits
             
-            # Get top-1 predictions for main_category, intervention, priority
-            preds_main = torch.argmax(logits_main, dim=1).item()
-            preds_interv = torch.argmax(logits_interv, dim=1).item()
-            preds_priority = torch.argmax(logits_priority, dim=1).item()
+            return self._result_from_logits(logits, return_top_k)
             
-            # Calculate confidence scores
-            main_conf = torch.softmax(logits_main, dim=1).max().item()
-            interv_conf = torch.softmax(logits_interv, dim=1).max().item()
-            priority_conf = torch.softmax(logits_priority, dim=1).max().item()
+        except Exception as e:
+            logger.error(f"Single classification failed: {e}")
+            raise
+
+    def _classify_batch_onnx(self, texts: List[str], return_top_k: bool = True) -> List[Dict[str, str]]:
+        """Classify preprocessed texts in one ONNX Runtime call, padded to the longest text"""
+        from .onnx_backend import pad_batch
+
+        rows = self.tokenizer(texts, truncation=True, max_length=self.max_length)["input_ids"]
+        input_ids, attention_mask = pad_batch(rows, self.tokenizer.pad_token_id or 0)
+        outputs = self.onnx_session.run(input_ids, attention_mask)
+        names = self.onnx_session.output_names
+        return [
+            self._result_from_logits(tuple(torch.from_numpy(outputs[name][i:i + 1]) for name in names), return_top_k)
+            for i in range(len(texts))
+        ]
+
+    def _result_from_logits(self, logits, return_top_k: bool = True) -> Dict[str, str]:
+        """Classification result from the four heads' logits for one text"""
+        logits_main, logits_sub, logits_interv, logits_priority = logits
+        # Get top-1 predictions for main_category, intervention, priority
+        preds_main = torch.argmax(logits_main, dim=1).item()
+        preds_interv = torch.argmax(logits_interv, dim=1).item()
+        preds_priority = torch.argmax(logits_priority, dim=1).item()
+        
+        # Calculate confidence scores
+        main_conf = torch.softmax(logits_main, dim=1).max().item()
+        interv_conf = torch.softmax(logits_interv, dim=1).max().item()
+        priority_conf = torch.softmax(logits_priority, dim=1).max().item()
+        
+        # Get top-k subcategories
+        if return_top_k:
+            sub_probs = torch.softmax(logits_sub, dim=1)
+            top_k_probs, top_k_indices = torch.topk(sub_probs, k=min(2, len(self.sub_categories)), dim=1)
             
-            # Get top-k subcategories
-            if return_top_k:
-                sub_probs = torch.softmax(logits_sub, dim=1)
-                top_k_probs, top_k_indices = torch.topk(sub_probs, k=min(2, len(self.sub_categories)), dim=1)
-                
-                # Extract top 2
-                sub_category_1 = self.sub_categories[top_k_indices[0][0].item()]
-                sub_conf_1 = top_k_probs[0][0].item()
-                
-                # Check if we have a second subcategory
-                if top_k_indices.shape[1] > 1:
-                    sub_category_2 = self.sub_categories[top_k_indices[0][1].item()]
-                    sub_conf_2 = top_k_probs[0][1].item()
-                else:
-                    sub_category_2 = None
-                    sub_conf_2 = 0.0
+            # Extract top 2
+            sub_category_1 = self.sub_categories[top_k_indices[0][0].item()]
+            sub_conf_1 = top_k_probs[0][0].item()
+            
+            # Check if we have a second subcategory
+            if top_k_indices.shape[1] > 1:
+                sub_category_2 = self.sub_categories[top_k_indices[0][1].item()]
+                sub_conf_2 = top_k_probs[0][1].item()
             else:
-                # Fallback to top-1 only
-                preds_sub = torch.argmax(logits_sub, dim=1).item()
-                sub_category_1 = self.sub_categories[preds_sub]
-                sub_conf_1 = torch.softmax(logits_sub, dim=1).max().item()
                 sub_category_2 = None
                 sub_conf_2 = 0.0
-            
-            # Calculate overall confidence
-            overall_conf = (main_conf + sub_conf_1 + interv_conf + priority_conf) / 4
-            
-            result = {
-                "main_category": self.main_categories[preds_main],
-                "sub_category": sub_category_1,
-                "sub_category_2": sub_category_2,
-                "intervention": self.interventions[preds_interv],
-                "priority": str(self.priorities[preds_priority]),
-                "confidence": round(overall_conf, 3),
-                "confidence_breakdown": {
-                    "main_category": round(main_conf, 3),
-                    "sub_category": round(sub_conf_1, 3),
-                    "sub_category_2": round(sub_conf_2, 3),
-                    "intervention": round(interv_conf, 3),
-                    "priority": round(priority_conf, 3)
-                }
+        else:
+            # Fallback to top-1 only
+            preds_sub = torch.argmax(logits_sub, dim=1).item()
+            sub_category_1 = self.sub_categories[preds_sub]
+            sub_conf_1 = torch.softmax(logits_sub, dim=1).max().item()
+            sub_category_2 = None
+            sub_conf_2 = 0.0
+        
+        # Calculate overall confidence
+        overall_conf = (main_conf + sub_conf_1 + interv_conf + priority_conf) / 4
+        
+        result = {
+            "main_category": self.main_categories[preds_main],
+            "sub_category": sub_category_1,
+            "sub_category_2": sub_category_2,
+            "intervention": self.interventions[preds_interv],
+            "priority": str(self.priorities[preds_priority]),
+            "confidence": round(overall_conf, 3),
+            "confidence_breakdown": {
+                "main_category": round(main_conf, 3),
+                "sub_category": round(sub_conf_1, 3),
+                "sub_category_2": round(sub_conf_2, 3),
+                "intervention": round(interv_conf, 3),
+                "priority": round(priority_conf, 3)
             }
-            
-            return result
-            
-        except Exception as e:
-            logger.error(f"Single classification failed: {e}")
-            raise
+        }
+        
+        return result
 
     def _classify_chunked(self, text: str, return_top_k: bool = True) -> Dict[str, str]:
         """Classify text using intelligent chunking and result aggregation"""
@@ -314,21 +354,26 @@ class ClassifierModel:
         logger.info(f" Processing {len(chunks)} classification chunks")
         
         chunk_results = []
+        # ONNX Runtime takes the chunks in batches, padded to the longest chunk in each batch
+        batch_size = 8 if self.onnx_session is not None else 1
         
-        for i, chunk in enumerate(chunks):
+        for i in range(0, len(chunks), batch_size):
+            batch = chunks[i:i + batch_size]
             try:
-                logger.debug(f"Classifying chunk {i+1}/{len(chunks)} ({chunk.token_count} tokens)")
+                logger.debug(f"Classifying chunks {i+1}-{i+len(batch)}/{len(chunks)} ({sum(c.token_count for c in batch)} tokens)")
                 
-                # Classify individual chunk with top-k
-                chunk_result = self._classify_single(chunk.text, return_top_k=return_top_k)
-                chunk_results.append(chunk_result)
+                # Classify individual chunks with top-k
+                if self.onnx_session is not None:
+                    chunk_results.extend(self._classify_batch_onnx([c.text for c in batch], return_top_k))
+                else:
+                    chunk_results.append(self._classify_single(batch[0].text, return_top_k=return_top_k))
                 
                 if i % 5 == 0:
                     self._cleanup_memory()
                     
             except Exception as e:
-                logger.error(f"Failed to classify chunk {i+1}: {e}")
-                chunk_results.append(self._get_default_classification())
+                logger.error(f"Failed to classify chunks {i+1}-{i+len(batch)}: {e}")
+                chunk_results.extend(self._get_default_classification() for _ in batch)
         
         # Aggregate results from all chunks
         aggregated_result = self._aggregate_classification_results(chunk_results, chunks)
@@ -528,6 +573,7 @@ class ClassifierModel:
             "loaded": self.loaded,
             "load_time": self.load_time.isoformat() if self.load_time else None,
             "device": str(self.device),
+            "backend": "onnxruntime" if self.onnx_session is not None else "pytorch",
             "error": self.error,
         }
 
@@ -537,6 +583,7 @@ class ClassifierModel:
                 "tokenizer_class": type(self.tokenizer).__name__,
                 "max_length": self.max_length,
                 "top_k_subcategories": True,  # NEW
+                "onnx": self.onnx_session.get_info() if self.onnx_session is not None else None,
                 "chunking": {
                     "supported": True,
                     "strategy": "weighted_voting_top_k",
@@ -3,6 +3,10 @@ from typing import Dict, Any, Optional, List
 from datetime import datetime
 import os
 import asyncio
+import threading
+import time
+
+from ..core.metrics import record_model_load_profile
 
 logger = logging.getLogger(__name__)
 
@@ -65,6 +69,83 @@ except ImportError:
     NUMPY_AVAILABLE = False
     logger.info("NumPy not available - numerical processing disabled")
 
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+MB = 1024 * 1024
+
+_WARMUP_TEXT = "Hello, I am calling to report that a child in my neighbourhood needs help."
+
+# First inference per model, used to measure warmup latency after loading
+_WARMUP_CALLS = {
+    "whisper": lambda m: m.transcribe_audio_array(numpy.zeros(16000, dtype=numpy.float32)),
+    "ner": lambda m: m.extract_entities(_WARMUP_TEXT, flat=True),
+    "classifier_model": lambda m: m.classify(_WARMUP_TEXT),
+    "translator": lambda m: m.translate(_WARMUP_TEXT),
+    "summarizer": lambda m: m.summarize(_WARMUP_TEXT),
+    "qa": lambda m: m.predict(_WARMUP_TEXT),
+}
+
+
+def _current_rss_bytes() -> int:
+    """Resident set size of this process"""
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss
+    return 0
+
+
+def _parse_model_list(value: Any, known_models: List[str]) -> List[str]:
+    """Parse a comma-separated model list setting ('all' selects every model)"""
+    if not isinstance(value, str):
+        return []
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    if "all" in names:
+        return list(known_models)
+    unknown = [name for name in names if name not in known_models]
+    if unknown:
+        logger.warning(f"⚠️ Ignoring unknown models in deferred_models: {unknown}")
+    return [name for name in names if name in known_models]
+
+
+def _round(value: Optional[float], digits: int) -> Optional[float]:
+    return round(value, digits) if value is not None else None
+
+
+class _PeakRSSSampler:
+    """
+    Samples process RSS on a background thread while a model loads
+
+    RSS is process-wide, so with concurrent loading the peak reflects every
+    model loading at the same time, not just this one.
+    """
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak_rss = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak_rss = max(self.peak_rss, _current_rss_bytes())
+
+    def __enter__(self):
+        self.peak_rss = _current_rss_bytes()
+        if PSUTIL_AVAILABLE:
+            self._thread = threading.Thread(target=self._sample, name="rss-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.peak_rss = max(self.peak_rss, _current_rss_bytes())
+        return False
+
 
 class ModelStatus:
     def __init__(self, name: str):
@@ -75,6 +156,12 @@ class ModelStatus:
         self.model_info = {}
         self.dependencies_available = False
         self.missing_dependencies = []
+        self.deferred = False
+        self.load_seconds = None
+        self.peak_rss_bytes = None
+        self.rss_delta_bytes = None
+        self.mmap_bytes = 0
+        self.warmup_seconds = None
 
 
 class ModelLoader:
@@ -167,6 +254,10 @@ class ModelLoader:
         for model_name in self.model_dependencies.keys():
             self.model_status[model_name] = ModelStatus(model_name)
             self._check_model_dependencies(model_name)
+
+        # Serialises loads of the same model (startup vs first-use vs reload)
+        self._load_locks = {name: threading.Lock() for name in self.model_dependencies}
+        self.deferred_models = _parse_model_list(settings.deferred_models, list(self.model_dependencies))
         
         logger.info(f"ModelLoader initialized with models_path={self.models_path}")
         logger.info(f"Available libraries: {list(AVAILABLE_LIBRARIES.keys())}")
@@ -205,144 +296,217 @@ class ModelLoader:
             logger.info(f"Model {model_name} dependencies satisfied")
     
     async def load_all_models(self):
-        """Load all models that have satisfied dependencies"""
+        """
+        Load all models that have satisfied dependencies
+
+        Independent models are loaded concurrently on worker threads (up to
+        settings.model_load_concurrency at a time). Models listed in
+        settings.deferred_models are skipped here and loaded on first use
+        through ensure_models_loaded().
+        """
+        from ..config.settings import settings
+
         logger.info("Starting model loading process...")
-        
-        for model_name in self.model_status.keys():
-            await self._load_model(model_name)
-    
+
+        eager_models = []
+        for model_name, model_status in self.model_status.items():
+            if model_name in self.deferred_models and model_status.dependencies_available:
+                model_status.deferred = True
+                logger.info(f"⏸️ Deferring {model_name} until first use")
+            else:
+                eager_models.append(model_name)
+
+        concurrency = max(1, int(settings.model_load_concurrency))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def load_with_limit(model_name: str):
+            async with semaphore:
+                await self._load_model(model_name)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(load_with_limit(name) for name in eager_models))
+        logger.info(
+            f"📦 Loaded {len(self.get_ready_models())}/{len(eager_models)} models in "
+            f"{time.perf_counter() - start:.1f}s (concurrency={concurrency})"
+        )
+
     async def _load_model(self, model_name: str):
         """Load a specific model if dependencies are available"""
+        # Raises KeyError for unknown models before any work is scheduled
+        self.model_status[model_name]
+        await asyncio.to_thread(self._load_model_sync, model_name)
+
+    def ensure_models_loaded(self, model_names: List[str]) -> bool:
+        """
+        Load any of the given models that were deferred or not loaded yet
+
+        Called from a Celery task_prerun hook so deferred models load when the
+        first task that needs them arrives. Returns True if all are ready.
+        """
+        for model_name in model_names:
+            model_status = self.model_status.get(model_name)
+            if model_status is None or model_status.loaded or not model_status.dependencies_available:
+                continue
+            if model_status.deferred or model_status.error is None:
+                logger.info(f"📦 Loading {model_name} on first use...")
+                self._load_model_sync(model_name)
+        return all(self.is_model_ready(name) for name in model_names)
+
+    def _get_model_instance(self, model_name: str):
+        """Return the model wrapper object for a model name, or None if not implemented"""
+        if model_name == "whisper":
+            # Load Whisper model directly for transcription
+            from .whisper_model import WhisperModel
+            return WhisperModel()
+        if model_name == "ner":
+            from .ner_model import ner_model
+            return ner_model
+        if model_name == "classifier_model":
+            from .classifier_model import classifier_model
+            return classifier_model
+        if model_name == "translator":
+            from .translator_model import translator_model
+            return translator_model
+        if model_name == "summarizer":
+            from .summarizer_model import summarization_model
+            return summarization_model
+        if model_name == "qa":
+            from .qa_model import qa_model
+            return qa_model
+        return None
+
+    def _load_model_sync(self, model_name: str):
+        """Load a model on the calling thread, recording its startup profile"""
         logger.info(f"Checking {model_name} model...")
-        
+
         model_status = self.model_status[model_name]
-        
-        try:
-            # Check if dependencies are available
-            if not model_status.dependencies_available:
-                logger.info(f"Skipping {model_name} - dependencies not available: {model_status.missing_dependencies}")
-                return
-            
-            if model_name == "whisper":
-                # Load Whisper model directly for transcription
-                from .whisper_model import WhisperModel
-
-                try:
-                    whisper_model = WhisperModel()
-                    success = whisper_model.load()
-                    if success:
-                        model_status.loaded = True
-                        model_status.error = None
-                        model_status.model_info = whisper_model.get_model_info()
-                        self.models[model_name] = whisper_model
-                        logger.info(f"✅ Whisper model loaded successfully for transcription")
-                    else:
-                        model_status.error = "Failed to load Whisper model"
-                        logger.error(f"❌ Whisper model failed to load: {model_status.error}")
-                except Exception as e:
-                    model_status.error = f"Whisper loading error: {str(e)}"
-                    logger.error(f"❌ Whisper model loading failed: {model_status.error}")
 
-                model_status.load_time = datetime.now()
+        # Check if dependencies are available
+        if not model_status.dependencies_available:
+            logger.info(f"Skipping {model_name} - dependencies not available: {model_status.missing_dependencies}")
+            return
+
+        with self._load_locks[model_name]:
+            if model_status.loaded:
                 return
-            
-            if model_name == "ner":
-                from .ner_model import ner_model
-                
-                success = ner_model.load()
-                if success:
-                    model_status.loaded = True
-                    model_status.error = None
-                    model_status.model_info = ner_model.get_model_info()
-                    self.models[model_name] = ner_model
-                    logger.info(f"✅ NER model loaded successfully")
-                else:
-                    model_status.error = ner_model.error or "Failed to load NER model"
-                    logger.error(f"❌ NER model failed to load: {model_status.error}")
-                
+
+            try:
+                from ..config.settings import settings
+
+                model_instance = self._get_model_instance(model_name)
+                if model_instance is None:
+                    # If we get here, the model isn't implemented yet
+                    model_status.error = f"Model loading implementation pending (dependencies available)"
+                    model_status.load_time = datetime.now()
+                    model_status.model_info = {
+                        "model_path": os.path.join(self.models_path, model_name),
+                        "dependencies_satisfied": True,
+                        "description": self.model_dependencies[model_name]["description"]
+                    }
+                    logger.info(f"Model {model_name} ready for implementation (dependencies satisfied)")
+                    return
+
+                rss_before = _current_rss_bytes()
+                start = time.perf_counter()
+                with _PeakRSSSampler() as rss_sampler:
+                    try:
+                        success = model_instance.load()
+                        load_error = None if success else getattr(model_instance, "error", None)
+                    except Exception as e:
+                        success = False
+                        load_error = str(e)
+                model_status.load_seconds = time.perf_counter() - start
+                model_status.peak_rss_bytes = rss_sampler.peak_rss
+                model_status.rss_delta_bytes = max(0, _current_rss_bytes() - rss_before)
                 model_status.load_time = datetime.now()
-                return
-            
-            elif model_name == "classifier_model":
-                from .classifier_model import classifier_model
-                success = classifier_model.load()
-                if success:
-                    model_status.loaded = True
-                    model_status.error = None
-                    model_status.model_info = classifier_model.get_model_info()
-                    self.models[model_name] = classifier_model
-                    logger.info(f"✅ {model_name} model loaded successfully")
-                else:
-                    model_status.error = classifier_model.error or "Failed to load classifier model"
+
+                if not success:
+                    model_status.error = load_error or f"Failed to load {model_name} model"
                     logger.error(f"❌ {model_name} model failed to load: {model_status.error}")
-                model_status.load_time = datetime.now()
-                return
-            
-            if model_name == "translator":
-                from .translator_model import translator_model
-
-                success = translator_model.load()
-                if success:
-                    model_status.loaded = True
-                    model_status.error = None
-                    model_status.model_info = translator_model.get_model_info()
-                    self.models[model_name] = translator_model
-                    logger.info("✅ Translation model loaded successfully")
-                else:
-                    model_status.error = translator_model.error or "Failed to load translation model"
-                    logger.error(f"❌ Translation model failed to load: {model_status.error}")
+                    return
 
-                model_status.load_time = datetime.now()
-                return
-            
-            if model_name == "summarizer":
-                from .summarizer_model import summarization_model
-
-                success = summarization_model.load()
-                if success:
-                    model_status.loaded = True
-                    model_status.error = None
-                    model_status.model_info = summarization_model.get_model_info()
-                    self.models[model_name] = summarization_model
-                    logger.info("✅ Summarization model loaded successfully")
-                else:
-                    model_status.error = summarization_model.error or "Failed to load summarization model"
-                    logger.error(f"❌ Summarization model failed to load: {model_status.error}")
+                if settings.model_weights_mmap:
+                    model_status.mmap_bytes = self._share_weights(model_name, model_instance)
+                if settings.model_warmup_on_load:
+                    model_status.warmup_seconds = self._warmup_model(model_name, model_instance)
 
+                model_status.loaded = True
+                model_status.deferred = False
+                model_status.error = None
+                model_status.model_info = model_instance.get_model_info()
+                self.models[model_name] = model_instance
+
+                record_model_load_profile(
+                    model_name,
+                    model_status.load_seconds,
+                    model_status.peak_rss_bytes,
+                    model_status.mmap_bytes,
+                    model_status.warmup_seconds
+                )
+                logger.info(
+                    f"✅ {model_name} model loaded in {model_status.load_seconds:.2f}s "
+                    f"(peak RSS {model_status.peak_rss_bytes / MB:.0f}MB, "
+                    f"+{model_status.rss_delta_bytes / MB:.0f}MB, "
+                    f"mmapped {model_status.mmap_bytes / MB:.0f}MB)"
+                )
+
+            except Exception as e:
+                logger.error(f"Failed to prepare {model_name} model: {e}")
+                model_status.error = str(e)
                 model_status.load_time = datetime.now()
-                return
-            
-            if model_name == "qa":
-                from .qa_model import qa_model
-                success = qa_model.load()
-                if success:
-                    model_status.loaded = True
-                    model_status.error = None
-                    model_status.model_info = qa_model.get_model_info()
-                    self.models[model_name] = qa_model
-                    logger.info("✅ QA model loaded successfully")
-                else:
-                    model_status.error = qa_model.error or "Failed to load QA model"
-                    logger.error(f"❌ QA model failed to load: {model_status.error}")
-                model_status.load_time = datetime.now()
-                return
-            
-            # If we get here, the model isn't implemented yet
-            model_status.error = f"Model loading implementation pending (dependencies available)"
-            model_status.load_time = datetime.now()
-            model_status.model_info = {
-                "model_path": os.path.join(self.models_path, model_name),
-                "dependencies_satisfied": True,
-                "description": self.model_dependencies[model_name]["description"]
-            }
-            
-            logger.info(f"Model {model_name} ready for implementation (dependencies satisfied)")
-            
+
+    def _share_weights(self, model_name: str, model_instance) -> int:
+        """Move the model's CPU weights onto shared mmapped safetensors pages"""
+        try:
+            from .weight_mmap import share_model_weights
+            mmap_bytes = share_model_weights(model_instance)
+            if mmap_bytes:
+                logger.info(f"🗺️ {model_name}: {mmap_bytes / MB:.0f}MB of weights now mmap-backed")
+            return mmap_bytes
         except Exception as e:
-            logger.error(f"Failed to prepare {model_name} model: {e}")
-            model_status.error = str(e)
-            model_status.load_time = datetime.now()
-    
+            logger.warning(f"⚠️ Could not mmap {model_name} weights, keeping in-memory copy: {e}")
+            return 0
+
+    def _warmup_model(self, model_name: str, model_instance) -> Optional[float]:
+        """Run a first inference so lazy initialisation isn't paid by the first real task"""
+        warmup = _WARMUP_CALLS.get(model_name)
+        if warmup is None:
+            return None
+        start = time.perf_counter()
+        try:
+            warmup(model_instance)
+        except Exception as e:
+            logger.warning(f"⚠️ {model_name} warmup inference failed: {e}")
+            return None
+        warmup_seconds = time.perf_counter() - start
+        logger.info(f"🔥 {model_name} warmup inference took {warmup_seconds:.2f}s")
+        return warmup_seconds
+
+    def reload_model(self, model_name: str) -> bool:
+        """
+        Reload a model on the calling thread and invalidate its cached results
+
+        Run on a worker by the reload_model control command (POST
+        /health/models/{model_name}/reload broadcasts it).
+        """
+        if model_name not in self.model_status:
+            raise ValueError(f"Unknown model: {model_name}")
+
+        logger.info(f"🔄 Reloading {model_name} model...")
+        with self._load_locks[model_name]:
+            self.models.pop(model_name, None)
+            model_status = self.model_status[model_name]
+            model_status.loaded = False
+            model_status.error = None
+
+        self._load_model_sync(model_name)
+
+        # Results produced by the previous weights must not be served again
+        from ..core.result_cache import model_result_cache
+        model_result_cache.invalidate_model(model_name)
+
+        return self.is_model_ready(model_name)
+
     def get_model_status(self) -> Dict[str, Any]:
         """Get status of all models"""
         status = {}
@@ -355,6 +519,12 @@ class ModelLoader:
                 "dependencies_available": model_status.dependencies_available,
                 "missing_dependencies": model_status.missing_dependencies,
                 "info": model_status.model_info,
+                "deferred": model_status.deferred,
+                "load_seconds": _round(model_status.load_seconds, 3),
+                "peak_rss_mb": _round(model_status.peak_rss_bytes and model_status.peak_rss_bytes / MB, 1),
+                "rss_delta_mb": _round(model_status.rss_delta_bytes and model_status.rss_delta_bytes / MB, 1),
+                "mmap_weights_mb": _round(model_status.mmap_bytes / MB, 1),
+                "warmup_seconds": _round(model_status.warmup_seconds, 3),
                 "description": self.model_dependencies.get(model_name, {}).get("description", "Unknown model")
             }
         
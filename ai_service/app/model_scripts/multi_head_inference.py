@@ -0,0 +1,176 @@
+# app/model_scripts/multi_head_inference.py
+"""
+Multi-Head Inference
+
+Runs the classifier (MultiTaskDistilBert) and QA (MultiHeadQAClassifier) heads
+on one text with the DistilBERT work shared between them, instead of each
+model tokenizing the text and running its own encoder padded to max_length.
+
+- shared:   both models carry the same encoder weights. One tokenizer call,
+            one encoder forward pass over the classifier input and the QA
+            input (a single row when they tokenize identically), then both
+            sets of heads on the shared hidden states.
+- batched:  the encoders have the same architecture and vocabulary but
+            different weights. One tokenizer call; each encoder runs on its
+            own row in the same job, without padding.
+- separate: anything else (different vocabularies, devices or
+            architectures, or either model on the ONNX backend). run() returns None and callers use the models'
+            own classify()/predict().
+
+The classifier still sees its preprocessed text and the QA model the raw
+text, so results match the separate models (up to floating point noise from
+padding). Texts too long for one classifier window keep the classifier's
+chunked path; only the QA side is shared then.
+"""
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+SHARED = "shared"
+BATCHED = "batched"
+SEPARATE = "separate"
+
+# Encoder hyperparameters that must agree for the models to run the same encoder code
+_ARCHITECTURE_KEYS = ("vocab_size", "dim", "n_layers", "n_heads", "hidden_dim", "max_position_embeddings", "activation")
+
+
+class MultiHeadInference:
+    """Classifier and QA heads over one DistilBERT tokenization and (when possible) one encoder pass."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._modes: Dict[Tuple[int, int], str] = {}
+        self.stats = {SHARED: 0, BATCHED: 0, SEPARATE: 0, "chunked_classification": 0}
+
+    @classmethod
+    def from_settings(cls) -> "MultiHeadInference":
+        from ..config.settings import settings
+        return cls(enabled=settings.shared_encoder_inference)
+
+    def mode(self, classifier, qa) -> str:
+        """How the two models can share work; decided once per pair of loaded models."""
+        if not self.enabled:
+            return SEPARATE
+        try:
+            if not (classifier.is_ready() and qa.is_ready()):
+                return SEPARATE
+            # Models on the ONNX backend run their own exported graphs
+            if getattr(classifier, "onnx_session", None) is not None or getattr(qa, "onnx_session", None) is not None:
+                return SEPARATE
+            key = (id(classifier.model), id(qa.model))
+        except Exception:
+            return SEPARATE
+
+        if key not in self._modes:
+            self._modes[key] = self._detect_mode(classifier, qa)
+            logger.info(f"🔗 Classifier/QA encoder mode: {self._modes[key]}")
+        return self._modes[key]
+
+    def _detect_mode(self, classifier, qa) -> str:
+        try:
+            classifier_encoder = classifier.model.distilbert
+            qa_encoder = qa.model.bert
+            if not isinstance(classifier_encoder, torch.nn.Module) or not isinstance(qa_encoder, torch.nn.Module):
+                return SEPARATE
+
+            if classifier.tokenizer.get_vocab() != qa.tokenizer.get_vocab():
+                return SEPARATE
+            if getattr(classifier.tokenizer, "do_lower_case", None) != getattr(qa.tokenizer, "do_lower_case", None):
+                return SEPARATE
+
+            classifier_config, qa_config = classifier_encoder.config, qa_encoder.config
+            if any(getattr(classifier_config, k, None) != getattr(qa_config, k, None) for k in _ARCHITECTURE_KEYS):
+                return SEPARATE
+
+            classifier_params = classifier_encoder.state_dict()
+            qa_params = qa_encoder.state_dict()
+            if next(iter(classifier_params.values())).device != next(iter(qa_params.values())).device:
+                return SEPARATE
+            if classifier_params.keys() != qa_params.keys():
+                return SEPARATE
+            for name, tensor in classifier_params.items():
+                other = qa_params[name]
+                if tensor.shape != other.shape or tensor.dtype != other.dtype:
+                    return SEPARATE
+            if all(torch.equal(tensor, qa_params[name]) for name, tensor in classifier_params.items()):
+                return SHARED
+            return BATCHED
+        except Exception as e:
+            logger.warning(f"⚠️ Could not compare classifier and QA encoders, running them separately: {e}")
+            return SEPARATE
+
+    def run(self, classifier, qa, text: str, threshold: float = 0.5) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        (classification, qa_predictions) for text, as classifier.classify(text) and
+        qa.predict(text, threshold) would return them; None if the models cannot share work.
+        """
+        mode = self.mode(classifier, qa)
+        if mode == SEPARATE or not text or not text.strip():
+            self.stats[SEPARATE] += 1
+            return None
+
+        clean_text = classifier.preprocess_text(text.strip())
+        # One tokenizer call for both inputs; truncation is applied per row below
+        classifier_ids, qa_ids = classifier.tokenizer([clean_text, text], add_special_tokens=True)["input_ids"]
+        qa_ids = self._truncate(qa_ids, qa.max_length)
+
+        classify_here = len(classifier_ids) <= classifier.max_length - 10
+        if not classify_here:
+            self.stats["chunked_classification"] += 1
+
+        device = next(qa.model.parameters()).device
+        with torch.no_grad():
+            if mode == SHARED:
+                rows = [qa_ids]
+                if classify_here and classifier_ids != qa_ids:
+                    rows.append(classifier_ids)
+                hidden = self._encode(qa.model.bert, rows, device)
+                qa_hidden = hidden[0:1, :len(qa_ids)]
+                classifier_hidden = hidden[len(rows) - 1:len(rows), :len(classifier_ids)] if classify_here else None
+            else:
+                qa_hidden = self._encode(qa.model.bert, [qa_ids], device)
+                classifier_hidden = self._encode(classifier.model.distilbert, [classifier_ids], device) if classify_here else None
+
+            qa_result = qa._format_predictions(qa.model.heads_from_hidden(qa_hidden), 0.5 if threshold is None else float(threshold))
+            if classify_here:
+                classification = classifier._result_from_logits(classifier.model.heads(classifier_hidden))
+
+        if not classify_here:
+            classification = classifier.classify(text)
+
+        self.stats[mode] += 1
+        return classification, qa_result
+
+    @staticmethod
+    def _truncate(ids: List[int], max_length: int) -> List[int]:
+        """Tokenizer truncation of a single sequence: keep the leading tokens and the final [SEP]"""
+        if len(ids) <= max_length:
+            return ids
+        return ids[:max_length - 1] + ids[-1:]
+
+    @staticmethod
+    def _encode(encoder, rows: List[List[int]], device) -> torch.Tensor:
+        """Encoder hidden states for token id rows, padded to the longest row"""
+        length = max(len(row) for row in rows)
+        input_ids = torch.zeros((len(rows), length), dtype=torch.long)
+        attention_mask = torch.zeros((len(rows), length), dtype=torch.long)
+        for i, row in enumerate(rows):
+            input_ids[i, :len(row)] = torch.tensor(row, dtype=torch.long)
+            attention_mask[i, :len(row)] = 1
+        output = encoder(input_ids=input_ids.to(device), attention_mask=attention_mask.to(device))
+        return output.last_hidden_state
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Mode of each model pair seen and how often each path ran."""
+        return {
+            "enabled": self.enabled,
+            "modes": sorted(set(self._modes.values())),
+            **self.stats,
+        }
+
+
+# Global instance
+multi_head_inference = MultiHeadInference.from_settings()
@@ -0,0 +1,135 @@
+# app/model_scripts/ner_batcher.py
+"""
+NER Micro-Batcher
+
+Groups entity extraction requests from many calls and progressive windows
+into NERModel.extract_entities_batch() calls, instead of one model call (and
+its per-call overhead) per text.
+
+Callers submit a text and wait for its entities. A background thread takes
+the first waiting request, collects more for up to NER_BATCH_MAX_WAIT_MS or
+until NER_BATCH_SIZE texts are waiting, and runs them as one batch. If a
+batch fails, each of its texts is retried on its own, so one bad text only
+fails its own caller.
+
+Requests submitted with wait=False run at once, together with whatever is
+already queued. The Celery worker uses this: it runs one task at a time
+(solo pool), so waiting there would only add latency with no peer to batch
+with. The streaming server's windows from concurrent calls do wait.
+"""
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Tuple
+
+from ..core.metrics import record_ner_batch
+
+logger = logging.getLogger(__name__)
+
+
+class NERMicroBatcher:
+    """Batches concurrent NER requests into extract_entities_batch() calls."""
+
+    def __init__(self, batch_size: int = 16, max_wait_ms: float = 10.0):
+        self.batch_size = batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue: "queue.Queue[Tuple[Any, str, bool, Future, bool]]" = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "batches": 0, "largest_batch": 0, "failed_batches": 0}
+
+    @classmethod
+    def from_settings(cls) -> "NERMicroBatcher":
+        from ..config.settings import settings
+        return cls(batch_size=settings.ner_batch_size, max_wait_ms=settings.ner_batch_max_wait_ms)
+
+    def submit(self, model, text: str, flat: bool = True, wait: bool = True) -> Future:
+        """Queue a text for model; the future resolves to its entities. wait=False skips waiting for more texts"""
+        future: Future = Future()
+        self._ensure_thread()
+        self._queue.put((model, text, flat, future, wait))
+        return future
+
+    def extract(self, model, text: str, flat: bool = True, wait: bool = True):
+        """Entities for text as model.extract_entities(text, flat) returns them, batched with other callers"""
+        return self.submit(model, text, flat, wait).result()
+
+    async def extract_async(self, model, text: str, flat: bool = True):
+        """extract() for async callers, without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(model, text, flat))
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="ner-batcher", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            max_wait_ms = self.max_wait_ms if batch[0][4] else 0
+            deadline = time.monotonic() + max_wait_ms / 1000
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[Tuple[Any, str, bool, Future, bool]]):
+        # Requests can come for different model instances and output formats
+        groups: Dict[Tuple[int, bool], List[Tuple[Any, str, bool, Future, bool]]] = {}
+        for request in batch:
+            groups.setdefault((id(request[0]), request[2]), []).append(request)
+
+        for (_, flat), requests in groups.items():
+            model = requests[0][0]
+            try:
+                results = self._extract(model, [request[1] for request in requests], flat)
+            except Exception as e:
+                if len(requests) == 1:
+                    requests[0][3].set_exception(e)
+                    continue
+                # Retry each text alone so the failure stays with the caller that caused it
+                self.stats["failed_batches"] += 1
+                logger.warning(f"⚠️ NER batch of {len(requests)} texts failed, retrying one by one: {e}")
+                for _, text, _, future, _ in requests:
+                    try:
+                        future.set_result(self._extract(model, [text], flat)[0])
+                    except Exception as text_error:
+                        future.set_exception(text_error)
+                continue
+            for request, result in zip(requests, results):
+                request[3].set_result(result)
+
+        self.stats["requests"] += len(batch)
+        self.stats["batches"] += 1
+        self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+        record_ner_batch(len(batch))
+        if len(batch) > 1:
+            logger.debug(f"🏷️ NER batch of {len(batch)} texts")
+
+    @staticmethod
+    def _extract(model, texts: List[str], flat: bool) -> List[Any]:
+        results = list(model.extract_entities_batch(texts, flat=flat))
+        if len(results) != len(texts):
+            raise RuntimeError(f"NER batch returned {len(results)} results for {len(texts)} texts")
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Configuration and batch counters."""
+        return {
+            "batch_size": self.batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "waiting": self._queue.qsize(),
+            "average_batch": round(self.stats["requests"] / self.stats["batches"], 2) if self.stats["batches"] else 0.0,
+            **self.stats,
+        }
+
+
+# Global instance
+ner_batcher = NERMicroBatcher.from_settings()
@@ -33,6 +33,8 @@ class NERModel:
         
         self.nlp = None
         self.hf_pipeline = None
+        self.onnx_session = None
+        self._chunker = None
         self.model_type = None
         self.loaded = False
         self.load_time = None
@@ -92,6 +94,8 @@ class NERModel:
                         tokenizer=AutoTokenizer.from_pretrained(self.hf_repo_id, **hf_kwargs),
                         aggregation_strategy="simple"
                     )
+                    self._chunker = None
+                    self._enable_onnx_backend()
                     self.use_hf = True
                     self.loaded = True
                     self.error = None
@@ -167,64 +171,138 @@ class NERModel:
             logger.error(f"Neither local nor installed spaCy model found. Install with: python -m spacy download en_core_web_lg")
             raise OSError(f"spaCy model not found. Error: {e}")
     
+    def _enable_onnx_backend(self):
+        """Run the token-classification pipeline's model on ONNX Runtime if configured (CPU only)"""
+        from .onnx_backend import OnnxTokenClassifier, export_onnx, onnx_backend_enabled
+
+        self.onnx_session = None
+        if not onnx_backend_enabled("ner"):
+            return
+        model = self.hf_pipeline.model
+        if model.device.type != "cpu":
+            logger.info(f"📦 ONNX backend is CPU-only, NER model stays on PyTorch ({model.device})")
+            return
+        self.onnx_session = export_onnx(model, "ner", ["logits"], lambda outputs: (outputs.logits,))
+        if self.onnx_session is not None:
+            # The pipeline keeps its tokenization and entity aggregation; only the forward pass moves
+            self.hf_pipeline.model = OnnxTokenClassifier(self.onnx_session, model)
+
     def extract_entities(self, text: str, flat: bool = True) -> Union[Dict[str, List[str]], List[Dict[str, str]]]:
         """Extract named entities from text"""
+        return self.extract_entities_batch([text], flat=flat)[0]
+
+    def extract_entities_batch(self, texts: List[str], flat: bool = True) -> List[Union[Dict[str, List[str]], List[Dict[str, str]]]]:
+        """
+        Extract named entities from several texts in batched model calls
+
+        spaCy runs the texts through nlp.pipe and Hugging Face through the
+        pipeline's batching. Texts longer than the Hugging Face model's input
+        are split with NERChunker and their entities mapped back to positions
+        in the full text. Returns one result per text, as extract_entities().
+        """
         if not self.loaded:
             raise RuntimeError("NER model not loaded. Call load() first.")
         
-        if not text or not text.strip():
-            return [] if flat else {}
+        from ..config.settings import settings
         
         try:
-            if self.use_hf and self.hf_pipeline is not None:
-                results = self.hf_pipeline(text.strip()) if text else []
-                if flat:
-                    entities = []
-                    for r in results:
-                        entities.append({
-                            "text": r.get("word", ""),
-                            "label": r.get("entity_group", r.get("entity", "")),
-                            "start": int(r.get("start", 0)),
-                            "end": int(r.get("end", 0)),
-                            "confidence": float(r.get("score", 1.0))
-                        })
-                    return entities
+            texts = [text.strip() if text else "" for text in texts]
+            # (text index, chunk metadata or None, text the model sees) per model input
+            pieces = []
+            chunked: Dict[int, List[Dict]] = {}
+            for i, text in enumerate(texts):
+                if not text:
+                    continue
+                chunks = self._chunk_long_text(text)
+                if chunks:
+                    chunked[i] = chunks
+                    pieces.extend((i, chunk, chunk["text"]) for chunk in chunks)
                 else:
-                    grouped: Dict[str, List[str]] = {}
-                    for r in results:
-                        label = r.get("entity_group", r.get("entity", ""))
-                        grouped.setdefault(label, []).append(r.get("word", ""))
-                    return grouped
+                    pieces.append((i, None, text))
             
-            # spaCy path
-            if self.nlp is None:
-                raise RuntimeError("spaCy model not initialized")
+            piece_entities = self._run_batch([piece[2] for piece in pieces], settings)
             
-            doc = self.nlp(text.strip())
+            entities: List[List[Dict]] = [[] for _ in texts]
+            chunk_entities: Dict[int, List[List[Dict]]] = {}
+            for (i, chunk, _), found in zip(pieces, piece_entities):
+                if chunk is None:
+                    entities[i] = found
+                else:
+                    chunk_entities.setdefault(i, []).append(found)
+            for i, chunks in chunked.items():
+                entities[i] = self._chunker.reconstruct_entities(chunk_entities[i], chunks, flat=True, transcript=texts[i])
+                logger.info(f"NER processed {len(chunks)} chunks of a {len(texts[i])} char text")
             
-            if flat:
-                entities = []
-                for ent in doc.ents:
-                    entities.append({
-                        "text": ent.text,
-                        "label": ent.label_,
-                        "start": ent.start_char,
-                        "end": ent.end_char,
-                        "confidence": getattr(ent, 'confidence', 1.0)
-                    })
-                return entities
-            else:
-                entity_dict = {}
-                for ent in doc.ents:
-                    if ent.label_ not in entity_dict:
-                        entity_dict[ent.label_] = []
-                    entity_dict[ent.label_].append(ent.text)
-                return entity_dict
+            return [found if flat else self._group_by_label(found) for found in entities]
                 
         except Exception as e:
             logger.error(f"NER processing failed: {e}")
             raise RuntimeError(f"NER processing failed: {str(e)}")
     
+    def _run_batch(self, texts: List[str], settings) -> List[List[Dict]]:
+        """Flat entities for each text, one batched model call"""
+        if not texts:
+            return []
+        
+        if self.use_hf and self.hf_pipeline is not None:
+            if len(texts) == 1:
+                results = [self.hf_pipeline(texts[0])]
+            else:
+                results = self.hf_pipeline(texts, batch_size=settings.ner_batch_size)
+            return [[{
+                "text": r.get("word", ""),
+                "label": r.get("entity_group", r.get("entity", "")),
+                "start": int(r.get("start", 0)),
+                "end": int(r.get("end", 0)),
+                "confidence": float(r.get("score", 1.0))
+            } for r in result] for result in results]
+        
+        # spaCy path
+        if self.nlp is None:
+            raise RuntimeError("spaCy model not initialized")
+        
+        if len(texts) == 1:
+            docs = [self.nlp(texts[0])]
+        else:
+            # Worker processes only pay off when there is more than one batch to share out
+            n_process = settings.ner_spacy_n_process if len(texts) > settings.ner_batch_size else 1
+            docs = self.nlp.pipe(texts, batch_size=settings.ner_batch_size, n_process=n_process)
+        return [[{
+            "text": ent.text,
+            "label": ent.label_,
+            "start": ent.start_char,
+            "end": ent.end_char,
+            "confidence": getattr(ent, 'confidence', 1.0)
+        } for ent in doc.ents] for doc in docs]
+    
+    def _chunk_long_text(self, text: str) -> Optional[List[Dict]]:
+        """NERChunker chunks for a text beyond the Hugging Face model's input size, else None"""
+        if not (self.use_hf and self.hf_pipeline is not None):
+            # spaCy has no fixed input size
+            return None
+        
+        tokenizer = self.hf_pipeline.tokenizer
+        model_max_length = getattr(tokenizer, "model_max_length", None)
+        max_tokens = min(model_max_length, 512) if isinstance(model_max_length, int) else 512
+        # Tokens never outnumber characters by more than the special tokens, so short texts skip tokenization
+        if len(text) + 4 <= max_tokens:
+            return None
+        
+        if self._chunker is None:
+            from ..utils.text_utils import NERChunker
+            self._chunker = NERChunker(tokenizer=tokenizer, max_tokens=max_tokens)
+        if self._chunker.count_tokens(text) <= max_tokens:
+            return None
+        chunks = self._chunker.chunk_transcript(text)
+        return chunks if len(chunks) > 1 else None
+    
+    @staticmethod
+    def _group_by_label(entities: List[Dict]) -> Dict[str, List[str]]:
+        grouped: Dict[str, List[str]] = {}
+        for entity in entities:
+            grouped.setdefault(entity["label"], []).append(entity["text"])
+        return grouped
+    
     def get_model_info(self) -> Dict:
         """Get standardized model information"""
         
@@ -236,6 +314,7 @@ class NERModel:
             "loaded": self.loaded,
             "load_time": self.load_time.isoformat() if self.load_time else None,
             "device": "cpu",  # spaCy models typically run on CPU
+            "backend": "onnxruntime" if self.onnx_session is not None else "pytorch",
             "error": self.error,
         }
 
@@ -262,6 +341,7 @@ class NERModel:
                     "hf_pipeline_task": self.hf_pipeline.task,
                     "hf_model_name_or_path": self.hf_pipeline.model.name_or_path,
                     "hf_tokenizer_name_or_path": self.hf_pipeline.tokenizer.name_or_path,
+                    "onnx": self.onnx_session.get_info() if self.onnx_session is not None else None,
                 })
         
         info["details"] = details
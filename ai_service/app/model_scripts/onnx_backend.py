@@ -0,0 +1,211 @@
+# app/model_scripts/onnx_backend.py
+"""
+ONNX Runtime Backend
+
+Optional exported-graph inference for the DistilBERT models (classifier, QA
+and the NER token-classification pipeline) on CPU-only sites, selected per
+model with ONNX_BACKEND_MODELS.
+
+- Each model is exported to ONNX once and cached on disk under a name keyed by
+  a hash of its weights, so restarts and other workers reuse the export and
+  retrained weights get a new file.
+- Graphs have dynamic batch and sequence axes: inputs are padded to the
+  longest text in the batch instead of max_length.
+- Sessions use the full graph optimisation level and a tuned intra-op thread
+  count (ONNX_INTRA_OP_THREADS, 0 = physical cores), with one inter-op thread
+  since a worker runs one inference at a time.
+
+When onnxruntime (or the onnx package for the export) is missing, or the
+export fails, the model keeps its PyTorch path.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import torch
+
+logger = logging.getLogger(__name__)
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+    logger.info("onnxruntime not available - ONNX backend disabled")
+
+ONNX_MODELS = ["classifier", "qa", "ner"]
+ONNX_OPSET = 17
+# Bumped when the export wrapper changes, so cached graphs are re-exported
+EXPORT_VERSION = 1
+
+
+def onnx_backend_enabled(model_name: str) -> bool:
+    """True if settings select the ONNX backend for the model (classifier, qa or ner)"""
+    from ..config.settings import settings
+    from .model_loader import _parse_model_list
+
+    return model_name in _parse_model_list(settings.onnx_backend_models, ONNX_MODELS)
+
+
+def weights_hash(module: torch.nn.Module) -> str:
+    """Hash of a module's class and weights, the cache key for its exported graph"""
+    digest = hashlib.sha256(f"{type(module).__name__}:{EXPORT_VERSION}:{ONNX_OPSET}".encode())
+    for name, tensor in module.state_dict().items():
+        tensor = tensor.detach().cpu().contiguous().reshape(-1)
+        digest.update(f"{name}:{tuple(tensor.shape)}:{tensor.dtype}".encode())
+        digest.update(tensor.view(torch.uint8).numpy().tobytes())
+    return digest.hexdigest()
+
+
+class _ExportWrapper(torch.nn.Module):
+    """Positional (input_ids, attention_mask) -> tuple of output tensors, for tracing"""
+
+    def __init__(self, module: torch.nn.Module, output_fn):
+        super().__init__()
+        self.module = module
+        self.output_fn = output_fn
+
+    def forward(self, input_ids, attention_mask):
+        return tuple(self.output_fn(self.module(input_ids=input_ids, attention_mask=attention_mask)))
+
+
+class OnnxSession:
+    """An exported model graph and its ONNX Runtime session."""
+
+    def __init__(self, path: str, output_names: Sequence[str], intra_op_threads: int = 0):
+        self.path = path
+        self.output_names = list(output_names)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.intra_op_num_threads = intra_op_threads or _physical_cores()
+        options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+        self.intra_op_threads = options.intra_op_num_threads
+
+    def run(self, input_ids, attention_mask) -> Dict[str, np.ndarray]:
+        """Outputs by name for a (batch, seq_len) batch of token ids and attention mask"""
+        outputs = self.session.run(self.output_names, {
+            "input_ids": np.asarray(input_ids, dtype=np.int64),
+            "attention_mask": np.asarray(attention_mask, dtype=np.int64),
+        })
+        return dict(zip(self.output_names, outputs))
+
+    def get_info(self) -> Dict[str, Any]:
+        return {"path": self.path, "outputs": self.output_names, "intra_op_threads": self.intra_op_threads}
+
+
+def _physical_cores() -> int:
+    try:
+        import psutil
+        return psutil.cpu_count(logical=False) or os.cpu_count() or 1
+    except ImportError:
+        return os.cpu_count() or 1
+
+
+def export_onnx(module: torch.nn.Module, name: str, output_names: Sequence[str], output_fn,
+                cache_dir: Optional[str] = None, intra_op_threads: Optional[int] = None) -> Optional[OnnxSession]:
+    """
+    ONNX Runtime session for module, exporting it on first use
+
+    output_fn maps the module's forward output to a sequence of tensors named
+    by output_names. Returns None (keep PyTorch) if onnxruntime is missing or
+    the export fails.
+    """
+    if not ONNXRUNTIME_AVAILABLE:
+        logger.warning(f"⚠️ ONNX backend requested for {name} but onnxruntime is not installed - using PyTorch")
+        return None
+
+    from ..config.settings import settings
+    cache_dir = cache_dir or settings.onnx_cache_dir or settings.get_model_path("onnx")
+    intra_op_threads = settings.onnx_intra_op_threads if intra_op_threads is None else intra_op_threads
+
+    try:
+        path = os.path.join(cache_dir, f"{name}-{weights_hash(module)[:16]}.onnx")
+        if os.path.exists(path):
+            logger.info(f"📦 Using cached ONNX export for {name}: {path}")
+        else:
+            _export(module, path, output_names, output_fn)
+            logger.info(f"📦 Exported {name} to ONNX: {path}")
+        return OnnxSession(path, output_names, intra_op_threads)
+    except Exception as e:
+        logger.warning(f"⚠️ ONNX export of {name} failed, using PyTorch: {e}")
+        return None
+
+
+def _export(module: torch.nn.Module, path: str, output_names: Sequence[str], output_fn):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    device = next(module.parameters()).device
+    was_training = module.training
+    wrapper = _ExportWrapper(module, output_fn).eval()
+
+    # Example with a padded row, so the attention-mask branch is traced
+    input_ids = torch.ones((2, 8), dtype=torch.long, device=device)
+    attention_mask = torch.ones((2, 8), dtype=torch.long, device=device)
+    attention_mask[1, 4:] = 0
+
+    dynamic_axes = {
+        "input_ids": {0: "batch", 1: "sequence"},
+        "attention_mask": {0: "batch", 1: "sequence"},
+        **{output: {0: "batch"} for output in output_names},
+    }
+    # Write to a temporary file first so concurrent workers never load a partial graph
+    fd, tmp_path = tempfile.mkstemp(suffix=".onnx", dir=os.path.dirname(path) or ".")
+    os.close(fd)
+    try:
+        with torch.no_grad():
+            torch.onnx.export(
+                wrapper, (input_ids, attention_mask), tmp_path,
+                input_names=["input_ids", "attention_mask"],
+                output_names=list(output_names),
+                dynamic_axes=dynamic_axes,
+                opset_version=ONNX_OPSET,
+                dynamo=False,
+            )
+        os.replace(tmp_path, path)
+    finally:
+        # torch.onnx.export restores the wrapper's training flag on every submodule
+        module.train(was_training)
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def pad_batch(rows: List[List[int]], pad_id: int = 0):
+    """(input_ids, attention_mask) int64 arrays padded to the longest row"""
+    length = max(len(row) for row in rows)
+    input_ids = np.full((len(rows), length), pad_id, dtype=np.int64)
+    attention_mask = np.zeros((len(rows), length), dtype=np.int64)
+    for i, row in enumerate(rows):
+        input_ids[i, :len(row)] = row
+        attention_mask[i, :len(row)] = 1
+    return input_ids, attention_mask
+
+
+class OnnxTokenClassifier:
+    """
+    Stand-in for the model of a transformers token-classification pipeline
+
+    The pipeline only calls the model and reads its config, so the exported
+    graph can replace the PyTorch model without changing the pipeline's
+    pre- and post-processing.
+    """
+
+    def __init__(self, session: OnnxSession, model: torch.nn.Module):
+        self.session = session
+        self.config = model.config
+        self.device = torch.device("cpu")
+        self.dtype = torch.float32
+        self.torch_model = model
+
+    def __call__(self, input_ids=None, attention_mask=None, **kwargs):
+        if attention_mask is None:
+            attention_mask = torch.ones_like(input_ids)
+        outputs = self.session.run(input_ids.cpu().numpy(), attention_mask.cpu().numpy())
+        return {"logits": torch.from_numpy(outputs["logits"])}
+
+    def __getattr__(self, name):
+        # Anything else the pipeline asks for comes from the PyTorch model
+        return getattr(self.__dict__["torch_model"], name)
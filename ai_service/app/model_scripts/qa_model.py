@@ -58,12 +58,15 @@ class MultiHeadQAClassifier(nn.Module):
 
     def forward(self, input_ids, attention_mask):
         output = self.bert(input_ids=input_ids, attention_mask=attention_mask)
-        pooled_output = self.dropout(output.last_hidden_state[:, 0])  # [CLS] token
-        logits = {
+        return {"logits": self.heads_from_hidden(output.last_hidden_state)}
+
+    def heads_from_hidden(self, hidden_state):
+        """QA heads on the encoder output (used directly when the encoder pass is shared)"""
+        pooled_output = self.dropout(hidden_state[:, 0])  # [CLS] token
+        return {
             head_name: torch.sigmoid(head_layer(pooled_output))
             for head_name, head_layer in self.heads.items()
         }
-        return {"logits": logits}
 
 # --- Service Class ---
 class QAModel:
@@ -81,6 +84,8 @@ class QAModel:
         self.load_time = None
         self.error = None
         self.max_length = 512
+        # ONNX Runtime session when ONNX_BACKEND_MODELS selects qa (CPU only)
+        self.onnx_session = None
 
     def load(self) -> bool:
         """Load the QA model and tokenizer - NO AUTHENTICATION"""
@@ -115,6 +120,7 @@ class QAModel:
                     
                     self.model.to(self.device)
                     self.model.eval()
+                    self._enable_onnx_backend()
                     
                     self.loaded = True
                     self.load_time = datetime.now()
@@ -150,6 +156,7 @@ class QAModel:
             self.model.load_state_dict(state_dict)
             self.model.to(self.device)
             self.model.eval()
+            self._enable_onnx_backend()
 
             self.loaded = True
             self.load_time = datetime.now()
@@ -163,6 +170,46 @@ class QAModel:
             logger.error(f"Failed to load QA model: {e}")
             return False
 
+    def _enable_onnx_backend(self):
+        """Switch inference to an ONNX Runtime session if configured (CPU only)"""
+        from .onnx_backend import export_onnx, onnx_backend_enabled
+
+        self.onnx_session = None
+        if not onnx_backend_enabled("qa"):
+            return
+        if self.device.type != "cpu":
+            logger.info(f"📦 ONNX backend is CPU-only, QA model stays on PyTorch ({self.device})")
+            return
+        self.onnx_session = export_onnx(
+            self.model, "qa", list(QA_HEADS_CONFIG), lambda outputs: [outputs["logits"][head] for head in QA_HEADS_CONFIG]
+        )
+
+    def _head_probabilities(self, text: str) -> Dict:
+        """Per-head probabilities (1, n_submetrics) for one text, from ONNX Runtime or PyTorch"""
+        if self.onnx_session is not None:
+            from .onnx_backend import pad_batch
+
+            ids = self.tokenizer(text, truncation=True, max_length=self.max_length)["input_ids"]
+            outputs = self.onnx_session.run(*pad_batch([ids], self.tokenizer.pad_token_id or 0))
+            return {head: torch.from_numpy(outputs[head]) for head in self.onnx_session.output_names}
+
+        # Tokenize input
+        encoding = self.tokenizer(
+            text,
+            return_tensors="pt",
+            padding="max_length",
+            truncation=True,
+            max_length=self.max_length
+        )
+        
+        input_ids = encoding["input_ids"].to(self.device)
+        attention_mask = encoding["attention_mask"].to(self.device)
+        
+        # Forward pass
+        with torch.no_grad():
+            outputs = self.model(input_ids=input_ids, attention_mask=attention_mask)
+            return outputs["logits"]
+
     def score_transcript(self, transcript: str, threshold: float = 0.5) -> Dict:
         """Score a transcript against QA metrics and calculate an overall score."""
         if not self.is_ready():
@@ -172,21 +219,8 @@ class QAModel:
             return self._get_default_score()
             
         try:
-            # Tokenize input
-            encoding = self.tokenizer(
-                transcript,
-                return_tensors="pt",
-                padding="max_length",
-                truncation=True,
-                max_length=self.max_length
-            )
-            input_ids = encoding["input_ids"].to(self.device)
-            attention_mask = encoding["attention_mask"].to(self.device)
-
             # Get model predictions
-            with torch.no_grad():
-                outputs = self.model(input_ids=input_ids, attention_mask=attention_mask)
-                logits = outputs["logits"]
+            logits = self._head_probabilities(transcript)
 
             # Process results
             detailed_scores = {}
@@ -234,24 +268,12 @@ class QAModel:
             
         threshold = 0.5 if threshold is None else float(threshold)
 
-        # Tokenize input
-        encoding = self.tokenizer(
-            text,
-            return_tensors="pt",
-            padding="max_length",
-            truncation=True,
-            max_length=self.max_length
-        )
+        logits = self._head_probabilities(text)
         
-        input_ids = encoding["input_ids"].to(self.device)
-        attention_mask = encoding["attention_mask"].to(self.device)
-        
-        # Forward pass
-        with torch.no_grad():
-            outputs = self.model(input_ids=input_ids, attention_mask=attention_mask)
-            logits = outputs["logits"]
-        
-        # Process results
+        return self._format_predictions(logits, threshold)
+
+    def _format_predictions(self, logits: Dict, threshold: float = 0.5) -> Dict:
+        """Per-head submetric predictions from the heads' probabilities for one text"""
         results = {}
         for head, probs in logits.items():
             if probs is None:
@@ -299,6 +321,7 @@ class QAModel:
             "loaded": self.loaded,
             "load_time": self.load_time.isoformat() if self.load_time else None,
             "device": str(self.device),
+            "backend": "onnxruntime" if self.onnx_session is not None else "pytorch",
             "error": self.error,
         }
 
@@ -310,6 +333,7 @@ class QAModel:
                 "max_length": self.max_length,
                 "qa_heads_config": QA_HEADS_CONFIG,
                 "head_submetric_labels": HEAD_SUBMETRIC_LABELS,
+                "onnx": self.onnx_session.get_info() if self.onnx_session is not None else None,
             }
             info["details"] = details
         
@@ -4,6 +4,7 @@ import logging
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM, pipeline
 import torch
 import os
+import time
 from datetime import datetime
 from typing import Dict, List, Optional
 import gc
@@ -25,6 +26,9 @@ class SummarizationModel:
         self.load_time = None
         self.error = None
         self.max_length = 512  # Model's maximum input token limit
+        # Generation statistics of the last summarize() call
+        self.last_run_stats: Dict = {}
+        self._run_stats: Dict = {}
         
         # Hugging Face repo support (hub-first)
         self.hf_repo_id = os.getenv("SUMMARIZATION_HF_REPO_ID") or getattr(settings, "hf_summarizer_model", None)
@@ -87,26 +91,51 @@ class SummarizationModel:
             return ""
 
         text = text.strip()
+        self._run_stats = {"generations": 0, "batches": 0, "reduce_levels": 0, "generated_tokens": 0}
+        started = time.perf_counter()
+        memory = _PeakMemory(self.device)
         
         try:
-            # Check if text needs chunking
-            token_count = len(self.tokenizer.encode(text, add_special_tokens=True))
-            
-            if token_count <= self.max_length - 50:  # Leave buffer
-                # Single summarization
-                return self._summarize_single(text, max_length, min_length)
-            else:
-                # Hierarchical summarization for long texts
-                logger.info(f"🔄 Text too long ({token_count} tokens), using hierarchical summarization")
-                return self._summarize_hierarchical(text, max_length, min_length)
+            with memory:
+                # Check if text needs chunking
+                token_count = len(self.tokenizer.encode(text, add_special_tokens=True))
+                
+                if token_count <= self.max_length - 50:  # Leave buffer
+                    # Single summarization
+                    return self._summarize_single(text, max_length, min_length)
+                else:
+                    # Hierarchical summarization for long texts
+                    logger.info(f"🔄 Text too long ({token_count} tokens), using hierarchical summarization")
+                    return self._summarize_hierarchical(text, max_length, min_length)
                 
         except Exception as e:
             logger.error(f"Summarization failed: {e}")
             raise RuntimeError(f"Summarization failed: {str(e)}")
         finally:
-            # Clean up GPU memory
+            self._finish_run_stats(time.perf_counter() - started, memory.peak_bytes)
+            # Clean up GPU memory, once per summary
             self._cleanup_memory()
 
+    def _finish_run_stats(self, duration: float, peak_bytes: int):
+        stats = self._run_stats
+        stats["duration_seconds"] = round(duration, 3)
+        stats["tokens_per_second"] = round(stats["generated_tokens"] / duration, 1) if duration > 0 else 0.0
+        stats["peak_memory_mb"] = round(peak_bytes / (1024 * 1024), 1) if peak_bytes else None
+        self.last_run_stats = stats
+        peak = f"{stats['peak_memory_mb']:.0f}MB" if stats["peak_memory_mb"] is not None else "n/a"
+        logger.info(f"📊 Summarization generated {stats['generated_tokens']} tokens in {stats['generations']} generations "
+                    f"({stats['batches']} batches, {stats['reduce_levels']} reduce levels): "
+                    f"{stats['tokens_per_second']:.1f} tokens/s, peak memory {peak}")
+
+    def _count_generated(self, summaries: List[str], batches: int = 0):
+        """Add generated summaries to the current run's statistics"""
+        stats = self._run_stats
+        stats["generations"] = stats.get("generations", 0) + len(summaries)
+        stats["batches"] = stats.get("batches", 0) + batches
+        stats["generated_tokens"] = stats.get("generated_tokens", 0) + sum(
+            len(self.tokenizer.encode(summary, add_special_tokens=False)) for summary in summaries
+        )
+
     def _summarize_single(self, text: str, max_length: int, min_length: int) -> str:
         """Summarize a single text chunk"""
         try:
@@ -121,6 +150,7 @@ class SummarizationModel:
             )
             
             result = summary[0]['summary_text'].strip()
+            self._count_generated([result], batches=1)
             logger.debug(f"✅ Single summary generated: {len(result)} characters")
             return result
             
@@ -130,75 +160,141 @@ class SummarizationModel:
 
     def _summarize_hierarchical(self, text: str, max_length: int, min_length: int) -> str:
         """
-        Perform hierarchical summarization for long texts:
+        Perform batched map-reduce summarization for long texts:
         1. Split into chunks
-        2. Summarize each chunk
-        3. Combine chunk summaries
+        2. Map: summarize the chunks in padded batches of similar length
+        3. Reduce: while the chunk summaries together exceed one model input,
+           pack them into input-sized groups and summarize those (up to
+           summarization_max_reduce_levels passes)
         4. Create final meta-summary
+        
+        Every pass draws on one generated-token budget
+        (summarization_max_generated_tokens), with max_length kept back for
+        the final summary.
         """
+        from ..config.settings import settings
         from ..core.text_chunker import text_chunker
         
         # Get chunks optimized for summarization (larger chunks)
         chunks = text_chunker.chunk_text(text, strategy="summarization")
         logger.info(f"🔄 Processing {len(chunks)} summarization chunks")
+        budget = settings.summarization_max_generated_tokens - max_length
         
-        # Step 1: Summarize each chunk
-        chunk_summaries = []
-        for i, chunk in enumerate(chunks):
-            try:
-                logger.debug(f"Summarizing chunk {i+1}/{len(chunks)} ({chunk.token_count} tokens)")
-                
-                # Adjust summary length based on chunk size
-                chunk_max_length = min(max_length // 2, max(50, chunk.token_count // 4))
-                chunk_min_length = min(min_length // 2, 20)
-                
-                chunk_summary = self._summarize_single(
-                    chunk.text, 
-                    chunk_max_length, 
-                    chunk_min_length
-                )
-                
-                chunk_summaries.append({
-                    'summary': chunk_summary,
-                    'chunk_id': chunk.chunk_id,
-                    'original_length': chunk.token_count
-                })
-                
-                # Clean up between chunks
-                if i % 3 == 0:  # Every 3 chunks
-                    self._cleanup_memory()
-                    
-            except Exception as e:
-                logger.error(f"Failed to summarize chunk {i+1}: {e}")
-                # Create fallback summary for failed chunk
-                chunk_summaries.append({
-                    'summary': self._create_fallback_summary(chunk.text),
-                    'chunk_id': chunk.chunk_id,
-                    'original_length': chunk.token_count
-                })
+        # Step 1: Summarize the chunks in batches
+        chunk_summaries = self._summarize_batch(
+            [chunk.text for chunk in chunks],
+            [chunk.token_count for chunk in chunks],
+            max_length, min_length, budget
+        )
+        chunk_summaries = [{
+            'summary': summary,
+            'chunk_id': chunk.chunk_id,
+            'original_length': chunk.token_count
+        } for chunk, summary in zip(chunks, chunk_summaries)]
         
-        # Step 2: Create meta-summary from chunk summaries
-        combined_summaries = ' '.join([cs['summary'] for cs in chunk_summaries])
+        # Step 2: Reduce the chunk summaries until they fit one model input
+        limit = self.max_length - 50
+        while True:
+            combined_summaries = ' '.join([cs['summary'] for cs in chunk_summaries])
+            combined_tokens = len(self.tokenizer.encode(combined_summaries))
+            if combined_tokens <= limit:
+                break
+            
+            groups = self._pack_summaries(chunk_summaries, limit)
+            remaining = budget - self._run_stats.get("generated_tokens", 0)
+            if (self._run_stats.get("reduce_levels", 0) >= settings.summarization_max_reduce_levels
+                    or len(groups) >= len(chunk_summaries) or remaining <= 0):
+                # Combined summaries are still too long, apply intelligent merging
+                logger.info(f"🔄 Merging {len(chunk_summaries)} summaries ({combined_tokens} tokens) without another reduce pass")
+                return self._optimize_combined_summaries(chunk_summaries, max_length)
+            
+            self._run_stats["reduce_levels"] = self._run_stats.get("reduce_levels", 0) + 1
+            logger.info(f"🔄 Reduce level {self._run_stats['reduce_levels']}: {len(chunk_summaries)} summaries -> {len(groups)}")
+            group_texts = [' '.join(cs['summary'] for cs in group) for group in groups]
+            reduced = self._summarize_batch(
+                group_texts,
+                [sum(cs['tokens'] for cs in group) for group in groups],
+                max_length, min_length, budget
+            )
+            chunk_summaries = [{
+                'summary': summary,
+                'chunk_id': i,
+                'original_length': sum(cs['original_length'] for cs in group)
+            } for i, (group, summary) in enumerate(zip(groups, reduced))]
         
-        # Check if combined summaries need further summarization
-        combined_tokens = len(self.tokenizer.encode(combined_summaries))
+        # Step 3: Final summarization of combined summaries
+        try:
+            final_summary = self._summarize_single(
+                combined_summaries, 
+                max_length, 
+                min_length
+            )
+            logger.info(f"✅ Hierarchical summarization completed: {len(final_summary)} characters")
+            return final_summary
+        except Exception as e:
+            logger.warning(f"Final summarization failed: {e}, returning combined summaries")
+            return self._optimize_combined_summaries(chunk_summaries, max_length)
+
+    def _summarize_batch(self, texts: List[str], token_counts: List[int], max_length: int,
+                         min_length: int, budget: int) -> List[str]:
+        """
+        Summaries of texts, generated in padded batches
         
-        if combined_tokens <= self.max_length - 50:
-            # Final summarization of combined summaries
+        Texts are batched in order of length so each batch pads little. Each
+        summary's length follows its text's size, capped so the pass fits the
+        generated-token budget left.
+        """
+        from ..config.settings import settings
+        
+        share = (budget - self._run_stats.get("generated_tokens", 0)) // max(1, len(texts))
+        if share < 16:
+            logger.warning(f"⚠️ Generated-token budget spent, using extractive summaries for {len(texts)} texts")
+            return [self._create_fallback_summary(text) for text in texts]
+        # Adjust summary length based on chunk size
+        lengths = [min(max_length // 2, max(50, count // 4), share) for count in token_counts]
+        chunk_min_length = min(min_length // 2, 20)
+        
+        summaries: List[Optional[str]] = [None] * len(texts)
+        order = sorted(range(len(texts)), key=lambda i: token_counts[i])
+        batch_size = settings.summarization_batch_size
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            batch_max_length = max(lengths[i] for i in batch)
             try:
-                final_summary = self._summarize_single(
-                    combined_summaries, 
-                    max_length, 
-                    min_length
+                logger.debug(f"Summarizing {len(batch)} chunks ({sum(token_counts[i] for i in batch)} tokens)")
+                outputs = self.pipeline(
+                    [texts[i] for i in batch],
+                    max_length=batch_max_length,
+                    min_length=min(chunk_min_length, batch_max_length),
+                    do_sample=False,
+                    truncation=True,
+                    batch_size=len(batch)
                 )
-                logger.info(f"✅ Hierarchical summarization completed: {len(final_summary)} characters")
-                return final_summary
+                results = [(output[0] if isinstance(output, list) else output)['summary_text'].strip() for output in outputs]
+                if len(results) != len(batch):
+                    raise RuntimeError(f"{len(results)} summaries for {len(batch)} chunks")
+                self._count_generated(results, batches=1)
             except Exception as e:
-                logger.warning(f"Final summarization failed: {e}, returning combined summaries")
-                return self._optimize_combined_summaries(chunk_summaries, max_length)
-        else:
-            # Combined summaries are still too long, apply intelligent merging
-            return self._optimize_combined_summaries(chunk_summaries, max_length)
+                logger.error(f"Failed to summarize a batch of {len(batch)} chunks: {e}")
+                # Create fallback summaries for the failed batch
+                results = [self._create_fallback_summary(texts[i]) for i in batch]
+            for i, summary in zip(batch, results):
+                summaries[i] = summary
+        return summaries
+
+    def _pack_summaries(self, chunk_summaries: List[Dict], limit: int) -> List[List[Dict]]:
+        """Consecutive summaries grouped into model inputs of at most limit tokens"""
+        groups: List[List[Dict]] = []
+        group_tokens = 0
+        for cs in chunk_summaries:
+            cs['tokens'] = len(self.tokenizer.encode(cs['summary'], add_special_tokens=False)) + 1
+            if groups and group_tokens + cs['tokens'] <= limit:
+                groups[-1].append(cs)
+                group_tokens += cs['tokens']
+            else:
+                groups.append([cs])
+                group_tokens = cs['tokens']
+        return groups
 
     def _create_fallback_summary(self, text: str, max_sentences: int = 2) -> str:
         """Create a simple extractive summary as fallback"""
@@ -347,12 +443,45 @@ class SummarizationModel:
                 "chunking": {
                     "supported": True,
                     "strategies": ["single_pass", "hierarchical"],
+                    "batched_map_reduce": True,
                 },
+                "last_run": self.last_run_stats,
                 "fallback_strategy": "extractive_summary",
             }
             info["details"] = details
         
         return info
 
+class _PeakMemory:
+    """Peak memory while a summary is generated: CUDA allocations on GPU, sampled process RSS on CPU"""
+
+    def __init__(self, device):
+        self.cuda = torch.device(device).type == "cuda" and torch.cuda.is_available()
+        self.peak_bytes = 0
+        self._sampler = None
+
+    def __enter__(self):
+        if self.cuda:
+            try:
+                torch.cuda.reset_peak_memory_stats()
+            except Exception as e:
+                logger.debug(f"CUDA peak memory unavailable: {e}")
+                self.cuda = False
+        else:
+            from .model_loader import _PeakRSSSampler
+            self._sampler = _PeakRSSSampler().__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.cuda:
+            self.peak_bytes = torch.cuda.max_memory_allocated()
+            self.cuda = False
+        elif self._sampler is not None:
+            self._sampler.__exit__(*exc_info)
+            self.peak_bytes = self._sampler.peak_rss
+            self._sampler = None
+        return False
+
+
 # Global instance
 summarization_model = SummarizationModel()
\ No newline at end of file
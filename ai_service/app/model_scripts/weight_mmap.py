@@ -0,0 +1,179 @@
+"""
+Memory-mapped model weights
+
+from_pretrained() copies every tensor into anonymous process memory, so each
+Celery worker process ends up holding a private copy of the weights. Remapping
+the parameters of a loaded CPU model onto a copy-on-write mmap of its
+safetensors file makes them file-backed instead: the pages live in the page
+cache once and are shared by every process that maps the same file.
+"""
+import json
+import logging
+import os
+import struct
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    torch = None
+    TORCH_AVAILABLE = False
+
+SAFETENSORS_WEIGHTS_NAME = "model.safetensors"
+SAFETENSORS_INDEX_NAME = "model.safetensors.index.json"
+
+# safetensors dtype -> (numpy dtype used for the mapping, torch dtype name)
+_SAFETENSORS_DTYPES = {
+    "F64": (np.float64, "float64"),
+    "F32": (np.float32, "float32"),
+    "F16": (np.float16, "float16"),
+    "BF16": (np.int16, "bfloat16"),
+    "I64": (np.int64, "int64"),
+    "I32": (np.int32, "int32"),
+    "I16": (np.int16, "int16"),
+    "I8": (np.int8, "int8"),
+    "U8": (np.uint8, "uint8"),
+    "BOOL": (np.bool_, "bool"),
+}
+
+
+def load_safetensors_mmap(path: str) -> Dict[str, Any]:
+    """
+    Map a safetensors file and return its tensors as views of the mapping
+
+    The mapping is copy-on-write: reads share the page cache, and a write to
+    a tensor only copies the touched page into the writing process.
+    """
+    if not TORCH_AVAILABLE:
+        raise RuntimeError("PyTorch is required to map model weights")
+
+    with open(path, "rb") as f:
+        (header_size,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_size))
+    header.pop("__metadata__", None)
+
+    data_start = 8 + header_size
+    if os.path.getsize(path) == data_start:
+        return {}
+    mapping = np.memmap(path, dtype=np.uint8, mode="c", offset=data_start)
+
+    tensors = {}
+    for name, entry in header.items():
+        if entry["dtype"] not in _SAFETENSORS_DTYPES:
+            logger.debug(f"Skipping {name}: unsupported dtype {entry['dtype']}")
+            continue
+        np_dtype, torch_dtype = _SAFETENSORS_DTYPES[entry["dtype"]]
+        begin, end = entry["data_offsets"]
+        array = mapping[begin:end].view(np_dtype).reshape(entry["shape"])
+        tensor = torch.from_numpy(array)
+        if torch_dtype == "bfloat16":
+            tensor = tensor.view(torch.bfloat16)
+        tensors[name] = tensor
+    return tensors
+
+
+def find_safetensors_files(name_or_path: Optional[str]) -> List[str]:
+    """Locate the safetensors weight file(s) for a local model dir or a cached Hub repo"""
+    if not name_or_path:
+        return []
+
+    if os.path.isdir(name_or_path):
+        single = os.path.join(name_or_path, SAFETENSORS_WEIGHTS_NAME)
+        if os.path.isfile(single):
+            return [single]
+        index = os.path.join(name_or_path, SAFETENSORS_INDEX_NAME)
+        if os.path.isfile(index):
+            return _shards_from_index(index, lambda shard: os.path.join(name_or_path, shard))
+        return []
+
+    try:
+        from huggingface_hub import try_to_load_from_cache
+    except ImportError:
+        return []
+
+    def cached(filename):
+        path = try_to_load_from_cache(repo_id=name_or_path, filename=filename)
+        return path if isinstance(path, str) and os.path.isfile(path) else None
+
+    try:
+        single = cached(SAFETENSORS_WEIGHTS_NAME)
+        if single:
+            return [single]
+        index = cached(SAFETENSORS_INDEX_NAME)
+        if index:
+            return _shards_from_index(index, cached)
+    except Exception as e:
+        logger.debug(f"Could not resolve cached weights for {name_or_path}: {e}")
+    return []
+
+
+def _shards_from_index(index_path: str, resolve) -> List[str]:
+    with open(index_path) as f:
+        shards = sorted(set(json.load(f).get("weight_map", {}).values()))
+    paths = [resolve(shard) for shard in shards]
+    return paths if all(p and os.path.isfile(p) for p in paths) else []
+
+
+def remap_weights_to_mmap(module, weight_files: List[str]) -> int:
+    """
+    Point a module's CPU parameters and buffers at mmapped safetensors data
+
+    Only tensors whose name, shape and dtype match the file exactly are
+    remapped; anything else (moved to GPU, cast, missing from the file) keeps
+    its in-memory copy. Returns the number of bytes that are now file-backed.
+    """
+    if not TORCH_AVAILABLE or not weight_files:
+        return 0
+
+    mapped = {}
+    for path in weight_files:
+        mapped.update(load_safetensors_mmap(path))
+
+    current = module.state_dict()
+    replacements = {}
+    for name, tensor in current.items():
+        source = mapped.get(name)
+        if (source is not None and tensor.device.type == "cpu"
+                and source.dtype == tensor.dtype and source.shape == tensor.shape):
+            replacements[name] = source
+
+    if not replacements:
+        return 0
+
+    module.load_state_dict(replacements, strict=False, assign=True)
+    # Weights that are tied in memory (e.g. embeddings/LM head) are only stored
+    # once in the file, so re-tie them to the mapped tensor
+    if hasattr(module, "tie_weights"):
+        module.tie_weights()
+
+    return sum(t.numel() * t.element_size() for t in replacements.values())
+
+
+def share_model_weights(model_instance) -> int:
+    """
+    Remap the torch module behind a model wrapper (its `.model`) onto mmapped weights
+
+    Returns bytes remapped; 0 when the model has no CPU torch module or no
+    safetensors file could be found.
+    """
+    if not TORCH_AVAILABLE:
+        return 0
+
+    module = getattr(model_instance, "model", None)
+    if not isinstance(module, torch.nn.Module):
+        return 0
+
+    name_or_path = getattr(module, "name_or_path", None)
+    if not name_or_path and getattr(module, "config", None) is not None:
+        name_or_path = getattr(module.config, "_name_or_path", None)
+
+    weight_files = find_safetensors_files(name_or_path)
+    if not weight_files:
+        return 0
+
+    return remap_weights_to_mmap(module, weight_files)
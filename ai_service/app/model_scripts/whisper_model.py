@@ -6,6 +6,9 @@ import os
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+from ..utils.audio_decoder import AudioDecodeError, decode_audio_native, pcm16_to_float32
+from ..core.tracing import tracer
+
 logger = logging.getLogger(__name__)
 
 class WhisperModel:
@@ -233,6 +236,41 @@ class WhisperModel:
         logger.warning(f"Language '{language}' not in known list, but will attempt transcription")
         return lang_code
     
+    def _encoder_context_frames(self, n_samples: int) -> Optional[int]:
+        """Mel frames to encode for n_samples of 16kHz audio in reduced-context mode, or None for the full 30s"""
+        if not self.settings.streaming_reduced_encoder_context:
+            return None
+        bucket = 2 * max(1, int(round(self.settings.streaming_encoder_bucket_seconds * 50)))  # even, for the stride-2 conv
+        frames = -(-n_samples // 160)
+        n_frames = max(-(-frames // bucket), 1) * bucket
+        return n_frames if n_frames < 3000 else None
+
+    def _encode_reduced_context(self, input_features, n_frames: int):
+        """
+        Whisper encoder forward pass over the first n_frames mel frames only
+
+        transformers' WhisperEncoder rejects inputs other than 3000 frames, so this
+        repeats its forward pass with the positional embeddings sliced to the frames
+        present; generate() then cross-attends to the shorter encoder_outputs.
+        """
+        from transformers.modeling_outputs import BaseModelOutput
+
+        encoder = self.model.get_encoder()
+        hidden_states = torch.nn.functional.gelu(encoder.conv1(input_features[..., :n_frames]))
+        hidden_states = torch.nn.functional.gelu(encoder.conv2(hidden_states)).permute(0, 2, 1)
+        hidden_states = hidden_states + encoder.embed_positions.weight[:hidden_states.shape[1]]
+        for layer in encoder.layers:
+            hidden_states = layer(hidden_states, None, layer_head_mask=None)[0]
+        return BaseModelOutput(last_hidden_state=encoder.layer_norm(hidden_states))
+
+    def _generate_inputs(self, input_features, n_samples: int) -> Dict[str, Any]:
+        """generate() inputs: padded features, or reduced-context encoder outputs for short audio"""
+        n_frames = self._encoder_context_frames(n_samples)
+        if n_frames is None:
+            attention_mask = torch.ones(input_features.shape[:-1], dtype=torch.long, device=input_features.device)
+            return {"input_features": input_features, "attention_mask": attention_mask}
+        return {"encoder_outputs": self._encode_reduced_context(input_features, n_frames)}
+
     def transcribe_audio_file(self, audio_file_path: str, language: Optional[str] = None) -> str:
         """Transcribe audio file to text with support for long audio"""
         if not self.is_loaded:
@@ -241,14 +279,28 @@ class WhisperModel:
         try:
             logger.info(f"Transcribing audio file: {Path(audio_file_path).name}")
 
+            audio_array, sample_rate = librosa.load(audio_file_path, sr=16000, mono=True)
+
+            return self.transcribe_audio_array(audio_array, language)
+
+        except Exception as e:
+            logger.error(f"Transcription failed: {e}")
+            raise RuntimeError(f"Transcription failed: {str(e)}")
+
+    def transcribe_audio_array(self, audio_array, language: Optional[str] = None) -> str:
+        """Transcribe 16kHz mono float32 audio with support for long audio"""
+        if not self.is_loaded:
+            raise RuntimeError("Whisper model not loaded")
+
+        try:
+            sample_rate = 16000
+
             validated_language = self._validate_language(language)
             if validated_language:
                 logger.info(f"Transcribing in: {validated_language} ({self.supported_languages.get(validated_language, 'Unknown')})")
             else:
                 logger.info("Transcribing with auto-detected language")
 
-            audio_array, sample_rate = librosa.load(audio_file_path, sr=16000, mono=True)
-
             duration = len(audio_array) / sample_rate
             logger.info(f"Audio duration: {duration:.1f} seconds")
 
@@ -275,13 +327,14 @@ class WhisperModel:
                     
                     logger.info(f"Processing chunk {chunk_num}/{total_chunks} (time: {chunk_time:.1f}s)")
                     
-                    inputs = self.processor(audio_chunk, sampling_rate=sample_rate, return_tensors="pt")
+                    with tracer.span("feature_extraction", audio_seconds=round(len(audio_chunk) / sample_rate, 3)):
+                        inputs = self.processor(audio_chunk, sampling_rate=sample_rate, return_tensors="pt")
                     input_features = inputs.input_features.to(device=self.device, dtype=self.torch_dtype)
                     
                     attention_mask = torch.ones(input_features.shape[:-1], dtype=torch.long, device=self.device)
                     
                     try:
-                        with torch.no_grad():
+                        with torch.no_grad(), tracer.span("generate"):
                             predicted_ids = self.model.generate(
                                 input_features,
                                 attention_mask=attention_mask,
@@ -301,7 +354,7 @@ class WhisperModel:
                         input_features = input_features.to(device="cpu", dtype=torch.float32)
                         attention_mask = attention_mask.to("cpu")
                         
-                        with torch.no_grad():
+                        with torch.no_grad(), tracer.span("generate"):
                             predicted_ids = self.model.generate(
                                 input_features,
                                 attention_mask=attention_mask,
@@ -322,13 +375,14 @@ class WhisperModel:
             else:
                 logger.info("Short audio detected (<=30s) - using standard transcription")
                 
-                inputs = self.processor(audio_array, sampling_rate=sample_rate, return_tensors="pt")
+                with tracer.span("feature_extraction", audio_seconds=round(len(audio_array) / sample_rate, 3)):
+                    inputs = self.processor(audio_array, sampling_rate=sample_rate, return_tensors="pt")
                 input_features = inputs.input_features.to(device=self.device, dtype=self.torch_dtype)
                 
                 attention_mask = torch.ones(input_features.shape[:-1], dtype=torch.long, device=self.device)
                 
                 try:
-                    with torch.no_grad():
+                    with torch.no_grad(), tracer.span("generate"):
                         predicted_ids = self.model.generate(
                             input_features,
                             attention_mask=attention_mask,
@@ -347,7 +401,7 @@ class WhisperModel:
                     input_features = input_features.to(device="cpu", dtype=torch.float32)
                     attention_mask = attention_mask.to("cpu")
                     
-                    with torch.no_grad():
+                    with torch.no_grad(), tracer.span("generate"):
                         predicted_ids = self.model.generate(
                             input_features,
                             attention_mask=attention_mask,
@@ -375,6 +429,14 @@ class WhisperModel:
         if not self.is_loaded:
             raise RuntimeError("Whisper model not loaded")
 
+        # PBX recordings (GSM, WAV, SLIN) decode in memory without a temp file
+        try:
+            pcm = decode_audio_native(audio_bytes)
+        except AudioDecodeError:
+            pcm = None
+        if pcm is not None and len(pcm):
+            return self.transcribe_audio_array(pcm16_to_float32(pcm), language)
+
         with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_file:
             try:
                 temp_file.write(audio_bytes)
@@ -389,8 +451,9 @@ class WhisperModel:
                 except:
                     pass
     
-    def transcribe_pcm_audio(self, pcm_bytes: bytes, sample_rate: int = 16000, language: Optional[str] = None) -> str:
-        """Transcribe PCM audio data directly from bytes"""
+    def transcribe_pcm_audio(self, pcm_bytes: bytes, sample_rate: int = 16000, language: Optional[str] = None,
+                             num_beams: int = 5) -> str:
+        """Transcribe PCM audio data directly from bytes (num_beams=1 for a cheap greedy decode)"""
         if not self.is_loaded:
             raise RuntimeError("Whisper model not loaded")
 
@@ -416,23 +479,22 @@ class WhisperModel:
 
             if validated_language:
                 generate_kwargs["language"] = validated_language
+            if num_beams > 1:
+                generate_kwargs["early_stopping"] = True
             
-            inputs = self.processor(audio_array, sampling_rate=sample_rate, return_tensors="pt")
+            with tracer.span("feature_extraction", audio_seconds=round(len(audio_array) / sample_rate, 3)):
+                inputs = self.processor(audio_array, sampling_rate=sample_rate, return_tensors="pt")
             input_features = inputs.input_features.to(device=self.device, dtype=self.torch_dtype)
             
-            attention_mask = torch.ones(input_features.shape[:-1], dtype=torch.long, device=self.device)
-            
             try:
-                with torch.no_grad():
+                with torch.no_grad(), tracer.span("generate"):
                     predicted_ids = self.model.generate(
-                        input_features,
-                        attention_mask=attention_mask,
+                        **self._generate_inputs(input_features, len(audio_array)),
                         max_length=448,
-                        num_beams=5,
+                        num_beams=num_beams,
                         repetition_penalty=1.1,
                         no_repeat_ngram_size=3,
                         length_penalty=1.0,
-                        early_stopping=True,
                         do_sample=False,
                         **generate_kwargs
                     )
@@ -443,18 +505,15 @@ class WhisperModel:
                 logger.warning("CUDA out of memory, falling back to CPU...")
                 self.model.to("cpu")
                 input_features = input_features.to(device="cpu", dtype=torch.float32)
-                attention_mask = attention_mask.to("cpu")
                 
-                with torch.no_grad():
+                with torch.no_grad(), tracer.span("generate"):
                     predicted_ids = self.model.generate(
-                        input_features,
-                        attention_mask=attention_mask,
+                        **self._generate_inputs(input_features, len(audio_array)),
                         max_length=448,
-                        num_beams=5,
+                        num_beams=num_beams,
                         repetition_penalty=1.1,
                         no_repeat_ngram_size=3,
                         length_penalty=1.0,
-                        early_stopping=True,
                         do_sample=False,
                         **generate_kwargs
                     )
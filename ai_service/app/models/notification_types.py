@@ -30,6 +30,7 @@ class NotificationType(str, Enum):
 
     # Progressive updates (no results, just progress)
     STREAMING_TRANSCRIPTION_SEGMENT = "streaming_transcription_segment"
+    STREAMING_TRANSCRIPTION_INTERIM = "streaming_transcription_interim"  # is_final=false, replaced by the final
     STREAMING_TRANSLATION_PROGRESS = "streaming_translation_progress"
     STREAMING_PROCESSING_UPDATE = "streaming_processing_update"
 
@@ -172,6 +173,7 @@ LEGACY_ENHANCED_MAPPING: Dict[str, NotificationType] = {
 NOTIFICATION_IMPORTANCE: Dict[NotificationType, NotificationImportance] = {
     # Progress notifications (frequent, no results)
     NotificationType.STREAMING_TRANSCRIPTION_SEGMENT: NotificationImportance.PROGRESS,
+    NotificationType.STREAMING_TRANSCRIPTION_INTERIM: NotificationImportance.PROGRESS,
     NotificationType.STREAMING_TRANSLATION_PROGRESS: NotificationImportance.PROGRESS,
     NotificationType.STREAMING_PROCESSING_UPDATE: NotificationImportance.PROGRESS,
     NotificationType.SYSTEM_PROCESSING_PROGRESS: NotificationImportance.PROGRESS,
@@ -12,8 +12,13 @@ Features:
 - Generates alerts when PII is found
 - Creates audit reports
 
+Lines are analyzed in batches (spaCy/Presidio run through nlp.pipe) after a
+cheap pre-filter, and large files or directories can be sharded across a
+process pool with --workers.
+
 Usage:
     python pii_log_scanner.py --scan /path/to/logs
+    python pii_log_scanner.py --scan /path/to/logs --workers 8
     python pii_log_scanner.py --monitor /path/to/logs --alert-email admin@openchs.org
     python pii_log_scanner.py --redact input.log output.log
 
@@ -27,6 +32,8 @@ import re
 import json
 import logging
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Tuple, Optional
@@ -44,7 +51,7 @@ except ImportError:
 try:
     from presidio_analyzer import AnalyzerEngine, Pattern, PatternRecognizer
     from presidio_anonymizer import AnonymizerEngine
-    from presidio_analyzer.nlp_engine import NlpEngineProvider
+    from presidio_analyzer.nlp_engine import NlpEngineProvider, NlpEngine
     PRESIDIO_AVAILABLE = True
 except ImportError:
     PRESIDIO_AVAILABLE = False
@@ -206,10 +213,38 @@ class KenyanLocationRecognizer(PatternRecognizer):
         )
 
 
+# Lines carrying only technical/system data (no user content)
+_TECHNICAL_LINE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'^[\s\d\-T:\.Z]+$',  # Timestamp only
+        r'^\s*\[?[A-F0-9\-]{36}\]?\s*$',  # UUID only
+        r'^\s*call_id[=:]\s*\d+\s*$',  # call_id assignment
+        r'^\s*task_id[=:]\s*[\w\-]+\s*$',  # task_id assignment
+        r'INFO:.*:Starting|INFO:.*:Completed|INFO:.*:Processing',  # Status logs
+        r'celery.*received|celery.*succeeded',  # Celery task status
+        r'^\s*\d+\s*$',  # Just numbers (IDs)
+    )
+]
+
+PRESIDIO_ENTITIES = [
+    "PERSON", "PHONE_NUMBER", "EMAIL_ADDRESS",
+    "LOCATION", "DATE_TIME", "KENYAN_PHONE",
+    "KENYAN_NAME", "KENYAN_LOCATION"
+]
+
+
 class PIILogScanner:
     """Main PII scanner for log files"""
 
-    def __init__(self, alert_email: str = None, use_presidio: bool = True, use_spacy: bool = True):
+    def __init__(
+        self,
+        alert_email: str = None,
+        use_presidio: bool = True,
+        use_spacy: bool = True,
+        batch_size: int = 256,
+        n_workers: int = 1,
+        shard_bytes: int = 64 * 1024 * 1024
+    ):
         """
         Initialize PII scanner
 
@@ -217,8 +252,14 @@ class PIILogScanner:
             alert_email: Email address to send alerts when PII is detected
             use_presidio: Use Presidio for advanced detection (requires installation)
             use_spacy: Use spaCy NER for entity detection (lightweight alternative)
+            batch_size: Lines per nlp.pipe batch
+            n_workers: Processes used to scan large files and directories
+            shard_bytes: Files larger than this are split into shards of this size
         """
         self.alert_email = alert_email
+        self.batch_size = max(1, batch_size)
+        self.n_workers = max(1, n_workers)
+        self.shard_bytes = max(1, shard_bytes)
         self.detections: List[PIIDetection] = []
         self.use_presidio = use_presidio and PRESIDIO_AVAILABLE
         self.use_spacy = use_spacy and SPACY_AVAILABLE and not self.use_presidio
@@ -332,17 +373,19 @@ class PIILogScanner:
 
     def _analyze_line_spacy(self, line: str) -> List[Dict]:
         """Analyze a line using spaCy NER, focusing on model predictions and user data."""
-        results = []
-
         # Extract text from model predictions and user data fields
-        text_to_analyze = self._extract_text_content(line)
+        text_to_analyze = self._content_for_ner(line)
 
         # Skip if no relevant content found
-        if not text_to_analyze or len(text_to_analyze.strip()) < 3:
-            return results
+        if not text_to_analyze:
+            return []
 
         # Run spaCy NER
-        doc = self.nlp(text_to_analyze)
+        return self._spacy_results(line, self.nlp(text_to_analyze))
+
+    def _spacy_results(self, line: str, doc) -> List[Dict]:
+        """Map a spaCy doc for a line's extracted content to detection results"""
+        results = []
 
         for ent in doc.ents:
             if ent.label_ in self.spacy_entity_types:
@@ -426,24 +469,20 @@ class PIILogScanner:
         # No relevant content fields found - skip this line
         return ""
 
+    def _content_for_ner(self, line: str) -> str:
+        """
+        Cheap pre-filter ahead of NER: the user content of a line, or "" when
+        the line is technical or has no content fields worth analyzing
+        """
+        # Every content field pattern needs a quoted key followed by ':'
+        if "':" not in line or self._is_technical_line(line):
+            return ""
+        text = self._extract_text_content(line)
+        return text if len(text.strip()) >= 3 else ""
+
     def _is_technical_line(self, line: str) -> bool:
         """Check if a line contains only technical/system data (no user content)."""
-        # Patterns for lines we should skip
-        technical_patterns = [
-            r'^[\s\d\-T:\.Z]+$',  # Timestamp only
-            r'^\s*\[?[A-F0-9\-]{36}\]?\s*$',  # UUID only
-            r'^\s*call_id[=:]\s*\d+\s*$',  # call_id assignment
-            r'^\s*task_id[=:]\s*[\w\-]+\s*$',  # task_id assignment
-            r'INFO:.*:Starting|INFO:.*:Completed|INFO:.*:Processing',  # Status logs
-            r'celery.*received|celery.*succeeded',  # Celery task status
-            r'^\s*\d+\s*$',  # Just numbers (IDs)
-        ]
-
-        for pattern in technical_patterns:
-            if re.match(pattern, line, re.IGNORECASE):
-                return True
-
-        return False
+        return any(pattern.match(line) for pattern in _TECHNICAL_LINE_PATTERNS)
 
     def _setup_regex_analyzer(self):
         """Setup regex-based analyzer (fallback when Presidio not available)"""
@@ -509,22 +548,21 @@ class PIILogScanner:
     def _analyze_line_presidio(self, line: str) -> List[Dict]:
         """Analyze a line using Presidio, focusing on model predictions and user data."""
         # Extract only relevant content (predictions, transcripts, etc.)
-        text_to_analyze = self._extract_text_content(line)
+        text_to_analyze = self._content_for_ner(line)
 
         # Skip if no relevant content found
-        if not text_to_analyze or len(text_to_analyze.strip()) < 3:
+        if not text_to_analyze:
             return []
 
         results = self.analyzer.analyze(
             text=text_to_analyze,
-            entities=[
-                "PERSON", "PHONE_NUMBER", "EMAIL_ADDRESS",
-                "LOCATION", "DATE_TIME", "KENYAN_PHONE",
-                "KENYAN_NAME", "KENYAN_LOCATION"
-            ],
+            entities=PRESIDIO_ENTITIES,
             language='en'
         )
+        return self._presidio_results(line, text_to_analyze, results)
 
+    def _presidio_results(self, line: str, text_to_analyze: str, results) -> List[Dict]:
+        """Map Presidio results on a line's extracted content back to the line"""
         # Extract entity text from the analyzed content and find position in original line
         parsed_results = []
         for r in results:
@@ -559,6 +597,122 @@ class PIILogScanner:
                 })
         return results
 
+    def analyze_line(self, line: str) -> List[Dict]:
+        """Analyze a single line with the configured backend"""
+        if self.use_presidio:
+            return self._analyze_line_presidio(line)
+        elif self.use_spacy:
+            return self._analyze_line_spacy(line)
+        return self._analyze_line_regex(line)
+
+    def _presidio_nlp_artifacts(self, texts: List[str]) -> List:
+        """
+        Run Presidio's spaCy pipeline over a batch of texts with nlp.pipe
+
+        Returns one NlpArtifacts per text, or None entries when the analyzer
+        has no batchable NLP engine (it then processes each text itself).
+        """
+        nlp_engine = getattr(self.analyzer, 'nlp_engine', None)
+        if not (PRESIDIO_AVAILABLE and isinstance(nlp_engine, NlpEngine)):
+            return [None] * len(texts)
+        return [
+            artifacts for _, artifacts in
+            nlp_engine.process_batch(texts, language='en', batch_size=self.batch_size)
+        ]
+
+    def analyze_lines(self, lines: List[str]) -> List[List[Dict]]:
+        """
+        Analyze a batch of lines with the configured backend
+
+        Lines without user content are filtered out before NER, and the
+        survivors go through the NLP pipeline together. Results are
+        identical to calling analyze_line on each line.
+        """
+        if not (self.use_presidio or self.use_spacy):
+            return [self._analyze_line_regex(line) for line in lines]
+
+        results: List[List[Dict]] = [[] for _ in lines]
+        candidates = []
+        texts = []
+        for i, line in enumerate(lines):
+            text = self._content_for_ner(line)
+            if text:
+                candidates.append(i)
+                texts.append(text)
+
+        if not texts:
+            return results
+
+        if self.use_presidio:
+            for i, text, nlp_artifacts in zip(candidates, texts, self._presidio_nlp_artifacts(texts)):
+                found = self.analyzer.analyze(
+                    text=text,
+                    entities=PRESIDIO_ENTITIES,
+                    language='en',
+                    nlp_artifacts=nlp_artifacts
+                )
+                results[i] = self._presidio_results(lines[i], text, found)
+        else:
+            for i, doc in zip(candidates, self.nlp.pipe(texts, batch_size=self.batch_size)):
+                results[i] = self._spacy_results(lines[i], doc)
+
+        return results
+
+    def _scan_line(self, line: str, log_file: Path, line_num: int) -> bool:
+        """
+        Analyze one line and record its detections
+
+        Returns:
+            True if the line contains PII
+        """
+        return self._record_results(line, self.analyze_line(line), log_file, line_num)
+
+    def _scan_lines(self, lines: List[str], log_file: Path, first_line_num: int) -> int:
+        """
+        Analyze a batch of consecutive lines and record their detections
+
+        Returns:
+            Number of lines containing PII
+        """
+        lines_with_pii = 0
+        for offset, (line, results) in enumerate(zip(lines, self.analyze_lines(lines))):
+            if self._record_results(line, results, log_file, first_line_num + offset):
+                lines_with_pii += 1
+        return lines_with_pii
+
+    def _record_results(self, line: str, results: List[Dict], log_file: Path, line_num: int) -> bool:
+        """Record detections for one analyzed line; True if it contains PII"""
+        if not results:
+            return False
+
+        # Record each detection
+        for result in results:
+            # Use pre-extracted text if available, otherwise extract from line
+            entity_text = result.get('text', line[result['start']:result['end']])
+
+            # Get context (50 chars before and after)
+            context_start = max(0, result['start'] - 50)
+            context_end = min(len(line), result['end'] + 50)
+            context = line[context_start:context_end].strip()
+
+            detection = PIIDetection(
+                timestamp=datetime.now().isoformat(),
+                log_file=str(log_file),
+                line_number=line_num,
+                entity_type=result['entity_type'],
+                entity_text=entity_text,
+                confidence=result['score'],
+                context=context
+            )
+            self.detections.append(detection)
+
+            self.logger.warning(
+                f"PII detected in {log_file.name}:{line_num} - "
+                f"{result['entity_type']}: {entity_text[:20]}... "
+                f"(confidence: {result['score']:.2f})"
+            )
+        return True
+
     def scan_log_file(self, log_file: Path) -> Tuple[int, int]:
         """
         Scan a single log file for PII
@@ -571,57 +725,149 @@ class PIILogScanner:
         """
         self.logger.info(f"Scanning: {log_file}")
 
+        if self.n_workers > 1:
+            try:
+                large = log_file.stat().st_size > self.shard_bytes
+            except OSError:
+                large = False
+            if large:
+                return self.scan_files_parallel([log_file])[log_file]
+
         total_lines = 0
         lines_with_pii = 0
 
         try:
             with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                for line_num, line in enumerate(f, 1):
-                    total_lines += 1
-
-                    # Analyze line for PII
-                    if self.use_presidio:
-                        results = self._analyze_line_presidio(line)
-                    elif self.use_spacy:
-                        results = self._analyze_line_spacy(line)
-                    else:
-                        results = self._analyze_line_regex(line)
-
-                    if results:
-                        lines_with_pii += 1
-
-                        # Record each detection
-                        for result in results:
-                            # Use pre-extracted text if available, otherwise extract from line
-                            entity_text = result.get('text', line[result['start']:result['end']])
-
-                            # Get context (50 chars before and after)
-                            context_start = max(0, result['start'] - 50)
-                            context_end = min(len(line), result['end'] + 50)
-                            context = line[context_start:context_end].strip()
-
-                            detection = PIIDetection(
-                                timestamp=datetime.now().isoformat(),
-                                log_file=str(log_file),
-                                line_number=line_num,
-                                entity_type=result['entity_type'],
-                                entity_text=entity_text,
-                                confidence=result['score'],
-                                context=context
-                            )
-                            self.detections.append(detection)
+                while True:
+                    batch = list(islice(f, self.batch_size))
+                    if not batch:
+                        break
 
-                            self.logger.warning(
-                                f"PII detected in {log_file.name}:{line_num} - "
-                                f"{result['entity_type']}: {entity_text[:20]}... "
-                                f"(confidence: {result['score']:.2f})"
-                            )
+                    # Analyze batch for PII
+                    lines_with_pii += self._scan_lines(batch, log_file, total_lines + 1)
+                    total_lines += len(batch)
 
         except Exception as e:
             self.logger.error(f"Error scanning {log_file}: {e}")
 
         return total_lines, lines_with_pii
 
+    def scan_log_file_from(
+        self,
+        log_file: Path,
+        offset: int = 0,
+        start_line: int = 0,
+        chunk_size: int = 1024 * 1024,
+        end: Optional[int] = None,
+        include_partial: bool = False
+    ) -> Tuple[int, int, int]:
+        """
+        Scan only the complete lines appended after a byte offset
+
+        A trailing line without a newline is left for the next scan, since
+        the writer may still be in the middle of it.
+
+        Args:
+            log_file: Path to log file
+            offset: Byte offset to resume from
+            start_line: Number of lines before offset (for detection line numbers)
+            chunk_size: Bytes read per iteration
+            end: Byte offset to stop at (default: end of file)
+            include_partial: Also scan a trailing line without a newline
+
+        Returns:
+            Tuple of (lines_scanned, lines_with_pii, new_offset)
+        """
+        total_lines = 0
+        lines_with_pii = 0
+
+        with open(log_file, 'rb') as f:
+            f.seek(offset)
+            position = offset
+            pending = b""
+            while end is None or position < end:
+                read_size = chunk_size if end is None else min(chunk_size, end - position)
+                chunk = f.read(read_size)
+                if not chunk:
+                    break
+                position += len(chunk)
+                pending += chunk
+                *complete, pending = pending.split(b"\n")
+                for start in range(0, len(complete), self.batch_size):
+                    raw_lines = complete[start:start + self.batch_size]
+                    batch = [self._decode_line(raw_line) + "\n" for raw_line in raw_lines]
+                    lines_with_pii += self._scan_lines(batch, log_file, start_line + total_lines + 1)
+                    total_lines += len(batch)
+                    offset += sum(len(raw_line) + 1 for raw_line in raw_lines)
+
+            if include_partial and pending:
+                if self._scan_lines([self._decode_line(pending)], log_file, start_line + total_lines + 1):
+                    lines_with_pii += 1
+                total_lines += 1
+                offset += len(pending)
+
+        return total_lines, lines_with_pii, offset
+
+    @staticmethod
+    def _decode_line(raw_line: bytes) -> str:
+        """Decode a raw line the way text-mode reading would (CRLF -> LF)"""
+        if raw_line.endswith(b"\r"):
+            raw_line = raw_line[:-1]
+        return raw_line.decode('utf-8', errors='ignore')
+
+    def scan_files_parallel(self, log_files: List[Path]) -> Dict[Path, Tuple[int, int]]:
+        """
+        Scan files across a process pool, splitting large files into shards
+
+        Shards are merged back in submission order, so detections come out in
+        file and line order with the same line numbers as a sequential scan.
+
+        Args:
+            log_files: Log files to scan
+
+        Returns:
+            Dict mapping each file to (total_lines, lines_with_pii)
+        """
+        results: Dict[Path, Tuple[int, int]] = {}
+        jobs = []
+        for log_file in log_files:
+            results[log_file] = (0, 0)
+            try:
+                shards = _plan_shards(log_file, self.shard_bytes)
+            except OSError as e:
+                self.logger.error(f"Error scanning {log_file}: {e}")
+                continue
+            jobs.extend((log_file, start, end) for start, end in shards)
+
+        if not jobs:
+            return results
+
+        self.logger.info(f"Scanning {len(log_files)} file(s) as {len(jobs)} shard(s) on {self.n_workers} workers")
+
+        with ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            initializer=_init_scan_worker,
+            initargs=(self.use_presidio, self.use_spacy, self.batch_size)
+        ) as pool:
+            futures = [pool.submit(_scan_shard, str(log_file), start, end) for log_file, start, end in jobs]
+
+            for (log_file, _, _), future in zip(jobs, futures):
+                try:
+                    lines, lines_with_pii, detections = future.result()
+                except Exception as e:
+                    self.logger.error(f"Error scanning {log_file}: {e}")
+                    continue
+
+                # Shard line numbers start at 1; shift them past earlier shards
+                lines_before, pii_before = results[log_file]
+                for detection in detections:
+                    detection.line_number += lines_before
+                    detection.log_file = str(log_file)
+                self.detections.extend(detections)
+                results[log_file] = (lines_before + lines, pii_before + lines_with_pii)
+
+        return results
+
     def scan_directory(self, log_dir: Path, pattern: str = "*.log") -> ScanResult:
         """
         Scan all log files in a directory
@@ -648,8 +894,13 @@ class PIILogScanner:
         total_lines_with_pii = 0
         high_risk_files = []
 
+        if self.n_workers > 1:
+            file_results = self.scan_files_parallel(log_files)
+        else:
+            file_results = {log_file: self.scan_log_file(log_file) for log_file in log_files}
+
         for log_file in log_files:
-            lines, lines_with_pii = self.scan_log_file(log_file)
+            lines, lines_with_pii = file_results[log_file]
             total_lines += lines
             total_lines_with_pii += lines_with_pii
 
@@ -709,48 +960,51 @@ class PIILogScanner:
         with open(input_file, 'r', encoding='utf-8', errors='ignore') as infile, \
              open(output_file, 'w', encoding='utf-8') as outfile:
 
-            for line in infile:
+            while True:
+                batch = list(islice(infile, self.batch_size))
+                if not batch:
+                    break
+
                 if self.use_presidio:
-                    # Analyze line
-                    results = self.analyzer.analyze(
-                        text=line,
-                        entities=[
-                            "PERSON", "PHONE_NUMBER", "EMAIL_ADDRESS",
-                            "LOCATION", "DATE_TIME", "KENYAN_PHONE",
-                            "KENYAN_NAME", "KENYAN_LOCATION"
-                        ],
-                        language='en'
-                    )
-
-                    if results:
-                        # Anonymize the line
-                        anonymized = self.anonymizer.anonymize(
+                    # Analyze whole lines, running the NLP pipeline over the batch at once
+                    for line, nlp_artifacts in zip(batch, self._presidio_nlp_artifacts(batch)):
+                        results = self.analyzer.analyze(
                             text=line,
-                            analyzer_results=results
+                            entities=PRESIDIO_ENTITIES,
+                            language='en',
+                            nlp_artifacts=nlp_artifacts
                         )
-                        outfile.write(anonymized.text)
-                        lines_redacted += 1
-                    else:
-                        outfile.write(line)
+
+                        if results:
+                            # Anonymize the line
+                            anonymized = self.anonymizer.anonymize(
+                                text=line,
+                                analyzer_results=results
+                            )
+                            outfile.write(anonymized.text)
+                            lines_redacted += 1
+                        else:
+                            outfile.write(line)
                 elif self.use_spacy:
                     # spaCy-based redaction
-                    results = self._analyze_line_spacy(line)
-                    if results:
-                        redacted_line = self._redact_by_positions(line, results)
-                        outfile.write(redacted_line)
-                        lines_redacted += 1
-                    else:
-                        outfile.write(line)
+                    for line, results in zip(batch, self.analyze_lines(batch)):
+                        if results:
+                            redacted_line = self._redact_by_positions(line, results)
+                            outfile.write(redacted_line)
+                            lines_redacted += 1
+                        else:
+                            outfile.write(line)
                 else:
                     # Regex-based redaction
-                    redacted_line = line
-                    for pattern, entity_type in self.regex_patterns:
-                        redacted_line = pattern.sub(f'[REDACTED-{entity_type}]', redacted_line)
+                    for line in batch:
+                        redacted_line = line
+                        for pattern, entity_type in self.regex_patterns:
+                            redacted_line = pattern.sub(f'[REDACTED-{entity_type}]', redacted_line)
 
-                    if redacted_line != line:
-                        lines_redacted += 1
+                        if redacted_line != line:
+                            lines_redacted += 1
 
-                    outfile.write(redacted_line)
+                        outfile.write(redacted_line)
 
         self.logger.info(f"Redacted {lines_redacted} lines")
         return lines_redacted
@@ -856,6 +1110,45 @@ This is an automated alert from the PII scanning system.
             self.logger.info(f"Alert would be sent to: {self.alert_email}")
 
 
+# Scanner owned by each process-pool worker, built once by _init_scan_worker
+_worker_scanner: Optional[PIILogScanner] = None
+
+
+def _init_scan_worker(use_presidio: bool, use_spacy: bool, batch_size: int):
+    """Process-pool initializer: load the analyzer once per worker"""
+    global _worker_scanner
+    _worker_scanner = PIILogScanner(use_presidio=use_presidio, use_spacy=use_spacy, batch_size=batch_size)
+
+
+def _scan_shard(log_file: str, start: int, end: int) -> Tuple[int, int, List[PIIDetection]]:
+    """Scan bytes [start, end) of a file in a worker; line numbers are shard-relative"""
+    scanner = _worker_scanner
+    scanner.detections = []
+    lines, lines_with_pii, _ = scanner.scan_log_file_from(
+        Path(log_file), start, end=end, include_partial=True
+    )
+    return lines, lines_with_pii, scanner.detections
+
+
+def _plan_shards(log_file: Path, shard_bytes: int) -> List[Tuple[int, int]]:
+    """Split a file into byte ranges of about shard_bytes, each ending on a line boundary"""
+    size = log_file.stat().st_size
+    shards = []
+    start = 0
+    with open(log_file, 'rb') as f:
+        while start < size:
+            end = start + shard_bytes
+            if end >= size:
+                end = size
+            else:
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            shards.append((start, end))
+            start = end
+    return shards
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(
@@ -866,6 +1159,9 @@ Examples:
   # Scan a directory
   python pii_log_scanner.py --scan /var/log/openchs/
 
+  # Scan large logs on 8 processes
+  python pii_log_scanner.py --scan /var/log/openchs/ --workers 8
+
   # Scan with specific pattern
   python pii_log_scanner.py --scan /var/log/openchs/ --pattern "celery*.log"
 
@@ -907,6 +1203,18 @@ Examples:
         action='store_true',
         help='Use regex-only detection (faster, less accurate)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Processes used to scan files and shards of large files (default: 1)'
+    )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=256,
+        help='Lines per NLP batch (default: 256)'
+    )
 
     args = parser.parse_args()
 
@@ -918,7 +1226,9 @@ Examples:
     # Initialize scanner
     scanner = PIILogScanner(
         alert_email=args.alert_email,
-        use_presidio=not args.no_presidio
+        use_presidio=not args.no_presidio,
+        batch_size=args.batch_size,
+        n_workers=args.workers
     )
 
     if args.scan:
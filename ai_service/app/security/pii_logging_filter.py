@@ -10,7 +10,11 @@ Features:
 - Redacts common Kenyan/Swahili names
 - Redacts location patterns
 - Fast regex-based detection (no external dependencies)
-- Thread-safe with LRU cache
+- Thread-safe with a bounded per-filter LRU cache
+
+All patterns are compiled into a single scanner (the name and location
+lexicons as prefix tries) and redacted in one left-to-right pass over the
+formatted message.
 
 Usage:
     import logging
@@ -28,10 +32,132 @@ Usage:
 
 import re
 import logging
-from typing import Dict, List, Tuple
-from functools import lru_cache
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
 
+# An opening parenthesis that starts a capturing group
+_CAPTURING_GROUP = re.compile(r'(?<!\\)\((?!\?)')
+
+# Extra passes allowed for messages that had PII
+_MAX_RESCANS = 3
+
+# Common Kenyan/Swahili names (comprehensive list)
+COMMON_NAMES = [
+    # Kikuyu names
+    'Wanjiru', 'Kamau', 'Njeri', 'Mwangi', 'Wanjiku', 'Karanja', 'Njoroge',
+    'Wairimu', 'Nyambura', 'Muthoni', 'Wambui', 'Mumbi', 'Wangari', 'Njoki',
+    'Gathoni', 'Nyokabi', 'Gitau', 'Kiarie', 'Kimani', 'Kariuki', 'Macharia',
+    # Luo names
+    'Otieno', 'Akinyi', 'Omondi', 'Adhiambo', 'Ochieng', 'Awino', 'Oduor',
+    'Onyango', 'Akoth', 'Owino', 'Auma', 'Odhiambo', 'Anyango', 'Atieno',
+    # Kalenjin names
+    'Chebet', 'Kiplagat', 'Rotich', 'Kibet', 'Jepkorir', 'Kosgei', 'Kipruto',
+    'Chepkoech', 'Kipchoge', 'Kiptoo', 'Cherono', 'Tanui', 'Kimutai',
+    # Luhya names
+    'Wekesa', 'Nafula', 'Simiyu', 'Nekesa', 'Wasike', 'Wanyama', 'Barasa',
+    'Makokha', 'Wafula', 'Nasimiyu', 'Khisa', 'Masinde',
+    # Kamba names
+    'Mutua', 'Mwende', 'Musyoka', 'Ndinda', 'Kioko', 'Muthama', 'Kilonzo',
+    'Musau', 'Nthenya', 'Wambua', 'Mutinda', 'Kavata',
+    # Coastal/Swahili names
+    'Mwanaisha', 'Bakari', 'Hamisi', 'Fatuma', 'Salim', 'Amina', 'Hassan',
+    'Zainab', 'Omar', 'Khadija', 'Mohamed', 'Aisha', 'Yusuf', 'Halima',
+    # Common English names used in Kenya
+    'John', 'Mary', 'Peter', 'Grace', 'James', 'Jane', 'David', 'Sarah',
+    'Michael', 'Elizabeth', 'Daniel', 'Margaret', 'Joseph', 'Anne',
+    # Titles that might indicate names follow
+    'Mama', 'Baba', 'Mzee', 'Bibi',
+]
+
+# Common Kenyan location patterns (counties, major towns)
+KENYAN_LOCATIONS = [
+    # Major cities
+    'Nairobi', 'Mombasa', 'Kisumu', 'Nakuru', 'Eldoret', 'Thika', 'Malindi',
+    'Kitale', 'Garissa', 'Kakamega', 'Nyeri', 'Meru', 'Embu', 'Machakos',
+    # Counties
+    'Kiambu', 'Kajiado', 'Narok', 'Turkana', 'Samburu', 'Kilifi', 'Kwale',
+    'Taita', 'Taveta', 'Lamu', 'Tana River', 'Isiolo', 'Marsabit', 'Wajir',
+    'Mandera', 'Moyale', 'Busia', 'Siaya', 'Homa Bay', 'Migori', 'Kisii',
+    'Nyamira', 'Bomet', 'Kericho', 'Nandi', 'Uasin Gishu', 'Trans Nzoia',
+    'Elgeyo Marakwet', 'Baringo', 'Laikipia', 'Nyandarua', 'Kirinyaga',
+    'Muranga', 'Tharaka Nithi', 'Kitui', 'Makueni', 'Vihiga', 'Bungoma',
+    # Neighborhoods/Areas
+    'Kibera', 'Mathare', 'Eastleigh', 'Westlands', 'Karen', 'Langata',
+    'Kasarani', 'Embakasi', 'Dagoretti', 'Ruaraka', 'Starehe', 'Makadara',
+    'Kamukunji', 'Roysambu', 'Githurai', 'Ruiru', 'Juja', 'Limuru',
+]
+
+
+def _lexicon_regex(words: Iterable[str]) -> str:
+    """
+    Build a regex matching any of the words, factored into a prefix trie
+
+    "Kamau|Kamukunji|Karen" becomes "Ka(?:m(?:au|ukunji)|ren)", so the regex
+    engine follows one branch per character instead of trying every word.
+    Longer continuations are tried first, so the longest word ending on a
+    word boundary wins.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word.lower():
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        branches = []
+        for char in sorted((c for c in node if c), reverse=True):
+            branches.append(re.escape(char) + build(node[char]))
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            body = '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+class _BoundedCache:
+    """Thread-safe LRU cache for sanitized messages, owned by one filter"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: str):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
 
 class PIISanitizingFilter(logging.Filter):
     """
@@ -46,16 +172,26 @@ class PIISanitizingFilter(logging.Filter):
     - Thread-safe
     """
 
-    def __init__(self, name: str = '', enable_stats: bool = True):
+    def __init__(
+        self,
+        name: str = '',
+        enable_stats: bool = True,
+        cache_size: int = 2048,
+        cache_max_length: int = 1024
+    ):
         """
         Initialize PII sanitizing filter
 
         Args:
             name: Filter name (optional)
             enable_stats: Track redaction statistics
+            cache_size: Maximum number of sanitized messages cached
+            cache_max_length: Messages longer than this are not cached
         """
         super().__init__(name)
         self._compile_patterns()
+        self._cache = _BoundedCache(cache_size)
+        self.cache_max_length = cache_max_length
         self.enable_stats = enable_stats
         self.redaction_count = 0
         self.messages_processed = 0
@@ -79,36 +215,8 @@ class PIISanitizingFilter(logging.Filter):
             '[REDACTED-EMAIL]'
         )
 
-        # Common Kenyan/Swahili names (comprehensive list)
-        common_names = [
-            # Kikuyu names
-            'Wanjiru', 'Kamau', 'Njeri', 'Mwangi', 'Wanjiku', 'Karanja', 'Njoroge',
-            'Wairimu', 'Nyambura', 'Muthoni', 'Wambui', 'Mumbi', 'Wangari', 'Njoki',
-            'Gathoni', 'Nyokabi', 'Gitau', 'Kiarie', 'Kimani', 'Kariuki', 'Macharia',
-            # Luo names
-            'Otieno', 'Akinyi', 'Omondi', 'Adhiambo', 'Ochieng', 'Awino', 'Oduor',
-            'Onyango', 'Akoth', 'Owino', 'Auma', 'Odhiambo', 'Anyango', 'Atieno',
-            # Kalenjin names
-            'Chebet', 'Kiplagat', 'Rotich', 'Kibet', 'Jepkorir', 'Kosgei', 'Kipruto',
-            'Chepkoech', 'Kipchoge', 'Kiptoo', 'Cherono', 'Tanui', 'Kimutai',
-            # Luhya names
-            'Wekesa', 'Nafula', 'Simiyu', 'Nekesa', 'Wasike', 'Wanyama', 'Barasa',
-            'Makokha', 'Wafula', 'Nasimiyu', 'Khisa', 'Masinde',
-            # Kamba names
-            'Mutua', 'Mwende', 'Musyoka', 'Ndinda', 'Kioko', 'Muthama', 'Kilonzo',
-            'Musau', 'Nthenya', 'Wambua', 'Mutinda', 'Kavata',
-            # Coastal/Swahili names
-            'Mwanaisha', 'Bakari', 'Hamisi', 'Fatuma', 'Salim', 'Amina', 'Hassan',
-            'Zainab', 'Omar', 'Khadija', 'Mohamed', 'Aisha', 'Yusuf', 'Halima',
-            # Common English names used in Kenya
-            'John', 'Mary', 'Peter', 'Grace', 'James', 'Jane', 'David', 'Sarah',
-            'Michael', 'Elizabeth', 'Daniel', 'Margaret', 'Joseph', 'Anne',
-            # Titles that might indicate names follow
-            'Mama', 'Baba', 'Mzee', 'Bibi',
-        ]
-
-        # Build regex pattern (case-insensitive word boundaries)
-        name_pattern = r'\b(' + '|'.join(re.escape(name) for name in common_names) + r')\b'
+        # Common Kenyan/Swahili names, case-insensitive on word boundaries
+        name_pattern = r'\b(' + _lexicon_regex(COMMON_NAMES) + r')\b'
         self.name_pattern: Tuple[re.Pattern, str] = (
             re.compile(name_pattern, re.IGNORECASE),
             '[REDACTED-NAME]'
@@ -121,23 +229,7 @@ class PIISanitizingFilter(logging.Filter):
         )
 
         # Common Kenyan location patterns (counties, major towns)
-        locations = [
-            # Major cities
-            'Nairobi', 'Mombasa', 'Kisumu', 'Nakuru', 'Eldoret', 'Thika', 'Malindi',
-            'Kitale', 'Garissa', 'Kakamega', 'Nyeri', 'Meru', 'Embu', 'Machakos',
-            # Counties
-            'Kiambu', 'Kajiado', 'Narok', 'Turkana', 'Samburu', 'Kilifi', 'Kwale',
-            'Taita', 'Taveta', 'Lamu', 'Tana River', 'Isiolo', 'Marsabit', 'Wajir',
-            'Mandera', 'Moyale', 'Busia', 'Siaya', 'Homa Bay', 'Migori', 'Kisii',
-            'Nyamira', 'Bomet', 'Kericho', 'Nandi', 'Uasin Gishu', 'Trans Nzoia',
-            'Elgeyo Marakwet', 'Baringo', 'Laikipia', 'Nyandarua', 'Kirinyaga',
-            'Muranga', 'Tharaka Nithi', 'Kitui', 'Makueni', 'Vihiga', 'Bungoma',
-            # Neighborhoods/Areas
-            'Kibera', 'Mathare', 'Eastleigh', 'Westlands', 'Karen', 'Langata',
-            'Kasarani', 'Embakasi', 'Dagoretti', 'Ruaraka', 'Starehe', 'Makadara',
-            'Kamukunji', 'Roysambu', 'Githurai', 'Ruiru', 'Juja', 'Limuru',
-        ]
-        location_pattern = r'\b(' + '|'.join(re.escape(loc) for loc in locations) + r')\b'
+        location_pattern = r'\b(' + _lexicon_regex(KENYAN_LOCATIONS) + r')\b'
         self.location_pattern: Tuple[re.Pattern, str] = (
             re.compile(location_pattern, re.IGNORECASE),
             '[REDACTED-LOCATION]'
@@ -157,12 +249,53 @@ class PIISanitizingFilter(logging.Filter):
             '[REDACTED-AGE]'
         )
 
-    @lru_cache(maxsize=2048)
+        self._compile_combined_pattern()
+
+    def _compile_combined_pattern(self):
+        """
+        Combine all redaction patterns into one alternation with named groups
+
+        Alternatives keep the old priority order (phones, email, names,
+        locations, ages) for matches starting at the same position. The ID
+        pattern stays out to avoid false positives with task IDs and timestamps.
+        """
+        groups = [
+            ('phone', [pattern for pattern, _ in self.phone_patterns], self.phone_patterns[0][1]),
+            ('email', [self.email_pattern[0]], self.email_pattern[1]),
+            ('name', [self.name_pattern[0]], self.name_pattern[1]),
+            ('location', [self.location_pattern[0]], self.location_pattern[1]),
+            ('age', [self.age_pattern[0]], self.age_pattern[1]),
+        ]
+        alternatives = []
+        self._replacements: Dict[str, str] = {}
+        for group, patterns, replacement in groups:
+            parts = []
+            for pattern in patterns:
+                # Inner groups become non-capturing so lastgroup names the category
+                source = _CAPTURING_GROUP.sub('(?:', pattern.pattern)
+                if pattern.flags & re.IGNORECASE:
+                    source = f'(?i:{source})'
+                parts.append(source)
+            alternatives.append(f'(?P<{group}>' + '|'.join(parts) + ')')
+            self._replacements[group] = replacement
+
+        # Every alternative starts on a word boundary or at '+' (or an email's
+        # leading punctuation), so positions inside a word are rejected with a
+        # single check before any branch is tried
+        self.combined_pattern: re.Pattern = re.compile(
+            r'(?:(?<!\w)|(?=[+.%\-]))(?:' + '|'.join(alternatives) + ')'
+        )
+
+    def _redact(self, match: re.Match) -> str:
+        return self._replacements[match.lastgroup]
+
     def _sanitize_text(self, text: str) -> str:
         """
         Sanitize text by redacting PII
 
-        Uses LRU cache for performance on repeated messages.
+        One left-to-right pass of the combined pattern (clean messages never
+        need more); repeated messages are served from the filter's bounded
+        LRU cache.
 
         Args:
             text: Original log message
@@ -173,56 +306,36 @@ class PIISanitizingFilter(logging.Filter):
         if not text or not isinstance(text, str):
             return text
 
-        sanitized = text
-        had_pii = False
-
-        # Redact phone numbers (high priority - most sensitive)
-        for pattern, replacement in self.phone_patterns:
-            if pattern.search(sanitized):
-                sanitized = pattern.sub(replacement, sanitized)
-                had_pii = True
-
-        # Redact emails
-        pattern, replacement = self.email_pattern
-        if pattern.search(sanitized):
-            sanitized = pattern.sub(replacement, sanitized)
-            had_pii = True
-
-        # Redact names
-        pattern, replacement = self.name_pattern
-        if pattern.search(sanitized):
-            sanitized = pattern.sub(replacement, sanitized)
-            had_pii = True
-
-        # Redact locations (lower priority - context dependent)
-        pattern, replacement = self.location_pattern
-        if pattern.search(sanitized):
-            sanitized = pattern.sub(replacement, sanitized)
-            had_pii = True
-
-        # Redact ages
-        pattern, replacement = self.age_pattern
-        if pattern.search(sanitized):
-            sanitized = pattern.sub(replacement, sanitized)
-            had_pii = True
-
-        # Note: ID pattern commented out to avoid false positives with task IDs, timestamps
-        # Uncomment if needed:
-        # pattern, replacement = self.id_pattern
-        # if pattern.search(sanitized):
-        #     sanitized = pattern.sub(replacement, sanitized)
-        #     had_pii = True
+        cacheable = len(text) <= self.cache_max_length
+        if cacheable:
+            cached = self._cache.get(text)
+            if cached is not None:
+                return cached
+
+        sanitized, redactions = self.combined_pattern.subn(self._redact, text)
+        if redactions:
+            # A redaction token can open a new word boundary ("+2547...Wanjiru"),
+            # so a message that had PII is re-scanned until nothing changes
+            for _ in range(_MAX_RESCANS):
+                sanitized, found = self.combined_pattern.subn(self._redact, sanitized)
+                if not found:
+                    break
 
         # Update stats
-        if self.enable_stats and had_pii:
+        if self.enable_stats and redactions:
             self.redaction_count += 1
 
+        if cacheable:
+            self._cache.put(text, sanitized)
         return sanitized
 
     def filter(self, record: logging.LogRecord) -> bool:
         """
         Filter method called by Python logging system
 
+        The message is formatted with its args once and the result is
+        sanitized, so PII is caught whether it sits in msg or in args.
+
         Args:
             record: Log record to process
 
@@ -232,7 +345,21 @@ class PIISanitizingFilter(logging.Filter):
         if self.enable_stats:
             self.messages_processed += 1
 
-        original_msg = None
+        if getattr(record, 'args', None):
+            try:
+                message = record.getMessage()
+            except Exception:
+                # Leave the formatting error to the handler, but still redact the parts
+                message = None
+            if isinstance(message, str):
+                sanitized = self._sanitize_text(message)
+                record.msg = sanitized
+                record.args = None
+                if self.enable_stats and sanitized != message:
+                    self.messages_with_pii += 1
+                return True
+            self._sanitize_msg_and_args(record)
+            return True
 
         # Sanitize the message
         if hasattr(record, 'msg') and isinstance(record.msg, str):
@@ -242,6 +369,16 @@ class PIISanitizingFilter(logging.Filter):
             if self.enable_stats and record.msg != original_msg:
                 self.messages_with_pii += 1
 
+        return True
+
+    def _sanitize_msg_and_args(self, record: logging.LogRecord):
+        """Sanitize msg and each string arg separately, for records that cannot be formatted"""
+        if isinstance(record.msg, str):
+            original_msg = record.msg
+            record.msg = self._sanitize_text(record.msg)
+            if self.enable_stats and record.msg != original_msg:
+                self.messages_with_pii += 1
+
         # Sanitize args if present (for format strings like "Hello %s")
         if hasattr(record, 'args') and record.args:
             if isinstance(record.args, dict):
@@ -261,12 +398,9 @@ class PIISanitizingFilter(logging.Filter):
                         sanitized_args.append(arg)
                 record.args = tuple(sanitized_args)
 
-        return True
-
     def get_stats(self) -> Dict:
         """Get statistics about redactions"""
         uptime = (datetime.now() - self._start_time).total_seconds()
-        cache_info = self._sanitize_text.cache_info()
 
         return {
             'total_messages': self.messages_processed,
@@ -274,15 +408,15 @@ class PIISanitizingFilter(logging.Filter):
             'pii_percentage': (self.messages_with_pii / self.messages_processed * 100) if self.messages_processed > 0 else 0,
             'total_redactions': self.redaction_count,
             'uptime_seconds': uptime,
-            'cache_hits': cache_info.hits,
-            'cache_misses': cache_info.misses,
-            'cache_size': cache_info.currsize,
-            'cache_maxsize': cache_info.maxsize,
+            'cache_hits': self._cache.hits,
+            'cache_misses': self._cache.misses,
+            'cache_size': len(self._cache),
+            'cache_maxsize': self._cache.maxsize,
         }
 
     def clear_cache(self):
         """Clear the LRU cache (useful for testing)"""
-        self._sanitize_text.cache_clear()
+        self._cache.clear()
 
 
 def setup_sanitized_logging(
@@ -5,16 +5,25 @@ Continuous PII Monitoring Service for OpenCHS
 Watches log directory for new files and scans them automatically for PII.
 Sends alerts when PII is detected.
 
+Files are tailed incrementally: a per-file (inode, offset) checkpoint means
+only bytes appended since the last check are analyzed, rotation and
+truncation restart the file from the beginning, and one analyzer instance is
+reused for the lifetime of the service. On Linux the loop can be woken by
+inotify instead of polling every check_interval seconds.
+
 """
 
+import os
 import time
 import logging
+import select
 import sys
 import signal
 import json
+from dataclasses import dataclass, asdict
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Set, Dict, Optional
+from typing import Set, Dict, Optional, Tuple
 import argparse
 
 # Import the scanner
@@ -24,14 +33,74 @@ except ImportError:
     from pii_log_scanner import PIILogScanner, ScanResult
 
 
+@dataclass
+class FileCheckpoint:
+    """How far a log file has been scanned"""
+    inode: int
+    device: int
+    offset: int
+    line_number: int
+
+
+class _InotifyWatcher:
+    """Minimal inotify watch on a directory via libc (Linux only)"""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    def __init__(self, directory: Path, debounce: float = 0.2):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        mask = (self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_FROM |
+                self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE)
+        if libc.inotify_add_watch(self.fd, str(directory).encode(), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+        self.debounce = debounce
+
+    def wait(self, timeout: float) -> bool:
+        """Block until the directory changes or timeout; returns True on change"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        # Coalesce a burst of writes into a single wakeup
+        while ready:
+            self._drain()
+            ready, _, _ = select.select([self.fd], [], [], self.debounce)
+        return True
+
+    def _drain(self):
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self):
+        os.close(self.fd)
+
+
 class PIIMonitorService:
     """
     Continuous monitoring service for PII in logs
 
     Features:
     - Watches directory for new log files
-    - Scans new files automatically
-    - Tracks files already scanned
+    - Scans only lines appended since the last check
+    - Persists per-file offset/inode checkpoints across restarts
     - Sends alerts when PII detected
     - Generates daily summary reports
     """
@@ -43,7 +112,9 @@ class PIIMonitorService:
         slack_webhook: str = None,
         check_interval: int = 300,  # 5 minutes
         pattern: str = "*.log",
-        use_presidio: bool = True
+        use_presidio: bool = True,
+        checkpoint_file: Optional[Path] = None,
+        use_inotify: bool = False
     ):
         """
         Initialize monitoring service
@@ -55,6 +126,8 @@ class PIIMonitorService:
             check_interval: Seconds between checks
             pattern: Glob pattern for log files
             use_presidio: Use Presidio for detection
+            checkpoint_file: JSON file persisting scan offsets (in-memory only if None)
+            use_inotify: Wake on directory changes instead of sleeping check_interval
         """
         self.watch_dir = Path(watch_dir)
         self.alert_email = alert_email
@@ -62,13 +135,20 @@ class PIIMonitorService:
         self.check_interval = check_interval
         self.pattern = pattern
         self.use_presidio = use_presidio
+        self.checkpoint_file = Path(checkpoint_file) if checkpoint_file else None
+        self.use_inotify = use_inotify
 
         # Track scanned files and their modification times
         self.scanned_files: Dict[Path, float] = {}
 
+        # Per-file scan position, keyed by path
+        self.checkpoints: Dict[str, FileCheckpoint] = {}
+
         # Statistics
         self.total_files_scanned = 0
         self.total_pii_detections = 0
+        self.total_lines_scanned = 0
+        self.total_scan_seconds = 0.0
         self.session_start = datetime.now()
         self.last_alert_time: Optional[datetime] = None
         self.alert_cooldown_hours = 1  # Minimum time between alerts
@@ -88,8 +168,12 @@ class PIIMonitorService:
         )
         self.logger = logging.getLogger('PIIMonitor')
 
-        # Initialize scanner (created fresh for each scan to clear detections)
+        # Scanner is created on first use and reused, so the analyzer and
+        # recognizers are only initialized once
         self.scanner: Optional[PIILogScanner] = None
+        self._watcher: Optional[_InotifyWatcher] = None
+
+        self._load_checkpoints()
 
         self.logger.info("=" * 60)
         self.logger.info("PII Monitor Service Initialized")
@@ -121,10 +205,19 @@ class PIIMonitorService:
             return False
 
         try:
-            current_mtime = file_path.stat().st_mtime
+            stat = file_path.stat()
+            current_mtime = stat.st_mtime
         except OSError:
             return False
 
+        checkpoint = self.checkpoints.get(str(file_path))
+        if checkpoint is not None and (
+            (checkpoint.inode, checkpoint.device) != (stat.st_ino, stat.st_dev)
+            or stat.st_size < checkpoint.offset
+        ):
+            # Rotated or truncated since the last scan
+            return True
+
         if file_path not in self.scanned_files:
             # New file
             return True
@@ -135,9 +228,18 @@ class PIIMonitorService:
 
         return False
 
+    def _get_scanner(self) -> PIILogScanner:
+        """Return the long-lived scanner, creating it on first use"""
+        if self.scanner is None:
+            self.scanner = PIILogScanner(
+                alert_email=self.alert_email,
+                use_presidio=self.use_presidio
+            )
+        return self.scanner
+
     def _scan_file(self, file_path: Path) -> Optional[ScanResult]:
         """
-        Scan a single file for PII
+        Scan lines appended to a file since its last checkpoint for PII
 
         Args:
             file_path: Path to file to scan
@@ -148,17 +250,28 @@ class PIIMonitorService:
         self.logger.info(f"Scanning: {file_path.name}")
 
         try:
-            # Create fresh scanner for this file
-            scanner = PIILogScanner(
-                alert_email=self.alert_email,
-                use_presidio=self.use_presidio
-            )
+            scanner = self._get_scanner()
+            # Detections are reported per scan; don't let them accumulate
+            scanner.detections.clear()
 
-            total_lines, lines_with_pii = scanner.scan_log_file(file_path)
+            # mtime is taken before reading so a write during the scan triggers another one
+            mtime = file_path.stat().st_mtime
+            start = time.perf_counter()
+            total_lines, lines_with_pii = self._scan_appended(scanner, file_path)
+            elapsed = time.perf_counter() - start
 
             # Update tracking
-            self.scanned_files[file_path] = file_path.stat().st_mtime
+            self.scanned_files[file_path] = mtime
             self.total_files_scanned += 1
+            self.total_lines_scanned += total_lines
+            self.total_scan_seconds += elapsed
+            self._save_checkpoints()
+
+            if total_lines:
+                self.logger.info(
+                    f"Scanned {total_lines} new lines of {file_path.name} in {elapsed:.2f}s "
+                    f"({total_lines / elapsed if elapsed > 0 else 0:.0f} lines/s)"
+                )
 
             if lines_with_pii > 0:
                 self.total_pii_detections += lines_with_pii
@@ -193,6 +306,98 @@ class PIIMonitorService:
             self.logger.error(f"Error scanning {file_path}: {e}")
             return None
 
+    def _scan_appended(self, scanner: PIILogScanner, file_path: Path) -> Tuple[int, int]:
+        """
+        Scan a file from its checkpoint, handling rotation and truncation
+
+        Returns:
+            Tuple of (lines_scanned, lines_with_pii)
+        """
+        key = str(file_path)
+        stat = file_path.stat()
+        checkpoint = self.checkpoints.get(key)
+        total_lines = 0
+        lines_with_pii = 0
+
+        if checkpoint is not None and (checkpoint.inode, checkpoint.device) != (stat.st_ino, stat.st_dev):
+            # The file was replaced (e.g. logrotate). If the old file was renamed
+            # within the watch directory, finish the lines written before rotation.
+            rotated = self._find_file_by_inode(checkpoint, exclude=file_path)
+            if rotated is not None:
+                lines, with_pii, _ = scanner.scan_log_file_from(
+                    rotated, checkpoint.offset, checkpoint.line_number
+                )
+                total_lines += lines
+                lines_with_pii += with_pii
+            self.logger.info(f"{file_path.name} was rotated, scanning new file from the start")
+            checkpoint = None
+        elif checkpoint is not None and stat.st_size < checkpoint.offset:
+            self.logger.info(f"{file_path.name} was truncated, scanning from the start")
+            checkpoint = None
+
+        offset = checkpoint.offset if checkpoint else 0
+        start_line = checkpoint.line_number if checkpoint else 0
+        lines, with_pii, new_offset = scanner.scan_log_file_from(file_path, offset, start_line)
+
+        self.checkpoints[key] = FileCheckpoint(
+            inode=stat.st_ino,
+            device=stat.st_dev,
+            offset=new_offset,
+            line_number=start_line + lines
+        )
+        return total_lines + lines, lines_with_pii + with_pii
+
+    def _find_file_by_inode(self, checkpoint: FileCheckpoint, exclude: Path) -> Optional[Path]:
+        """Find a rotated log file in the watch directory by its inode"""
+        try:
+            for candidate in self.watch_dir.iterdir():
+                if candidate == exclude or not candidate.is_file():
+                    continue
+                stat = candidate.stat()
+                if (stat.st_ino, stat.st_dev) == (checkpoint.inode, checkpoint.device):
+                    return candidate
+        except OSError:
+            pass
+        return None
+
+    def _load_checkpoints(self):
+        """Load persisted scan checkpoints"""
+        if not self.checkpoint_file or not self.checkpoint_file.exists():
+            return
+        try:
+            with open(self.checkpoint_file) as f:
+                data = json.load(f)
+            self.checkpoints = {path: FileCheckpoint(**cp) for path, cp in data.items()}
+            self.logger.info(f"Loaded checkpoints for {len(self.checkpoints)} files")
+        except (OSError, ValueError, TypeError) as e:
+            self.logger.warning(f"Ignoring unreadable checkpoint file {self.checkpoint_file}: {e}")
+
+    def _save_checkpoints(self):
+        """Persist scan checkpoints atomically"""
+        if not self.checkpoint_file:
+            return
+        tmp_file = self.checkpoint_file.with_suffix(self.checkpoint_file.suffix + ".tmp")
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump({path: asdict(cp) for path, cp in self.checkpoints.items()}, f)
+            os.replace(tmp_file, self.checkpoint_file)
+        except OSError as e:
+            self.logger.error(f"Failed to save checkpoints: {e}")
+
+    def _lines_per_second(self) -> float:
+        if self.total_scan_seconds <= 0:
+            return 0.0
+        return self.total_lines_scanned / self.total_scan_seconds
+
+    def _wait_for_changes(self):
+        """Sleep until the next check, waking early on inotify events if enabled"""
+        if self._watcher is not None:
+            if self._watcher.wait(self.check_interval):
+                self.logger.debug("Woken by file change")
+            return
+        self.logger.debug(f"Waiting {self.check_interval}s until next check...")
+        time.sleep(self.check_interval)
+
     def _can_send_alert(self) -> bool:
         """Check if we can send an alert (rate limiting)"""
         if self.last_alert_time is None:
@@ -274,7 +479,9 @@ This is an automated alert from the PII monitoring service.
             "session_start": self.session_start.isoformat(),
             "files_scanned": self.total_files_scanned,
             "pii_detections": self.total_pii_detections,
-            "files_tracked": len(self.scanned_files)
+            "files_tracked": len(self.scanned_files),
+            "lines_scanned": self.total_lines_scanned,
+            "lines_per_second": round(self._lines_per_second(), 1)
         }
 
         summary_file = Path(f"pii_summary_{summary['date']}.json")
@@ -290,10 +497,13 @@ This is an automated alert from the PII monitoring service.
         self.logger.info(f"Files scanned: {self.total_files_scanned}")
         self.logger.info(f"PII detections: {self.total_pii_detections}")
         self.logger.info(f"Files tracked: {len(self.scanned_files)}")
+        self.logger.info(f"Lines scanned: {self.total_lines_scanned} ({self._lines_per_second():.0f} lines/s)")
 
         # Reset daily counters
         self.total_files_scanned = 0
         self.total_pii_detections = 0
+        self.total_lines_scanned = 0
+        self.total_scan_seconds = 0.0
 
     def _handle_signal(self, signum, frame):
         """Handle shutdown signals"""
@@ -311,6 +521,13 @@ This is an automated alert from the PII monitoring service.
 
         last_summary_date = datetime.now().date()
 
+        if self.use_inotify:
+            try:
+                self._watcher = _InotifyWatcher(self.watch_dir)
+                self.logger.info("Using inotify for change notifications")
+            except (OSError, AttributeError) as e:
+                self.logger.warning(f"inotify unavailable ({e}), polling every {self.check_interval}s")
+
         try:
             while self.running:
                 # Check for new or modified files
@@ -333,13 +550,15 @@ This is an automated alert from the PII monitoring service.
 
                 # Wait before next check
                 if self.running:
-                    self.logger.debug(f"Waiting {self.check_interval}s until next check...")
-                    time.sleep(self.check_interval)
+                    self._wait_for_changes()
 
         except Exception as e:
             self.logger.error(f"Fatal error in monitoring service: {e}")
             raise
         finally:
+            if self._watcher is not None:
+                self._watcher.close()
+                self._watcher = None
             self.logger.info("Monitoring service stopped")
             self._generate_daily_summary()  # Final summary
 
@@ -374,6 +593,8 @@ This is an automated alert from the PII monitoring service.
             "files_tracked": len(self.scanned_files),
             "total_files_scanned": self.total_files_scanned,
             "total_pii_detections": self.total_pii_detections,
+            "total_lines_scanned": self.total_lines_scanned,
+            "lines_per_second": round(self._lines_per_second(), 1),
             "session_start": self.session_start.isoformat(),
             "last_alert": self.last_alert_time.isoformat() if self.last_alert_time else None,
             "running": self.running
@@ -399,6 +620,9 @@ Examples:
   # Custom check interval (10 minutes)
   python pii_monitor.py --watch /var/log/openchs/ --check-interval 600
 
+  # Wake on file changes (Linux) instead of polling
+  python pii_monitor.py --watch /var/log/openchs/ --inotify
+
 Systemd Service:
   Create /etc/systemd/system/pii-monitor.service with:
 
@@ -452,6 +676,16 @@ Systemd Service:
         action='store_true',
         help='Use regex-only detection'
     )
+    parser.add_argument(
+        '--checkpoint-file',
+        type=Path,
+        help='File storing per-log scan offsets (default: <watch>/.pii_monitor_checkpoints.json)'
+    )
+    parser.add_argument(
+        '--inotify',
+        action='store_true',
+        help='Wake on file changes via inotify instead of polling (Linux)'
+    )
 
     args = parser.parse_args()
 
@@ -467,7 +701,9 @@ Systemd Service:
         slack_webhook=args.slack_webhook,
         check_interval=args.check_interval,
         pattern=args.pattern,
-        use_presidio=not args.no_presidio
+        use_presidio=not args.no_presidio,
+        checkpoint_file=args.checkpoint_file or args.watch / '.pii_monitor_checkpoints.json',
+        use_inotify=args.inotify
     )
 
     if args.once:
@@ -31,8 +31,10 @@ import urllib3
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 # Add these imports with the existing imports
-from ..db.session import SessionLocal
 from ..db.repositories.feedback_repository import FeedbackRepository
+from ..db.feedback_writer import FeedbackWriteBuffer, write_feedback_rows_sync
+from .notification_delivery import NotificationDeliveryQueue, PayloadLogWriter
+from ..core.tracing import tracer
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -83,9 +85,16 @@ class EnhancedNotificationService:
             verify=False  # Disable SSL verification for self-signed certificates
         )
 
+        # Background delivery queue, started by the API process (see start_delivery_queue)
+        self.delivery_queue: Optional[NotificationDeliveryQueue] = None
+
+        # Write-behind buffer for feedback rows, started by the API process (see start_feedback_buffer)
+        self.feedback_buffer: Optional[FeedbackWriteBuffer] = None
+
         # Payload logging configuration
         self.enable_payload_logging = settings.enable_agent_payload_logging
         self.payload_log_file = settings.agent_payload_log_file
+        self.payload_log_writer: Optional[PayloadLogWriter] = None
 
         # Initialize payload logging if enabled
         if self.enable_payload_logging:
@@ -109,6 +118,12 @@ class EnhancedNotificationService:
                     f.write("# Each line is a JSON object representing a notification payload\n")
                     f.write("# Format: JSONL (JSON Lines) - one object per line\n")
 
+            self.payload_log_writer = PayloadLogWriter(
+                self.payload_log_file,
+                batch_size=settings.notification_payload_log_batch_size,
+                flush_interval=settings.notification_payload_log_flush_interval
+            )
+
             logger.info(f"📝 Payload logging enabled: {self.payload_log_file}")
 
         except Exception as e:
@@ -123,7 +138,7 @@ class EnhancedNotificationService:
             payload: The original notification payload (v2.0 format)
             request_body: The actual request body being sent (may be wrapped in base64)
         """
-        if not self.enable_payload_logging:
+        if not self.enable_payload_logging or self.payload_log_writer is None:
             return
 
         try:
@@ -138,9 +153,8 @@ class EnhancedNotificationService:
                 "request_body": request_body
             }
 
-            # Append to JSONL file
-            with open(self.payload_log_file, 'a') as f:
-                f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+            # Appended to the JSONL file in batches by the writer thread
+            self.payload_log_writer.write(log_entry)
 
             logger.debug(f"📝 Logged payload: {payload.get('notification_type')} for call {log_entry['call_id']}")
 
@@ -460,8 +474,71 @@ class EnhancedNotificationService:
         
         return base_payload
 
+    async def start_delivery_queue(self) -> None:
+        """Start background delivery on the running event loop."""
+        if self.delivery_queue is not None and self.delivery_queue.is_active():
+            return
+        self.delivery_queue = NotificationDeliveryQueue.from_settings(self)
+        await self.delivery_queue.start()
+
+    async def stop_delivery_queue(self, timeout: float = 10.0) -> None:
+        """Drain and stop background delivery; later sends go inline again."""
+        if self.delivery_queue is not None:
+            await self.delivery_queue.stop(timeout=timeout)
+            self.delivery_queue = None
+        if self.payload_log_writer is not None:
+            await asyncio.to_thread(self.payload_log_writer.flush, timeout)
+
+    async def start_feedback_buffer(self) -> None:
+        """Batch feedback row writes across calls on the running event loop."""
+        if self.feedback_buffer is not None and self.feedback_buffer.is_active():
+            return
+        self.feedback_buffer = FeedbackWriteBuffer.from_settings()
+        await self.feedback_buffer.start()
+
+    async def stop_feedback_buffer(self) -> None:
+        """Write buffered feedback rows and stop batching; later calls write inline."""
+        if self.feedback_buffer is not None:
+            await self.feedback_buffer.stop()
+            self.feedback_buffer = None
+
+    def get_delivery_stats(self) -> Dict[str, Any]:
+        """Delivery queue and payload log statistics."""
+        stats: Dict[str, Any] = {
+            "mode": "queued" if self.delivery_queue is not None else "inline",
+            "queue": self.delivery_queue.get_stats() if self.delivery_queue is not None else None,
+        }
+        if self.payload_log_writer is not None:
+            stats["payload_log"] = {
+                "entries_written": self.payload_log_writer.entries_written,
+                "entries_dropped": self.payload_log_writer.entries_dropped
+            }
+        return stats
+
     async def _send_notification(self, data: Dict[str, Any]) -> bool:
-        """Send notification with retry logic."""
+        """
+        Send notification.
+
+        Hands the payload to the delivery queue when one is running on this event
+        loop, so the caller does not wait on HTTP or retries. Otherwise (Celery
+        workers, scripts) the notification is delivered inline.
+        """
+        if self.delivery_queue is not None and self.delivery_queue.is_active():
+            return await self.delivery_queue.enqueue(data)
+        return await self._deliver_notification(data)
+
+    async def _deliver_notification(self, data: Dict[str, Any], client: Optional[httpx.AsyncClient] = None) -> bool:
+        """Deliver notification with retry logic."""
+        call_id = (data.get("call_metadata") or {}).get("call_id")
+        with tracer.span("notification_delivery", call_id=call_id,
+                         notification_type=data.get("notification_type")) as span:
+            delivered = await self._send_with_retries(data, client)
+            if span:
+                span.set_attribute("delivered", delivered)
+            return delivered
+
+    async def _send_with_retries(self, data: Dict[str, Any], client: Optional[httpx.AsyncClient] = None) -> bool:
+        client = client or self.client
         headers = await self._get_auth_headers()
 
         # Prepare request body
@@ -501,7 +578,7 @@ class EnhancedNotificationService:
         
         for attempt in range(retry_attempts):
             try:
-                response = await self.client.post(
+                response = await client.post(
                     self.endpoint_url,
                     json=request_body,
                     headers=headers
@@ -581,6 +658,8 @@ class EnhancedNotificationService:
             "segment_text": segment_text,
             "cumulative_transcript": cumulative_transcript,
             "segment_id": metadata.get("segment_id"),
+            "window_id": metadata.get("window_id"),
+            "is_final": True,
             "word_count": len(segment_text.split()),
             "confidence_score": metadata.get("confidence", 0.90)
         }
@@ -599,6 +678,41 @@ class EnhancedNotificationService:
             call_metadata=metadata,
             ui_metadata=ui_metadata
         )
+
+    async def send_streaming_interim_transcription(
+        self,
+        call_id: str,
+        interim_text: str,
+        window_id: int,
+        **metadata
+    ) -> bool:
+        """Send an interim (is_final=false) transcript of the window still being recorded.
+
+        The final STREAMING_TRANSCRIPTION with the same window_id replaces it.
+        """
+        
+        payload_data = {
+            "segment_text": interim_text,
+            "window_id": window_id,
+            "is_final": False,
+            "audio_seconds": metadata.get("audio_seconds"),
+            "word_count": len(interim_text.split())
+        }
+        
+        ui_metadata = {
+            "priority": 1,
+            "display_panel": "transcript",
+            "requires_action": False
+        }
+        
+        return await self.send_notification(
+            call_id=call_id,
+            notification_type=NotificationType.STREAMING_TRANSCRIPTION_INTERIM,
+            processing_mode=ProcessingMode.STREAMING,
+            payload_data=payload_data,
+            call_metadata=metadata,
+            ui_metadata=ui_metadata
+        )
     
     async def send_streaming_translation(
         self,
@@ -818,15 +932,18 @@ class EnhancedNotificationService:
         """
         Create initial feedback entries for all tasks when processing completes.
         Called automatically when sending notifications.
-    
+
+        All task rows for the call are written in one INSERT and one
+        transaction. In the API process the rows go to the write-behind buffer
+        and are batched with other calls; elsewhere (Celery workers) they are
+        written immediately from a worker thread.
+
         Args:
             call_id: Unique call identifier
             pipeline_results: Complete pipeline results containing all task outputs
             processing_mode: Processing mode used
         """
         try:
-            db = SessionLocal()
-
             # Map of task names to their results in pipeline output
             task_mapping = {
                 'transcription': pipeline_results.get('transcript'),
@@ -838,35 +955,34 @@ class EnhancedNotificationService:
                 'insights': pipeline_results.get('insights'),
             }
 
-            created_count = 0
-            for task, prediction in task_mapping.items():
-                # Create feedback entry if task was attempted (even if result is empty)
-                # Skip only if prediction is explicitly None (task was skipped)
-                if prediction is not None:
-                    # Ensure we have a valid prediction object (convert empty to appropriate type)
-                    if prediction == {} or prediction == "" or prediction == []:
-                        # Keep empty results as-is for feedback
-                        pass
-
-                    feedback = FeedbackRepository.create_initial_feedback(
-                        db=db,
-                        call_id=call_id,
-                        task=task,
-                        prediction=prediction if prediction else {},  # Use empty dict if falsy
-                        processing_mode=processing_mode,
-                        model_version=None  # Can be enhanced to track versions
-                    )
-                    if feedback:
-                        created_count += 1
-
-            db.close()
+            # Create feedback entry if task was attempted (even if result is empty)
+            # Skip only if prediction is explicitly None (task was skipped)
+            rows = [
+                FeedbackRepository.initial_feedback_row(
+                    call_id=call_id,
+                    task=task,
+                    prediction=prediction if prediction else {},  # Use empty dict if falsy
+                    processing_mode=processing_mode,
+                    model_version=None  # Can be enhanced to track versions
+                )
+                for task, prediction in task_mapping.items()
+                if prediction is not None
+            ]
+            if not rows:
+                return
+
+            if self.feedback_buffer is not None and self.feedback_buffer.is_active():
+                await self.feedback_buffer.add(rows)
+                logger.info(f"✅ Queued {len(rows)} feedback entries for call {call_id}")
+                return
+
+            created_count = await asyncio.to_thread(write_feedback_rows_sync, rows)
             logger.info(f"✅ Created {created_count} feedback entries for call {call_id}")
 
         except Exception as e:
             logger.error(f"❌ Failed to create feedback entries: {e}")
 
-    
-  
+
 # Singleton instance
 notification_service = EnhancedNotificationService()
 enhanced_notification_service = notification_service  # Alias for backward compatibility
\ No newline at end of file
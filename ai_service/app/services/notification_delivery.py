@@ -0,0 +1,486 @@
+"""
+Outbound Notification Delivery
+
+Decouples notification delivery from the code paths that produce notifications.
+Callers enqueue a fully built v2.0 payload and return immediately; a fixed pool of
+sender tasks delivers it over one shared keep-alive (optionally HTTP/2) client.
+
+- Ordering: every call_id is pinned to a single sender shard, so the notifications
+  for one call leave in the order they were produced.
+- Coalescing: progress and streaming snapshot updates supersede any older,
+  still-undelivered update of the same type for the same call.
+- Durability (optional): queued payloads are journaled in a Redis hash and replayed
+  on start, so an API restart does not lose them.
+- Payload logging: PayloadLogWriter batches the JSONL development log on a
+  background thread instead of opening the file on the event loop per message.
+"""
+import asyncio
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from ..config.settings import settings, get_redis_url
+from ..core.metrics import (
+    update_notification_queue_depth,
+    record_notification_delivery,
+    record_notification_drop,
+)
+from ..models.notification_types import NotificationType
+
+logger = logging.getLogger(__name__)
+
+# Notification types whose payload is a full snapshot (progress, cumulative results),
+# so a newer one makes any older undelivered one for the same call redundant.
+COALESCIBLE_TYPES = frozenset({
+    NotificationType.SYSTEM_PROCESSING_PROGRESS.value,
+    NotificationType.STREAMING_PROCESSING_UPDATE.value,
+    NotificationType.STREAMING_TRANSCRIPTION_INTERIM.value,
+    NotificationType.STREAMING_TRANSLATION_PROGRESS.value,
+    NotificationType.STREAMING_TRANSLATION.value,
+    NotificationType.STREAMING_ENTITIES.value,
+    NotificationType.STREAMING_CLASSIFICATION.value,
+    NotificationType.STREAMING_QA.value,
+})
+
+
+class PayloadLogWriter:
+    """Batched JSONL writer for agent payload logging, running on a daemon thread."""
+
+    _STOP = object()
+
+    def __init__(self, path: str, batch_size: int = 100, flush_interval: float = 0.5,
+                 max_pending: int = 10000):
+        self.path = path
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = float(flush_interval)
+        self.max_pending = max_pending
+        self.entries_written = 0
+        self.entries_dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._atexit_registered = False
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        """Queue a log entry without blocking; drops the entry if the writer is saturated."""
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.entries_dropped += 1
+            record_notification_drop(str(entry.get("notification_type") or "unknown"), "payload_log_full")
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued entry has been written. Returns False on timeout."""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Flush pending entries and stop the writer thread."""
+        thread = self._thread
+        if thread is None or not thread.is_alive() or self._pid != os.getpid():
+            return
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+
+    def _ensure_thread(self) -> None:
+        # Started lazily and re-created after fork: threads do not survive into
+        # prefork Celery children.
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            if self._pid is not None and self._pid != os.getpid():
+                self._queue = queue.Queue(maxsize=self.max_pending)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="payload-log-writer", daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.close)
+                self._atexit_registered = True
+
+    def _run(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            batch = [first]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(entry is self._STOP for entry in batch)
+            entries = [entry for entry in batch if entry is not self._STOP]
+            try:
+                if entries:
+                    self._write_batch(entries)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write_batch(self, entries: List[Dict[str, Any]]) -> None:
+        lines = []
+        for entry in entries:
+            try:
+                lines.append(json.dumps(entry, ensure_ascii=False, default=str))
+            except Exception as e:
+                logger.error(f"❌ Failed to serialize payload log entry: {e}")
+        if not lines:
+            return
+        try:
+            with open(self.path, 'a') as f:
+                f.write('\n'.join(lines) + '\n')
+            self.entries_written += len(lines)
+        except Exception as e:
+            self.entries_dropped += len(lines)
+            logger.error(f"❌ Failed to write {len(lines)} payload log entries: {e}")
+
+
+@dataclass
+class OutboundNotification:
+    """A queued v2.0 payload with the bookkeeping needed for ordering and coalescing."""
+    data: Dict[str, Any]
+    call_id: str
+    notification_type: str
+    enqueued_at: float = field(default_factory=time.monotonic)
+    superseded: bool = False
+
+    @property
+    def message_id(self) -> str:
+        return str(self.data.get("message_id", ""))
+
+
+class NotificationDeliveryQueue:
+    """
+    Sharded in-memory delivery queue with a fixed pool of sender tasks.
+
+    The queue is bound to the event loop it was started on. Code running on any
+    other loop (e.g. the short-lived loops in Celery workers) keeps sending inline.
+    """
+
+    def __init__(
+        self,
+        service,
+        num_senders: int = 4,
+        max_queue_size: int = 1000,
+        request_timeout: float = 10,
+        http2: bool = False,
+        max_keepalive_connections: int = 10,
+        redis_backed: bool = False,
+        redis_key: str = "notification_outbox",
+        coalesce_types=COALESCIBLE_TYPES,
+    ):
+        self.service = service
+        self.num_senders = max(1, int(num_senders))
+        self.max_queue_size = max(1, int(max_queue_size))
+        self.request_timeout = request_timeout
+        self.http2 = http2
+        self.max_keepalive_connections = max(1, int(max_keepalive_connections))
+        self.redis_backed = redis_backed
+        self.redis_key = redis_key
+        self.coalesce_types = frozenset(coalesce_types)
+
+        self._queues: List[asyncio.Queue] = []
+        self._senders: List[asyncio.Task] = []
+        self._latest: Dict[tuple, OutboundNotification] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_http2 = False
+        self._redis = None
+
+        self.stats = {
+            "enqueued": 0,
+            "delivered": 0,
+            "failed": 0,
+            "coalesced": 0,
+            "dropped_queue_full": 0,
+            "replayed": 0,
+        }
+
+    @classmethod
+    def from_settings(cls, service) -> "NotificationDeliveryQueue":
+        """Build a queue from the notification delivery settings."""
+        return cls(
+            service,
+            num_senders=settings.notification_sender_count,
+            max_queue_size=settings.notification_queue_max_size,
+            request_timeout=settings.notification_request_timeout,
+            http2=settings.notification_http2,
+            max_keepalive_connections=settings.notification_max_keepalive_connections,
+            redis_backed=settings.notification_queue_redis_backed,
+            redis_key=settings.notification_queue_redis_key,
+        )
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Create the shared client and sender tasks on the running loop."""
+        if self._senders:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._queues = [asyncio.Queue(maxsize=self.max_queue_size) for _ in range(self.num_senders)]
+        self._client = self._create_client()
+
+        self._senders = [
+            asyncio.create_task(self._sender(index), name=f"notification-sender-{index}")
+            for index in range(self.num_senders)
+        ]
+
+        if self.redis_backed:
+            await self._connect_journal()
+            await self._replay_journal()
+        logger.info(
+            f"📬 Notification delivery queue started: {self.num_senders} senders, "
+            f"http2={self._client_http2}, redis_backed={self._redis is not None}"
+        )
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Drain queued notifications (up to timeout), then stop the senders."""
+        if not self._senders:
+            return
+
+        try:
+            await asyncio.wait_for(asyncio.gather(*(q.join() for q in self._queues)), timeout)
+        except asyncio.TimeoutError:
+            pending = self.depth()
+            logger.warning(f"⚠️ Notification queue stopped with {pending} undelivered notifications")
+            if self._redis is None:
+                for q in self._queues:
+                    while not q.empty():
+                        item = q.get_nowait()
+                        q.task_done()
+                        if not item.superseded:
+                            record_notification_drop(item.notification_type, "shutdown")
+
+        for task in self._senders:
+            task.cancel()
+        await asyncio.gather(*self._senders, return_exceptions=True)
+        self._senders = []
+        self._latest.clear()
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._redis is not None:
+            try:
+                await self._redis.aclose()
+            except Exception:
+                pass
+            self._redis = None
+
+        update_notification_queue_depth(0)
+        logger.info("📭 Notification delivery queue stopped")
+
+    def is_active(self) -> bool:
+        """True when senders are running on the caller's event loop."""
+        if not self._senders:
+            return False
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    async def enqueue(self, data: Dict[str, Any]) -> bool:
+        """
+        Queue a v2.0 payload for delivery.
+
+        Returns True once the notification is queued. Coalescible updates are
+        dropped (returning False) instead of waiting when their shard is full;
+        everything else waits for space.
+        """
+        item = OutboundNotification(
+            data=data,
+            call_id=str(data.get("call_metadata", {}).get("call_id", "unknown")),
+            notification_type=str(data.get("notification_type", "unknown")),
+        )
+        shard = self._queues[self._shard_for(item.call_id)]
+        coalescible = item.notification_type in self.coalesce_types
+
+        if coalescible and shard.full():
+            self.stats["dropped_queue_full"] += 1
+            record_notification_drop(item.notification_type, "queue_full")
+            logger.warning(f"⚠️ Notification queue full - dropped {item.notification_type} for call {item.call_id}")
+            return False
+
+        if coalescible:
+            key = (item.call_id, item.notification_type)
+            previous = self._latest.get(key)
+            if previous is not None and not previous.superseded:
+                previous.superseded = True
+                self.stats["coalesced"] += 1
+                record_notification_drop(previous.notification_type, "coalesced")
+                await self._journal_remove(previous)
+            self._latest[key] = item
+
+        await self._journal_add(item)
+        await shard.put(item)
+        self.stats["enqueued"] += 1
+        update_notification_queue_depth(self.depth())
+        return True
+
+    def depth(self) -> int:
+        """Total notifications waiting across all shards."""
+        return sum(q.qsize() for q in self._queues)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue configuration, depth and delivery counters."""
+        return {
+            "running": bool(self._senders),
+            "senders": self.num_senders,
+            "depth": self.depth(),
+            "shard_depths": [q.qsize() for q in self._queues],
+            "max_queue_size": self.max_queue_size,
+            "http2": self._client_http2,
+            "redis_backed": self._redis is not None,
+            **self.stats,
+        }
+
+    # ------------------------------------------------------------------
+    # Sender side
+    # ------------------------------------------------------------------
+
+    def _shard_for(self, call_id: str) -> int:
+        return zlib.crc32(call_id.encode("utf-8")) % self.num_senders
+
+    async def _sender(self, index: int) -> None:
+        shard = self._queues[index]
+        while True:
+            item = await shard.get()
+            key = (item.call_id, item.notification_type)
+            try:
+                if item.superseded:
+                    continue
+                # In flight from here on: a newer update queues behind it instead of superseding it
+                if self._latest.get(key) is item:
+                    del self._latest[key]
+
+                try:
+                    delivered = await self.service._deliver_notification(item.data, client=self._client)
+                except Exception as e:
+                    logger.error(f"❌ Notification sender {index} failed on {item.notification_type}: {e}")
+                    delivered = False
+
+                status = "success" if delivered else "failed"
+                record_notification_delivery(item.notification_type, status, time.monotonic() - item.enqueued_at)
+                if delivered:
+                    self.stats["delivered"] += 1
+                else:
+                    self.stats["failed"] += 1
+                    record_notification_drop(item.notification_type, "retries_exhausted")
+            finally:
+                if not item.superseded:
+                    await self._journal_remove(item)
+                shard.task_done()
+                update_notification_queue_depth(self.depth())
+
+    def _create_client(self) -> httpx.AsyncClient:
+        http2 = self.http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("⚠️ notification_http2 enabled but 'h2' is not installed - using HTTP/1.1 keep-alive")
+                http2 = False
+        self._client_http2 = http2
+
+        return httpx.AsyncClient(
+            timeout=self.request_timeout,
+            verify=False,  # Helpline endpoints use self-signed certificates
+            http2=http2,
+            limits=httpx.Limits(
+                max_keepalive_connections=self.max_keepalive_connections,
+                max_connections=max(self.max_keepalive_connections, self.num_senders),
+                keepalive_expiry=60.0,
+            ),
+        )
+
+    # ------------------------------------------------------------------
+    # Redis journal
+    # ------------------------------------------------------------------
+
+    async def _connect_journal(self) -> None:
+        try:
+            import redis.asyncio as aioredis
+            client = aioredis.from_url(get_redis_url(), decode_responses=True)
+            await client.ping()
+            self._redis = client
+        except Exception as e:
+            logger.warning(f"⚠️ Notification journal unavailable, queue is memory-only: {e}")
+            self._redis = None
+
+    async def _replay_journal(self) -> None:
+        if self._redis is None:
+            return
+        try:
+            entries = await self._redis.hgetall(self.redis_key)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to read notification journal: {e}")
+            return
+
+        pending = []
+        for raw in entries.values():
+            try:
+                pending.append(json.loads(raw))
+            except (TypeError, ValueError):
+                continue
+        pending.sort(key=lambda data: data.get("timestamp", ""))
+
+        for data in pending:
+            item = OutboundNotification(
+                data=data,
+                call_id=str(data.get("call_metadata", {}).get("call_id", "unknown")),
+                notification_type=str(data.get("notification_type", "unknown")),
+            )
+            await self._queues[self._shard_for(item.call_id)].put(item)
+        if pending:
+            self.stats["replayed"] += len(pending)
+            logger.info(f"📬 Replaying {len(pending)} journaled notifications")
+
+    async def _journal_add(self, item: OutboundNotification) -> None:
+        if self._redis is None or not item.message_id:
+            return
+        try:
+            await self._redis.hset(self.redis_key, item.message_id, json.dumps(item.data, default=str))
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to journal notification {item.message_id}: {e}")
+
+    async def _journal_remove(self, item: OutboundNotification) -> None:
+        if self._redis is None or not item.message_id:
+            return
+        try:
+            await self._redis.hdel(self.redis_key, item.message_id)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to clear journaled notification {item.message_id}: {e}")
@@ -1,24 +1,80 @@
 # app/streaming/audio_buffer.py
+import time
 import numpy as np
-from typing import Optional
+from typing import Any, Dict, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Energy is measured on 20ms frames; window cuts always fall on frame boundaries
+FRAME_SAMPLES = 320
+FRAME_BYTES = FRAME_SAMPLES * 2
+
+
+def adaptive_window_config() -> Dict[str, Any]:
+    """AsteriskAudioBuffer arguments from the streaming window settings ({} keeps fixed 5s windows)"""
+    from ..config.settings import settings
+    if not settings.streaming_adaptive_windows:
+        return {}
+    from .window_controller import window_controller
+    return {
+        "min_window_seconds": settings.streaming_min_window_seconds,
+        "max_window_seconds": settings.streaming_max_window_seconds,
+        "overlap_seconds": settings.streaming_window_overlap_seconds,
+        "silence_rms": settings.streaming_silence_rms,
+        "controller": window_controller
+    }
+
+
 class AsteriskAudioBuffer:
-    """Simple buffer for 16kHz 16-bit mixed-mono audio from Asterisk"""
-    
-    def __init__(self):
+    """
+    Segmenting buffer for 16kHz 16-bit mixed-mono audio from Asterisk
+
+    Windows are between min_window_seconds and max_window_seconds long. Once a
+    window reaches its target length (set by the WindowController, or the
+    maximum without one), it is cut at the quietest 20ms frame if that frame is
+    below silence_rms, so words are not split; otherwise the buffer waits for a
+    pause until the maximum length and then cuts at the quietest frame found.
+    Consecutive windows can share overlap_seconds of audio.
+
+    With the defaults (min = max = 5s, no silence threshold) this is a fixed
+    5-second window without overlap.
+    """
+
+    def __init__(
+        self,
+        min_window_seconds: float = 5.0,
+        max_window_seconds: float = 5.0,
+        overlap_seconds: float = 0.0,
+        silence_rms: Optional[float] = None,
+        controller=None
+    ):
         self.sample_rate = 16000
-        self.window_size_bytes = 160000  # 5 seconds = 5 * 16000 * 2 bytes
+        self.min_window_bytes = self._frames_to_bytes(min_window_seconds)
+        self.window_size_bytes = max(self._frames_to_bytes(max_window_seconds), self.min_window_bytes)
+        self.overlap_bytes = max(0, min(self._frames_to_bytes(overlap_seconds), self.min_window_bytes - FRAME_BYTES))
+        self.silence_rms = silence_rms
+        self.controller = controller
         self.buffer = bytearray()
         self.offset = 0
+        # Bytes dropped from the front of the buffer by compaction, so positions stay absolute
+        self.compacted_bytes = 0
         self.chunk_count = 0
+        self.window_count = 0
         self.expected_chunk_size = 320  # 10ms chunks: 160 samples * 2 bytes = 320 bytes
-        
+
+        # RMS of every complete frame from the start of the buffer (only with silence_rms)
+        self._frame_rms: List[float] = []
+        self.last_window: Optional[Dict[str, Any]] = None
+        self.window_started_at: Optional[float] = None
+
+    def _frames_to_bytes(self, seconds: float) -> int:
+        """Whole 20ms frames covering the given duration, in bytes"""
+        return int(round(seconds * self.sample_rate / FRAME_SAMPLES)) * FRAME_BYTES
+
     def add_chunk(self, chunk: bytes) -> Optional[np.ndarray]:
         """
-        Add audio chunk of any size, return audio array when 5-second window ready
+        Add audio chunk of any size, return audio array when a window is ready
         Mixed-mono audio contains both caller and agent voices in one channel
         """
         # Accept chunks of any size - Asterisk may send variable chunk sizes
@@ -27,42 +83,125 @@ class AsteriskAudioBuffer:
             logger.debug(f"🔧 Small chunk received: {len(chunk)} bytes (typical: {self.expected_chunk_size})")
         elif len(chunk) > self.expected_chunk_size * 2:
             logger.debug(f"🔧 Large chunk received: {len(chunk)} bytes (typical: {self.expected_chunk_size})")
-        
+
+        if self.window_started_at is None:
+            self.window_started_at = time.time()
         self.buffer.extend(chunk)
         self.chunk_count += 1
         current_size = len(self.buffer)
-        
-        # Check if we have 5 seconds of audio (exactly like original aii_server.py)
-        if (current_size - self.offset) >= self.window_size_bytes:
-            # Extract exactly 5 seconds from the current offset
-            window_start = self.offset
-            window_end = self.offset + self.window_size_bytes
-            window_data = self.buffer[window_start:window_end]
-            
-            # Convert to numpy array (your specified format)
-            audio_array = np.frombuffer(window_data, np.int16).flatten().astype(np.float32) / 32768.0
-            
-            # Sliding window - move offset forward by 5 seconds
-            self.offset += self.window_size_bytes
-            
-            # Reset buffer when it gets too large (keep only recent data)
-            if current_size >= self.window_size_bytes * 10:  # Reset after 50 seconds
-                # Keep only the most recent 5 seconds of data  
-                recent_data = self.buffer[self.offset:]
-                self.buffer = bytearray(recent_data)
-                self.offset = 0
-                logger.info(f"🔄 Buffer reset after 50 seconds")
-                
-            logger.debug(f"🎵 Audio ready: {len(audio_array)/16000:.1f}s")
-            return audio_array
-            
+        pending = current_size - self.offset
+
+        if pending < self.min_window_bytes:
+            return None
+
+        cut = self._find_cut(pending)
+        if cut is None:
+            return None
+
+        window_start = self.offset
+        window_end, reason = cut
+        window_data = self.buffer[window_start:window_end]
+
+        # Convert to numpy array (your specified format)
+        audio_array = np.frombuffer(window_data, np.int16).flatten().astype(np.float32) / 32768.0
+
+        # Next window starts at the cut, minus the overlap
+        overlap = self.overlap_bytes if self.window_count else 0
+        end_time = time.time()
+        self.last_window = {
+            "window_id": self.window_count,
+            "start_time": self.window_started_at,
+            "duration_seconds": len(audio_array) / self.sample_rate,
+            "new_audio_seconds": (len(window_data) - overlap) / (self.sample_rate * 2),
+            "overlap_seconds": overlap / (self.sample_rate * 2),
+            "cut_reason": reason,
+            "end_time": end_time,
+            # Position of the window's last byte in the call's audio stream
+            "stream_end_seconds": (self.compacted_bytes + window_end) / (self.sample_rate * 2)
+        }
+        self.window_count += 1
+        self.window_started_at = end_time
+        self.offset = window_end - self.overlap_bytes
+
+        # Reset buffer when it gets too large (keep only recent data)
+        if current_size >= self.window_size_bytes * 10:
+            self._compact()
+
+        logger.debug(f"🎵 Audio ready: {len(audio_array)/16000:.1f}s")
+        return audio_array
+
+    def pending_seconds(self) -> float:
+        """Audio in the window currently being recorded"""
+        return (len(self.buffer) - self.offset) / (self.sample_rate * 2)
+
+    def partial_window(self) -> bytes:
+        """16-bit PCM of the window currently being recorded, for interim decoding"""
+        end = self.offset + (len(self.buffer) - self.offset) // 2 * 2
+        return bytes(self.buffer[self.offset:end])
+
+    def _find_cut(self, pending: int):
+        """
+        End of the next window (absolute byte position) and why it was cut there,
+        or None to keep buffering.
+        """
+        if self.silence_rms is None:
+            # Fixed windows: cut at the maximum length
+            if pending >= self.window_size_bytes:
+                return self.offset + self.window_size_bytes, "fixed"
+            return None
+
+        target = self.window_size_bytes
+        if self.controller is not None:
+            target = min(max(self._frames_to_bytes(self.controller.update()), self.min_window_bytes), target)
+        if pending < target:
+            return None
+
+        self._measure_frames()
+        limit = self.offset + min(pending, self.window_size_bytes)
+        first = (self.offset + self.min_window_bytes) // FRAME_BYTES - 1
+        last = limit // FRAME_BYTES
+        energies = self._frame_rms[first:last]
+        if not energies:
+            return None
+
+        # Latest of the quietest frames, so equal energies give the longest window
+        quietest = len(energies) - 1 - int(np.argmin(energies[::-1]))
+        cut = (first + quietest + 1) * FRAME_BYTES
+        if energies[quietest] <= self.silence_rms:
+            return cut, "pause"
+        if pending >= self.window_size_bytes:
+            return cut, "max_length"
         return None
-        
+
+    def _measure_frames(self):
+        """RMS of the complete frames not measured yet"""
+        measured = len(self._frame_rms)
+        complete = len(self.buffer) // FRAME_BYTES
+        if complete <= measured:
+            return
+        frames = np.frombuffer(
+            self.buffer[measured * FRAME_BYTES:complete * FRAME_BYTES], np.int16
+        ).reshape(-1, FRAME_SAMPLES).astype(np.float32) / 32768.0
+        self._frame_rms.extend(np.sqrt(np.mean(frames * frames, axis=1)).tolist())
+
+    def _compact(self):
+        """Drop audio before the current window start"""
+        dropped_frames = self.offset // FRAME_BYTES
+        recent_data = self.buffer[self.offset:]
+        self.buffer = bytearray(recent_data)
+        self._frame_rms = self._frame_rms[dropped_frames:]
+        self.compacted_bytes += self.offset
+        self.offset = 0
+        logger.info(f"🔄 Buffer reset after {self.window_size_bytes * 10 / (self.sample_rate * 2):.0f} seconds")
+
     def get_stats(self) -> dict:
         """Get buffer statistics"""
         return {
             "buffer_size_bytes": len(self.buffer),
             "buffer_duration_seconds": len(self.buffer) / (self.sample_rate * 2),
             "chunks_received": self.chunk_count,
-            "window_ready": (len(self.buffer) - self.offset) >= self.window_size_bytes
-        }
\ No newline at end of file
+            "window_ready": (len(self.buffer) - self.offset) >= self.window_size_bytes,
+            "windows_emitted": self.window_count,
+            "adaptive": self.silence_rms is not None,
+            "last_window": self.last_window
+        }
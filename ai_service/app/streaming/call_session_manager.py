@@ -1,6 +1,7 @@
 # app/streaming/call_session_manager.py
 import json
 import logging
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from dataclasses import dataclass, asdict
@@ -10,7 +11,8 @@ from ..config.settings import redis_task_client, settings
 from .progressive_processor import progressive_processor
 from app.core.enhanced_processing_manager import enhanced_processing_manager, EnhancedProcessingMode
 from ..services.enhanced_notification_service import notification_service as enhanced_notification_service, NotificationType
-from ..utils import download_audio_by_method, convert_gsm_to_wav
+from ..utils import download_audio_by_method, convert_gsm_to_wav, prefetch_audio
+from ..core.tracing import tracer
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -223,7 +225,8 @@ class CallSessionManager:
                 logger.debug(f"ℹ️ [session] Streaming processing disabled for call {call_id} (mode: {session.processing_mode.value})")
                 segment['metadata']['streaming_processing_disabled'] = True
             
-            # Store updated session
+            # Store updated session (committed_at: wall clock when the segment became visible)
+            segment['committed_at'] = time.time()
             redis_update_success = self._store_session_in_redis(session)
             if not redis_update_success:
                 logger.warning(f"⚠️ [session] Failed to update session {call_id} in Redis")
@@ -312,6 +315,10 @@ class CallSessionManager:
             if not redis_final_success:
                 logger.warning(f"⚠️ [session] Failed to store final session {call_id} in Redis")
             
+            # Start fetching the recording while progressive analysis is finalized
+            if enhanced_processing_manager.should_enable_postcall(session.processing_mode):
+                self._prefetch_recording(session)
+            
             # Finalize progressive processing and trigger summarization
             try:
                 final_analysis = await progressive_processor.finalize_call_analysis(call_id)
@@ -447,14 +454,15 @@ class CallSessionManager:
             include_insights = postcall_config.get("enable_insights_generation", True)
             
             # Submit to AI pipeline
-            task = process_audio_task.delay(
-                audio_bytes=audio_bytes,
-                filename=filename,
-                language="sw",
-                include_translation=include_translation,
-                include_insights=include_insights,
-                processing_mode=session.processing_mode.value  # Pass enum value as string
-            )
+            with tracer.span("enqueue", call_id=call_id, task="process_audio_task"):
+                task = process_audio_task.delay(
+                    audio_bytes=audio_bytes,
+                    filename=filename,
+                    language="sw",
+                    include_translation=include_translation,
+                    include_insights=include_insights,
+                    processing_mode=session.processing_mode.value  # Pass enum value as string
+                )
             
             # Store task reference
             session_key = f"call_session:{call_id}"
@@ -495,13 +503,14 @@ class CallSessionManager:
             transcript_bytes = json.dumps(transcript_data).encode('utf-8')
             
             # Submit to full AI pipeline with pre-transcribed flag
-            task = process_audio_task.delay(
-                audio_bytes=transcript_bytes,
-                filename=filename,
-                language="sw",  # Could be stored in session metadata
-                include_translation=True,
-                include_insights=True
-            )
+            with tracer.span("enqueue", call_id=session.call_id, task="process_audio_task"):
+                task = process_audio_task.delay(
+                    audio_bytes=transcript_bytes,
+                    filename=filename,
+                    language="sw",  # Could be stored in session metadata
+                    include_translation=True,
+                    include_insights=True
+                )
             
             # Store task reference in session metadata
             session_key = f"call_session:{session.call_id}"
@@ -902,18 +911,19 @@ class CallSessionManager:
             session_key = f"call_session:{session.call_id}"
             session_data = session.to_dict()
             
-            # Store main session data
-            self.redis_client.hset(session_key, 'data', json.dumps(session_data))
-            
-            # Set expiration (keep for 24 hours after last activity)
-            expire_time = int((session.last_activity + timedelta(hours=24)).timestamp())
-            self.redis_client.expireat(session_key, expire_time)
-            
-            # Add to active sessions set
-            if session.status == 'active':
-                self.redis_client.sadd('active_call_sessions', session.call_id)
-            else:
-                self.redis_client.srem('active_call_sessions', session.call_id)
+            with tracer.span("redis_write", call_id=session.call_id, key="call_session"):
+                # Store main session data
+                self.redis_client.hset(session_key, 'data', json.dumps(session_data))
+                
+                # Set expiration (keep for 24 hours after last activity)
+                expire_time = int((session.last_activity + timedelta(hours=24)).timestamp())
+                self.redis_client.expireat(session_key, expire_time)
+                
+                # Add to active sessions set
+                if session.status == 'active':
+                    self.redis_client.sadd('active_call_sessions', session.call_id)
+                else:
+                    self.redis_client.srem('active_call_sessions', session.call_id)
                 
             logger.debug(f"🔍 [session] Successfully stored session {session.call_id} in Redis")
             return True
@@ -922,6 +932,24 @@ class CallSessionManager:
             logger.error(f"❌ Failed to store session {session.call_id} in Redis: {e}")
             return False
     
+    def count_window(self, call_id: str, counter: str) -> None:
+        """
+        Increment a per-call streaming window counter (windows_submitted,
+        windows_empty) kept next to the session data, so dropped windows can
+        be told apart from silent ones
+        """
+        if not self.redis_client:
+            from ..config.settings import redis_task_client
+            self.redis_client = redis_task_client
+
+        if not self.redis_client:
+            return
+
+        try:
+            self.redis_client.hincrby(f"call_session:{call_id}", counter, 1)
+        except Exception as e:
+            logger.error(f"❌ Failed to count {counter} for call {call_id}: {e}")
+
     def _get_session_from_redis(self, call_id: str) -> Optional[Dict]:
         """Retrieve session from Redis"""
         # Ensure we have a Redis client
@@ -978,6 +1006,19 @@ class CallSessionManager:
         if inactive_sessions:
             logger.info(f"🧹 [session] Cleaned up {len(inactive_sessions)} inactive sessions")
     
+    def _prefetch_recording(self, session: CallSession):
+        """Kick off a background download of the call recording for post-call processing"""
+        try:
+            download_config = session.processing_plan.get("postcall_processing", {}).get("audio_download", {})
+            if download_config.get("method", "scp") != "scp":
+                return
+            
+            scp_config = download_config.get("config") or None
+            if prefetch_audio(session.call_id, scp_config):
+                logger.info(f"📥 [session] Prefetching recording for call {session.call_id}")
+        except Exception as e:
+            logger.warning(f"⚠️ [session] Recording prefetch failed for {session.call_id}: {e}")
+    
     async def _download_and_process_audio_with_mode(self, session: CallSession):
         """Download complete audio file using configured method based on processing mode"""
         try:
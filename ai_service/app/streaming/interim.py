@@ -0,0 +1,127 @@
+# app/streaming/interim.py
+"""
+Interim Transcript Scheduler
+
+Decides when the streaming server submits an interim (greedy, is_final=false)
+decode of the window a call is still recording. The final beam-search decode
+of the window replaces it once the window is cut.
+
+Interim decodes share the worker with final decodes, so they are throttled to
+never hold finals up:
+
+- At most one interim per call per interval_seconds of new audio.
+- At most one interim in flight per call; a new one waits until the previous
+  finished (or max_age_seconds passed).
+- None while the broker queue has work waiting (finals come first).
+- Interim tasks expire after max_age_seconds, so any that end up queued behind
+  finals are discarded by the worker without decoding.
+"""
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from ..config.settings import settings
+from ..core.metrics import record_interim_transcript
+
+logger = logging.getLogger(__name__)
+
+
+class InterimScheduler:
+    """Per-call throttle for interim transcript decodes."""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        interval_seconds: float = 1.0,
+        max_age_seconds: float = 2.0,
+        controller=None
+    ):
+        self.enabled = enabled
+        self.interval_seconds = interval_seconds
+        self.max_age_seconds = max_age_seconds
+        self._controller = controller
+        self._calls: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"submitted": 0, "skipped_busy": 0, "skipped_inflight": 0}
+
+    @classmethod
+    def from_settings(cls) -> "InterimScheduler":
+        """Build a scheduler from the interim transcript settings."""
+        return cls(
+            enabled=settings.streaming_interim_enabled,
+            interval_seconds=settings.streaming_interim_interval_seconds,
+            max_age_seconds=settings.streaming_interim_max_age_seconds,
+        )
+
+    @property
+    def controller(self):
+        if self._controller is None:
+            from .window_controller import window_controller
+            self._controller = window_controller
+        return self._controller
+
+    def should_submit(self, call_id: str, window_id: int, pending_seconds: float,
+                      now: Optional[float] = None) -> bool:
+        """True when an interim decode of the call's current window is due and allowed."""
+        if not self.enabled:
+            return False
+
+        now = time.monotonic() if now is None else now
+        state = self._calls.get(call_id)
+        if state is None or state["window_id"] != window_id:
+            state = {"window_id": window_id, "audio_seconds": 0.0, "result": None, "submitted_at": None}
+            self._calls[call_id] = state
+
+        if pending_seconds - state["audio_seconds"] < self.interval_seconds:
+            return False
+
+        if self._in_flight(state, now):
+            return self._skip(state, pending_seconds, "skipped_inflight")
+
+        depth = self.controller.queue_depth()
+        if depth:
+            return self._skip(state, pending_seconds, "skipped_busy")
+        return True
+
+    def submitted(self, call_id: str, result, pending_seconds: float, now: Optional[float] = None) -> None:
+        """Remember the interim just submitted for the call's current window."""
+        state = self._calls.get(call_id)
+        if state is None:
+            return
+        state["result"] = result
+        state["submitted_at"] = time.monotonic() if now is None else now
+        state["audio_seconds"] = pending_seconds
+        self.stats["submitted"] += 1
+        record_interim_transcript("submitted")
+
+    def forget(self, call_id: str) -> None:
+        """Drop a call's state when its connection closes."""
+        self._calls.pop(call_id, None)
+
+    def _in_flight(self, state: Dict[str, Any], now: float) -> bool:
+        if state["result"] is None or now - state["submitted_at"] >= self.max_age_seconds:
+            return False
+        try:
+            return not state["result"].ready()
+        except Exception:
+            return False
+
+    def _skip(self, state: Dict[str, Any], pending_seconds: float, reason: str) -> bool:
+        # Wait another interval of audio before trying again
+        state["audio_seconds"] = pending_seconds
+        self.stats[reason] += 1
+        record_interim_transcript(reason)
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Configuration, calls being tracked and throttle counters."""
+        return {
+            "enabled": self.enabled,
+            "interval_seconds": self.interval_seconds,
+            "max_age_seconds": self.max_age_seconds,
+            "calls": len(self._calls),
+            **self.stats,
+        }
+
+
+# Global instance
+interim_scheduler = InterimScheduler.from_settings()
@@ -6,6 +6,9 @@ from dataclasses import dataclass, asdict
 import asyncio
 import json
 
+from ..model_scripts.ner_batcher import ner_batcher
+from .translation_memo import TranslationMemo
+
 logger = logging.getLogger(__name__)
 
 # Import notification service
@@ -61,9 +64,13 @@ class ProgressiveProcessor:
         self.target_window_chars = 300  # Target window size
         self.overlap_chars = 50  # Overlap between windows for context
         self.processing_interval = timedelta(seconds=30)  # Min time between processing
+        self.translation_memo_size = 1000  # Distinct sentences remembered per call
         
         # Track processing state per call
         self.call_analyses: Dict[str, ProgressiveAnalysis] = {}
+        # Sentence translations per call, so window overlaps are never re-translated
+        self.translation_memos: Dict[str, TranslationMemo] = {}
+        self.call_transcripts: Dict[str, str] = {}
         
     async def should_process_window(self, call_id: str, transcript: str) -> bool:
         """Determine if we should create a new processing window"""
@@ -140,8 +147,14 @@ class ProgressiveProcessor:
         
         return window
     
-    async def process_window(self, call_id: str, window: ProcessingWindow) -> ProcessingWindow:
-        """Process a window through translation, NER, and classification"""
+    async def process_window(self, call_id: str, window: ProcessingWindow,
+                             transcript: Optional[str] = None) -> ProcessingWindow:
+        """
+        Process a window through translation, NER, and classification
+        
+        transcript is the call's cumulative transcript the window was cut
+        from; without it the window text is taken as the transcript.
+        """
         
         start_time = datetime.now()
         
@@ -154,18 +167,25 @@ class ProgressiveProcessor:
             if not models:
                 raise RuntimeError("Models not available for progressive processing")
             
-            # Step 1: Translation
+            # Step 1: Translation of the sentences completed since the last window
             translator_model = models.models.get("translator")
             if translator_model and window.text_content:
-                logger.info(f"🌐 Translating window {window.window_id} for call {call_id}")
-                window.translation = translator_model.translate(window.text_content)
+                if transcript is None:
+                    transcript = window.text_content
+                memo = self._get_translation_memo(call_id)
+                self.call_transcripts[call_id] = transcript
+                new_sentences = memo.update(transcript[:window.end_position], translator_model.translate)
+                logger.info(f"🌐 Translated {len(new_sentences)} new sentences for window {window.window_id} of call {call_id}")
+                # The window's translation (overlap included) comes from the memo
+                window.translation = memo.translation_for(window.start_position, window.end_position) or None
             
             # Step 2: NER on translated text (or original if no translation)
             ner_text = window.translation if window.translation else window.text_content
             ner_model = models.models.get("ner")
             if ner_model and ner_text:
                 logger.info(f"🏷️ Extracting entities from window {window.window_id} for call {call_id}")
-                window.entities = ner_model.extract_entities(ner_text, flat=False)
+                # Batched with the windows of other calls being processed at the same time
+                window.entities = await ner_batcher.extract_async(ner_model, ner_text, flat=False)
             
             # Step 3: Classification on translated text
             classifier_model = models.models.get("classifier_model") 
@@ -204,18 +224,23 @@ class ProgressiveProcessor:
             logger.error(f"Failed to get models: {e}")
             return None
     
+    def _get_translation_memo(self, call_id: str) -> TranslationMemo:
+        if call_id not in self.translation_memos:
+            self.translation_memos[call_id] = TranslationMemo(
+                max_entries=self.translation_memo_size,
+                max_sentence_chars=self.target_window_chars * 2
+            )
+        return self.translation_memos[call_id]
+    
     async def _update_cumulative_analysis(self, call_id: str, window: ProcessingWindow):
         """Update cumulative analysis with new window results"""
         
         analysis = self.call_analyses[call_id]
         
-        # Update cumulative translation with smart concatenation
-        if window.translation:
-            analysis.cumulative_translation = self._merge_translation(
-                analysis.cumulative_translation, 
-                window.translation,
-                window.start_position > 0  # Has overlap if not first window
-            )
+        # Cumulative translation is assembled from the call's sentence translations
+        memo = self.translation_memos.get(call_id)
+        if memo:
+            analysis.cumulative_translation = memo.cumulative_translation
         
         # Update latest entities and track evolution
         if window.entities:
@@ -252,54 +277,13 @@ class ProgressiveProcessor:
             'classification_trend': [c['main_category'] for c in analysis.classification_evolution[-5:]]  # Last 5
         }
     
-    def _merge_translation(self, existing: str, new_translation: str, has_overlap: bool) -> str:
-        """Merge translations with overlap handling"""
-        
-        if not existing:
-            return new_translation
-        
-        if not new_translation:
-            return existing
-        
-        if not has_overlap:
-            # No overlap, simple concatenation
-            return existing + " " + new_translation
-        
-        # Try to find overlap and merge intelligently
-        existing_words = existing.split()
-        new_words = new_translation.split()
-        
-        # Look for overlap (last few words of existing match first few words of new)
-        max_overlap = min(10, len(existing_words), len(new_words))
-        best_overlap = 0
-        
-        for overlap_size in range(max_overlap, 0, -1):
-            existing_end = existing_words[-overlap_size:]
-            new_start = new_words[:overlap_size]
-            
-            # Check for exact match or high similarity
-            if existing_end == new_start:
-                best_overlap = overlap_size
-                break
-        
-        if best_overlap > 0:
-            # Remove overlapping words from new translation
-            merged_new_words = new_words[best_overlap:]
-            if merged_new_words:
-                return existing + " " + " ".join(merged_new_words)
-            else:
-                return existing
-        else:
-            # No overlap found, concatenate with separator
-            return existing + " " + new_translation
-    
     async def process_if_ready(self, call_id: str, transcript: str) -> Optional[ProcessingWindow]:
         """Check if ready and process new window if needed"""
         
         try:
             if await self.should_process_window(call_id, transcript):
                 window = self.create_processing_window(call_id, transcript)
-                processed_window = await self.process_window(call_id, window)
+                processed_window = await self.process_window(call_id, window, transcript)
                 
                 # Store analysis in Redis for persistence
                 await self._store_analysis_in_redis(call_id)
@@ -320,8 +304,12 @@ class ProgressiveProcessor:
             return None
         
         analysis = self.call_analyses[call_id]
+        summary = None
         
         try:
+            # Translate the sentence still open when the last window was processed
+            await self._flush_translation(call_id)
+            
             # Trigger summarization if we have substantial content
             if len(analysis.cumulative_translation) > 100:
                 summary = await self._generate_final_summary(call_id, analysis)
@@ -372,6 +360,29 @@ class ProgressiveProcessor:
         except Exception as e:
             logger.error(f"❌ Failed to finalize analysis for call {call_id}: {e}")
             return None
+        finally:
+            self.translation_memos.pop(call_id, None)
+            self.call_transcripts.pop(call_id, None)
+    
+    async def _flush_translation(self, call_id: str):
+        """Translate the transcript text after the last sentence boundary"""
+        
+        memo = self.translation_memos.get(call_id)
+        transcript = self.call_transcripts.get(call_id)
+        if not memo or not transcript or not transcript[memo.position:].strip():
+            return
+        
+        try:
+            models = await self._get_models_async()
+            translator_model = models.models.get("translator") if models else None
+            if not translator_model:
+                return
+            
+            memo.update(transcript, translator_model.translate, final=True)
+            self.call_analyses[call_id].cumulative_translation = memo.cumulative_translation
+            logger.info(f"🌐 Translation memo for call {call_id}: {memo.get_stats()}")
+        except Exception as e:
+            logger.error(f"❌ Failed to translate the end of call {call_id}: {e}")
     
     async def _generate_final_summary(self, call_id: str, analysis: ProgressiveAnalysis) -> Optional[str]:
         """Generate final summary of the call"""
@@ -1,13 +1,16 @@
 # app/streaming/tcp_server.py - Updated to use Celery and Call Session Management
 import asyncio
+import time
 import logging
 import numpy as np
 from typing import Dict, Optional
 from datetime import datetime
 
-from .audio_buffer import AsteriskAudioBuffer
+from .audio_buffer import AsteriskAudioBuffer, adaptive_window_config
 from .call_session_manager import call_session_manager
-from ..tasks.audio_tasks import process_streaming_audio_task  # Use your existing Celery tasks
+from .interim import interim_scheduler
+from ..core.tracing import tracer
+from ..tasks.audio_tasks import process_streaming_audio_task, process_streaming_interim_task  # Use your existing Celery tasks
 
 logger = logging.getLogger(__name__)
 
@@ -45,17 +48,18 @@ class AsteriskTCPServer:
                     logger.info(f"🔌 [client] Connection closed by {client_addr}")
                     break
                 
-                # Header inspection - log first few packets in detail
-                if packet_count <= 10:
-                    logger.info(f"🔍 [header] Packet {packet_count}: {len(data)} bytes")
-                    logger.info(f"🔍 [header] Hex dump: {data[:min(64, len(data))].hex()}")
-                    logger.info(f"🔍 [header] ASCII: {data[:min(64, len(data))].decode('ascii', errors='replace')}")
+                # Header inspection - log first few packets in detail (debug only,
+                # so the dumps are skipped entirely and shed first under load)
+                if packet_count <= 10 and logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"🔍 [header] Packet {packet_count}: {len(data)} bytes")
+                    logger.debug(f"🔍 [header] Hex dump: {data[:min(64, len(data))].hex()}")
+                    logger.debug(f"🔍 [header] ASCII: {data[:min(64, len(data))].decode('ascii', errors='replace')}")
                     
                     # Look for potential call ID patterns
                     if b'CALL' in data or b'call' in data:
-                        logger.info(f"🔍 [header] CALL keyword found in packet {packet_count}")
+                        logger.debug(f"🔍 [header] CALL keyword found in packet {packet_count}")
                     if any(char.isdigit() for char in data.decode('ascii', errors='ignore')):
-                        logger.info(f"🔍 [header] Digits found in packet {packet_count}")
+                        logger.debug(f"🔍 [header] Digits found in packet {packet_count}")
                 
                 if not audio_mode:
                     # Handle UID protocol - extract call ID
@@ -74,7 +78,7 @@ class AsteriskTCPServer:
                                 call_session = await call_session_manager.start_session(call_id, connection_info)
                                 
                                 # Create audio buffer for this call
-                                audio_buffer = AsteriskAudioBuffer()
+                                audio_buffer = AsteriskAudioBuffer(**adaptive_window_config())
                                 
                                 # Track active connection
                                 self.active_connections[call_id] = {
@@ -99,13 +103,17 @@ class AsteriskTCPServer:
                     
                     if audio_array is not None:
                         # Submit to Celery for transcription with call session tracking
-                        await self._submit_transcription(audio_array, call_id)
+                        await self._submit_transcription(audio_array, call_id, audio_buffer.last_window)
+                    elif interim_scheduler.enabled and self._realtime_enabled(call_session) and \
+                            interim_scheduler.should_submit(call_id, audio_buffer.window_count, audio_buffer.pending_seconds()):
+                        self._submit_interim(audio_buffer, call_id)
                     
         except Exception as e:
             logger.error(f"❌ [client] Error handling connection {temp_connection_id}: {e}")
         finally:
             # Cleanup connection and end call session
             if call_id:
+                interim_scheduler.forget(call_id)
                 try:
                     # End call session
                     await call_session_manager.end_session(call_id, reason="connection_closed")
@@ -122,7 +130,7 @@ class AsteriskTCPServer:
             await writer.wait_closed()
             logger.info(f"🧹 Connection closed: {temp_connection_id}")
             
-    async def _submit_transcription(self, audio_array: np.ndarray, call_id: str):
+    async def _submit_transcription(self, audio_array: np.ndarray, call_id: str, window: Optional[Dict] = None):
         """Submit transcription to Celery worker with call session tracking"""
         try:
             # Check if real-time processing is enabled for this session
@@ -143,22 +151,60 @@ class AsteriskTCPServer:
             timestamp = datetime.now().strftime("%H%M%S%f")[:-3]  # milliseconds
             filename = f"call_{call_id}_{timestamp}.wav"
             
-            # Submit to streaming transcription task
-            task = process_streaming_audio_task.delay(
-                audio_bytes=audio_bytes,
-                filename=filename,
-                connection_id=call_id,  # Now using call_id
-                language="sw",
-                sample_rate=16000,
-                duration_seconds=5.0,
-                is_streaming=True
-            )
+            # Each window is a trace: buffer fill, enqueue, then the worker's stages
+            # (the trace travels to the worker in the task message headers)
+            with tracer.span("window", call_id=call_id, window_id=window.get("window_id") if window else None):
+                if window:
+                    tracer.record_span("buffer_fill", window["start_time"], window["end_time"],
+                                       audio_seconds=window.get("duration_seconds"), cut_reason=window.get("cut_reason"))
+                with tracer.span("enqueue", task="process_streaming_audio_task"):
+                    task = process_streaming_audio_task.delay(
+                        audio_bytes=audio_bytes,
+                        filename=filename,
+                        connection_id=call_id,  # Now using call_id
+                        language="sw",
+                        sample_rate=16000,
+                        duration_seconds=window["new_audio_seconds"] if window else len(audio_array) / 16000,
+                        is_streaming=True,
+                        window_end_time=window["end_time"] if window else time.time(),
+                        window_id=window.get("window_id") if window else None,
+                        window_start_time=window.get("start_time") if window else None,
+                        stream_end_seconds=window.get("stream_end_seconds") if window else None
+                    )
+            call_session_manager.count_window(call_id, "windows_submitted")
             
             logger.info(f"🎵 Submitted transcription task {task.id} for call {call_id}")
             
         except Exception as e:
             logger.error(f"❌ Failed to submit transcription for call {call_id}: {e}")
             
+    @staticmethod
+    def _realtime_enabled(session) -> bool:
+        if session is None:
+            return False
+        return session.processing_plan.get("realtime_processing", {}).get("enabled", False)
+
+    def _submit_interim(self, audio_buffer: AsteriskAudioBuffer, call_id: str):
+        """Submit a greedy decode of the window still being recorded (is_final=false)"""
+        try:
+            pending_seconds = audio_buffer.pending_seconds()
+            result = process_streaming_interim_task.apply_async(
+                kwargs={
+                    "audio_bytes": audio_buffer.partial_window(),
+                    "call_id": call_id,
+                    "window_id": audio_buffer.window_count,
+                    "window_start_time": audio_buffer.window_started_at,
+                    "language": "sw",
+                    "sample_rate": 16000
+                },
+                # Discarded unexecuted if stuck behind final decodes
+                expires=interim_scheduler.max_age_seconds
+            )
+            interim_scheduler.submitted(call_id, result, pending_seconds)
+            logger.debug(f"💬 Submitted interim decode {result.id} for call {call_id} ({pending_seconds:.1f}s)")
+        except Exception as e:
+            logger.error(f"❌ Failed to submit interim decode for call {call_id}: {e}")
+
     async def start_server(self):
         """Start TCP server"""
         try:
@@ -200,5 +246,6 @@ class AsteriskTCPServer:
             "active_connections": len(self.active_connections),
             "call_sessions": connection_stats,
             "transcription_method": "celery_workers",
+            "interim_transcripts": interim_scheduler.get_stats(),
             "tcp_port": self.port
         }
\ No newline at end of file
@@ -0,0 +1,116 @@
+# app/streaming/translation_memo.py
+"""
+Per-call sentence translation memo for progressive processing
+
+Progressive windows overlap, so translating each window's text re-translates
+the overlap and leaves the cumulative translation to be stitched together by
+guessing where the windows meet. The memo instead follows the cumulative
+transcript sentence by sentence:
+
+- Only sentences completed since the last update are split off and
+  translated; text after the last sentence boundary waits for the next
+  update (or for the end of the call).
+- Each sentence is translated at most once, keyed by its normalized text, so
+  a repeated sentence ("Hello?", "Okay.") reuses its translation.
+- The cumulative translation is the translations of the sentences in order.
+
+Sentence boundaries are fixed once a sentence is taken, so a later window
+never changes an earlier sentence.
+"""
+import logging
+import re
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Terminal punctuation (with any closing quotes or brackets) followed by whitespace or the end of the text
+_SENTENCE_END = re.compile(r'[.!?]+["\')\]]*(?=\s|$)')
+
+
+def normalize_sentence(sentence: str) -> str:
+    """Memo key for a sentence: lowercased with whitespace collapsed"""
+    return " ".join(sentence.lower().split())
+
+
+class TranslationMemo:
+    """Sentence-level translations of one call's cumulative transcript."""
+
+    def __init__(self, max_entries: int = 1000, max_sentence_chars: int = 600):
+        self.max_entries = max_entries
+        # Unpunctuated speech still gets translated once this much text waits without a boundary
+        self.max_sentence_chars = max_sentence_chars
+        self.position = 0  # transcript offset up to which sentences have been taken
+        self.sentences: List[Tuple[int, int]] = []  # (start, end) of each sentence in the transcript
+        self.parts: List[str] = []  # translation of each sentence
+        self._memo: "OrderedDict[str, str]" = OrderedDict()
+        self.stats = {"sentences": 0, "translated": 0, "reused": 0}
+
+    def update(self, transcript: str, translate: Callable[[str], str], final: bool = False) -> List[str]:
+        """
+        Translate the sentences completed in transcript since the last update
+
+        transcript is the call's cumulative transcript (it only grows). With
+        final, the text after the last sentence boundary is taken as a
+        sentence too. Returns the translations of the new sentences.
+        """
+        new_parts = []
+        for start, end in self._complete_sentences(transcript, final):
+            sentence = transcript[start:end].strip()
+            if sentence:
+                # A failed translation leaves the sentence for the next update
+                translation = self._translate(sentence, translate)
+                self.sentences.append((transcript.index(sentence, start), end))
+                self.parts.append(translation)
+                new_parts.append(translation)
+            self.position = end
+        return new_parts
+
+    def _complete_sentences(self, transcript: str, final: bool) -> List[Tuple[int, int]]:
+        spans = []
+        start = self.position
+        for match in _SENTENCE_END.finditer(transcript, self.position):
+            spans.append((start, match.end()))
+            start = match.end()
+
+        # Long unpunctuated stretches are cut at a word boundary
+        while len(transcript) - start > self.max_sentence_chars:
+            cut = transcript.rfind(" ", start, start + self.max_sentence_chars)
+            end = cut if cut > start else start + self.max_sentence_chars
+            spans.append((start, end))
+            start = end
+
+        if final and transcript[start:].strip():
+            spans.append((start, len(transcript)))
+        return spans
+
+    def _translate(self, sentence: str, translate: Callable[[str], str]) -> str:
+        key = normalize_sentence(sentence)
+        self.stats["sentences"] += 1
+        if key in self._memo:
+            self._memo.move_to_end(key)
+            self.stats["reused"] += 1
+            return self._memo[key]
+
+        translation = translate(sentence) or ""
+        self._memo[key] = translation
+        self.stats["translated"] += 1
+        if len(self._memo) > self.max_entries:
+            self._memo.popitem(last=False)
+        return translation
+
+    def translation_for(self, start: int, end: Optional[int] = None) -> str:
+        """Translation of the sentences overlapping transcript[start:end]"""
+        return " ".join(
+            part for (s, e), part in zip(self.sentences, self.parts)
+            if e > start and (end is None or s < end) and part
+        )
+
+    @property
+    def cumulative_translation(self) -> str:
+        """Translation of every sentence taken so far, in order"""
+        return " ".join(part for part in self.parts if part)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Sentence counters and memo size."""
+        return {**self.stats, "memo_entries": len(self._memo), "position": self.position}
@@ -1,12 +1,13 @@
 # app/streaming/websocket_server.py - WebSocket server for Asterisk
 import asyncio
+import time
 import logging
 import numpy as np
-from typing import Dict
+from typing import Dict, Optional
 from datetime import datetime
 from fastapi import WebSocket, WebSocketDisconnect
 
-from .audio_buffer import AsteriskAudioBuffer
+from .audio_buffer import AsteriskAudioBuffer, adaptive_window_config
 from ..tasks.audio_tasks import process_streaming_audio_task
 
 logger = logging.getLogger(__name__)
@@ -27,7 +28,7 @@ class AsteriskWebSocketManager:
         logger.info(f"🎙️ [WebSocket] Connection from {client_info} → {connection_id}")
         
         # Create buffer for this connection
-        audio_buffer = AsteriskAudioBuffer()
+        audio_buffer = AsteriskAudioBuffer(**adaptive_window_config())
         self.active_connections[connection_id] = {
             "websocket": websocket,
             "buffer": audio_buffer,
@@ -60,7 +61,7 @@ class AsteriskWebSocketManager:
                     
                     if audio_array is not None:
                         # Submit to Celery for transcription
-                        await self._submit_transcription(audio_array, connection_id)
+                        await self._submit_transcription(audio_array, connection_id, audio_buffer.last_window)
                 else:
                     logger.warning(f"⚠️ [WebSocket] Unexpected data size: {len(data)} bytes (expected 640)")
                     
@@ -74,7 +75,7 @@ class AsteriskWebSocketManager:
                 del self.active_connections[connection_id]
             logger.info(f"🧹 Cleaned up WebSocket connection {connection_id}")
             
-    async def _submit_transcription(self, audio_array: np.ndarray, connection_id: str):
+    async def _submit_transcription(self, audio_array: np.ndarray, connection_id: str, window: Optional[Dict] = None):
         """Submit transcription to Celery worker"""
         try:
             # Convert numpy array to bytes for Celery (same as TCP version)
@@ -91,8 +92,11 @@ class AsteriskWebSocketManager:
                 connection_id=connection_id,
                 language="sw",  # Default to Swahili, can be made configurable
                 sample_rate=16000,
-                duration_seconds=5.0,
-                is_streaming=True
+                duration_seconds=window["new_audio_seconds"] if window else len(audio_array) / 16000,
+                is_streaming=True,
+                window_end_time=window["end_time"] if window else time.time(),
+                window_id=window.get("window_id") if window else None,
+                window_start_time=window.get("start_time") if window else None
             )
             
             logger.info(f"🎵 [WebSocket] Submitted transcription task {task.id} for {connection_id}")
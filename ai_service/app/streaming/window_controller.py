@@ -0,0 +1,142 @@
+# app/streaming/window_controller.py
+"""
+Window Controller
+
+Chooses the target length of live transcription windows so calls hold a target
+end-to-end latency (window start to transcript) without overrunning the
+workers.
+
+- Workers idle: narrow windows towards target latency minus the worker's
+  processing time, so transcripts arrive sooner.
+- Worker queue at or above the high watermark: widen windows. Fewer, longer
+  windows cost less per second of audio (fixed per-task overhead), letting the
+  workers catch up at the price of latency.
+- Otherwise, or when the queue depth is unknown or stale: hold.
+
+Inputs come from the Celery cluster-state cache (queue lengths sampled by the
+API process, task runtimes from task-succeeded events), so an update is a few
+dictionary reads. One controller is shared by every call in the process.
+"""
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from ..config.settings import settings
+from ..core.metrics import update_streaming_window_target
+
+logger = logging.getLogger(__name__)
+
+STREAMING_TASK_NAME = "process_streaming_audio_task"
+
+
+class WindowController:
+    """Queue-depth feedback controller for the live transcription window length."""
+
+    def __init__(
+        self,
+        min_window_seconds: float = 2.0,
+        max_window_seconds: float = 8.0,
+        target_latency_seconds: float = 6.0,
+        high_watermark: int = 4,
+        widen_factor: float = 1.25,
+        narrow_factor: float = 0.9,
+        update_interval: float = 1.0,
+        default_service_seconds: float = 1.0,
+        monitor=None
+    ):
+        self.min_window_seconds = min_window_seconds
+        self.max_window_seconds = max(max_window_seconds, min_window_seconds)
+        self.target_latency_seconds = target_latency_seconds
+        self.high_watermark = high_watermark
+        self.widen_factor = widen_factor
+        self.narrow_factor = narrow_factor
+        self.update_interval = update_interval
+        self.default_service_seconds = default_service_seconds
+        self._monitor = monitor
+
+        self.window_seconds = self._clamp(target_latency_seconds - default_service_seconds)
+        self._last_update: Optional[float] = None
+        self.last_queue_depth: Optional[int] = None
+        self.stats = {"updates": 0, "widened": 0, "narrowed": 0, "held": 0}
+
+    @classmethod
+    def from_settings(cls) -> "WindowController":
+        """Build a controller from the streaming window settings."""
+        return cls(
+            min_window_seconds=settings.streaming_min_window_seconds,
+            max_window_seconds=settings.streaming_max_window_seconds,
+            target_latency_seconds=settings.streaming_target_latency_seconds,
+            high_watermark=settings.streaming_queue_high_watermark,
+        )
+
+    @property
+    def monitor(self):
+        if self._monitor is None:
+            from ..core.celery_monitor import celery_monitor
+            self._monitor = celery_monitor
+        return self._monitor
+
+    def _clamp(self, window_seconds: float) -> float:
+        return min(max(window_seconds, self.min_window_seconds), self.max_window_seconds)
+
+    def queue_depth(self) -> Optional[int]:
+        """Tasks waiting in the monitored queues, or None if the sample is stale."""
+        monitor = self.monitor
+        if monitor.queues_updated_at is None:
+            return None
+        if time.time() - monitor.queues_updated_at > max(monitor.stale_after, 2 * monitor.sample_interval):
+            return None
+        return sum(monitor.queue_lengths.values())
+
+    def service_seconds(self) -> float:
+        """Recent processing time of one streaming window on a worker."""
+        return self.monitor.task_runtimes.get(STREAMING_TASK_NAME, self.default_service_seconds)
+
+    def update(self, now: Optional[float] = None) -> float:
+        """Adjust the target window at most once per update_interval; returns it."""
+        now = time.monotonic() if now is None else now
+        if self._last_update is not None and now - self._last_update < self.update_interval:
+            return self.window_seconds
+        self._last_update = now
+        self.stats["updates"] += 1
+
+        depth = self.queue_depth()
+        self.last_queue_depth = depth
+        previous = self.window_seconds
+
+        if depth is not None and depth >= self.high_watermark:
+            self.window_seconds = self._clamp(previous * self.widen_factor)
+        elif depth == 0:
+            desired = self._clamp(self.target_latency_seconds - self.service_seconds())
+            if previous > desired:
+                self.window_seconds = max(previous * self.narrow_factor, desired)
+            else:
+                self.window_seconds = min(previous * self.widen_factor, desired)
+
+        if self.window_seconds > previous:
+            self.stats["widened"] += 1
+            logger.info(f"🪟 Streaming window widened to {self.window_seconds:.1f}s (queue depth {depth})")
+        elif self.window_seconds < previous:
+            self.stats["narrowed"] += 1
+            logger.debug(f"🪟 Streaming window narrowed to {self.window_seconds:.1f}s")
+        else:
+            self.stats["held"] += 1
+
+        update_streaming_window_target(self.window_seconds)
+        return self.window_seconds
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current target window and controller counters."""
+        return {
+            "window_seconds": round(self.window_seconds, 2),
+            "min_window_seconds": self.min_window_seconds,
+            "max_window_seconds": self.max_window_seconds,
+            "target_latency_seconds": self.target_latency_seconds,
+            "high_watermark": self.high_watermark,
+            "last_queue_depth": self.last_queue_depth,
+            **self.stats,
+        }
+
+
+# Global instance
+window_controller = WindowController.from_settings()
@@ -5,15 +5,20 @@ from celery.signals import worker_init
 from ..celery_app import celery_app
 import logging
 import asyncio
+import time
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone
 from ..config.settings import redis_task_client, settings
 from ..core.metrics import (
     celery_task_duration_seconds,
     celery_tasks_total,
+    record_interim_transcript,
+    record_streaming_latency,
+    record_time_to_first_word,
     record_upload_size
 )
 from ..core.insights_service import generate_case_insights
+from ..core.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -496,6 +501,41 @@ def process_audio_task(self, audio_bytes, filename, language=None, include_trans
         # Let Celery handle the failure automatically
         raise RuntimeError(error_msg)
 
+
+_progress_redis = None
+
+
+def _get_progress_redis():
+    """Synchronous Redis client for progress updates, shared by all tasks of this worker"""
+    global _progress_redis
+    if _progress_redis is None:
+        import redis
+        from ..config.settings import get_redis_url
+        _progress_redis = redis.from_url(get_redis_url(), decode_responses=True)
+    return _progress_redis
+
+
+def _run_shared_heads(classifier_model, text: str, threshold: float):
+    """(classification, qa_score) from one shared DistilBERT pass, or None to run the models separately"""
+    try:
+        from ..model_scripts.classifier_model import ClassifierModel
+        from ..model_scripts.qa_model import qa_model
+        from ..model_scripts.multi_head_inference import multi_head_inference
+
+        if not isinstance(classifier_model, ClassifierModel):
+            return None
+        return multi_head_inference.run(classifier_model, qa_model, text, threshold=threshold)
+    except Exception as e:
+        logger.warning(f"⚠️ Shared classifier/QA inference failed, running the models separately: {e}")
+        return None
+
+
+def _record_stage(name: str, step_start: datetime, status: Dict[str, Any]):
+    """Add a finished pipeline stage to the task's trace"""
+    error = status.get("error")
+    tracer.record_span(name, step_start.timestamp(), status=status.get("status"), error=str(error) if error else None)
+
+
 def _process_audio_sync_worker(
     task_instance,
     models,  # Use worker models instead of global model_loader
@@ -540,37 +580,16 @@ def _process_audio_sync_worker(
     def publish_update(step, progress, message=None, partial_result=None, metadata=None):
         """Sync wrapper to publish streaming updates"""
         try:
-            # Use synchronous Redis client for Celery worker compatibility
-            import redis
-            from ..config.settings import get_redis_url
-            
-            # Create synchronous Redis client
-            redis_client = redis.from_url(get_redis_url(), decode_responses=True)
-            
-            # Build update message
-            update = {
-                "task_id": task_id,
-                "step": step,
-                "progress": progress,
-                "timestamp": datetime.now().isoformat(),
-                "message": message or f"Processing: {step}"
-            }
-            
-            if partial_result:
-                update["partial_result"] = partial_result
+            from ..core.streaming import new_progress_update, publish_progress_sync
             
-            if metadata:
-                update["metadata"] = metadata
-            
-            # Publish to Redis channel
-            channel = f"audio_stream:{task_id}"
-            subscribers = redis_client.publish(channel, json.dumps(update))
+            # Build update message, keep it for late subscribers and publish it
+            update = new_progress_update(task_id, step, progress, message, partial_result, metadata)
+            with tracer.span("redis_write", key="progress", step=step):
+                subscribers = publish_progress_sync(_get_progress_redis(), task_id, update)
             
             if subscribers > 0:
                 logger.debug(f"📡 Published {step} update for task {task_id} to {subscribers} subscribers")
             
-            redis_client.close()
-            
         except Exception as e:
             logger.error(f"❌ Failed to publish update for {step}: {e}")
     
@@ -636,6 +655,7 @@ def _process_audio_sync_worker(
         "status": "completed",
         "output_length": len(transcript)
     }
+    _record_stage("transcription", step_start, processing_steps["transcription"])
     
     # Step 2: Translation (if enabled, always use custom translator)
     if include_translation:
@@ -689,6 +709,8 @@ def _process_audio_sync_worker(
                 "error": str(e)
             }
 
+        _record_stage("translation", step_start, processing_steps["translation"])
+
         # Publish final translation result (if any translation was successful)
         if translation:
             translation_duration = (datetime.now() - step_start).total_seconds()
@@ -749,6 +771,8 @@ def _process_audio_sync_worker(
             "error": str(e)
         }
     
+    _record_stage("ner", step_start, ner_status)
+
     # Classification
     task_instance.update_state(
         state="PROCESSING",
@@ -757,12 +781,19 @@ def _process_audio_sync_worker(
     publish_update("classification", 70, "Classifying content...")
     
     step_start = datetime.now()
+    shared_qa_score = None
     try:
         classifier_model = models.models.get("classifier_model")
         if not classifier_model:
             publish_update("classification_error", 70, "Classifier model not available")
             raise RuntimeError("Classifier model not available")
-        classification = classifier_model.classify(nlp_text)
+
+        # Classifier and QA heads on one DistilBERT pass where the models allow it
+        shared = _run_shared_heads(classifier_model, nlp_text, threshold)
+        if shared:
+            classification, shared_qa_score = shared
+        else:
+            classification = classifier_model.classify(nlp_text)
         
         classification_duration = (datetime.now() - step_start).total_seconds()
         publish_update(
@@ -788,6 +819,8 @@ def _process_audio_sync_worker(
             "error": str(e)
         }
     
+    _record_stage("classification", step_start, classifier_status)
+
     # Summarization
     task_instance.update_state(
         state="PROCESSING",
@@ -827,6 +860,8 @@ def _process_audio_sync_worker(
             "error": str(e)
         }  
  
+    _record_stage("summarization", step_start, summary_status)
+
     # QA Scoring
     task_instance.update_state(
         state="PROCESSING",
@@ -839,10 +874,12 @@ def _process_audio_sync_worker(
         # ← FIXED: Import QA model directly (same as standalone QA endpoint)
         from ..model_scripts.qa_model import qa_model
         
-        if not qa_model.is_ready():
+        if shared_qa_score is not None:
+            qa_score = shared_qa_score  # computed with the classification
+        elif not qa_model.is_ready():
             raise RuntimeError("QA model not ready")
-        
-        qa_score = qa_model.predict(nlp_text, threshold=threshold, return_raw=return_raw)
+        else:
+            qa_score = qa_model.predict(nlp_text, threshold=threshold, return_raw=return_raw)
 
         qa_duration = (datetime.now() - step_start).total_seconds()
         
@@ -874,6 +911,8 @@ def _process_audio_sync_worker(
             "error": str(e)
         }
 
+    _record_stage("qa_scoring", step_start, qa_status)
+
     # Step 4: Insights (if enabled)
     insights = {}
     llm_insights = None
@@ -930,6 +969,7 @@ def _process_audio_sync_worker(
                 "fallback": "basic_insights_available"
             }
 
+        _record_stage("insights", llm_insights_start_time, llm_insights if isinstance(llm_insights, dict) else {})
 
         # Use ai-service insights as primary insights if available and successful
         # Otherwise fall back to basic insights
@@ -1028,7 +1068,8 @@ def _process_audio_sync_worker(
 
     # Send notifications to agent system
     try:
-        _send_pipeline_notifications(filename, result, task_id)
+        with tracer.span("notifications"):
+            _send_pipeline_notifications(filename, result, task_id)
     except Exception as e:
         logger.error(f"Failed to send pipeline notifications: {e}")
 
@@ -1186,12 +1227,23 @@ def process_streaming_audio_task(
     language: str = "sw",
     sample_rate: int = 16000,
     duration_seconds: float = 5.0,
-    is_streaming: bool = True
+    is_streaming: bool = True,
+    window_end_time: Optional[float] = None,
+    window_id: Optional[int] = None,
+    window_start_time: Optional[float] = None,
+    stream_end_seconds: Optional[float] = None
 ):
     """
     Process real-time streaming audio chunks from Asterisk with call session tracking
-    Mixed-mono audio (both caller and agent voices) in 5-second windows from 10ms chunks
+    Mixed-mono audio (both caller and agent voices) in adaptive windows from 10ms chunks
     Quick transcription only for low latency, adds to cumulative transcript
+
+    duration_seconds is the new audio in the window (excluding any overlap with the
+    previous window); window_end_time is when the buffer cut the window, used to
+    record end-to-end window latency. With interim transcripts enabled, the result
+    is also sent as the final (is_final=true) transcript of window_id.
+    stream_end_seconds (the window's end position in the call audio) is kept in
+    the segment metadata so load tests can match segments to the audio sent.
     """
     
     try:
@@ -1207,11 +1259,12 @@ def process_streaming_audio_task(
         whisper_model = models.models.get("whisper")
         if whisper_model:
             # Use the PCM processing method for transcription only
-            transcript = whisper_model.transcribe_pcm_audio(
-                audio_bytes,
-                sample_rate=sample_rate,
-                language=language
-            )
+            with tracer.span("transcription", audio_seconds=duration_seconds, window_id=window_id):
+                transcript = whisper_model.transcribe_pcm_audio(
+                    audio_bytes,
+                    sample_rate=sample_rate,
+                    language=language
+                )
 
             # No translation in streaming mode
             translation = None
@@ -1239,7 +1292,10 @@ def process_streaming_audio_task(
                     'task_id': self.request.id,
                     'processing_duration': processing_duration,
                     'filename': filename,
-                    'sample_rate': sample_rate
+                    'sample_rate': sample_rate,
+                    'window_id': window_id,
+                    'window_end_time': window_end_time,
+                    'stream_end_seconds': stream_end_seconds
                 }
                 
                 # Only add to session if we have actual content (not empty/filtered)
@@ -1248,32 +1304,47 @@ def process_streaming_audio_task(
                     updated_session = None
                     for retry in range(3):  # Try up to 3 times
                         try:
-                            updated_session = loop.run_until_complete(
-                                call_session_manager.add_transcription(
-                                    call_id,
-                                    transcript,
-                                    duration_seconds,
-                                    metadata
+                            with tracer.span("add_transcription", window_id=window_id):
+                                updated_session = loop.run_until_complete(
+                                    call_session_manager.add_transcription(
+                                        call_id,
+                                        transcript,
+                                        duration_seconds,
+                                        metadata
+                                    )
                                 )
-                            )
                             if updated_session:
                                 break
                             
                             # If session not found and this is first attempt, wait briefly for session creation
                             if retry < 2:
                                 logger.debug(f"🔄 Session {call_id} not ready, retry {retry + 1}/3 after 500ms")
-                                import time
                                 time.sleep(0.5)
                                 
                         except Exception as session_error:
                             logger.error(f"❌ Session operation failed for {call_id} (retry {retry + 1}/3): {session_error}")
                             if retry == 2:  # Last attempt
                                 raise
-                            import time
                             time.sleep(0.5)
                 else:
                     logger.debug(f"📭 Skipping empty content for call {call_id}")
+                    call_session_manager.count_window(call_id, "windows_empty")
                     updated_session = None
+
+                # Replace the interim transcript shown for this window (if any)
+                if transcript:
+                    _mark_first_word(call_id, window_id, window_start_time, "final")
+                if settings.streaming_interim_enabled and window_id is not None and \
+                        (transcript or _interim_shown(call_id, window_id)):
+                    from ..services.enhanced_notification_service import notification_service as enhanced_notification_service
+                    loop.run_until_complete(
+                        enhanced_notification_service.send_streaming_transcription(
+                            call_id,
+                            transcript,
+                            updated_session.cumulative_transcript if updated_session else "",
+                            window_id=window_id
+                        )
+                    )
                 
                 # Concise logging for streaming chunks
                 if updated_session:
@@ -1287,6 +1358,10 @@ def process_streaming_audio_task(
                 
             except Exception as session_error:
                 logger.error(f"❌ Session update failed for {call_id}: {session_error}")
+
+            # End-to-end: window cut on the streaming server to transcript in the session
+            if window_end_time is not None:
+                record_streaming_latency("asterisk_window", max(0.0, time.time() - window_end_time + duration_seconds))
             
             return {
                 "call_id": call_id,
@@ -1304,6 +1379,104 @@ def process_streaming_audio_task(
         logger.error(f"❌ Streaming transcription failed: {e}")
         raise
 
+FIRST_WORD_KEY_PREFIX = "streaming_first_word:"
+
+
+def _first_word_key(call_id: str, window_id: int) -> str:
+    return f"{FIRST_WORD_KEY_PREFIX}{call_id}:{window_id}"
+
+
+def _mark_first_word(call_id: str, window_id: Optional[int], window_start_time: Optional[float],
+                     source: str) -> bool:
+    """
+    Record time to first word the first time a window produces words.
+
+    Whichever decode of the window gets there first (interim or final) claims it,
+    so interim and final latencies can be compared. Returns True if this call did.
+    """
+    if window_id is None or window_start_time is None:
+        return False
+    try:
+        first = _get_progress_redis().set(_first_word_key(call_id, window_id), source, nx=True, ex=600)
+    except Exception as e:
+        logger.debug(f"Could not record first word for {call_id} window {window_id}: {e}")
+        return False
+    if first:
+        record_time_to_first_word(source, max(0.0, time.time() - window_start_time))
+    return bool(first)
+
+
+def _interim_shown(call_id: str, window_id: int) -> bool:
+    """True if an interim transcript with words was sent for the window"""
+    try:
+        return _get_progress_redis().get(_first_word_key(call_id, window_id)) == "interim"
+    except Exception:
+        return False
+
+
+@celery_app.task(bind=True, name="process_streaming_interim_task")
+def process_streaming_interim_task(
+    self,
+    audio_bytes: bytes,
+    call_id: str,
+    window_id: int,
+    window_start_time: Optional[float] = None,
+    language: str = "sw",
+    sample_rate: int = 16000
+):
+    """
+    Interim transcript of the window a call is still recording
+    Greedy decode (num_beams=1) sent to the agent as is_final=false; the final
+    beam-search decode of the same window replaces it. Submitted with a short
+    expiry, so interims queued behind final decodes are discarded unexecuted.
+    """
+    models = get_worker_models()
+    whisper_model = models.models.get("whisper") if models else None
+    if not whisper_model:
+        record_interim_transcript("no_model")
+        return {"error": "Whisper model not loaded"}
+
+    start_time = time.time()
+    transcript = whisper_model.transcribe_pcm_audio(
+        audio_bytes,
+        sample_rate=sample_rate,
+        language=language,
+        num_beams=1
+    )
+    decode_duration = time.time() - start_time
+    audio_seconds = len(audio_bytes) / (2 * sample_rate)
+
+    if not transcript:
+        record_interim_transcript("empty")
+        return {"call_id": call_id, "window_id": window_id, "transcript": "", "decode_duration": decode_duration}
+
+    _mark_first_word(call_id, window_id, window_start_time, "interim")
+
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    from ..services.enhanced_notification_service import notification_service as enhanced_notification_service
+    sent = loop.run_until_complete(
+        enhanced_notification_service.send_streaming_interim_transcription(
+            call_id, transcript, window_id, audio_seconds=audio_seconds
+        )
+    )
+    record_interim_transcript("sent" if sent else "send_failed")
+    logger.debug(f"💬 {call_id} window {window_id} interim ({audio_seconds:.1f}s, {decode_duration:.2f}s): {transcript}")
+
+    return {
+        "call_id": call_id,
+        "window_id": window_id,
+        "transcript": transcript,
+        "audio_seconds": audio_seconds,
+        "decode_duration": decode_duration,
+        "notification_sent": sent
+    }
+
+
 def handle_task_error(self, error_msg, call_id=None):
     """Consistent error handling for all Celery tasks"""
     logger.error(error_msg)
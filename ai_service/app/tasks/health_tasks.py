@@ -3,26 +3,26 @@ import socket
 from typing import Dict, Any
 from ..celery_app import celery_app
 
-@celery_app.task(name="health_check_models")
-def health_check_models() -> Dict[str, Any]:
-    """Check which models are loaded on this Celery worker"""
+MODEL_KEYS = {
+    "qa": "qa",
+    "classifier": "classifier_model",
+    "ner": "ner",
+    "summarizer": "summarizer",
+    "translator": "translator",
+    "whisper": "whisper",
+}
+
+
+def build_model_status(loader) -> Dict[str, Any]:
+    """Model status of this worker, as reported by health_check_models and published to the broker"""
     try:
-        from ..model_scripts.model_loader import model_loader
-        
         # Get ready models
-        ready_models = model_loader.get_ready_models()
-        
+        ready_models = loader.get_ready_models()
+
         return {
             "worker_host": socket.gethostname(),
             "status": "healthy",
-            "models_loaded": {
-                "qa": "qa" in ready_models,
-                "classifier": "classifier_model" in ready_models,
-                "ner": "ner" in ready_models,
-                "summarizer": "summarizer" in ready_models,
-                "translator": "translator" in ready_models,
-                "whisper": "whisper" in ready_models,
-            },
+            "models_loaded": {name: key in ready_models for name, key in MODEL_KEYS.items()},
             "ready_models": ready_models,
             "total_ready_models": len(ready_models)
         }
@@ -31,14 +31,14 @@ def health_check_models() -> Dict[str, Any]:
             "worker_host": socket.gethostname(),
             "status": "error",
             "error": str(e),
-            "models_loaded": {
-                "qa": False,
-                "classifier": False,
-                "ner": False,
-                "summarizer": False,
-                "translator": False,
-                "whisper": False,
-            },
+            "models_loaded": {name: False for name in MODEL_KEYS},
             "ready_models": [],
             "total_ready_models": 0
-        }
\ No newline at end of file
+        }
+
+
+@celery_app.task(name="health_check_models")
+def health_check_models() -> Dict[str, Any]:
+    """Check which models are loaded on this Celery worker"""
+    from ..model_scripts.model_loader import model_loader
+    return build_model_status(model_loader)
@@ -1,16 +1,17 @@
 import logging
 from datetime import datetime
 from typing import Dict, Any, Optional
-from celery.signals import worker_init
+from celery.signals import worker_init, task_prerun
+from celery.worker.control import control_command
 import os
+import socket
+import sys
 
 from ..celery_app import celery_app
 from ..model_scripts.model_loader import model_loader
 from ..utils.text_utils import (
-    NERChunker,
     ClassificationChunker,
     ClassificationAggregator,
-    SummarizationChunker,
     TranslationChunker
 )
 from ..core.metrics import (
@@ -19,19 +20,37 @@ from ..core.metrics import (
     model_operations_total,
     update_model_status
 )
+from ..core.result_cache import model_result_cache, model_version_key
 
 logger = logging.getLogger(__name__)
 
 # Global model loader for Celery worker
 worker_model_loader = None
 
+# Celery node name of this worker (e.g. "celery@host"), set on worker init
+worker_hostname = None
+
+
+def publish_model_status(loader=None):
+    """Publish this worker's model status (of loader, by default the model tasks' loader) for the API's cluster-state reads"""
+    loader = loader or worker_model_loader
+    if loader is None:
+        return
+    from .health_tasks import build_model_status
+    from ..core.celery_monitor import publish_worker_models
+    publish_worker_models(
+        worker_hostname or f"celery@{socket.gethostname()}",
+        build_model_status(loader)
+    )
+
 
 @worker_init.connect
 def initialize_model_worker(**kwargs):
     """Initialize models when worker starts"""
-    global worker_model_loader
+    global worker_model_loader, worker_hostname
     
     logger.info(" Initializing model worker for individual model tasks...")
+    worker_hostname = getattr(kwargs.get("sender"), "hostname", None)
     
     try:
         from ..model_scripts.model_loader import ModelLoader
@@ -49,6 +68,7 @@ def initialize_model_worker(**kwargs):
                 logger.error(" WARNING: No models were loaded successfully!")
                 logger.error(f"Failed models: {worker_model_loader.get_failed_models()}")
                 logger.error(f"Blocked models: {worker_model_loader.get_blocked_models()}")
+            publish_model_status()
         else:
             logger.error(" Model loading failed")
             worker_model_loader = None
@@ -67,17 +87,75 @@ def get_worker_model_loader():
     return worker_model_loader
 
 
+# Models each task needs; deferred models are loaded when their first task arrives
+TASK_MODEL_REQUIREMENTS = {
+    "process_audio_task": ["whisper", "translator", "ner", "classifier_model", "summarizer", "qa"],
+    "process_audio_quick_task": ["whisper", "ner", "classifier_model", "summarizer", "qa"],
+    "process_streaming_audio_task": ["whisper"],
+    "process_streaming_interim_task": ["whisper"],
+    "ner_extract_task": ["ner"],
+    "classifier_classify_task": ["classifier_model"],
+    "translation_translate_task": ["translator"],
+    "summarization_summarize_task": ["summarizer"],
+    "qa_evaluate_task": ["qa"],
+    "whisper_transcribe_task": ["whisper"],
+}
+
+
+@task_prerun.connect
+def load_deferred_models(sender=None, **kwargs):
+    """Load any deferred models the incoming task needs and publish the new model status"""
+    required = TASK_MODEL_REQUIREMENTS.get(getattr(sender, "name", None))
+    if not required:
+        return
+    # Audio tasks run on audio_tasks' worker loader, model tasks on this module's
+    module = sys.modules.get(getattr(sender, "__module__", None))
+    loader = getattr(module, "worker_model_loader", None)
+    if loader is None:
+        return
+    ready_before = len(loader.get_ready_models())
+    loader.ensure_models_loaded(required)
+    if len(loader.get_ready_models()) != ready_before:
+        publish_model_status(loader)
+
+
+@control_command(args=[("model_name", str)], signature="<model_name>")
+def reload_model(state, model_name: str) -> Dict[str, Any]:
+    """Reload a model on this worker and invalidate its cached results"""
+    if worker_model_loader is None:
+        return {"error": "Model loader not initialized in worker"}
+    try:
+        ready = worker_model_loader.reload_model(model_name)
+    except ValueError as e:
+        return {"error": str(e)}
+    except Exception as e:
+        logger.error(f"❌ Failed to reload {model_name}: {e}")
+        return {"error": f"Reload failed: {e}"}
+    publish_model_status()
+    return {"ok": {"model": model_name, "ready": ready}}
+
 
 # NER TASK
 
+def _extract_entities(ner_model, text: str, flat: bool):
+    """Run NER over the text through the batcher; the model chunks texts beyond its input size"""
+    from ..model_scripts.ner_batcher import ner_batcher
+
+    # The solo worker runs one task at a time, so there is no concurrent request to wait for
+    entities = ner_batcher.extract(ner_model, text, flat=flat, wait=False)
+    logger.info(f" NER processed {len(text)} chars")
+    return entities
+
+
 @celery_app.task(bind=True, name="ner_extract_task")
-def ner_extract_task(self, text: str, flat: bool = True) -> Dict[str, Any]:
+def ner_extract_task(self, text: str, flat: bool = True, use_cache: bool = True) -> Dict[str, Any]:
     """
     Extract named entities from text using Celery task
 
     Args:
         text: Input text for NER
         flat: Return flat list (True) or grouped by label (False)
+        use_cache: Serve/store the result in the model result cache
 
     Returns:
         Dictionary with entities, processing time, and model info
@@ -99,36 +177,14 @@ def ner_extract_task(self, text: str, flat: bool = True) -> Dict[str, Any]:
             model_operations_total.labels(model="ner", operation="extract", status="failure").inc()
             raise RuntimeError("NER model not available")
         
-        # Initialize chunker
-        tokenizer_name = "distilbert-base-uncased"
-        chunker = NERChunker(tokenizer_name=tokenizer_name, max_tokens=512)
-        
-        # Count tokens
-        token_count = chunker.count_tokens(text)
-        MAX_SOURCE_LENGTH = 512
-        
-        if token_count <= MAX_SOURCE_LENGTH:
-            # Direct entity extraction
-            entities = ner_model.extract_entities(text, flat=flat)
-            logger.info(f" NER processed {len(text)} chars (no chunking)")
-        else:
-            # Chunking needed
-            logger.info(f"📦 Chunking: {token_count} tokens > {MAX_SOURCE_LENGTH}")
-            
-            chunks = chunker.chunk_transcript(text)
-            chunk_entities = []
-            
-            for i, chunk_info in enumerate(chunks):
-                chunk_ent = ner_model.extract_entities(chunk_info['text'], flat=True)
-                chunk_entities.append(chunk_ent)
-                logger.debug(f"  Chunk {i+1}/{len(chunks)}: {len(chunk_ent)} entities")
-            
-            # Reconstruct entities
-            entities = chunker.reconstruct_entities(chunk_entities, chunks, flat=flat)
-            logger.info(f" Processed {len(chunks)} chunks, {len(entities)} entities")
+        model_info = ner_model.get_model_info()
+        entities, cached = model_result_cache.get_or_compute(
+            "ner", model_version_key(model_info), text, {"flat": flat},
+            lambda: _extract_entities(ner_model, text, flat),
+            use_cache=use_cache
+        )
         
         processing_time = (datetime.now() - start_time).total_seconds()
-        model_info = ner_model.get_model_info()
 
         # Track metrics
         model_processing_seconds.labels(model="ner", operation="extract").observe(processing_time)
@@ -136,6 +192,7 @@ def ner_extract_task(self, text: str, flat: bool = True) -> Dict[str, Any]:
 
         return {
             "entities": entities,
+            "cached": cached,
             "processing_time": processing_time,
             "model_info": model_info,
             "timestamp": datetime.now().isoformat(),
@@ -153,13 +210,86 @@ def ner_extract_task(self, text: str, flat: bool = True) -> Dict[str, Any]:
 
 # CLASSIFIER TASK
 
+def _classify_narrative(classifier, narrative: str) -> Dict[str, Any]:
+    """Classify the narrative, chunking and aggregating when it exceeds the model's input size"""
+    # Initialize chunker
+    tokenizer_name = "distilbert-base-uncased"
+    chunker = ClassificationChunker(
+        tokenizer_name=tokenizer_name,
+        max_tokens=512,
+        overlap_tokens=150
+    )
+    
+    token_count = chunker.count_tokens(narrative)
+    MAX_SOURCE_LENGTH = 512
+    
+    logger.info(f"🔍 Classification: {token_count} tokens")
+    if token_count <= MAX_SOURCE_LENGTH:
+        # Direct classification
+        classification = classifier.classify(narrative)
+
+        aggregated_result = {
+            'main_category': classification['main_category'],
+            'sub_category': classification['sub_category'],
+            'sub_category_2': classification.get('sub_category_2'),  # ← FIXED: Include top-2 subcategory
+            'intervention': classification['intervention'],
+            'priority': classification['priority'],
+            'confidence_scores': classification.get('confidence_breakdown', {}),
+            'chunks_processed': 1,
+            'chunk_predictions': None
+        }
+
+
+    else:
+        # Chunking needed
+        logger.info(f"📦 Chunking: {token_count} tokens > {MAX_SOURCE_LENGTH}")
+        
+        chunks = chunker.chunk_transcript(narrative)
+        chunk_predictions = []
+        
+        for i, chunk_info in enumerate(chunks):
+            logger.info(f" Processing chunk {i+1}/{len(chunks)}")
+            chunk_classification = classifier.classify(chunk_info['text'])
+            
+            chunk_pred = {
+                'main_category': chunk_classification['main_category'],
+                'sub_category': chunk_classification['sub_category'],
+                'sub_category_2': chunk_classification.get('sub_category_2'), 
+                'intervention': chunk_classification['intervention'],
+                'priority': chunk_classification['priority'],
+                'confidence_scores': chunk_classification.get('confidence_breakdown', {})
+            }
+            chunk_predictions.append(chunk_pred)
+        
+        # Aggregate predictions
+        aggregator = ClassificationAggregator()
+        aggregated_result = aggregator.aggregate_case_classification(chunk_predictions)
+        aggregated_result['chunks_processed'] = len(chunks)
+        
+        # Build chunk prediction objects
+        chunk_pred_objects = []
+        for i, chunk in enumerate(chunks):
+            chunk_pred_objects.append({
+                'chunk_index': chunk['chunk_index'],
+                'token_count': chunk['token_count'],
+                'sentence_count': chunk['sentence_count'],
+                'position_ratio': chunk['position_ratio'],
+                **chunk_predictions[i]
+            })
+        
+        aggregated_result['chunk_predictions'] = chunk_pred_objects
+    
+    return aggregated_result
+
+
 @celery_app.task(bind=True, name="classifier_classify_task")
-def classifier_classify_task(self, narrative: str) -> Dict[str, Any]:
+def classifier_classify_task(self, narrative: str, use_cache: bool = True) -> Dict[str, Any]:
     """
     Classify case narrative using Celery task
 
     Args:
         narrative: Case narrative text
+        use_cache: Serve/store the result in the model result cache
 
     Returns:
         Dictionary with classification results
@@ -179,75 +309,14 @@ def classifier_classify_task(self, narrative: str) -> Dict[str, Any]:
             model_operations_total.labels(model="classifier", operation="classify", status="failure").inc()
             raise RuntimeError("Classifier model not available")
         
-        # Initialize chunker
-        tokenizer_name = "distilbert-base-uncased"
-        chunker = ClassificationChunker(
-            tokenizer_name=tokenizer_name,
-            max_tokens=512,
-            overlap_tokens=150
+        model_info = classifier.get_model_info()
+        aggregated_result, cached = model_result_cache.get_or_compute(
+            "classifier_model", model_version_key(model_info), narrative, None,
+            lambda: _classify_narrative(classifier, narrative),
+            use_cache=use_cache
         )
         
-        token_count = chunker.count_tokens(narrative)
-        MAX_SOURCE_LENGTH = 512
-        
-        logger.info(f"🔍 Classification: {token_count} tokens")
-        if token_count <= MAX_SOURCE_LENGTH:
-            # Direct classification
-            classification = classifier.classify(narrative)
-
-            aggregated_result = {
-                'main_category': classification['main_category'],
-                'sub_category': classification['sub_category'],
-                'sub_category_2': classification.get('sub_category_2'),  # ← FIXED: Include top-2 subcategory
-                'intervention': classification['intervention'],
-                'priority': classification['priority'],
-                'confidence_scores': classification.get('confidence_breakdown', {}),
-                'chunks_processed': 1,
-                'chunk_predictions': None
-            }
-
-
-        else:
-            # Chunking needed
-            logger.info(f"📦 Chunking: {token_count} tokens > {MAX_SOURCE_LENGTH}")
-            
-            chunks = chunker.chunk_transcript(narrative)
-            chunk_predictions = []
-            
-            for i, chunk_info in enumerate(chunks):
-                logger.info(f" Processing chunk {i+1}/{len(chunks)}")
-                chunk_classification = classifier.classify(chunk_info['text'])
-                
-                chunk_pred = {
-                    'main_category': chunk_classification['main_category'],
-                    'sub_category': chunk_classification['sub_category'],
-                    'sub_category_2': chunk_classification.get('sub_category_2'), 
-                    'intervention': chunk_classification['intervention'],
-                    'priority': chunk_classification['priority'],
-                    'confidence_scores': chunk_classification.get('confidence_breakdown', {})
-                }
-                chunk_predictions.append(chunk_pred)
-            
-            # Aggregate predictions
-            aggregator = ClassificationAggregator()
-            aggregated_result = aggregator.aggregate_case_classification(chunk_predictions)
-            aggregated_result['chunks_processed'] = len(chunks)
-            
-            # Build chunk prediction objects
-            chunk_pred_objects = []
-            for i, chunk in enumerate(chunks):
-                chunk_pred_objects.append({
-                    'chunk_index': chunk['chunk_index'],
-                    'token_count': chunk['token_count'],
-                    'sentence_count': chunk['sentence_count'],
-                    'position_ratio': chunk['position_ratio'],
-                    **chunk_predictions[i]
-                })
-            
-            aggregated_result['chunk_predictions'] = chunk_pred_objects
-        
         processing_time = (datetime.now() - start_time).total_seconds()
-        model_info = classifier.get_model_info()
 
         # Track metrics
         model_processing_seconds.labels(model="classifier", operation="classify").observe(processing_time)
@@ -257,6 +326,7 @@ def classifier_classify_task(self, narrative: str) -> Dict[str, Any]:
 
         return {
             **aggregated_result,
+            "cached": cached,
             "processing_time": processing_time,
             "model_info": model_info,
             "timestamp": datetime.now().isoformat(),
@@ -274,13 +344,46 @@ def classifier_classify_task(self, narrative: str) -> Dict[str, Any]:
 
 # TRANSLATION TASK
 
+def _translate_text(translator_model, text: str) -> str:
+    """Translate the text, chunking when it exceeds the model's input size"""
+    # Initialize chunker
+    tokenizer_name = "openchs/sw-en-opus-mt-mul-en-v1"
+    chunker = TranslationChunker(tokenizer_name=tokenizer_name, max_tokens=512)
+    
+    token_count = chunker.count_tokens(text)
+    MAX_SOURCE_LENGTH = 512
+    
+    if token_count <= MAX_SOURCE_LENGTH:
+        # Direct translation
+        translated = translator_model.translate(text)
+        logger.info(f" Translated {len(text)} chars (no chunking)")
+    else:
+        # Chunking needed
+        logger.info(f"📦 Chunking: {token_count} tokens > {MAX_SOURCE_LENGTH}")
+        
+        chunks = chunker.chunk_transcript(text)
+        translated_chunks = []
+        
+        for i, chunk_info in enumerate(chunks):
+            chunk_translated = translator_model.translate(chunk_info['text'])
+            translated_chunks.append(chunk_translated)
+            logger.debug(f"  Chunk {i+1}/{len(chunks)} translated")
+        
+        # Reconstruct translation
+        translated = chunker.reconstruct_translation(translated_chunks)
+        logger.info(f" Processed {len(chunks)} chunks")
+    
+    return translated
+
+
 @celery_app.task(bind=True, name="translation_translate_task")
-def translation_translate_task(self, text: str) -> Dict[str, Any]:
+def translation_translate_task(self, text: str, use_cache: bool = True) -> Dict[str, Any]:
     """
     Translate text using Celery task
 
     Args:
         text: Text to translate
+        use_cache: Serve/store the result in the model result cache
 
     Returns:
         Dictionary with translation results
@@ -300,35 +403,14 @@ def translation_translate_task(self, text: str) -> Dict[str, Any]:
             model_operations_total.labels(model="translator", operation="translate", status="failure").inc()
             raise RuntimeError("Translator model not available")
         
-        # Initialize chunker
-        tokenizer_name = "openchs/sw-en-opus-mt-mul-en-v1"
-        chunker = TranslationChunker(tokenizer_name=tokenizer_name, max_tokens=512)
-        
-        token_count = chunker.count_tokens(text)
-        MAX_SOURCE_LENGTH = 512
-        
-        if token_count <= MAX_SOURCE_LENGTH:
-            # Direct translation
-            translated = translator_model.translate(text)
-            logger.info(f" Translated {len(text)} chars (no chunking)")
-        else:
-            # Chunking needed
-            logger.info(f"📦 Chunking: {token_count} tokens > {MAX_SOURCE_LENGTH}")
-            
-            chunks = chunker.chunk_transcript(text)
-            translated_chunks = []
-            
-            for i, chunk_info in enumerate(chunks):
-                chunk_translated = translator_model.translate(chunk_info['text'])
-                translated_chunks.append(chunk_translated)
-                logger.debug(f"  Chunk {i+1}/{len(chunks)} translated")
-            
-            # Reconstruct translation
-            translated = chunker.reconstruct_translation(translated_chunks)
-            logger.info(f" Processed {len(chunks)} chunks")
+        model_info = translator_model.get_model_info()
+        translated, cached = model_result_cache.get_or_compute(
+            "translator", model_version_key(model_info), text, None,
+            lambda: _translate_text(translator_model, text),
+            use_cache=use_cache
+        )
         
         processing_time = (datetime.now() - start_time).total_seconds()
-        model_info = translator_model.get_model_info()
 
         # Track metrics
         model_processing_seconds.labels(model="translator", operation="translate").observe(processing_time)
@@ -338,6 +420,7 @@ def translation_translate_task(self, text: str) -> Dict[str, Any]:
 
         return {
             "translated": translated,
+            "cached": cached,
             "processing_time": processing_time,
             "model_info": model_info,
             "timestamp": datetime.now().isoformat(),
@@ -355,14 +438,30 @@ def translation_translate_task(self, text: str) -> Dict[str, Any]:
 
 # SUMMARIZATION TASK
 
+def _summarize_text(summarizer_model, text: str, max_length: int) -> str:
+    """Summarize the text; the model map-reduces texts beyond its input size in batches"""
+    summary = summarizer_model.summarize(text, max_length=max_length)
+    stats = getattr(summarizer_model, "last_run_stats", None)
+    if isinstance(stats, dict) and stats:
+        logger.info(f" Summarization generated {stats.get('generated_tokens')} tokens "
+                    f"at {stats.get('tokens_per_second')} tokens/s")
+    return summary
+
+
 @celery_app.task(bind=True, name="summarization_summarize_task")
-def summarization_summarize_task(self, text: str, max_length: int = 256) -> Dict[str, Any]:
+def summarization_summarize_task(
+    self,
+    text: str,
+    max_length: int = 256,
+    use_cache: bool = True
+) -> Dict[str, Any]:
     """
     Summarize text using Celery task
 
     Args:
         text: Text to summarize
         max_length: Maximum summary length
+        use_cache: Serve/store the result in the model result cache
 
     Returns:
         Dictionary with summary results
@@ -382,42 +481,14 @@ def summarization_summarize_task(self, text: str, max_length: int = 256) -> Dict
             model_operations_total.labels(model="summarizer", operation="summarize", status="failure").inc()
             raise RuntimeError("Summarizer model not available")
         
-        # Initialize chunker
-        tokenizer_name = "openchs/sum-flan-t5-base-synthetic-v1"
-        chunker = SummarizationChunker(
-            tokenizer_name=tokenizer_name,
-            max_tokens=512,
-            overlap_tokens=0
+        model_info = summarizer_model.get_model_info()
+        summary, cached = model_result_cache.get_or_compute(
+            "summarizer", model_version_key(model_info), text, {"max_length": max_length},
+            lambda: _summarize_text(summarizer_model, text, max_length),
+            use_cache=use_cache
         )
         
-        prompt_prefix = "Summarize the following child helpline case call transcript: "
-        full_input = prompt_prefix + text
-        token_count = chunker.count_tokens(full_input)
-        MAX_SOURCE_LENGTH = 512
-        
-        if token_count <= MAX_SOURCE_LENGTH:
-            # Direct summarization
-            summary = summarizer_model.summarize(text, max_length=max_length)
-        else:
-            # Chunking needed
-            logger.info(f"📦 Chunking: {token_count} tokens > {MAX_SOURCE_LENGTH}")
-            
-            chunks = chunker.chunk_transcript(text)
-            chunk_summaries = []
-            
-            for i, chunk_info in enumerate(chunks):
-                chunk_summary = summarizer_model.summarize(
-                    chunk_info['text'], 
-                    max_length=max_length
-                )
-                chunk_summaries.append(chunk_summary)
-            
-            # Reconstruct summary
-            summary = chunker.reconstruct_summary(chunk_summaries)
-            logger.info(f" Processed {len(chunks)} chunks")
-        
         processing_time = (datetime.now() - start_time).total_seconds()
-        model_info = summarizer_model.get_model_info()
 
         # Track metrics
         model_processing_seconds.labels(model="summarizer", operation="summarize").observe(processing_time)
@@ -427,6 +498,7 @@ def summarization_summarize_task(self, text: str, max_length: int = 256) -> Dict
 
         return {
             "summary": summary,
+            "cached": cached,
             "processing_time": processing_time,
             "model_info": model_info,
             "timestamp": datetime.now().isoformat(),
@@ -442,12 +514,67 @@ def summarization_summarize_task(self, text: str, max_length: int = 256) -> Dict
 
 
 # QA TASK
+def _evaluate_transcript(qa_model, transcript: str, threshold: Optional[float], return_raw: bool) -> Dict[str, Any]:
+    """Score the transcript, chunking and aggregating when it exceeds the model's input size"""
+    # Initialize chunker
+    tokenizer_name = "distilbert-base-uncased"
+    chunker = ClassificationChunker(
+        tokenizer_name=tokenizer_name,
+        max_tokens=512,
+        overlap_tokens=150
+    )
+    
+    token_count = chunker.count_tokens(transcript)
+    MAX_SOURCE_LENGTH = 512
+    
+    if token_count <= MAX_SOURCE_LENGTH:
+        # Direct evaluation
+        logger.info(f"✅ QA evaluation - no chunking: {token_count} tokens")
+        evaluation_result = qa_model.predict(
+            transcript,
+            threshold=threshold,
+            return_raw=return_raw
+        )
+    else:
+        # Chunking needed
+        logger.info(f"📦 QA chunking: {token_count} tokens > {MAX_SOURCE_LENGTH}")
+        
+        chunks = chunker.chunk_transcript(transcript)
+        
+        # Evaluate each chunk
+        chunk_predictions = []
+        for i, chunk_item in enumerate(chunks):
+            logger.info(f"  Processing chunk {i+1}/{len(chunks)}")
+            
+            chunk_result = qa_model.predict(
+                chunk_item['text'],
+                threshold=threshold,
+                return_raw=True
+            )
+            chunk_predictions.append(chunk_result)
+        
+        # Aggregate results
+        logger.info(f"🔗 Aggregating {len(chunk_predictions)} predictions")
+        aggregator = ClassificationAggregator()
+        aggregated_result = aggregator.aggregate_qa_scoring(chunk_predictions)
+        
+        if aggregated_result and aggregated_result['success']:
+            evaluation_result = aggregated_result['predictions']
+        else:
+            # Fallback aggregation
+            logger.error("QA aggregation failed, using fallback")
+            evaluation_result = _fallback_qa_aggregation(chunk_predictions)
+    
+    return evaluation_result
+
+
 @celery_app.task(bind=True, name="qa_evaluate_task")
 def qa_evaluate_task(
     self,
     transcript: str,
     threshold: Optional[float] = None,
-    return_raw: bool = False
+    return_raw: bool = False,
+    use_cache: bool = True
 ) -> Dict[str, Any]:
     """
     Evaluate transcript for quality assurance using Celery task
@@ -456,6 +583,7 @@ def qa_evaluate_task(
         transcript: Call transcript to evaluate
         threshold: Classification threshold
         return_raw: Include raw probabilities
+        use_cache: Serve/store the result in the model result cache
 
     Returns:
         Dictionary with QA evaluation results
@@ -473,57 +601,15 @@ def qa_evaluate_task(
             model_operations_total.labels(model="qa", operation="evaluate", status="failure").inc()
             raise RuntimeError("QA model not ready")
         
-        # Initialize chunker
-        tokenizer_name = "distilbert-base-uncased"
-        chunker = ClassificationChunker(
-            tokenizer_name=tokenizer_name,
-            max_tokens=512,
-            overlap_tokens=150
+        model_info = qa_model.get_model_info()
+        evaluation_result, cached = model_result_cache.get_or_compute(
+            "qa", model_version_key(model_info), transcript,
+            {"threshold": threshold, "return_raw": return_raw},
+            lambda: _evaluate_transcript(qa_model, transcript, threshold, return_raw),
+            use_cache=use_cache
         )
         
-        token_count = chunker.count_tokens(transcript)
-        MAX_SOURCE_LENGTH = 512
-        
-        if token_count <= MAX_SOURCE_LENGTH:
-            # Direct evaluation
-            logger.info(f"✅ QA evaluation - no chunking: {token_count} tokens")
-            evaluation_result = qa_model.predict(
-                transcript,
-                threshold=threshold,
-                return_raw=return_raw
-            )
-        else:
-            # Chunking needed
-            logger.info(f"📦 QA chunking: {token_count} tokens > {MAX_SOURCE_LENGTH}")
-            
-            chunks = chunker.chunk_transcript(transcript)
-            
-            # Evaluate each chunk
-            chunk_predictions = []
-            for i, chunk_item in enumerate(chunks):
-                logger.info(f"  Processing chunk {i+1}/{len(chunks)}")
-                
-                chunk_result = qa_model.predict(
-                    chunk_item['text'],
-                    threshold=threshold,
-                    return_raw=True
-                )
-                chunk_predictions.append(chunk_result)
-            
-            # Aggregate results
-            logger.info(f"🔗 Aggregating {len(chunk_predictions)} predictions")
-            aggregator = ClassificationAggregator()
-            aggregated_result = aggregator.aggregate_qa_scoring(chunk_predictions)
-            
-            if aggregated_result and aggregated_result['success']:
-                evaluation_result = aggregated_result['predictions']
-            else:
-                # Fallback aggregation
-                logger.error("QA aggregation failed, using fallback")
-                evaluation_result = _fallback_qa_aggregation(chunk_predictions)
-        
         processing_time = (datetime.now() - start_time).total_seconds()
-        model_info = qa_model.get_model_info()
 
         # Track metrics
         model_processing_seconds.labels(model="qa", operation="evaluate").observe(processing_time)
@@ -533,6 +619,7 @@ def qa_evaluate_task(
 
         return {
             "evaluations": evaluation_result,
+            "cached": cached,
             "processing_time": processing_time,
             "model_info": model_info,
             "timestamp": datetime.now().isoformat(),
@@ -4,14 +4,21 @@ Utility modules for the AI service
 
 from .scp_audio_downloader import (
     download_audio_via_scp,
+    download_audio_via_sftp,
+    prefetch_audio,
     download_and_convert_audio,
     download_audio_by_method,
     convert_gsm_to_wav
 )
+from .sftp_pool import SFTPConnectionPool, close_sftp_pools
 
 __all__ = [
     "download_audio_via_scp",
+    "download_audio_via_sftp",
+    "prefetch_audio",
     "download_and_convert_audio", 
     "download_audio_by_method",
-    "convert_gsm_to_wav"
+    "convert_gsm_to_wav",
+    "SFTPConnectionPool",
+    "close_sftp_pools"
 ]
\ No newline at end of file
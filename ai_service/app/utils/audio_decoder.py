@@ -0,0 +1,202 @@
+"""
+In-process decoding of PBX call recordings to 16 kHz mono int16 PCM
+
+Asterisk records calls as raw GSM 6.10 frames (.gsm), 16 kHz WAV (.wav16),
+WAV, or headerless signed linear PCM (.sln/.slin at 8 kHz, .sln16 at 16 kHz).
+These are decoded in memory with libsndfile (via soundfile) and resampled
+with a polyphase filter, so no subprocess or temp file is involved.
+Anything else falls back to ffmpeg over stdin/stdout pipes.
+"""
+import asyncio
+import io
+import logging
+import subprocess
+import wave
+from math import gcd
+from typing import Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except (ImportError, OSError):
+    sf = None
+    SOUNDFILE_AVAILABLE = False
+    logger.info("soundfile not available - PBX recordings will be decoded with ffmpeg")
+
+try:
+    from scipy.signal import resample_poly
+    SCIPY_AVAILABLE = True
+except ImportError:
+    resample_poly = None
+    SCIPY_AVAILABLE = False
+
+TARGET_SAMPLE_RATE = 16000
+
+GSM_FRAME_BYTES = 33
+GSM_FRAME_MAGIC = 0xD
+GSM_SAMPLE_RATE = 8000
+
+# Format hints (file extensions / download_info["format"]) understood natively
+_HINT_FORMATS = {
+    "gsm": "gsm",
+    "wav": "wav",
+    "wav16": "slin16",
+    "sln": "slin",
+    "slin": "slin",
+    "raw": "slin",
+    "sln16": "slin16",
+    "slin16": "slin16",
+}
+
+
+# Headerless formats need the demuxer named explicitly when read from a pipe
+_FFMPEG_INPUT_ARGS = {
+    "gsm": ["-f", "gsm"],
+    "slin": ["-f", "s16le", "-ar", "8000", "-ac", "1"],
+    "slin16": ["-f", "s16le", "-ar", "16000", "-ac", "1"],
+}
+
+
+class AudioDecodeError(Exception):
+    """Raised when audio cannot be decoded"""
+    pass
+
+
+def detect_audio_format(audio_bytes: bytes, format_hint: Optional[str] = None) -> str:
+    """
+    Detect the recording format from its header, falling back to the hint
+
+    Returns one of "wav", "gsm", "slin", "slin16" or "unknown".
+    """
+    if audio_bytes[:4] == b"RIFF" and audio_bytes[8:12] == b"WAVE":
+        return "wav"
+
+    hint = (format_hint or "").lower().lstrip(".")
+    if hint in _HINT_FORMATS and hint != "wav":
+        return _HINT_FORMATS[hint]
+
+    if _looks_like_gsm(audio_bytes):
+        return "gsm"
+    return "unknown"
+
+
+def _looks_like_gsm(audio_bytes: bytes) -> bool:
+    """Raw GSM 6.10 is a sequence of 33-byte frames whose first nibble is 0xD"""
+    if len(audio_bytes) < GSM_FRAME_BYTES or len(audio_bytes) % GSM_FRAME_BYTES:
+        return False
+    frame_heads = np.frombuffer(audio_bytes, dtype=np.uint8)[::GSM_FRAME_BYTES][:256]
+    return bool(np.all((frame_heads >> 4) == GSM_FRAME_MAGIC))
+
+
+def resample_pcm16(samples: np.ndarray, orig_sr: int, target_sr: int = TARGET_SAMPLE_RATE) -> np.ndarray:
+    """Polyphase-resample int16 PCM, returning int16"""
+    if orig_sr == target_sr:
+        return samples.astype(np.int16, copy=False)
+    if not SCIPY_AVAILABLE:
+        raise AudioDecodeError("scipy is required for resampling")
+
+    divisor = gcd(orig_sr, target_sr)
+    resampled = resample_poly(samples.astype(np.float32), target_sr // divisor, orig_sr // divisor)
+    return np.clip(np.rint(resampled), -32768, 32767).astype(np.int16)
+
+
+def _read_soundfile(audio_bytes: bytes, **kwargs) -> Tuple[np.ndarray, int]:
+    if not SOUNDFILE_AVAILABLE:
+        raise AudioDecodeError("soundfile is not installed")
+    try:
+        samples, sample_rate = sf.read(io.BytesIO(audio_bytes), dtype="int16", always_2d=True, **kwargs)
+    except Exception as e:
+        raise AudioDecodeError(f"libsndfile could not decode audio: {e}") from e
+
+    if samples.shape[1] > 1:
+        samples = samples.mean(axis=1).astype(np.int16)
+    else:
+        samples = samples[:, 0]
+    return samples, sample_rate
+
+
+def decode_audio_native(audio_bytes: bytes, format_hint: Optional[str] = None) -> np.ndarray:
+    """Decode a PBX recording in-process to 16 kHz mono int16 PCM"""
+    audio_format = detect_audio_format(audio_bytes, format_hint)
+
+    if audio_format == "wav":
+        samples, sample_rate = _read_soundfile(audio_bytes)
+    elif audio_format == "gsm":
+        usable = len(audio_bytes) - len(audio_bytes) % GSM_FRAME_BYTES
+        samples, sample_rate = _read_soundfile(
+            audio_bytes[:usable], format="RAW", subtype="GSM610",
+            samplerate=GSM_SAMPLE_RATE, channels=1
+        )
+    elif audio_format in ("slin", "slin16"):
+        usable = len(audio_bytes) - len(audio_bytes) % 2
+        samples = np.frombuffer(audio_bytes[:usable], dtype="<i2")
+        sample_rate = 16000 if audio_format == "slin16" else 8000
+    else:
+        raise AudioDecodeError(f"Unsupported audio format for native decoding (hint: {format_hint})")
+
+    return resample_pcm16(samples, sample_rate)
+
+
+def decode_audio_ffmpeg(audio_bytes: bytes, audio_format: Optional[str] = None,
+                        timeout: Optional[float] = 300) -> np.ndarray:
+    """Decode any ffmpeg-readable audio to 16 kHz mono int16 PCM over pipes"""
+    cmd = [
+        "ffmpeg", "-hide_banner", "-loglevel", "error",
+        *_FFMPEG_INPUT_ARGS.get(audio_format, []),
+        "-i", "pipe:0",
+        "-f", "s16le", "-acodec", "pcm_s16le",
+        "-ac", "1", "-ar", str(TARGET_SAMPLE_RATE),
+        "pipe:1",
+    ]
+    try:
+        result = subprocess.run(cmd, input=audio_bytes, capture_output=True, timeout=timeout)
+    except FileNotFoundError as e:
+        raise AudioDecodeError("ffmpeg not installed") from e
+    except subprocess.TimeoutExpired as e:
+        raise AudioDecodeError(f"ffmpeg timed out after {timeout}s") from e
+
+    if result.returncode != 0:
+        error_output = result.stderr.decode(errors="replace").strip() or "Unknown error"
+        raise AudioDecodeError(f"ffmpeg failed (code {result.returncode}): {error_output}")
+    return np.frombuffer(result.stdout, dtype="<i2").copy()
+
+
+def decode_audio(audio_bytes: bytes, format_hint: Optional[str] = None, allow_ffmpeg: bool = True) -> np.ndarray:
+    """
+    Decode a recording to 16 kHz mono int16 PCM
+
+    Tries in-process decoding first and falls back to piped ffmpeg.
+    """
+    try:
+        return decode_audio_native(audio_bytes, format_hint)
+    except AudioDecodeError as e:
+        if not allow_ffmpeg:
+            raise
+        logger.info(f"🔄 [decode] Native decoding unavailable ({e}), using ffmpeg")
+        return decode_audio_ffmpeg(audio_bytes, detect_audio_format(audio_bytes, format_hint))
+
+
+async def decode_audio_async(audio_bytes: bytes, format_hint: Optional[str] = None,
+                             allow_ffmpeg: bool = True) -> np.ndarray:
+    """decode_audio on a worker thread, for use from the event loop"""
+    return await asyncio.to_thread(decode_audio, audio_bytes, format_hint, allow_ffmpeg)
+
+
+def pcm16_to_float32(samples: np.ndarray) -> np.ndarray:
+    """Convert int16 PCM to float32 in [-1, 1) as expected by Whisper"""
+    return samples.astype(np.float32) / 32768.0
+
+
+def encode_wav(samples: np.ndarray, sample_rate: int = TARGET_SAMPLE_RATE) -> bytes:
+    """Wrap int16 mono PCM in an in-memory WAV container"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(samples.astype("<i2", copy=False).tobytes())
+    return buffer.getvalue()
@@ -6,11 +6,27 @@ import asyncio
 import logging
 import os
 import tempfile
+import time
 from typing import Optional, Tuple, Dict, Any
 
+from .audio_decoder import AudioDecodeError, TARGET_SAMPLE_RATE, decode_audio_async, encode_wav
+from .sftp_pool import ASYNCSSH_AVAILABLE, get_sftp_pool
+
 logger = logging.getLogger(__name__)
 
 
+def _load_scp_config() -> Dict[str, Any]:
+    """Load SCP configuration from settings with environment variable fallbacks"""
+    from ..config.settings import settings
+    return {
+        "user": settings.scp_user,
+        "server": settings.scp_server,
+        "password": settings.scp_password,
+        "remote_path_template": settings.scp_remote_path_template,
+        "timeout_seconds": settings.scp_timeout_seconds
+    }
+
+
 async def download_audio_via_scp(call_id: str, scp_config: Dict[str, Any] = None) -> Tuple[Optional[bytes], Dict[str, Any]]:
     """
     Download audio file from Asterisk server via SCP with configurable credentials
@@ -27,15 +43,7 @@ async def download_audio_via_scp(call_id: str, scp_config: Dict[str, Any] = None
     
     # Get SCP configuration (allow override for flexibility)
     if scp_config is None:
-        # Load from settings with environment variable fallbacks
-        from ..config.settings import settings
-        scp_config = {
-            "user": settings.scp_user,
-            "server": settings.scp_server,
-            "password": settings.scp_password,
-            "remote_path_template": settings.scp_remote_path_template,
-            "timeout_seconds": settings.scp_timeout_seconds
-        }
+        scp_config = _load_scp_config()
     
     # Format remote path with call_id
     remote_path = scp_config["remote_path_template"].format(call_id=call_id)
@@ -166,10 +174,116 @@ async def download_audio_via_scp(call_id: str, scp_config: Dict[str, Any] = None
                 logger.warning(f"⚠️ Failed to cleanup temp file {temp_path}: {e}")
 
 
+async def download_audio_via_sftp(call_id: str, scp_config: Dict[str, Any] = None) -> Tuple[Optional[bytes], Dict[str, Any]]:
+    """
+    Download audio file from Asterisk server over a pooled persistent SFTP connection
+    
+    Uses the same configuration as download_audio_via_scp. If the recording
+    was prefetched when the call ended, the in-flight download is reused.
+    
+    Args:
+        call_id: The unique call ID (e.g., 1755070077.79708)
+        scp_config: Optional SCP configuration override
+        
+    Returns:
+        Tuple of (audio_bytes, download_info)
+    """
+    if scp_config is None:
+        scp_config = _load_scp_config()
+    
+    remote_path = scp_config["remote_path_template"].format(call_id=call_id)
+    file_format = _detect_audio_format(remote_path)
+    
+    download_info = {
+        "call_id": call_id,
+        "server": scp_config["server"],
+        "remote_path": remote_path,
+        "method": "sftp",
+        "success": False,
+        "file_size_bytes": 0,
+        "file_size_mb": 0.0,
+        "error": None,
+        "format": file_format,
+        "prefetched": False
+    }
+    
+    start_time = time.monotonic()
+    try:
+        pool = get_sftp_pool(scp_config)
+        
+        prefetch_task = pool.claim_prefetched(call_id)
+        if prefetch_task is not None:
+            download_info["prefetched"] = True
+            try:
+                # Shielded so cancelling this download is not mistaken for a cancelled prefetch
+                audio_bytes = await asyncio.shield(prefetch_task)
+            except asyncio.CancelledError:
+                if not prefetch_task.cancelled():
+                    # This download was cancelled (request abort, shutdown): stop the prefetch too
+                    prefetch_task.cancel()
+                    raise
+                # The prefetch itself was cancelled (expired or pool closing): download directly
+                audio_bytes = await pool.fetch(remote_path)
+        else:
+            logger.info(f"📥 [sftp] Downloading {scp_config['user']}@{scp_config['server']}:{remote_path}")
+            audio_bytes = await pool.fetch(remote_path)
+        
+        if not audio_bytes:
+            download_info["error"] = f"Downloaded file is empty: {remote_path}"
+            logger.error(f"❌ [sftp] {download_info['error']}")
+            return None, download_info
+        
+        download_info.update({
+            "success": True,
+            "file_size_bytes": len(audio_bytes),
+            "file_size_mb": round(len(audio_bytes) / (1024 * 1024), 2),
+            "download_seconds": round(time.monotonic() - start_time, 3)
+        })
+        logger.info(f"✅ [sftp] Downloaded {download_info['file_size_mb']:.2f}MB audio file ({file_format} format) "
+                    f"in {download_info['download_seconds']:.2f}s")
+        return audio_bytes, download_info
+        
+    except Exception as e:
+        error_msg = f"SFTP error: {str(e) or type(e).__name__}"
+        download_info["error"] = error_msg
+        logger.error(f"❌ [sftp] Audio download failed for call {call_id}: {error_msg}")
+        return None, download_info
+
+
+def prefetch_audio(call_id: str, scp_config: Dict[str, Any] = None) -> bool:
+    """
+    Start downloading a call's recording in the background when the call ends
+    
+    The download is picked up by download_audio_via_sftp for the same call_id.
+    
+    Returns:
+        True if a prefetch was started
+    """
+    from ..config.settings import settings
+    
+    if not (settings.scp_prefetch_on_call_end and settings.scp_use_connection_pool and ASYNCSSH_AVAILABLE):
+        return False
+    if settings.mock_enabled and settings.mock_skip_scp_download:
+        return False
+    
+    try:
+        if scp_config is None:
+            scp_config = _load_scp_config()
+        remote_path = scp_config["remote_path_template"].format(call_id=call_id)
+        get_sftp_pool(scp_config).prefetch(call_id, remote_path)
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️ [sftp] Could not start prefetch for {call_id}: {e}")
+        return False
+
+
 async def convert_gsm_to_wav(gsm_bytes: bytes) -> Optional[bytes]:
     """
     Convert GSM audio data to WAV format for better processing
     
+    Decodes in-process to 16kHz mono PCM; falls back to ffmpeg over pipes
+    when the data can't be decoded natively. Nothing touches the disk.
+    
     Args:
         gsm_bytes: Raw GSM audio data
         
@@ -177,63 +291,22 @@ async def convert_gsm_to_wav(gsm_bytes: bytes) -> Optional[bytes]:
         WAV audio bytes or None if conversion fails
     """
     try:
-        # Create temporary files for conversion
-        with tempfile.NamedTemporaryFile(suffix='.gsm', delete=False) as gsm_temp:
-            gsm_temp.write(gsm_bytes)
-            gsm_path = gsm_temp.name
+        start_time = time.monotonic()
+        pcm = await decode_audio_async(gsm_bytes, format_hint="gsm")
+        wav_bytes = encode_wav(pcm)
         
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as wav_temp:
-            wav_path = wav_temp.name
+        wav_size_mb = len(wav_bytes) / (1024 * 1024)
+        gsm_size_mb = len(gsm_bytes) / (1024 * 1024)
         
-        try:
-            # Use ffmpeg to convert GSM to WAV
-            convert_cmd = [
-                'ffmpeg', '-y',  # Overwrite output file
-                '-i', gsm_path,  # Input GSM file
-                '-ar', '16000',  # Sample rate 16kHz (standard for Whisper)
-                '-ac', '1',      # Mono audio
-                '-f', 'wav',     # Output format WAV
-                wav_path         # Output file
-            ]
-            
-            logger.debug(f"🔄 [convert] Converting GSM to WAV: ffmpeg -i {gsm_path} -ar 16000 -ac 1 -f wav {wav_path}")
-            
-            process = await asyncio.create_subprocess_exec(
-                *convert_cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode == 0 and os.path.exists(wav_path) and os.path.getsize(wav_path) > 0:
-                # Read converted WAV file
-                with open(wav_path, 'rb') as f:
-                    wav_bytes = f.read()
-                
-                wav_size_mb = len(wav_bytes) / (1024 * 1024)
-                gsm_size_mb = len(gsm_bytes) / (1024 * 1024)
-                
-                logger.info(f"🔄 [convert] GSM→WAV conversion successful: {gsm_size_mb:.2f}MB → {wav_size_mb:.2f}MB")
-                
-                return wav_bytes
-            else:
-                error_output = stderr.decode().strip() if stderr else "Unknown error"
-                logger.error(f"❌ [convert] FFmpeg conversion failed (code {process.returncode}): {error_output}")
-                return None
-                
-        finally:
-            # Cleanup temp files
-            for temp_path in [gsm_path, wav_path]:
-                if os.path.exists(temp_path):
-                    try:
-                        os.unlink(temp_path)
-                    except Exception as e:
-                        logger.warning(f"⚠️ Failed to cleanup {temp_path}: {e}")
-                        
-    except FileNotFoundError:
-        logger.error("❌ [convert] ffmpeg not installed - required for GSM to WAV conversion")
-        logger.error("❌ [convert] Install with: apt-get install ffmpeg")
+        logger.info(f"🔄 [convert] GSM→WAV conversion successful: {gsm_size_mb:.2f}MB → {wav_size_mb:.2f}MB "
+                    f"({len(pcm) / TARGET_SAMPLE_RATE:.1f}s audio in {time.monotonic() - start_time:.2f}s)")
+        
+        return wav_bytes
+        
+    except AudioDecodeError as e:
+        logger.error(f"❌ [convert] GSM to WAV conversion failed: {e}")
+        if "not installed" in str(e):
+            logger.error("❌ [convert] Install with: apt-get install ffmpeg")
         return None
         
     except Exception as e:
@@ -482,7 +555,7 @@ async def download_audio_by_method(call_id: str, method: str, config: Dict[str,
 
     Args:
         call_id: The unique call ID
-        method: Download method ("scp", "http", "local", "mock", "disabled")
+        method: Download method ("scp", "sftp", "http", "local", "mock", "disabled")
         config: Method-specific configuration
 
     Returns:
@@ -495,7 +568,11 @@ async def download_audio_by_method(call_id: str, method: str, config: Dict[str,
         return await download_audio_for_mock(call_id)
 
     if method.lower() == "scp":
+        if settings.scp_use_connection_pool and ASYNCSSH_AVAILABLE:
+            return await download_audio_via_sftp(call_id, config)
         return await download_audio_via_scp(call_id, config)
+    elif method.lower() == "sftp":
+        return await download_audio_via_sftp(call_id, config)
     elif method.lower() == "http":
         return await download_audio_via_http(call_id, config or {})
     elif method.lower() == "local":
@@ -0,0 +1,301 @@
+"""
+Persistent SSH/SFTP connection pool for Asterisk call recording downloads
+
+Replaces one `sshpass scp` process per call with a small set of long-lived
+SSH connections to the PBX. Recordings are read over SFTP straight into
+memory (or streamed into a spool file), downloads are bounded by a
+semaphore, transient failures are retried with jittered backoff, and a
+download can be prefetched as soon as a call ends so the bytes are usually
+already in flight when the post-call pipeline asks for them.
+"""
+import asyncio
+import io
+import logging
+import random
+import time
+from collections import deque
+from typing import Any, BinaryIO, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import asyncssh
+    ASYNCSSH_AVAILABLE = True
+except ImportError:
+    asyncssh = None
+    ASYNCSSH_AVAILABLE = False
+    logger.info("asyncssh not available - pooled SFTP downloads disabled, falling back to scp")
+
+
+class SFTPConnectionPool:
+    """Pool of persistent SSH connections with an SFTP session each"""
+
+    def __init__(
+        self,
+        host: str,
+        username: str,
+        password: Optional[str] = None,
+        port: int = 22,
+        max_connections: int = 4,
+        max_parallel_downloads: int = 4,
+        connect_timeout: float = 30.0,
+        retries: int = 3,
+        retry_base_delay: float = 0.5,
+        read_block_size: int = 256 * 1024,
+        prefetch_ttl_seconds: float = 300.0,
+        known_hosts: Optional[str] = None,
+    ):
+        if not ASYNCSSH_AVAILABLE:
+            raise RuntimeError("asyncssh is required for pooled SFTP downloads")
+
+        self.host = host
+        self.username = username
+        self.password = password
+        self.port = port
+        self.max_connections = max_connections
+        self.connect_timeout = connect_timeout
+        self.retries = retries
+        self.retry_base_delay = retry_base_delay
+        self.read_block_size = read_block_size
+        self.prefetch_ttl_seconds = prefetch_ttl_seconds
+        self.known_hosts = known_hosts
+
+        self._idle: Deque[Tuple[Any, Any]] = deque()
+        self._open_connections = 0
+        self._connection_slots = asyncio.Semaphore(max_connections)
+        self._download_slots = asyncio.Semaphore(max_parallel_downloads)
+        self._prefetched: Dict[str, Tuple[asyncio.Task, float]] = {}
+        self._closed = False
+
+        self.stats = {
+            "connections_opened": 0,
+            "connections_reused": 0,
+            "downloads": 0,
+            "bytes_downloaded": 0,
+            "retries": 0,
+            "failures": 0,
+            "prefetch_started": 0,
+            "prefetch_hits": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Downloads
+    # ------------------------------------------------------------------
+
+    async def fetch(self, remote_path: str) -> bytes:
+        """Download a remote file into memory"""
+        buffer = io.BytesIO()
+        await self.fetch_into(remote_path, buffer)
+        return buffer.getvalue()
+
+    async def fetch_to_file(self, remote_path: str, local_path: str) -> int:
+        """Stream a remote file into a local spool file, returning its size"""
+        with open(local_path, "wb") as sink:
+            return await self.fetch_into(remote_path, sink)
+
+    async def fetch_into(self, remote_path: str, sink: BinaryIO) -> int:
+        """Stream a remote file into a writable binary sink with retries"""
+        async with self._download_slots:
+            attempt = 0
+            while True:
+                start_offset = sink.tell() if sink.seekable() else None
+                try:
+                    size = await self._fetch_once(remote_path, sink)
+                    self.stats["downloads"] += 1
+                    self.stats["bytes_downloaded"] += size
+                    return size
+                except Exception as e:
+                    if not self._is_retryable(e) or attempt >= self.retries:
+                        self.stats["failures"] += 1
+                        raise
+                    if start_offset is None:
+                        self.stats["failures"] += 1
+                        raise
+
+                    # Discard the partial read before trying again
+                    sink.seek(start_offset)
+                    sink.truncate()
+
+                    delay = random.uniform(0, self.retry_base_delay * (2 ** attempt))
+                    attempt += 1
+                    self.stats["retries"] += 1
+                    logger.warning(f"⚠️ [sftp] Download of {remote_path} failed ({e}), "
+                                   f"retry {attempt}/{self.retries} in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+
+    async def _fetch_once(self, remote_path: str, sink: BinaryIO) -> int:
+        conn, sftp = await self._acquire()
+        healthy = False
+        try:
+            size = 0
+            async with sftp.open(remote_path, "rb", block_size=self.read_block_size) as remote_file:
+                while True:
+                    block = await remote_file.read(self.read_block_size)
+                    if not block:
+                        break
+                    sink.write(block)
+                    size += len(block)
+            healthy = True
+            return size
+        except asyncssh.SFTPError:
+            # Remote-side file errors leave the connection usable
+            healthy = True
+            raise
+        finally:
+            self._release(conn, sftp, healthy)
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        if isinstance(error, (asyncssh.SFTPNoSuchFile, asyncssh.SFTPPermissionDenied)):
+            return False
+        if isinstance(error, asyncssh.PermissionDenied):
+            return False
+        return isinstance(error, (OSError, asyncio.TimeoutError, asyncssh.Error))
+
+    # ------------------------------------------------------------------
+    # Prefetch
+    # ------------------------------------------------------------------
+
+    def prefetch(self, key: str, remote_path: str) -> asyncio.Task:
+        """Start downloading a file in the background, to be claimed later by key"""
+        self._expire_prefetched()
+        existing = self._prefetched.get(key)
+        if existing is not None:
+            return existing[0]
+
+        task = asyncio.create_task(self.fetch(remote_path))
+        # Failures are surfaced to whoever claims the task
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._prefetched[key] = (task, time.monotonic())
+        self.stats["prefetch_started"] += 1
+        logger.info(f"📥 [sftp] Prefetching {remote_path}")
+        return task
+
+    def claim_prefetched(self, key: str) -> Optional[asyncio.Task]:
+        """Take ownership of a prefetch started for key, if any"""
+        entry = self._prefetched.pop(key, None)
+        if entry is None:
+            return None
+        self.stats["prefetch_hits"] += 1
+        return entry[0]
+
+    def _expire_prefetched(self):
+        now = time.monotonic()
+        for key, (task, started) in list(self._prefetched.items()):
+            if now - started > self.prefetch_ttl_seconds:
+                task.cancel()
+                del self._prefetched[key]
+
+    # ------------------------------------------------------------------
+    # Connection management
+    # ------------------------------------------------------------------
+
+    async def _acquire(self) -> Tuple[Any, Any]:
+        await self._connection_slots.acquire()
+        try:
+            while self._idle:
+                conn, sftp = self._idle.popleft()
+                if not conn.is_closed():
+                    self.stats["connections_reused"] += 1
+                    return conn, sftp
+                self._open_connections -= 1
+
+            conn = await asyncio.wait_for(
+                asyncssh.connect(
+                    self.host,
+                    port=self.port,
+                    username=self.username,
+                    password=self.password,
+                    known_hosts=self.known_hosts,
+                    keepalive_interval=10,
+                ),
+                timeout=self.connect_timeout,
+            )
+            try:
+                sftp = await conn.start_sftp_client()
+            except Exception:
+                conn.close()
+                raise
+            self._open_connections += 1
+            self.stats["connections_opened"] += 1
+            logger.info(f"🔌 [sftp] Opened connection to {self.username}@{self.host}:{self.port} "
+                        f"({self._open_connections}/{self.max_connections})")
+            return conn, sftp
+        except BaseException:
+            self._connection_slots.release()
+            raise
+
+    def _release(self, conn, sftp, healthy: bool):
+        if healthy and not self._closed and not conn.is_closed():
+            self._idle.append((conn, sftp))
+        else:
+            self._open_connections -= 1
+            sftp.exit()
+            conn.close()
+        self._connection_slots.release()
+
+    async def close(self):
+        """Close all idle connections and cancel outstanding prefetches"""
+        self._closed = True
+        for task, _ in self._prefetched.values():
+            task.cancel()
+        self._prefetched.clear()
+
+        while self._idle:
+            conn, sftp = self._idle.popleft()
+            self._open_connections -= 1
+            sftp.exit()
+            conn.close()
+            try:
+                await conn.wait_closed()
+            except Exception:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool usage statistics"""
+        return {
+            **self.stats,
+            "open_connections": self._open_connections,
+            "idle_connections": len(self._idle),
+            "pending_prefetches": len(self._prefetched),
+        }
+
+
+# Pools are bound to the event loop that created their connections
+_pools: Dict[Tuple[str, int, str], Tuple[SFTPConnectionPool, asyncio.AbstractEventLoop]] = {}
+
+
+def get_sftp_pool(config: Dict[str, Any]) -> SFTPConnectionPool:
+    """Get (or create) the shared pool for a server/user on the running event loop"""
+    from ..config.settings import settings
+
+    loop = asyncio.get_running_loop()
+    key = (config["server"], int(config.get("port", settings.scp_port)), config["user"])
+
+    entry = _pools.get(key)
+    if entry is not None and entry[1] is loop and not entry[0]._closed:
+        return entry[0]
+
+    pool = SFTPConnectionPool(
+        host=config["server"],
+        port=key[1],
+        username=config["user"],
+        password=config.get("password"),
+        max_connections=settings.scp_pool_max_connections,
+        max_parallel_downloads=settings.scp_max_parallel_downloads,
+        connect_timeout=config.get("timeout_seconds", settings.scp_timeout_seconds),
+        retries=settings.scp_download_retries,
+        retry_base_delay=settings.scp_retry_base_delay,
+        known_hosts=settings.scp_known_hosts_file,
+    )
+    _pools[key] = (pool, loop)
+    return pool
+
+
+async def close_sftp_pools():
+    """Close every pool created on the running event loop"""
+    loop = asyncio.get_running_loop()
+    for key, (pool, pool_loop) in list(_pools.items()):
+        if pool_loop is loop:
+            await pool.close()
+            del _pools[key]
@@ -15,8 +15,9 @@ logger = logging.getLogger(__name__)
 class BaseChunker:
     """Base class for all chunking strategies"""
     
-    def __init__(self, tokenizer_name: str = "distilbert-base-uncased", max_tokens: int = 512):
-        self.tokenizer = AutoTokenizer.from_pretrained(tokenizer_name)
+    def __init__(self, tokenizer_name: str = "distilbert-base-uncased", max_tokens: int = 512, tokenizer=None):
+        # An already loaded tokenizer (e.g. the model's own) avoids loading tokenizer_name
+        self.tokenizer = tokenizer if tokenizer is not None else AutoTokenizer.from_pretrained(tokenizer_name)
         self.max_tokens = max_tokens
     
     def count_tokens(self, text: str) -> int:
@@ -328,11 +329,28 @@ class NERChunker(BaseChunker):
         
         return chunks
     
+    @staticmethod
+    def original_offsets(transcript: str) -> List[int]:
+        """
+        Position in transcript of each character of the whitespace-normalized
+        text that chunk_transcript() cuts chunks from, plus the transcript end
+        """
+        lead = len(transcript) - len(transcript.lstrip())
+        offsets = []
+        for match in re.finditer(r'\s+|\S+', transcript[lead:]):
+            if match.group().isspace():
+                offsets.append(lead + match.start())  # collapsed to one space
+            else:
+                offsets.extend(range(lead + match.start(), lead + match.end()))
+        offsets.append(len(transcript))
+        return offsets
+    
     def reconstruct_entities(
         self, 
         chunk_entities: List[List[Dict]], 
         chunks: List[Dict],
-        flat: bool = True
+        flat: bool = True,
+        transcript: str = None
     ) -> Union[List[Dict], Dict[str, List[str]]]:
         """
         Reconstruct full entity list from chunked NER results
@@ -342,6 +360,8 @@ class NERChunker(BaseChunker):
             chunk_entities: List of entity lists from each chunk
             chunks: List of chunk metadata from chunk_transcript()
             flat: If True, return flat list; if False, return grouped by label
+            transcript: The chunked transcript; when given, positions refer to it
+                rather than to its whitespace-normalized form
             
         Returns:
             Either List[Dict] with adjusted positions or Dict[str, List[str]] grouped by label
@@ -349,6 +369,7 @@ class NERChunker(BaseChunker):
         if not chunk_entities or not chunks:
             return [] if flat else {}
         
+        offsets = self.original_offsets(transcript) if transcript is not None else None
         all_entities = []
         
         # Process each chunk's entities
@@ -362,11 +383,17 @@ class NERChunker(BaseChunker):
             
             for entity in entities:
                 # Adjust character positions based on chunk offset
+                start = entity.get('start', 0) + chunk_start
+                end = entity.get('end', 0) + chunk_start
+                if offsets is not None:
+                    last = len(offsets) - 1
+                    start = offsets[min(start, last)]
+                    end = offsets[min(end - 1, last - 1)] + 1 if end > 0 else offsets[0]
                 adjusted_entity = {
                     'text': entity.get('text', ''),
                     'label': entity.get('label', ''),
-                    'start': entity.get('start', 0) + chunk_start,
-                    'end': entity.get('end', 0) + chunk_start,
+                    'start': start,
+                    'end': end,
                     'confidence': entity.get('confidence', 0.0)
                 }
                 all_entities.append(adjusted_entity)
@@ -0,0 +1,8 @@
+"""
+Offline micro-benchmarks for the service's hot paths
+
+Unlike load_test.py and scripts/analyze_performance.py, these need no
+running server, Redis or downloaded models: inputs are generated locally
+(see fixtures.py) and everything runs on CPU. Run them with
+`python -m benchmarks` from ai_service/.
+"""
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Run the hot-path benchmarks and compare them against a stored baseline
+
+Benchmarks cover window cutting, transcript stitching, session
+(de)serialization, the transcript chunkers, chunk aggregation, the PII log
+filter and the ai_streaming mel/beam search front end. Results are written
+as JSON; compare exits with status 1 when any benchmark is more than the
+threshold slower than the baseline, so it can gate CI.
+
+Baselines are machine specific: record one on the machine (or CI runner
+class) that will run the comparison.
+
+Usage:
+    python -m benchmarks list
+    python -m benchmarks run --json reports/benchmarks.json
+    python -m benchmarks run --filter streaming --filter "pii_filter.*" --compare benchmarks/baseline.json
+    python -m benchmarks run --json benchmarks/baseline.json          # record a new baseline
+    python -m benchmarks compare benchmarks/baseline.json reports/benchmarks.json --threshold 0.2
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+# Stub inputs only: never reach for the Hugging Face hub
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks import bench_ai_streaming, bench_logging, bench_streaming, bench_text  # noqa: E402,F401
+from benchmarks.harness import (compare, format_time, load_results, run_benchmark, save_results,  # noqa: E402
+                                select)
+
+DEFAULT_BASELINE = str(Path(__file__).resolve().parent / "baseline.json")
+STATUS_ICONS = {"ok": "✅", "improved": "⚡", "regressed": "❌", "new": "🆕", "missing": "⚠️"}
+
+
+def print_comparison(rows, threshold: float) -> int:
+    """Print the comparison table and return the number of regressions"""
+    print(f"\n📊 Comparison against baseline (threshold {threshold:.0%})")
+    for row in rows:
+        change = f"{row['change']:+.1%}" if row["change"] is not None else ""
+        print(f"{STATUS_ICONS[row['status']]} {row['name']:<50} {format_time(row['baseline_us']):>10} → "
+              f"{format_time(row['current_us']):>10} {change:>8}")
+    regressions = [row for row in rows if row["status"] == "regressed"]
+    if regressions:
+        print(f"❌ {len(regressions)} benchmark(s) regressed by more than {threshold:.0%}")
+    else:
+        print("✅ No regressions")
+    return len(regressions)
+
+
+def cmd_list(args) -> int:
+    for bench in select(args.filter):
+        print(f"{bench.name:<50} [{bench.group}] {bench.description}")
+    return 0
+
+
+def cmd_run(args) -> int:
+    benches = select(args.filter)
+    if not benches:
+        print("❌ No benchmarks match the filter")
+        return 1
+
+    print(f"📊 Running {len(benches)} benchmarks (repeat {args.repeat}, min {args.min_time}s per round)")
+    results = []
+    for bench in benches:
+        try:
+            result = run_benchmark(bench, repeat=args.repeat, min_time=args.min_time)
+        except Exception as e:
+            print(f"❌ {bench.name}: {type(e).__name__}: {e}")
+            if args.strict:
+                return 1
+            continue
+        results.append(result)
+        print(f"{bench.name:<50} {format_time(result['min_us']):>10} "
+              f"(median {format_time(result['median_us'])}, ±{format_time(result['stdev_us'])}, {result['number']} calls/round)")
+
+    if args.json:
+        save_results(args.json, results, {"repeat": args.repeat, "min_time": args.min_time, "filter": args.filter})
+        print(f"💾 Results written to {args.json}")
+
+    if args.compare:
+        if not Path(args.compare).exists():
+            print(f"❌ Baseline {args.compare} not found")
+            return 1
+        current = {result["name"]: result for result in results}
+        # Only what ran this time is compared, so a filtered run does not report the rest as missing
+        baseline = {name: row for name, row in load_results(args.compare).items() if name in current}
+        return 1 if print_comparison(compare(baseline, current, args.threshold), args.threshold) else 0
+    return 0
+
+
+def cmd_compare(args) -> int:
+    rows = compare(load_results(args.baseline), load_results(args.current), args.threshold)
+    regressions = print_comparison(rows, args.threshold)
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump({"threshold": args.threshold, "comparison": rows}, f, indent=2)
+        print(f"💾 Comparison written to {args.json}")
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Offline hot-path benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="List the benchmarks")
+    list_parser.add_argument("--filter", action="append", help="Glob on benchmark name or group (repeatable)")
+    list_parser.set_defaults(func=cmd_list)
+
+    run_parser = commands.add_parser("run", help="Run benchmarks")
+    run_parser.add_argument("--filter", action="append", help="Glob on benchmark name or group (repeatable)")
+    run_parser.add_argument("--repeat", type=int, default=7, help="Timed rounds per benchmark (default: 7)")
+    run_parser.add_argument("--min-time", type=float, default=0.2,
+                            help="Minimum seconds per round; sets the calls per round (default: 0.2)")
+    run_parser.add_argument("--json", help="Write results to this JSON file")
+    run_parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE,
+                            help=f"Compare against a baseline results file (default: {DEFAULT_BASELINE})")
+    run_parser.add_argument("--threshold", type=float, default=0.25,
+                            help="Allowed slowdown as a fraction of the baseline (default: 0.25)")
+    run_parser.add_argument("--strict", action="store_true", help="Stop at the first benchmark that fails to run")
+    run_parser.set_defaults(func=cmd_run)
+
+    compare_parser = commands.add_parser("compare", help="Compare a results file against a baseline")
+    compare_parser.add_argument("baseline", help="Baseline results file")
+    compare_parser.add_argument("current", help="Results file to check")
+    compare_parser.add_argument("--threshold", type=float, default=0.25,
+                                help="Allowed slowdown as a fraction of the baseline (default: 0.25)")
+    compare_parser.add_argument("--json", help="Write the comparison to this JSON file")
+    compare_parser.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    # Info logging from the code under test would dominate the shorter benchmarks
+    logging.disable(logging.INFO)
+    sys.exit(main())
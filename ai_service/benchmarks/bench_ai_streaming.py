@@ -0,0 +1,93 @@
+"""
+ai_streaming decoder front end: log-mel features and one beam search step
+
+ai_streaming is a flat set of modules (`from mel import ...`), so its
+directory is put on sys.path, and mel_filters() loads its filterbank from a
+path relative to that directory.
+"""
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+from .fixtures import slin_audio
+from .harness import benchmark
+
+AI_STREAMING_DIR = Path(__file__).resolve().parents[2] / "ai_streaming"
+
+EOT = 50257  # multilingual end-of-transcript token
+N_VOCAB = 51865
+
+
+@contextmanager
+def _ai_streaming():
+    if str(AI_STREAMING_DIR) not in sys.path:
+        sys.path.insert(0, str(AI_STREAMING_DIR))
+    cwd = os.getcwd()
+    os.chdir(AI_STREAMING_DIR)
+    try:
+        yield
+    finally:
+        os.chdir(cwd)
+
+
+def _mel(seconds: float, reduced_context: bool):
+    import torch
+    with _ai_streaming():
+        from mel import N_FRAMES, bucket_frames, log_mel_spectrogram
+        audio = slin_audio(seconds)
+        n_frames = bucket_frames(len(audio)) if reduced_context else N_FRAMES
+        device = torch.device("cpu")
+        # The first call caches the filterbank, read relative to ai_streaming/
+        log_mel_spectrogram(device, audio, 80, n_frames)
+    return lambda: log_mel_spectrogram(device, audio, 80, n_frames)
+
+
+@benchmark("ai_streaming.log_mel_spectrogram.5s_padded_30s", group="ai_streaming")
+def bench_mel_padded():
+    """Log-mel features of a 5s window padded to 30s (full-context encoder)"""
+    return _mel(5.0, reduced_context=False)
+
+
+@benchmark("ai_streaming.log_mel_spectrogram.5s_bucketed", group="ai_streaming")
+def bench_mel_bucketed():
+    """Log-mel features of a 5s window padded to the next 2s bucket (reduced-context encoder)"""
+    return _mel(5.0, reduced_context=True)
+
+
+class _NoKVCache:
+    """Inference stand-in; the step under test only reorders the cache"""
+
+    def rearrange_kv_cache(self, source_indices):
+        pass
+
+
+def _beam_step(n_audio: int, beam_size: int = 5, prefix_tokens: int = 40):
+    import torch
+    with _ai_streaming():
+        from decoding import BeamSearchDecoder
+
+    generator = torch.Generator().manual_seed(0)
+    rows = n_audio * beam_size
+    tokens = torch.randint(0, EOT, (rows, prefix_tokens), generator=generator)
+    logits = torch.randn(rows, N_VOCAB, generator=generator)
+    sum_logprobs = -torch.rand(rows, generator=generator) * 10
+    decoder = BeamSearchDecoder(beam_size, EOT, _NoKVCache())
+
+    def run():
+        # update() writes the new scores into sum_logprobs, so each step starts from a copy
+        decoder.reset()
+        decoder.update(tokens, logits, sum_logprobs.clone())
+    return run
+
+
+@benchmark("ai_streaming.beam_search_update.beam5", group="ai_streaming")
+def bench_beam_update():
+    """One BeamSearchDecoder.update step: 1 audio, beam 5, 40-token prefixes"""
+    return _beam_step(n_audio=1)
+
+
+@benchmark("ai_streaming.beam_search_update.beam5_batch4", group="ai_streaming")
+def bench_beam_update_batch():
+    """One BeamSearchDecoder.update step: 4 audios, beam 5, 40-token prefixes"""
+    return _beam_step(n_audio=4)
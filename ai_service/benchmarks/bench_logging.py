@@ -0,0 +1,52 @@
+"""
+PII sanitizing log filter on service-like log records
+"""
+import logging
+import random
+
+from .fixtures import SENTENCES
+from .harness import benchmark
+
+TEMPLATES = [
+    "🔄 Processing audio chunk {i} for call {call}",
+    "✅ Task {task} completed in {ms}ms",
+    "🎙️ Transcribed window {i} for call {call}: {text}",
+    "Translation for call {call}: {text}",
+    "GET /health/models 200 in {ms}ms",
+]
+
+
+def _messages(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [
+        rng.choice(TEMPLATES).format(i=i, call=f"17{i:08d}", task=f"{i:08x}-4b1c", ms=rng.randrange(5, 900),
+                                     text=rng.choice(SENTENCES))
+        for i in range(count)
+    ]
+
+
+@benchmark("pii_filter.filter.1000_records", group="logging")
+def bench_pii_filter():
+    """PIISanitizingFilter over 1000 unique f-string records, two in five with transcript text"""
+    from app.security.pii_logging_filter import PIISanitizingFilter
+    messages = _messages(1000)
+    # No cache, so every run sanitizes as unique production messages do
+    pii_filter = PIISanitizingFilter(cache_size=0)
+
+    def run():
+        for msg in messages:
+            pii_filter.filter(logging.LogRecord("bench", logging.INFO, __file__, 0, msg, None, None))
+    return run
+
+
+@benchmark("pii_filter.filter.cached_1000_records", group="logging")
+def bench_pii_filter_cached():
+    """PIISanitizingFilter over 1000 records it has already sanitized (cache hits)"""
+    from app.security.pii_logging_filter import PIISanitizingFilter
+    messages = _messages(1000)
+    pii_filter = PIISanitizingFilter(cache_size=2048)
+
+    def run():
+        for msg in messages:
+            pii_filter.filter(logging.LogRecord("bench", logging.INFO, __file__, 0, msg, None, None))
+    return run
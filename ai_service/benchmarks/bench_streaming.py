@@ -0,0 +1,93 @@
+"""
+Streaming hot paths: window cutting, transcript stitching and session (de)serialization
+"""
+from datetime import datetime
+
+from .fixtures import slin_audio, transcript, transcript_windows
+from .harness import benchmark
+
+CHUNK_BYTES = 320  # 10ms of SLIN, as Asterisk sends it
+
+
+def _feed(buffer_factory, audio: bytes):
+    def run():
+        buffer = buffer_factory()
+        for start in range(0, len(audio), CHUNK_BYTES):
+            buffer.add_chunk(audio[start:start + CHUNK_BYTES])
+    return run
+
+
+@benchmark("audio_buffer.add_chunk.fixed_60s", group="streaming")
+def bench_add_chunk_fixed():
+    """60s of 10ms chunks through fixed 5s windows"""
+    from app.streaming.audio_buffer import AsteriskAudioBuffer
+    return _feed(lambda: AsteriskAudioBuffer(), slin_audio(60))
+
+
+@benchmark("audio_buffer.add_chunk.adaptive_60s", group="streaming")
+def bench_add_chunk_adaptive():
+    """60s of 10ms chunks through adaptive 2-8s windows cut at pauses"""
+    from app.streaming.audio_buffer import AsteriskAudioBuffer
+    return _feed(
+        lambda: AsteriskAudioBuffer(min_window_seconds=2.0, max_window_seconds=8.0, overlap_seconds=0.5,
+                                    silence_rms=0.01),
+        slin_audio(60)
+    )
+
+
+@benchmark("call_session.concatenate_transcript.120_windows", group="streaming")
+def bench_concatenate_transcript():
+    """Stitch 120 overlapping window transcripts into the cumulative transcript"""
+    from app.streaming.call_session_manager import CallSessionManager
+    manager = CallSessionManager(redis_client=object())
+    windows = transcript_windows(120)
+
+    def run():
+        cumulative = ""
+        for text in windows:
+            cumulative = manager._concatenate_transcript(cumulative, text)
+    return run
+
+
+def _session():
+    from app.core.enhanced_processing_manager import EnhancedProcessingMode
+    from app.streaming.call_session_manager import CallSession
+
+    segments = [
+        {"transcript": text, "duration": 5.0, "timestamp": datetime.now().isoformat(),
+         "metadata": {"window_id": i, "cut_reason": "pause", "rtf": 0.21}}
+        for i, text in enumerate(transcript_windows(60))
+    ]
+    return CallSession(
+        call_id="1700000000.123",
+        start_time=datetime.now(),
+        last_activity=datetime.now(),
+        connection_info={"client_addr": ["10.0.0.5", 41234], "source": "asterisk"},
+        transcript_segments=segments,
+        cumulative_transcript=transcript(120),
+        total_audio_duration=300.0,
+        segment_count=len(segments),
+        status="active",
+        processing_mode=EnhancedProcessingMode.DUAL,
+        processing_plan={
+            "mode": EnhancedProcessingMode.DUAL,
+            "realtime_processing": {"enabled": True, "window_seconds": 5},
+            "post_call_processing": {"enabled": True, "scp": {"password": "secret", "host": "pbx"}},
+        },
+    )
+
+
+@benchmark("call_session.to_dict.60_segments", group="streaming")
+def bench_session_to_dict():
+    """Serialize a 5-minute session (60 segments, enum processing plan)"""
+    session = _session()
+    return session.to_dict
+
+
+@benchmark("call_session.from_dict.60_segments", group="streaming")
+def bench_session_from_dict():
+    """Rebuild a 5-minute session from its serialized form"""
+    from app.streaming.call_session_manager import CallSession
+    data = _session().to_dict()
+    # from_dict converts the timestamps in place, so each call gets a shallow copy
+    return lambda: CallSession.from_dict(dict(data))
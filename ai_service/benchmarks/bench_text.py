@@ -0,0 +1,107 @@
+"""
+Transcript chunkers and chunk aggregation ahead of the NLP models
+"""
+import random
+from unittest.mock import patch
+
+from .fixtures import tokenizer, tokenizer_dir, transcript
+from .harness import benchmark
+
+# About a 10-minute call
+CALL_SENTENCES = 150
+
+
+@benchmark("text_utils.classification_chunker.10min", group="text")
+def bench_classification_chunker():
+    """ClassificationChunker (512 tokens, 150 overlap) over a 10-minute transcript"""
+    from app.utils.text_utils import ClassificationChunker
+    chunker, text = ClassificationChunker(tokenizer_name=tokenizer_dir()), transcript(CALL_SENTENCES)
+    return lambda: chunker.chunk_transcript(text)
+
+
+@benchmark("text_utils.translation_chunker.10min", group="text")
+def bench_translation_chunker():
+    """TranslationChunker (512 tokens, no overlap) over a 10-minute transcript"""
+    from app.utils.text_utils import TranslationChunker
+    chunker, text = TranslationChunker(tokenizer=tokenizer()), transcript(CALL_SENTENCES)
+    return lambda: chunker.chunk_transcript(text)
+
+
+@benchmark("text_utils.summarization_chunker.10min", group="text")
+def bench_summarization_chunker():
+    """SummarizationChunker (512 tokens, 100 overlap) over a 10-minute transcript"""
+    from app.utils.text_utils import SummarizationChunker
+    chunker, text = SummarizationChunker(tokenizer_name=tokenizer_dir()), transcript(CALL_SENTENCES)
+    return lambda: chunker.chunk_transcript(text)
+
+
+@benchmark("text_utils.ner_chunker.10min", group="text")
+def bench_ner_chunker():
+    """NERChunker (sentence boundaries, character offsets) over a 10-minute transcript"""
+    from app.utils.text_utils import NERChunker
+    chunker, text = NERChunker(tokenizer=tokenizer()), transcript(CALL_SENTENCES)
+    return lambda: chunker.chunk_transcript(text)
+
+
+def _intelligent_chunker():
+    """IntelligentTextChunker with the local tokenizer and the regex sentence splitter"""
+    from app.core import text_chunker
+    with patch.object(text_chunker.AutoTokenizer, "from_pretrained", return_value=tokenizer()), \
+            patch.object(text_chunker.spacy, "load", side_effect=OSError("benchmarks run without spaCy models")):
+        return text_chunker.IntelligentTextChunker()
+
+
+def _register_intelligent(strategy: str):
+    @benchmark(f"text_chunker.{strategy}.10min", group="text",
+               description=f"IntelligentTextChunker '{strategy}' strategy over a 10-minute transcript")
+    def bench():
+        chunker, text = _intelligent_chunker(), transcript(CALL_SENTENCES)
+        return lambda: chunker.chunk_text(text, strategy=strategy)
+    return bench
+
+
+for _strategy in ("classification", "translation", "summarization", "ner"):
+    _register_intelligent(_strategy)
+
+
+def _chunk_predictions(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    main = ["advice_counselling", "child_protection", "gbv", "information", "nutrition"]
+    sub = [f"sub_{i}" for i in range(20)]
+    interventions = ["counselling", "referral", "awareness", "follow_up"]
+    return [
+        {
+            "main_category": rng.choice(main),
+            "sub_category": rng.choice(sub),
+            "sub_category_2": rng.choice(sub),
+            "intervention": rng.choice(interventions),
+            "priority": rng.choice(["1", "2", "3"]),
+            "confidence_scores": {
+                "main_category": rng.random(), "sub_category": rng.random(), "sub_category_2": rng.random(),
+                "intervention": rng.random(), "priority": rng.random(),
+            },
+        }
+        for _ in range(count)
+    ]
+
+
+@benchmark("classification_aggregator.case.12_chunks", group="text")
+def bench_aggregate_case_classification():
+    """Confidence-weighted vote over 12 chunk classifications"""
+    from app.utils.text_utils import ClassificationAggregator
+    predictions = _chunk_predictions(12)
+    return lambda: ClassificationAggregator.aggregate_case_classification(predictions)
+
+
+@benchmark("classification_aggregator.qa.12_chunks", group="text")
+def bench_aggregate_qa_scoring():
+    """Probability-weighted vote over 12 chunk QA scorings (6 heads)"""
+    from app.utils.text_utils import ClassificationAggregator
+    rng = random.Random(0)
+    heads = {"opening": 1, "listening": 5, "proactiveness": 3, "resolution": 5, "hold": 2, "closing": 1}
+    predictions = [
+        {head: [{"submetric": f"{head}_{i}", "prediction": rng.random() > 0.5, "probability": rng.random()}
+                for i in range(n)] for head, n in heads.items()}
+        for _ in range(12)
+    ]
+    return lambda: ClassificationAggregator.aggregate_qa_scoring(predictions)
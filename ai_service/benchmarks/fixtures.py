@@ -0,0 +1,77 @@
+"""
+Deterministic inputs for the benchmarks
+
+Everything here is generated locally: call-like transcripts, SLIN audio and
+a small WordPiece tokenizer built from the transcript vocabulary (saved to a
+temporary directory so chunkers can load it by path, as they would a model's
+tokenizer). Nothing is downloaded.
+"""
+import random
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+SENTENCES = [
+    "Hello, thank you for calling the child helpline, how can I help you today?",
+    "I am calling about my neighbour's daughter, she is twelve years old and she has not been going to school.",
+    "The mother says the father beats them when he comes home drunk and the child is afraid to go back.",
+    "We will refer the case to the children's officer in Nairobi and follow up with the police station.",
+    "Please stay on the line while I take some details about where the family lives.",
+    "Is the child safe right now, and is there another relative she can stay with tonight?",
+    "My name is Wanjiru Kamau and I live in Kibera near the market.",
+    "You can reach me on 0712345678 or email me at mama.neema@gmail.com.",
+    "She told her teacher that she has not eaten since Monday.",
+    "Okay.",
+]
+
+
+def transcript(sentences: int, seed: int = 0) -> str:
+    """A call transcript of the given number of sentences"""
+    rng = random.Random(seed)
+    return " ".join(rng.choice(SENTENCES) for _ in range(sentences))
+
+
+def transcript_windows(count: int, words_per_window: int = 20, overlap_words: int = 3, seed: int = 0) -> List[str]:
+    """Successive window transcripts whose first words repeat the end of the previous window"""
+    words = transcript(count * words_per_window // 10 + 10, seed).split()
+    windows, position = [], 0
+    for _ in range(count):
+        start = max(0, position - overlap_words)
+        windows.append(" ".join(words[start:position + words_per_window]))
+        position += words_per_window
+    return windows
+
+
+def slin_audio(seconds: float, seed: int = 0) -> bytes:
+    """16 kHz 16-bit mono speech-like audio: tone bursts separated by near-silence"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    envelope = (np.sin(2 * np.pi * 0.4 * t) > -0.3).astype(np.float32)
+    signal = 0.3 * np.sin(2 * np.pi * 220 * t) * envelope + 0.01 * rng.standard_normal(t.size)
+    return (np.clip(signal, -1, 1) * 32767).astype(np.int16).tobytes()
+
+
+@lru_cache(maxsize=None)
+def tokenizer_dir() -> str:
+    """Directory holding a DistilBERT-style WordPiece tokenizer over the transcript vocabulary"""
+    from transformers import DistilBertTokenizerFast
+
+    workdir = Path(tempfile.mkdtemp(prefix="benchmark_tokenizer_"))
+    words = sorted({w.strip(",.?'").lower() for s in SENTENCES for w in s.split()} - {""})
+    specials = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+    characters = sorted({c for s in SENTENCES for c in s.lower() if not c.isspace()})
+    vocab_file = workdir / "vocab.txt"
+    vocab = list(dict.fromkeys(specials + characters + [f"##{c}" for c in characters] + words))
+    vocab_file.write_text("\n".join(vocab))
+    DistilBertTokenizerFast(vocab_file=str(vocab_file), model_max_length=512).save_pretrained(str(workdir))
+    return str(workdir)
+
+
+def tokenizer():
+    from transformers import AutoTokenizer
+    return AutoTokenizer.from_pretrained(tokenizer_dir())
@@ -0,0 +1,192 @@
+"""
+Benchmark harness
+
+Benchmarks register themselves with the @benchmark decorator. A benchmark is
+a setup function that builds its inputs and returns the zero-argument
+callable to time, so setup cost (tokenizers, synthetic audio) stays out of
+the measurement.
+
+Each benchmark is calibrated so one timing round lasts at least min_time,
+then timed for several rounds with the garbage collector off. The fastest
+round is the number compared against the baseline: interference from other
+processes only ever adds time, so the minimum is the most repeatable
+estimate (the median is reported alongside).
+"""
+import fnmatch
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Regressions are judged on the fastest round's time per call
+METRIC = "min_us"
+
+
+@dataclass
+class Benchmark:
+    """One registered benchmark."""
+    name: str
+    group: str
+    setup: Callable[[], Callable[[], Any]]
+    description: str = ""
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, group: str, description: Optional[str] = None):
+    """Register a setup function returning the callable to time (described by its docstring)"""
+    def register(setup: Callable[[], Callable[[], Any]]):
+        if name in BENCHMARKS:
+            raise ValueError(f"Duplicate benchmark name: {name}")
+        doc = (setup.__doc__ or "").strip()
+        BENCHMARKS[name] = Benchmark(name, group, setup, description or (doc.splitlines()[0] if doc else ""))
+        return setup
+    return register
+
+
+def select(patterns: Optional[List[str]] = None) -> List[Benchmark]:
+    """Registered benchmarks whose name or group matches any of the glob patterns"""
+    if not patterns:
+        return list(BENCHMARKS.values())
+    return [
+        bench for bench in BENCHMARKS.values()
+        if any(fnmatch.fnmatch(bench.name, p) or fnmatch.fnmatch(bench.group, p) for p in patterns)
+    ]
+
+
+def calibrate(fn: Callable[[], Any], min_time: float, max_number: int = 1_000_000) -> int:
+    """Calls per round so that a round lasts at least min_time"""
+    number = 1
+    while True:
+        began = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - began
+        if elapsed >= min_time or number >= max_number:
+            return number
+        # Aim a little past min_time so the next try usually passes
+        number = min(max_number, max(number * 2, int(number * min_time * 1.2 / max(elapsed, 1e-9))))
+
+
+def run_benchmark(bench: Benchmark, repeat: int = 5, min_time: float = 0.1) -> Dict[str, Any]:
+    """Time one benchmark; times are per call in microseconds"""
+    fn = bench.setup()
+    fn()  # warm caches and lazy imports
+    number = calibrate(fn, min_time)
+
+    rounds = []
+    gc.collect()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            began = time.perf_counter()
+            for _ in range(number):
+                fn()
+            rounds.append((time.perf_counter() - began) / number * 1e6)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    median = statistics.median(rounds)
+    return {
+        "name": bench.name,
+        "group": bench.group,
+        "median_us": round(median, 3),
+        "min_us": round(min(rounds), 3),
+        "max_us": round(max(rounds), 3),
+        "stdev_us": round(statistics.stdev(rounds), 3) if len(rounds) > 1 else 0.0,
+        "ops_per_second": round(1e6 / median, 1) if median else None,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """What the numbers depend on, so results from different machines are not mixed up"""
+    info = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+    try:
+        import torch
+        info["torch"] = torch.__version__
+        info["torch_threads"] = torch.get_num_threads()
+    except ImportError:
+        pass
+    try:
+        info["git_commit"] = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10,
+            cwd=Path(__file__).resolve().parent
+        ).stdout.strip() or None
+    except Exception:
+        info["git_commit"] = None
+    return info
+
+
+def save_results(path: str, results: List[Dict[str, Any]], settings: Optional[Dict[str, Any]] = None):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "environment": environment(),
+            "settings": settings or {},
+            "results": results,
+        }, f, indent=2)
+
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """Benchmark results in a results file, by name"""
+    with open(path) as f:
+        data = json.load(f)
+    return {row["name"]: row for row in data["results"]}
+
+
+def compare(baseline: Dict[str, Dict[str, Any]], current: Dict[str, Dict[str, Any]],
+            threshold: float = 0.25) -> List[Dict[str, Any]]:
+    """
+    Compare two sets of results by the fastest round's time per call
+
+    A benchmark regresses when it is more than threshold (a fraction) slower
+    than the baseline and improves when it is more than threshold faster.
+    Benchmarks only in one of the two sets are reported as new or missing.
+    """
+    rows = []
+    for name in sorted(set(baseline) | set(current)):
+        old, new = baseline.get(name), current.get(name)
+        if old is None or new is None:
+            rows.append({"name": name, "status": "new" if old is None else "missing",
+                         "baseline_us": old[METRIC] if old else None,
+                         "current_us": new[METRIC] if new else None, "change": None})
+            continue
+        change = (new[METRIC] - old[METRIC]) / old[METRIC] if old[METRIC] else 0.0
+        if change > threshold:
+            status = "regressed"
+        elif change < -threshold:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({"name": name, "status": status, "baseline_us": old[METRIC],
+                     "current_us": new[METRIC], "change": round(change, 4)})
+    return rows
+
+
+def format_time(us: Optional[float]) -> str:
+    if us is None:
+        return "-"
+    if us >= 1e6:
+        return f"{us / 1e6:.2f}s"
+    if us >= 1e3:
+        return f"{us / 1e3:.2f}ms"
+    return f"{us:.2f}µs"
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Backfill (or repair) the feedback_daily_rollup table from agent_feedback.
+
+Run once after deploying the rollups against a database that already holds
+feedback, and whenever the rollups need to be recomputed. Each run replaces
+the rollup rows of the selected day range in one transaction.
+
+Usage:
+    python scripts/backfill_feedback_rollups.py
+    python scripts/backfill_feedback_rollups.py --start 2026-01-01 --end 2026-01-31
+    python scripts/backfill_feedback_rollups.py --verify --json reports/rollup_backfill.json
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.session import SessionLocal, init_db  # noqa: E402
+from app.db.repositories.feedback_repository import FeedbackRepository  # noqa: E402
+from app.db.repositories.feedback_rollup_repository import FeedbackRollupRepository  # noqa: E402
+
+
+def verify(db, start_day: date, end_day: date) -> bool:
+    """Compare rollup statistics with a scan of agent_feedback for the same days."""
+    kwargs = dict(start_date=start_day, end_date=end_day)
+    from_rollups = FeedbackRepository.get_feedback_statistics(db, use_rollups=True, **kwargs)
+    from_scan = FeedbackRepository.get_feedback_statistics(db, use_rollups=False, **kwargs)
+    return from_rollups == from_scan
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill feedback_daily_rollup from agent_feedback")
+    parser.add_argument("--start", type=date.fromisoformat, help="First day to rebuild (YYYY-MM-DD, default: all)")
+    parser.add_argument("--end", type=date.fromisoformat, help="Last day to rebuild (YYYY-MM-DD, default: all)")
+    parser.add_argument("--verify", action="store_true",
+                        help="Check the rebuilt range against a full scan of agent_feedback")
+    parser.add_argument("--json", help="Write the result to this JSON file")
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    try:
+        print(f"🔄 Rebuilding feedback rollups ({args.start or 'first day'} → {args.end or 'today'})")
+        started = time.perf_counter()
+        rows = FeedbackRollupRepository.rebuild(db, args.start, args.end)
+        elapsed = time.perf_counter() - started
+        print(f"✅ Wrote {rows:,} rollup rows in {elapsed:.2f}s")
+
+        result = {"rollup_rows": rows, "seconds": round(elapsed, 3)}
+        if args.verify:
+            matches = verify(db, args.start or date(1970, 1, 1), args.end or date.today())
+            result["verified"] = matches
+            print("✅ Rollups match agent_feedback" if matches else "❌ Rollups differ from agent_feedback")
+    finally:
+        db.close()
+
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+    if args.verify and not result["verified"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark for PBX recording decoding
+
+Compares in-process decoding (app.utils.audio_decoder) with the ffmpeg
+paths on synthetic GSM 6.10 and 16 kHz WAV recordings of typical call
+lengths.
+
+- native:       libsndfile decode + polyphase resample, all in memory
+- ffmpeg_pipe:  ffmpeg over stdin/stdout (the fallback path)
+- ffmpeg_temp:  GSM written to a temp file, ffmpeg writing a second temp
+                file that is read back (the previous convert_gsm_to_wav)
+
+Usage:
+    python scripts/benchmark_audio_decoding.py
+    python scripts/benchmark_audio_decoding.py --minutes 5 15 45 --repeat 3 --json reports/decode_bench.json
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+import soundfile as sf
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.utils.audio_decoder import decode_audio_ffmpeg, decode_audio_native  # noqa: E402
+
+
+def synthesize_call(minutes: float, sample_rate: int) -> np.ndarray:
+    """Speech-like test signal: amplitude-modulated tones with noise"""
+    rng = np.random.default_rng(0)
+    samples = int(minutes * 60 * sample_rate)
+    t = np.arange(samples, dtype=np.float32) / sample_rate
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 0.3 * t)
+    signal = envelope * (0.2 * np.sin(2 * np.pi * 220 * t) + 0.1 * np.sin(2 * np.pi * 1250 * t))
+    signal += 0.02 * rng.standard_normal(samples).astype(np.float32)
+    return (np.clip(signal, -1, 1) * 32767).astype(np.int16)
+
+
+def encode_recording(samples: np.ndarray, sample_rate: int, fmt: str) -> bytes:
+    buffer = io.BytesIO()
+    if fmt == "gsm":
+        sf.write(buffer, samples, sample_rate, format="RAW", subtype="GSM610")
+    else:
+        sf.write(buffer, samples, sample_rate, format="WAV", subtype="PCM_16")
+    return buffer.getvalue()
+
+
+def ffmpeg_temp_files(audio_bytes: bytes, suffix: str) -> bytes:
+    """The previous temp-file round trip"""
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as src:
+        src.write(audio_bytes)
+        src_path = src.name
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as dst:
+        dst_path = dst.name
+    try:
+        input_args = ["-f", "gsm"] if suffix == ".gsm" else []
+        subprocess.run(
+            ["ffmpeg", "-y", "-loglevel", "error", *input_args, "-i", src_path,
+             "-ar", "16000", "-ac", "1", "-f", "wav", dst_path],
+            check=True, capture_output=True
+        )
+        with open(dst_path, "rb") as f:
+            return f.read()
+    finally:
+        for path in (src_path, dst_path):
+            if os.path.exists(path):
+                os.unlink(path)
+
+
+def time_runs(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return {"median_s": statistics.median(durations), "min_s": min(durations)}
+
+
+def run_benchmark(minutes_list: List[float], repeat: int) -> List[Dict]:
+    has_ffmpeg = shutil.which("ffmpeg") is not None
+    if not has_ffmpeg:
+        print("⚠️ ffmpeg not found - only the native decoder will be measured")
+
+    results = []
+    for minutes in minutes_list:
+        for fmt, sample_rate, suffix in (("gsm", 8000, ".gsm"), ("wav16", 16000, ".wav16")):
+            audio_bytes = encode_recording(synthesize_call(minutes, sample_rate), sample_rate, fmt)
+            audio_seconds = minutes * 60
+
+            methods = {"native": lambda: decode_audio_native(audio_bytes, fmt)}
+            if has_ffmpeg:
+                methods["ffmpeg_pipe"] = lambda: decode_audio_ffmpeg(audio_bytes, "gsm" if fmt == "gsm" else None)
+                methods["ffmpeg_temp"] = lambda: ffmpeg_temp_files(audio_bytes, suffix)
+
+            for method, fn in methods.items():
+                timing = time_runs(fn, repeat)
+                row = {
+                    "minutes": minutes,
+                    "format": fmt,
+                    "method": method,
+                    "input_mb": round(len(audio_bytes) / (1024 * 1024), 2),
+                    "median_s": round(timing["median_s"], 4),
+                    "min_s": round(timing["min_s"], 4),
+                    "x_realtime": round(audio_seconds / timing["median_s"], 1),
+                }
+                results.append(row)
+                print(f"{minutes:>5.0f} min  {fmt:<6} {method:<12} {row['input_mb']:>7.2f}MB  "
+                      f"{row['median_s']:>8.3f}s  {row['x_realtime']:>9.1f}x realtime")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PBX recording decoding")
+    parser.add_argument("--minutes", type=float, nargs="+", default=[5, 15, 45],
+                        help="Recording lengths to benchmark (default: 5 15 45)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    print("📊 Audio decoding benchmark")
+    results = run_benchmark(args.minutes, args.repeat)
+
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the reduced-context Whisper encoder on live call windows
+
+Transcribes audio cut into streaming windows twice through
+WhisperModel.transcribe_pcm_audio:
+
+- full:     every window padded to 30 seconds (3000 mel frames)
+- reduced:  only the frames present, rounded up to --bucket-seconds
+            (STREAMING_REDUCED_ENCODER_CONTEXT=true)
+
+and reports per-window latency for both, plus word error rate against
+reference transcripts when a sample set is given. The sample set is a
+directory of 16 kHz WAV files with a same-named .txt reference transcript
+each (e.g. a local Swahili set); without one, synthetic audio is used for
+latency only.
+
+Usage:
+    python scripts/benchmark_encoder_context.py --device cpu
+    python scripts/benchmark_encoder_context.py --samples data/sw_samples --language sw --window-seconds 5 --json reports/encoder_context.json
+"""
+
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import torch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config.settings import settings  # noqa: E402
+from app.model_scripts.whisper_model import WhisperModel  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+
+def normalize(text: str) -> List[str]:
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def word_errors(reference: List[str], hypothesis: List[str]) -> int:
+    """Word-level edit distance"""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1]
+
+
+def load_samples(directory: Optional[str], limit: int) -> List[Tuple[str, np.ndarray, Optional[str]]]:
+    """(name, int16 audio, reference transcript) per sample"""
+    if not directory:
+        rng = np.random.default_rng(0)
+        t = np.arange(30 * SAMPLE_RATE, dtype=np.float32) / SAMPLE_RATE
+        signal = (0.5 + 0.5 * np.sin(2 * np.pi * 0.3 * t)) * 0.2 * np.sin(2 * np.pi * 220 * t)
+        signal += 0.02 * rng.standard_normal(len(t)).astype(np.float32)
+        return [("synthetic", (np.clip(signal, -1, 1) * 32767).astype(np.int16), None)]
+
+    import librosa
+
+    samples = []
+    for wav_path in sorted(Path(directory).glob("*.wav"))[:limit or None]:
+        audio, _ = librosa.load(str(wav_path), sr=SAMPLE_RATE, mono=True)
+        txt_path = wav_path.with_suffix(".txt")
+        reference = txt_path.read_text(encoding="utf-8").strip() if txt_path.exists() else None
+        samples.append((wav_path.stem, (np.clip(audio, -1, 1) * 32767).astype(np.int16), reference))
+    return samples
+
+
+def run_mode(whisper: WhisperModel, samples, reduced: bool, window_seconds: float, bucket_seconds: float,
+             language: Optional[str]) -> Dict:
+    whisper.settings = settings.model_copy(update={
+        "streaming_reduced_encoder_context": reduced,
+        "streaming_encoder_bucket_seconds": bucket_seconds,
+    })
+    window = int(window_seconds * SAMPLE_RATE)
+    latencies, errors, reference_words = [], 0, 0
+
+    for name, audio, reference in samples:
+        words = []
+        for start in range(0, len(audio), window):
+            pcm = audio[start:start + window].tobytes()
+            began = time.perf_counter()
+            text = whisper.transcribe_pcm_audio(pcm, sample_rate=SAMPLE_RATE, language=language)
+            latencies.append(time.perf_counter() - began)
+            words.extend(normalize(text))
+        if reference is not None:
+            ref_words = normalize(reference)
+            errors += word_errors(ref_words, words)
+            reference_words += len(ref_words)
+
+    return {
+        "mode": "reduced" if reduced else "full",
+        "windows": len(latencies),
+        "median_window_s": round(statistics.median(latencies), 4),
+        "p95_window_s": round(float(np.percentile(latencies, 95)), 4),
+        "wer": round(errors / reference_words, 4) if reference_words else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare reduced-context and full-padding Whisper encoding")
+    parser.add_argument("--samples", help="Directory of 16kHz .wav files with .txt reference transcripts")
+    parser.add_argument("--limit", type=int, default=0, help="Use at most this many samples (0 = all)")
+    parser.add_argument("--language", default="sw", help="Transcription language (default: sw)")
+    parser.add_argument("--window-seconds", type=float, default=5.0, help="Streaming window length")
+    parser.add_argument("--bucket-seconds", type=float, default=settings.streaming_encoder_bucket_seconds,
+                        help="Reduced-context bucket length")
+    parser.add_argument("--device", choices=["auto", "cpu"], default="cpu", help="Run on CPU (default) or the load() default")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    print("📊 Whisper encoder context benchmark")
+    whisper = WhisperModel()
+    if not whisper.load():
+        print(f"❌ Whisper model failed to load: {whisper.error}")
+        sys.exit(1)
+    if args.device == "cpu":
+        whisper.device, whisper.torch_dtype = "cpu", torch.float32
+        whisper.model.to(device="cpu", dtype=whisper.torch_dtype)
+
+    samples = load_samples(args.samples, args.limit)
+    print(f"🎵 {len(samples)} sample(s), {args.window_seconds:.1f}s windows, {args.bucket_seconds:.1f}s buckets, device {whisper.device}")
+
+    # Warm up both paths so the first measured window does not pay for lazy initialisation
+    warmup = samples[0][1][:int(args.window_seconds * SAMPLE_RATE)]
+    for reduced in (False, True):
+        run_mode(whisper, [("warmup", warmup, None)], reduced, args.window_seconds, args.bucket_seconds, args.language)
+
+    results = []
+    for reduced in (False, True):
+        row = run_mode(whisper, samples, reduced, args.window_seconds, args.bucket_seconds, args.language)
+        results.append(row)
+        wer = f"{row['wer']:.3f}" if row["wer"] is not None else "n/a"
+        print(f"{row['mode']:<8} {row['windows']:>5} windows  median {row['median_window_s']:>7.3f}s  "
+              f"p95 {row['p95_window_s']:>7.3f}s  WER {wer}")
+
+    speedup = results[0]["median_window_s"] / results[1]["median_window_s"]
+    print(f"⚡ Reduced context: {speedup:.1f}x faster per window")
+
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump({"settings": vars(args), "results": results, "speedup": round(speedup, 2)}, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
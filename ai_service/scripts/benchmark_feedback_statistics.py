@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Benchmark for agent feedback statistics: table scan vs daily rollups
+
+For each table size, fills a fresh SQLite database with synthetic feedback
+(7 tasks, spread over --days days, ~60% rated), backfills the rollups, then
+times FeedbackRepository.get_feedback_statistics for several look-back
+windows read both ways:
+
+- scan:   GROUP BY task over agent_feedback filtered by created_at
+- rollup: GROUP BY task over feedback_daily_rollup (one row per task per day)
+
+Usage:
+    python scripts/benchmark_feedback_statistics.py
+    python scripts/benchmark_feedback_statistics.py --rows 1000000 --windows 7 30 --json reports/feedback_stats_bench.json
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.db.models import FeedbackDailyRollup  # noqa: E402
+from app.db.repositories.feedback_repository import FeedbackRepository  # noqa: E402
+from app.db.repositories.feedback_rollup_repository import FeedbackRollupRepository  # noqa: E402
+from app.db.session import Base  # noqa: E402
+
+TASKS = ["transcription", "classification", "ner", "summarization", "translation", "qa", "insights"]
+INSERT_SQL = (
+    "INSERT INTO agent_feedback (call_id, task, prediction, feedback, created_at, processing_mode) "
+    "VALUES (?, ?, '{}', ?, ?, 'post_call')"
+)
+
+
+def populate(engine, rows: int, days: int, seed: int = 0) -> float:
+    """Bulk load synthetic feedback rows; returns seconds taken."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    span = days * 86400
+    started = time.perf_counter()
+
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("PRAGMA synchronous = OFF")
+        cursor.execute("PRAGMA journal_mode = MEMORY")
+        batch = []
+        for i in range(rows):
+            call, task = divmod(i, len(TASKS))
+            created = now - timedelta(seconds=rng.randrange(span))
+            rating = rng.randint(1, 5) if rng.random() < 0.6 else None
+            batch.append((f"call_{call}", TASKS[task], rating, created.strftime("%Y-%m-%d %H:%M:%S.%f")))
+            if len(batch) == 50000:
+                cursor.executemany(INSERT_SQL, batch)
+                batch.clear()
+        if batch:
+            cursor.executemany(INSERT_SQL, batch)
+        raw.commit()
+    finally:
+        raw.close()
+    return time.perf_counter() - started
+
+
+def time_statistics(db, days: int, use_rollups: bool, repeat: int) -> Dict[str, float]:
+    # Explicit day ranges, so both reads cover exactly the same rows
+    end_date = datetime.utcnow().date()
+    start_date = end_date - timedelta(days=days - 1)
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = FeedbackRepository.get_feedback_statistics(
+            db, start_date=start_date, end_date=end_date, use_rollups=use_rollups
+        )
+        timings.append((time.perf_counter() - started) * 1000)
+    return {"median_ms": statistics.median(timings), "min_ms": min(timings), "result": result}
+
+
+def run_size(rows: int, days: int, windows: List[int], repeat: int, workdir: Path) -> List[Dict]:
+    db_path = workdir / f"feedback_bench_{rows}.db"
+    if db_path.exists():
+        db_path.unlink()
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+
+    print(f"📝 Loading {rows:,} feedback rows over {days} days")
+    load_seconds = populate(engine, rows, days)
+
+    db = sessionmaker(bind=engine)()
+    try:
+        started = time.perf_counter()
+        rollup_rows = FeedbackRollupRepository.rebuild(db)
+        backfill_seconds = time.perf_counter() - started
+        print(f"🔄 Backfilled {rollup_rows:,} rollup rows in {backfill_seconds:.2f}s "
+              f"(load took {load_seconds:.1f}s)")
+
+        results = []
+        for window in windows:
+            scan = time_statistics(db, window, use_rollups=False, repeat=repeat)
+            rollup = time_statistics(db, window, use_rollups=True, repeat=repeat)
+            speedup = scan["median_ms"] / rollup["median_ms"] if rollup["median_ms"] else 0
+            results_match = scan["result"] == rollup["result"]
+            results.append({
+                "rows": rows,
+                "window_days": window,
+                "scan_ms": round(scan["median_ms"], 2),
+                "rollup_ms": round(rollup["median_ms"], 2),
+                "speedup": round(speedup, 1),
+                "rollup_rows": db.query(FeedbackDailyRollup).count(),
+                "backfill_seconds": round(backfill_seconds, 2),
+                "results_match": results_match,
+            })
+            print(f"{rows:>11,} rows  {window:>4}d  scan {scan['median_ms']:>10.2f}ms  "
+                  f"rollup {rollup['median_ms']:>7.2f}ms  ⚡ {speedup:>8.1f}x"
+                  f"{'' if results_match else '  ❌ results differ'}")
+        return results
+    finally:
+        db.close()
+        engine.dispose()
+        db_path.unlink()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark feedback statistics: scan vs rollups")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000],
+                        help="Table sizes to test (default: 1000000 10000000)")
+    parser.add_argument("--days", type=int, default=365, help="Days of history to spread rows over")
+    parser.add_argument("--windows", type=int, nargs="+", default=[1, 7, 30, 365],
+                        help="Look-back windows in days")
+    parser.add_argument("--repeat", type=int, default=5, help="Queries per measurement")
+    parser.add_argument("--workdir", type=Path, default=Path(tempfile.gettempdir()),
+                        help="Directory for the temporary SQLite databases")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    print("📊 Feedback statistics benchmark (SQLite)")
+    results = []
+    for rows in args.rows:
+        results.extend(run_size(rows, args.days, args.windows, args.repeat, args.workdir))
+
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the ONNX Runtime backend of the DistilBERT models on CPU
+
+Runs the classifier, QA and NER models on the same texts through PyTorch and
+through their ONNX Runtime exports (ONNX_BACKEND_MODELS), and reports p50/p99
+latency per text for each backend, the speedup, and whether the two backends
+agree on the predictions.
+
+By default the configured models are loaded as the service would load them.
+With --synthetic, randomly initialised DistilBERT-base sized models are used
+instead, so the backends can be compared without model downloads (latency
+only; the predictions are meaningless).
+
+Usage:
+    python scripts/benchmark_onnx_backend.py
+    python scripts/benchmark_onnx_backend.py --synthetic --models classifier,qa --threads 4 --json reports/onnx_backend.json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+import torch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config.settings import settings  # noqa: E402
+from app.model_scripts.onnx_backend import ONNX_MODELS, ONNXRUNTIME_AVAILABLE  # noqa: E402
+
+SENTENCES = [
+    "Hello, thank you for calling the child helpline, how can I help you today?",
+    "I am calling about my neighbour's daughter, she is twelve years old and she has not been going to school.",
+    "The mother says the father beats them when he comes home drunk and the child is afraid to go back.",
+    "We will refer the case to the children's officer in Nairobi and follow up with the police station.",
+    "Please stay on the line while I take some details about where the family lives.",
+    "Is the child safe right now, and is there another relative she can stay with tonight?",
+]
+
+
+def make_texts(count: int) -> List[str]:
+    """Call-like texts from 1 to 12 sentences, the range the service sees per window and per call"""
+    rng = np.random.default_rng(0)
+    return [" ".join(rng.choice(SENTENCES, size=int(rng.integers(1, 13)))) for _ in range(count)]
+
+
+def synthetic_models(names: List[str]) -> Dict:
+    """DistilBERT-base sized models with random weights and a generated vocabulary"""
+    from transformers import (DistilBertConfig, DistilBertForTokenClassification, DistilBertModel,
+                              DistilBertTokenizerFast, pipeline)
+    from app.model_scripts.classifier_model import ClassifierModel, MultiTaskDistilBert
+    from app.model_scripts.ner_model import NERModel
+    from app.model_scripts.qa_model import MultiHeadQAClassifier, QAModel
+
+    workdir = Path(tempfile.mkdtemp(prefix="onnx_benchmark_"))
+    words = sorted({w.strip(",.?'").lower() for s in SENTENCES for w in s.split()})
+    vocab_file = workdir / "vocab.txt"
+    vocab_file.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", ",", ".", "?", "'", "s"] + words))
+    tokenizer = DistilBertTokenizerFast(vocab_file=str(vocab_file), model_max_length=512)
+    config = DistilBertConfig(vocab_size=tokenizer.vocab_size)
+
+    models = {}
+    if "classifier" in names:
+        classifier = ClassifierModel(model_path=str(workdir))
+        classifier.device = torch.device("cpu")
+        classifier.tokenizer = tokenizer
+        classifier.main_categories = [f"main_{i}" for i in range(8)]
+        classifier.sub_categories = [f"sub_{i}" for i in range(40)]
+        classifier.interventions = [f"intervention_{i}" for i in range(6)]
+        classifier.priorities = [1, 2, 3]
+        classifier.model = MultiTaskDistilBert(config, 8, 40, 6, 3).eval()
+        classifier.loaded = True
+        models["classifier"] = classifier
+    if "qa" in names:
+        DistilBertModel(config).save_pretrained(workdir / "qa_encoder")
+        qa = QAModel(model_path=str(workdir))
+        qa.device = torch.device("cpu")
+        qa.tokenizer = tokenizer
+        qa.model = MultiHeadQAClassifier(model_name=str(workdir / "qa_encoder")).eval()
+        qa.loaded = True
+        models["qa"] = qa
+    if "ner" in names:
+        config.id2label = {0: "O", 1: "B-PER", 2: "I-PER", 3: "B-LOC", 4: "I-LOC"}
+        config.label2id = {label: i for i, label in config.id2label.items()}
+        ner = NERModel(model_path=str(workdir))
+        ner.hf_pipeline = pipeline("token-classification", model=DistilBertForTokenClassification(config).eval(),
+                                   tokenizer=tokenizer, aggregation_strategy="simple", device="cpu")
+        ner.use_hf = ner.loaded = True
+        models["ner"] = ner
+    return models
+
+
+def loaded_models(names: List[str]) -> Dict:
+    """The configured models, loaded on CPU"""
+    from app.model_scripts.classifier_model import classifier_model
+    from app.model_scripts.ner_model import ner_model
+    from app.model_scripts.qa_model import qa_model
+
+    models = {}
+    for name, model in (("classifier", classifier_model), ("qa", qa_model), ("ner", ner_model)):
+        if name not in names:
+            continue
+        if hasattr(model, "device"):
+            model.device = torch.device("cpu")
+        if not model.load():
+            print(f"❌ {name} failed to load: {model.error}")
+            continue
+        if name == "ner" and not model.use_hf:
+            print("⚠️ NER loaded spaCy rather than a Hugging Face pipeline - no ONNX backend to compare")
+            continue
+        models[name] = model
+    return models
+
+
+def predict_fn(name: str, model) -> Callable[[str], object]:
+    if name == "classifier":
+        return model.classify
+    if name == "qa":
+        return model.predict
+    return lambda text: model.hf_pipeline(text)
+
+
+def summary(name: str, result) -> object:
+    """The part of a result both backends must agree on"""
+    if name == "classifier":
+        return tuple(result[k] for k in ("main_category", "sub_category", "intervention", "priority"))
+    if name == "qa":
+        return {head: [m["prediction"] for m in metrics] for head, metrics in result.items()}
+    return [(e["entity_group"], e["start"], e["end"]) for e in result]
+
+
+def measure(fn: Callable[[str], object], texts: List[str], warmup: int) -> Dict:
+    for text in texts[:warmup]:
+        fn(text)
+    latencies, results = [], []
+    for text in texts:
+        began = time.perf_counter()
+        results.append(fn(text))
+        latencies.append((time.perf_counter() - began) * 1000)
+    return {
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p99_ms": round(float(np.percentile(latencies, 99)), 2),
+        "mean_ms": round(statistics.mean(latencies), 2),
+        "results": results,
+    }
+
+
+def enable_onnx(model) -> bool:
+    model._enable_onnx_backend()
+    return model.onnx_session is not None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare PyTorch and ONNX Runtime latency for the DistilBERT models")
+    parser.add_argument("--models", default="all", help="Comma-separated models: classifier, qa, ner or all")
+    parser.add_argument("--synthetic", action="store_true", help="Use random DistilBERT-base sized models (no downloads)")
+    parser.add_argument("--texts", type=int, default=200, help="Number of texts per model and backend")
+    parser.add_argument("--warmup", type=int, default=10, help="Untimed calls before measuring")
+    parser.add_argument("--threads", type=int, default=0, help="Threads for both backends (0 = physical cores)")
+    parser.add_argument("--cache-dir", help="ONNX export cache (default: ONNX_CACHE_DIR)")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    if not ONNXRUNTIME_AVAILABLE:
+        print("❌ onnxruntime is not installed")
+        sys.exit(1)
+
+    from app.model_scripts.model_loader import _parse_model_list
+    from app.model_scripts.onnx_backend import _physical_cores
+
+    names = _parse_model_list(args.models, ONNX_MODELS)
+    threads = args.threads or _physical_cores()
+    torch.set_num_threads(threads)
+    # Models load on PyTorch first; the ONNX backend is switched on per model below
+    settings.onnx_backend_models = ""
+    settings.onnx_intra_op_threads = threads
+    if args.cache_dir:
+        settings.onnx_cache_dir = args.cache_dir
+
+    print(f"📊 ONNX Runtime backend benchmark ({threads} threads, {args.texts} texts)")
+    models = synthetic_models(names) if args.synthetic else loaded_models(names)
+    if not models:
+        print("❌ No models to benchmark")
+        sys.exit(1)
+    texts = make_texts(args.texts)
+
+    rows = []
+    for name, model in models.items():
+        pytorch = measure(predict_fn(name, model), texts, args.warmup)
+
+        settings.onnx_backend_models = name
+        exported_at = time.perf_counter()
+        if not enable_onnx(model):
+            print(f"❌ {name}: ONNX export failed, see the log")
+            continue
+        export_s = time.perf_counter() - exported_at
+        onnx = measure(predict_fn(name, model), texts, args.warmup)
+        settings.onnx_backend_models = ""
+
+        agreement = sum(summary(name, a) == summary(name, b) for a, b in zip(pytorch["results"], onnx["results"])) / len(texts)
+        row = {
+            "model": name,
+            "pytorch": {k: v for k, v in pytorch.items() if k != "results"},
+            "onnxruntime": {k: v for k, v in onnx.items() if k != "results"},
+            "speedup_p50": round(pytorch["p50_ms"] / onnx["p50_ms"], 2),
+            "speedup_p99": round(pytorch["p99_ms"] / onnx["p99_ms"], 2),
+            "prediction_agreement": round(agreement, 4),
+            "export_s": round(export_s, 2),
+            "onnx_path": model.onnx_session.path,
+        }
+        rows.append(row)
+        print(f"{name:<10} pytorch p50 {row['pytorch']['p50_ms']:>8.2f}ms p99 {row['pytorch']['p99_ms']:>8.2f}ms | "
+              f"onnx p50 {row['onnxruntime']['p50_ms']:>8.2f}ms p99 {row['onnxruntime']['p99_ms']:>8.2f}ms | "
+              f"⚡ {row['speedup_p50']:.2f}x p50  {row['speedup_p99']:.2f}x p99  agreement {agreement:.1%}")
+
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump({"settings": {**vars(args), "threads": threads}, "results": rows}, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for the PII logging filter
+
+Compares PIISanitizingFilter (one combined pattern, one pass over the
+formatted message, per-filter bounded cache) with the previous sequential
+implementation, rebuilt here as the baseline: a search and a sub per pattern
+group over plain alternations, lru_cache on the bound method, and msg and
+args sanitized separately.
+
+Messages mirror the service's logging: mostly f-strings (no args), most
+without PII, a few %-style calls, and call/task ids that keep all but a
+fraction of messages unique so they miss the caches.
+
+Usage:
+    python scripts/benchmark_pii_filter.py
+    python scripts/benchmark_pii_filter.py --messages 200000 --repeat-ratio 0.5 --json reports/pii_filter_bench.json
+"""
+
+import argparse
+import json
+import logging
+import random
+import re
+import statistics
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.security.pii_logging_filter import (  # noqa: E402
+    COMMON_NAMES,
+    KENYAN_LOCATIONS,
+    PIISanitizingFilter,
+)
+
+
+class SequentialPIIFilter(PIISanitizingFilter):
+    """The previous filter: separate search/sub per pattern, msg and args apart"""
+
+    def _compile_patterns(self):
+        super()._compile_patterns()
+        self.name_pattern = (
+            re.compile(r'\b(' + '|'.join(re.escape(n) for n in COMMON_NAMES) + r')\b', re.IGNORECASE),
+            '[REDACTED-NAME]'
+        )
+        self.location_pattern = (
+            re.compile(r'\b(' + '|'.join(re.escape(loc) for loc in KENYAN_LOCATIONS) + r')\b', re.IGNORECASE),
+            '[REDACTED-LOCATION]'
+        )
+
+    @lru_cache(maxsize=2048)
+    def _sanitize_text(self, text: str) -> str:
+        if not text or not isinstance(text, str):
+            return text
+        sanitized = text
+        for pattern, replacement in (self.phone_patterns + [self.email_pattern, self.name_pattern,
+                                                           self.location_pattern, self.age_pattern]):
+            if pattern.search(sanitized):
+                sanitized = pattern.sub(replacement, sanitized)
+        return sanitized
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.msg, str):
+            record.msg = self._sanitize_text(record.msg)
+        if record.args:
+            if isinstance(record.args, dict):
+                record.args = {k: self._sanitize_text(v) if isinstance(v, str) else v
+                               for k, v in record.args.items()}
+            else:
+                record.args = tuple(self._sanitize_text(a) if isinstance(a, str) else a
+                                    for a in record.args)
+        return True
+
+
+TEMPLATES = [
+    ("🔄 Processing audio chunk {i} for call {call}", None),
+    ("✅ Task {task} completed in {ms}ms", None),
+    ("📊 Queue depth %d, active workers %d", "ints"),
+    ("GET /health/models 200 in {ms}ms", None),
+    ("🎙️ Transcribed window {i} for call {call}: {text}", None),
+    ("Translation for call {call}: {text}", None),
+    ("❌ Failed to reach agent endpoint for call {call}: timeout after {ms}ms", None),
+    ("Caller %s from %s, phone %s", "pii"),
+]
+
+TRANSCRIPTS = [
+    "I would like to report a case of child neglect in our neighbourhood",
+    "My name is Wanjiru Kamau and I live in Kibera near the market",
+    "The child is 12 years old and has not been to school this term",
+    "You can reach me on 0712345678 or email me at mama.neema@gmail.com",
+    "We need help with school fees for the next term please",
+]
+
+
+def build_messages(count: int, repeat_ratio: float, seed: int = 0) -> List[tuple]:
+    rng = random.Random(seed)
+    messages = []
+    for i in range(count):
+        template, kind = rng.choice(TEMPLATES)
+        unique = rng.random() >= repeat_ratio
+        msg = template.format(
+            i=i if unique else 0,
+            call=f"17{i:08d}" if unique else "1700000000",
+            task=f"{i:08x}-4b1c" if unique else "task",
+            ms=rng.randrange(5, 900) if unique else 10,
+            text=rng.choice(TRANSCRIPTS),
+        )
+        if kind == "ints":
+            args = (rng.randrange(50), rng.randrange(8))
+        elif kind == "pii":
+            args = (rng.choice(COMMON_NAMES), rng.choice(KENYAN_LOCATIONS), f"07{rng.randrange(10 ** 8):08d}")
+        else:
+            args = None
+        messages.append((msg, args))
+    return messages
+
+
+def make_records(messages: List[tuple]) -> List[logging.LogRecord]:
+    return [
+        logging.LogRecord("bench", logging.INFO, __file__, 0, msg, args, None)
+        for msg, args in messages
+    ]
+
+
+def measure(filter_cls, messages: List[tuple], repeat: int) -> Dict[str, float]:
+    rates = []
+    for _ in range(repeat):
+        pii_filter = filter_cls()
+        records = make_records(messages)
+        start = time.perf_counter()
+        for record in records:
+            pii_filter.filter(record)
+            record.getMessage()
+        rates.append(len(records) / (time.perf_counter() - start))
+    return {"median": statistics.median(rates), "max": max(rates)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the PII logging filter")
+    parser.add_argument("--messages", type=int, default=100000, help="Messages per run (default: 100000)")
+    parser.add_argument("--repeat-ratio", type=float, default=0.3,
+                        help="Fraction of messages that repeat exactly (default: 0.3)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per filter")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    messages = build_messages(args.messages, args.repeat_ratio)
+
+    # Both filters must produce the same log output
+    sequential, combined = SequentialPIIFilter(), PIISanitizingFilter()
+    mismatches = 0
+    for a, b in zip(make_records(messages), make_records(messages)):
+        sequential.filter(a)
+        combined.filter(b)
+        mismatches += a.getMessage() != b.getMessage()
+
+    print(f"📊 PII filter benchmark: {args.messages:,} messages, {args.repeat_ratio:.0%} repeated")
+    results = []
+    for name, filter_cls in (("sequential", SequentialPIIFilter), ("combined", PIISanitizingFilter)):
+        rate = measure(filter_cls, messages, args.repeat)
+        results.append({"filter": name, "messages_per_second": round(rate["median"]),
+                        "best_messages_per_second": round(rate["max"])})
+        print(f"{name:<11} {rate['median']:>12,.0f} msg/s  (best {rate['max']:,.0f})")
+
+    speedup = results[1]["messages_per_second"] / results[0]["messages_per_second"]
+    print(f"⚡ Speedup: {speedup:.2f}x, output mismatches: {mismatches}")
+
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump({"results": results, "speedup": round(speedup, 2), "mismatches": mismatches}, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Benchmark for PII log scanning
+
+Generates a synthetic Celery/application log (1 GB by default) with a
+realistic mix of technical lines, status lines and model predictions that
+carry PII, then scans it three ways:
+
+- line_by_line: one analyzer call per line (the previous scan loop)
+- batched:      pre-filtered lines analyzed in batches (nlp.pipe for NER backends)
+- parallel:     batched, with the file sharded across a process pool
+
+Usage:
+    python scripts/benchmark_pii_scanning.py
+    python scripts/benchmark_pii_scanning.py --size-mb 64 --backend spacy --workers 8
+    python scripts/benchmark_pii_scanning.py --log /tmp/pii_bench.log --keep --json reports/pii_bench.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.security.pii_log_scanner import PIILogScanner  # noqa: E402
+
+MB = 1024 * 1024
+
+NAMES = ["Wanjiru Kamau", "Otieno", "Neema", "Baraka Mwangi", "Amina Hassan", "Juma"]
+PLACES = ["Nairobi", "Kibera", "Mombasa", "Arusha", "Dodoma", "a village near Kisumu"]
+
+
+def synthesize_line(rng: random.Random, i: int) -> str:
+    ts = f"2026-01-30 10:{(i // 60) % 60:02d}:{i % 60:02d},{i % 1000:03d}"
+    kind = rng.random()
+    if kind < 0.35:
+        return f"[{ts}: INFO/ForkPoolWorker-{i % 8}] Task audio_tasks.process_audio_task[{i:08x}] received\n"
+    if kind < 0.6:
+        return f"{ts} - app.core.resource_manager - INFO - GPU memory 3.{i % 10}GB, queue depth {i % 17}\n"
+    if kind < 0.75:
+        return f"{ts} - app.api.health - INFO - GET /health/models 200 in {i % 90}ms\n"
+    name, place = rng.choice(NAMES), rng.choice(PLACES)
+    phone = f"07{rng.randrange(10 ** 8):08d}"
+    text = rng.choice([
+        f"My name is {name} and I am calling from {place}",
+        f"The child is 12 years old and lives with {name} in {place}",
+        f"Please call me back on {phone}, this is {name}",
+        "The caller asked about school fees support for next term",
+    ])
+    return f"{ts} - INFO - {{'call_id': '{i}', 'task': 'transcription', 'prediction': '\"{text}\"'}}\n"
+
+
+def write_synthetic_log(path: Path, size_mb: float) -> int:
+    rng = random.Random(0)
+    target = int(size_mb * MB)
+    written = 0
+    i = 0
+    with open(path, "w") as f:
+        while written < target:
+            block = "".join(synthesize_line(rng, i + j) for j in range(10000))
+            f.write(block)
+            written += len(block.encode())
+            i += 10000
+    return written
+
+
+def scan_line_by_line(scanner: PIILogScanner, log_file: Path):
+    lines = lines_with_pii = 0
+    with open(log_file, "r", encoding="utf-8", errors="ignore") as f:
+        for line_num, line in enumerate(f, 1):
+            lines += 1
+            if scanner._scan_line(line, log_file, line_num):
+                lines_with_pii += 1
+    return lines, lines_with_pii
+
+
+def run_benchmark(log_file: Path, backend: str, workers: int, batch_size: int,
+                  shard_mb: float, methods: List[str]) -> List[Dict]:
+    use_presidio = backend == "presidio"
+    use_spacy = backend in ("presidio", "spacy")
+    size_mb = log_file.stat().st_size / MB
+
+    results = []
+    for method in methods:
+        scanner = PIILogScanner(
+            use_presidio=use_presidio,
+            use_spacy=use_spacy,
+            batch_size=batch_size,
+            n_workers=workers if method == "parallel" else 1,
+            shard_bytes=int(shard_mb * MB),
+        )
+        active = "presidio" if scanner.use_presidio else ("spacy" if scanner.use_spacy else "regex")
+
+        start = time.perf_counter()
+        if method == "line_by_line":
+            lines, lines_with_pii = scan_line_by_line(scanner, log_file)
+        else:
+            lines, lines_with_pii = scanner.scan_log_file(log_file)
+        elapsed = time.perf_counter() - start
+
+        row = {
+            "method": method,
+            "backend": active,
+            "workers": scanner.n_workers,
+            "size_mb": round(size_mb, 1),
+            "lines": lines,
+            "lines_with_pii": lines_with_pii,
+            "detections": len(scanner.detections),
+            "seconds": round(elapsed, 2),
+            "lines_per_second": round(lines / elapsed) if elapsed else 0,
+            "mb_per_second": round(size_mb / elapsed, 2) if elapsed else 0,
+        }
+        results.append(row)
+        print(f"{method:<13} {active:<9} x{row['workers']:<3} {row['lines']:>11,} lines  "
+              f"{row['seconds']:>8.2f}s  {row['lines_per_second']:>10,} lines/s  "
+              f"{row['mb_per_second']:>7.2f} MB/s  {row['detections']:,} detections")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PII log scanning")
+    parser.add_argument("--size-mb", type=float, default=1024, help="Synthetic log size (default: 1024)")
+    parser.add_argument("--log", type=Path, help="Log file to use (generated if it does not exist)")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated log file")
+    parser.add_argument("--backend", choices=["regex", "spacy", "presidio"], default="regex",
+                        help="Analyzer backend (default: regex)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes for the parallel run (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=256, help="Lines per NLP batch")
+    parser.add_argument("--shard-mb", type=float, default=64, help="Shard size for the parallel run")
+    parser.add_argument("--methods", nargs="+", default=["line_by_line", "batched", "parallel"],
+                        choices=["line_by_line", "batched", "parallel"])
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    # Per-detection warnings would dominate the measurement
+    logging.disable(logging.WARNING)
+
+    log_file = args.log or Path(tempfile.gettempdir()) / f"pii_bench_{int(args.size_mb)}mb.log"
+    generated = False
+    if not log_file.exists():
+        print(f"📝 Generating {args.size_mb:.0f}MB synthetic log at {log_file}")
+        write_synthetic_log(log_file, args.size_mb)
+        generated = True
+
+    print("📊 PII scanning benchmark")
+    try:
+        results = run_benchmark(log_file, args.backend, args.workers, args.batch_size,
+                                args.shard_mb, args.methods)
+    finally:
+        if generated and not args.keep:
+            log_file.unlink()
+
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,657 @@
+#!/usr/bin/env python3
+"""
+Replay call traffic against the Asterisk TCP server and report capacity
+
+Streams N calls built from local WAV files to AsteriskTCPServer as 16 kHz
+SLIN in 10ms chunks, at real-time pace or --speed times faster. Call lengths
+and arrival times follow configurable distributions (--call-length,
+--arrival). While the calls run, the broker queue depth is sampled; once they
+end and the workers drain, every call session is read back from Redis and the
+run is reduced to a capacity report:
+
+  - per-window end-to-end latency: socket write of the window's last byte to
+    the add_transcription commit (segment committed_at)
+  - windows submitted, committed, empty (silence) and dropped
+  - real-time factor (transcription time / window audio) per window
+  - queue depth and the notifications the workers sent
+
+The only services needed are Redis and the streaming server with its Celery
+workers; a local notification sink is built in (point the workers'
+NOTIFICATION_ENDPOINT_URL / NOTIFICATION_AUTH_ENDPOINT_URL at the URLs it
+prints). Latency compares this host's clock with the workers', so run on the
+same host or NTP-synced machines. Windows are only transcribed in streaming
+or dual processing mode.
+
+Usage:
+    # 20 calls of the WAV files' own length, arriving at 6 per minute
+    python scripts/simulate_call_traffic.py --audio-folder /path/to/wavs --calls 20
+
+    # 50 concurrent calls (all at once), lognormal lengths around 3 minutes
+    python scripts/simulate_call_traffic.py --audio-folder /path/to/wavs --calls 50 --arrival burst \\
+        --call-length lognormal --mean-call-seconds 180
+
+    # 4x real time, with an in-process streaming server, JSON report
+    python scripts/simulate_call_traffic.py --audio-folder /path/to/wavs --speed 4 --start-server \\
+        --json reports/capacity.json
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import math
+import random
+import sys
+import time
+import wave
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+SAMPLE_RATE = 16000
+BYTES_PER_SECOND = SAMPLE_RATE * 2
+CHUNK_BYTES = 320  # 10ms of 16-bit mono, as Asterisk sends it
+CALL_LENGTHS = ("source", "fixed", "uniform", "exponential", "lognormal")
+ARRIVALS = ("poisson", "uniform", "burst")
+QUEUE = "model_processing"
+
+
+@dataclass
+class CallPlan:
+    """One simulated call: when it starts (seconds after the run starts) and what it streams"""
+    call_id: str
+    start_offset: float
+    source: str
+    pcm: bytes
+
+    @property
+    def duration_seconds(self) -> float:
+        return len(self.pcm) / BYTES_PER_SECOND
+
+
+@dataclass
+class CallRecord:
+    """What happened on the socket for one call"""
+    plan: CallPlan
+    write_times: List[float] = field(default_factory=list)  # wall clock after each chunk write
+    connected_at: Optional[float] = None
+    closed_at: Optional[float] = None
+    error: Optional[str] = None
+
+    def write_time_at(self, stream_seconds: float) -> Optional[float]:
+        """Wall clock when the byte at this stream position was written"""
+        if not self.write_times:
+            return None
+        chunk = math.ceil(stream_seconds * BYTES_PER_SECOND / CHUNK_BYTES) - 1
+        return self.write_times[min(max(chunk, 0), len(self.write_times) - 1)]
+
+
+# ============================================================================
+# Traffic model
+# ============================================================================
+
+def load_wav(path: Path) -> np.ndarray:
+    """16 kHz mono int16 samples of a PCM WAV file"""
+    with wave.open(str(path), "rb") as wav:
+        channels, width, rate = wav.getnchannels(), wav.getsampwidth(), wav.getframerate()
+        raw = wav.readframes(wav.getnframes())
+
+    if width not in (1, 2, 4):
+        raise ValueError(f"Unsupported sample width: {width}")
+    if width == 1:
+        audio = (np.frombuffer(raw, np.uint8).astype(np.float32) - 128) / 128
+    else:
+        dtype = np.int16 if width == 2 else np.int32
+        audio = np.frombuffer(raw, dtype).astype(np.float32) / np.iinfo(dtype).max
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1)
+    if rate != SAMPLE_RATE:
+        positions = np.arange(int(len(audio) * SAMPLE_RATE / rate)) * rate / SAMPLE_RATE
+        audio = np.interp(positions, np.arange(len(audio)), audio)
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+def load_sources(audio_folder: str) -> List[Tuple[str, np.ndarray]]:
+    """Every readable WAV file in the folder, sorted by name"""
+    folder = Path(audio_folder)
+    if not folder.is_dir():
+        raise ValueError(f"Audio folder does not exist: {audio_folder}")
+
+    sources = []
+    for path in sorted(p for p in folder.iterdir() if p.suffix.lower() == ".wav"):
+        try:
+            samples = load_wav(path)
+        except (wave.Error, ValueError, EOFError) as e:
+            print(f"⚠️ Skipping {path.name}: {e}")
+            continue
+        if len(samples):
+            sources.append((path.name, samples))
+    if not sources:
+        raise ValueError(f"No readable WAV files in {audio_folder}")
+    return sources
+
+
+def call_length(rng: random.Random, distribution: str, mean: float, minimum: float, maximum: float,
+                sigma: float = 0.8, source_seconds: Optional[float] = None) -> float:
+    """Draw a call length in seconds, clamped to [minimum, maximum]"""
+    if distribution == "source":
+        seconds = source_seconds if source_seconds is not None else mean
+    elif distribution == "fixed":
+        seconds = mean
+    elif distribution == "uniform":
+        seconds = rng.uniform(minimum, maximum)
+    elif distribution == "exponential":
+        seconds = rng.expovariate(1.0 / mean)
+    elif distribution == "lognormal":
+        # mu chosen so the distribution's mean (not its median) is `mean`
+        seconds = rng.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma)
+    else:
+        raise ValueError(f"Unknown call length distribution: {distribution}")
+    return min(max(seconds, minimum), maximum)
+
+
+def arrival_offsets(rng: random.Random, process: str, calls: int, calls_per_minute: float) -> List[float]:
+    """Call start times in seconds after the run starts"""
+    if process == "burst":
+        return [0.0] * calls
+    interval = 60.0 / calls_per_minute
+    if process == "uniform":
+        return [i * interval for i in range(calls)]
+    if process == "poisson":
+        offsets, now = [], 0.0
+        for _ in range(calls):
+            offsets.append(now)
+            now += rng.expovariate(1.0 / interval)
+        return offsets
+    raise ValueError(f"Unknown arrival process: {process}")
+
+
+def call_audio(rng: random.Random, samples: np.ndarray, seconds: float) -> bytes:
+    """`seconds` of little-endian SLIN from a random point in the source, looping it as needed"""
+    count = int(seconds * SAMPLE_RATE)
+    start = rng.randrange(len(samples))
+    repeats = (start + count) // len(samples) + 1
+    return np.tile(samples, repeats)[start:start + count].astype("<i2").tobytes()
+
+
+def plan_calls(args, sources: List[Tuple[str, np.ndarray]]) -> List[CallPlan]:
+    rng = random.Random(args.seed)
+    offsets = arrival_offsets(rng, args.arrival, args.calls, args.calls_per_minute)
+    run_id = time.strftime("%H%M%S")
+    plans = []
+    for i, offset in enumerate(offsets):
+        name, samples = sources[i % len(sources)]
+        seconds = call_length(rng, args.call_length, args.mean_call_seconds, args.min_call_seconds,
+                              args.max_call_seconds, args.call_length_sigma, len(samples) / SAMPLE_RATE)
+        plans.append(CallPlan(
+            call_id=f"{args.call_id_prefix}{run_id}{i:04d}",
+            # Arrivals are compressed with the audio so the offered load keeps its shape
+            start_offset=offset / args.speed,
+            source=name,
+            pcm=call_audio(rng, samples, seconds)
+        ))
+    return plans
+
+
+# ============================================================================
+# Notification sink
+# ============================================================================
+
+class NotificationSink:
+    """
+    Minimal HTTP endpoint standing in for the helpline API: answers the token
+    request and accepts every notification, counting them by type
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8399):
+        self.host = host
+        self.port = port
+        self.server = None
+        self.received: Counter = Counter()
+        self.calls: Counter = Counter()
+        self.auth_requests = 0
+
+    @property
+    def endpoint_url(self) -> str:
+        return f"http://{self.host}:{self.port}/api/msg/"
+
+    @property
+    def auth_url(self) -> str:
+        return f"http://{self.host}:{self.port}/api/"
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+
+    async def stop(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+    def record(self, body: bytes):
+        """Count a notification, unwrapping the base64 envelope if used"""
+        try:
+            data = json.loads(body or b"{}")
+            if "message" in data and "notification_type" not in data:
+                data = json.loads(base64.b64decode(data["message"]))
+        except (ValueError, TypeError):
+            self.received["unparseable"] += 1
+            return
+        self.received[data.get("notification_type", "unknown")] += 1
+        call_id = (data.get("call_metadata") or {}).get("call_id")
+        if call_id:
+            self.calls[call_id] += 1
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method = request_line.split(b" ", 1)[0].upper()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length") or 0))
+
+                if method == b"GET":
+                    self.auth_requests += 1
+                    # Token in the helpline API's format, see _fetch_auth_token
+                    payload = {"ss": [["simulated-token"]], "expires_in": 3600}
+                else:
+                    self.record(body)
+                    payload = {"status": "ok"}
+                data = json.dumps(payload).encode()
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                             b"Content-Length: " + str(len(data)).encode() + b"\r\n\r\n" + data)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "total": sum(self.received.values()),
+            "by_type": dict(self.received),
+            "calls_notified": len(self.calls),
+            "auth_requests": self.auth_requests
+        }
+
+
+# ============================================================================
+# Traffic replay
+# ============================================================================
+
+async def stream_call(host: str, port: int, record: CallRecord, run_start: float, speed: float, pace_ms: float):
+    """Connect at the planned time, send the call id, then the audio at `speed` times real time"""
+    plan = record.plan
+    delay = run_start + plan.start_offset - time.time()
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError as e:
+        record.error = f"connect failed: {e}"
+        return
+    record.connected_at = time.time()
+
+    try:
+        writer.write(plan.call_id.encode() + b"\r")
+        await writer.drain()
+        # The server drops whatever follows the call id in the same read
+        await asyncio.sleep(0.05)
+
+        sent, total = 0, len(plan.pcm)
+        stream_start = time.time()
+        while sent < total:
+            due = min(total, int((time.time() - stream_start) * speed * BYTES_PER_SECOND) // CHUNK_BYTES * CHUNK_BYTES
+                      + CHUNK_BYTES)
+            while sent < due:
+                writer.write(plan.pcm[sent:sent + CHUNK_BYTES])
+                sent += CHUNK_BYTES
+                record.write_times.append(time.time())
+            await writer.drain()
+            await asyncio.sleep(pace_ms / 1000)
+    except (ConnectionError, OSError) as e:
+        record.error = f"stream failed after {len(record.write_times)} chunks: {e}"
+    finally:
+        record.closed_at = time.time()
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+
+async def sample_queue(broker, samples: List[Dict[str, float]], interval: float, stop: asyncio.Event):
+    """LLEN the streaming queue (with its priority lists) and the unacked hash until stopped"""
+    from app.core.celery_monitor import PRIORITY_QUEUE_SUFFIXES, UNACKED_KEY
+
+    while not stop.is_set():
+        try:
+            pipe = broker.pipeline(transaction=False)
+            for suffix in PRIORITY_QUEUE_SUFFIXES:
+                pipe.llen(f"{QUEUE}{suffix}")
+            pipe.hlen(UNACKED_KEY)
+            replies = await pipe.execute()
+            samples.append({"time": time.time(), "depth": sum(int(n or 0) for n in replies[:-1]),
+                            "unacked": int(replies[-1] or 0)})
+        except Exception as e:
+            print(f"⚠️ Queue sampling failed: {e}")
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def read_session(redis_client, call_id: str) -> Dict[str, Any]:
+    """Session data and window counters for one call"""
+    fields = await redis_client.hmget(f"call_session:{call_id}", "data", "windows_submitted", "windows_empty")
+    return {
+        "data": json.loads(fields[0]) if fields[0] else None,
+        "submitted": int(fields[1] or 0),
+        "empty": int(fields[2] or 0)
+    }
+
+
+def window_segments(session: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Segments written by streaming window transcription"""
+    data = session.get("data") or {}
+    return [s for s in data.get("transcript_segments", [])
+            if (s.get("metadata") or {}).get("stream_end_seconds") is not None]
+
+
+async def wait_for_drain(redis_client, records: List[CallRecord], timeout: float, settle: float) -> Dict[str, Dict]:
+    """
+    Poll sessions until every submitted window is committed or empty (or the
+    timeout passes). Waits `settle` seconds first so the last windows of
+    each call can reach the queue.
+    """
+    await asyncio.sleep(settle)
+    deadline = time.time() + timeout
+    while True:
+        sessions = {r.plan.call_id: await read_session(redis_client, r.plan.call_id) for r in records}
+        outstanding = sum(max(0, s["submitted"] - s["empty"] - len(window_segments(s))) for s in sessions.values())
+        if not outstanding or time.time() >= deadline:
+            if outstanding:
+                print(f"⚠️ Drain timeout: {outstanding} windows still outstanding")
+            return sessions
+        print(f"⏳ Waiting for {outstanding} windows...")
+        await asyncio.sleep(2.0)
+
+
+# ============================================================================
+# Report
+# ============================================================================
+
+def percentiles(values: List[float]) -> Optional[Dict[str, float]]:
+    if not values:
+        return None
+    array = np.asarray(values, dtype=np.float64)
+    return {
+        "count": len(values),
+        "mean": round(float(array.mean()), 4),
+        "p50": round(float(np.percentile(array, 50)), 4),
+        "p95": round(float(np.percentile(array, 95)), 4),
+        "p99": round(float(np.percentile(array, 99)), 4),
+        "max": round(float(array.max()), 4)
+    }
+
+
+def peak_concurrency(records: List[CallRecord]) -> int:
+    events = []
+    for r in records:
+        if r.connected_at is not None and r.closed_at is not None:
+            events += [(r.connected_at, 1), (r.closed_at, -1)]
+    peak = active = 0
+    # Closes sort before opens at the same instant
+    for _, delta in sorted(events):
+        active += delta
+        peak = max(peak, active)
+    return peak
+
+
+def build_report(args, records: List[CallRecord], sessions: Dict[str, Dict], queue_samples: List[Dict],
+                 notifications: Dict[str, Any]) -> Dict[str, Any]:
+    latencies, server_latencies, rtfs = [], [], []
+    submitted = committed = empty = 0
+    calls_without_session = []
+
+    for record in records:
+        session = sessions.get(record.plan.call_id) or {}
+        if record.error is None and not session.get("data"):
+            calls_without_session.append(record.plan.call_id)
+        segments = window_segments(session)
+        submitted += session.get("submitted", 0)
+        empty += session.get("empty", 0)
+        committed += len(segments)
+
+        for segment in segments:
+            metadata = segment["metadata"]
+            committed_at = segment.get("committed_at")
+            written_at = record.write_time_at(metadata["stream_end_seconds"])
+            if committed_at is not None and written_at is not None:
+                latencies.append(committed_at - written_at)
+            if committed_at is not None and metadata.get("window_end_time") is not None:
+                server_latencies.append(committed_at - metadata["window_end_time"])
+            if segment.get("audio_duration") and metadata.get("processing_duration") is not None:
+                rtfs.append(metadata["processing_duration"] / segment["audio_duration"])
+
+    dropped = max(0, submitted - committed - empty)
+    drop_rate = dropped / submitted if submitted else None
+    latency = percentiles(latencies)
+    peak = peak_concurrency(records)
+    depths = [s["depth"] for s in queue_samples]
+
+    checks = {
+        "windows_transcribed": submitted > 0,
+        "p95_latency": latency is not None and latency["p95"] <= args.max_p95_latency,
+        "drop_rate": drop_rate is not None and drop_rate <= args.max_drop_rate,
+        "calls_connected": all(r.error is None for r in records)
+    }
+
+    return {
+        "config": {
+            "calls": args.calls, "speed": args.speed, "arrival": args.arrival,
+            "calls_per_minute": args.calls_per_minute, "call_length": args.call_length,
+            "mean_call_seconds": args.mean_call_seconds, "seed": args.seed,
+            "target": f"{args.host}:{args.port}"
+        },
+        "calls": {
+            "planned": len(records),
+            "failed": [{"call_id": r.plan.call_id, "error": r.error} for r in records if r.error],
+            "without_session": calls_without_session,
+            "audio_seconds": round(sum(len(r.write_times) * CHUNK_BYTES / BYTES_PER_SECOND for r in records), 1),
+            "peak_concurrent": peak,
+            # k concurrent calls at k-times speed load the workers like k * speed real-time calls
+            "peak_realtime_equivalent": round(peak * args.speed, 1)
+        },
+        "windows": {
+            "submitted": submitted, "committed": committed, "empty": empty, "dropped": dropped,
+            "drop_rate": round(drop_rate, 4) if drop_rate is not None else None
+        },
+        "latency_seconds": {
+            "end_to_end": latency,
+            # Window cut on the server to commit: queueing plus transcription
+            "cut_to_commit": percentiles(server_latencies)
+        },
+        "real_time_factor": percentiles(rtfs),
+        "queue": {
+            "samples": len(depths),
+            "max_depth": max(depths) if depths else None,
+            "mean_depth": round(float(np.mean(depths)), 2) if depths else None,
+            "max_unacked": max((s["unacked"] for s in queue_samples), default=None)
+        },
+        "notifications": notifications,
+        "verdict": {
+            "passed": all(checks.values()),
+            "checks": checks,
+            "max_p95_latency": args.max_p95_latency,
+            "max_drop_rate": args.max_drop_rate
+        }
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    calls, windows, verdict = report["calls"], report["windows"], report["verdict"]
+    print("\n📊 Capacity report")
+    print(f"📞 Calls: {calls['planned']} planned, {len(calls['failed'])} failed, "
+          f"peak {calls['peak_concurrent']} concurrent (≈{calls['peak_realtime_equivalent']} real-time), "
+          f"{calls['audio_seconds']:.0f}s audio sent")
+    drop_rate = f"{windows['drop_rate']:.2%}" if windows["drop_rate"] is not None else "n/a"
+    print(f"🪟 Windows: {windows['submitted']} submitted, {windows['committed']} committed, "
+          f"{windows['empty']} empty, {windows['dropped']} dropped ({drop_rate})")
+
+    for name, stats in [("End-to-end latency", report["latency_seconds"]["end_to_end"]),
+                        ("Cut-to-commit latency", report["latency_seconds"]["cut_to_commit"]),
+                        ("Real-time factor", report["real_time_factor"])]:
+        if stats:
+            print(f"⏱️ {name}: p50 {stats['p50']:.2f}  p95 {stats['p95']:.2f}  p99 {stats['p99']:.2f}  "
+                  f"max {stats['max']:.2f}")
+        else:
+            print(f"⏱️ {name}: no data")
+
+    queue = report["queue"]
+    if queue["samples"]:
+        print(f"📥 Queue: max depth {queue['max_depth']}, mean {queue['mean_depth']}, "
+              f"max unacked {queue['max_unacked']}")
+    print(f"🔔 Notifications: {report['notifications']['total']} {report['notifications']['by_type']}")
+
+    if not verdict["checks"]["windows_transcribed"]:
+        print("⚠️ No windows were submitted: is DEFAULT_PROCESSING_MODE streaming or dual?")
+    for name, ok in verdict["checks"].items():
+        print(f"{'✅' if ok else '❌'} {name}")
+    print("✅ PASS: sustained this load" if verdict["passed"] else "❌ FAIL: load not sustained")
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+async def run(args) -> Dict[str, Any]:
+    import redis.asyncio as aioredis
+
+    sources = load_sources(args.audio_folder)
+    plans = plan_calls(args, sources)
+    audio_seconds = sum(p.duration_seconds for p in plans)
+    print(f"📋 {len(plans)} calls from {len(sources)} WAV files, {audio_seconds:.0f}s of audio, "
+          f"{args.arrival} arrivals, {args.speed:g}x speed")
+
+    sink = NotificationSink(args.sink_host, args.sink_port)
+    if not args.no_sink:
+        await sink.start()
+        print("🔔 Notification sink running; start the workers with:")
+        print(f"   NOTIFICATION_ENDPOINT_URL={sink.endpoint_url}")
+        print(f"   NOTIFICATION_AUTH_ENDPOINT_URL={sink.auth_url}")
+
+    server_task = None
+    if args.start_server:
+        from app.streaming.tcp_server import AsteriskTCPServer
+        server = AsteriskTCPServer(args.host, args.port)
+        server_task = asyncio.create_task(server.start_server())
+        await asyncio.sleep(0.5)
+        print(f"🚀 Streaming server started on {args.host}:{args.port}")
+
+    session_redis = aioredis.from_url(args.redis_url, decode_responses=True)
+    broker_redis = aioredis.from_url(args.broker_url, decode_responses=True)
+    queue_samples: List[Dict[str, float]] = []
+    stop_sampling = asyncio.Event()
+    sampler = asyncio.create_task(sample_queue(broker_redis, queue_samples, args.sample_interval, stop_sampling))
+
+    try:
+        records = [CallRecord(plan) for plan in plans]
+        run_start = time.time() + 0.5
+        await asyncio.gather(*(stream_call(args.host, args.port, r, run_start, args.speed, args.pace_ms)
+                               for r in records))
+        print(f"📤 All calls streamed in {time.time() - run_start:.1f}s, draining...")
+        sessions = await wait_for_drain(session_redis, records, args.drain_timeout, args.settle_seconds)
+    finally:
+        stop_sampling.set()
+        await sampler
+        await session_redis.aclose()
+        await broker_redis.aclose()
+        await sink.stop()
+        if server_task:
+            server_task.cancel()
+
+    return build_report(args, records, sessions, queue_samples, sink.summary())
+
+
+def main() -> int:
+    from app.config.settings import get_redis_url, settings
+
+    redis_url = get_redis_url()
+    parser = argparse.ArgumentParser(description="Replay call traffic against the Asterisk TCP server")
+    parser.add_argument("--audio-folder", required=True, help="Folder of WAV files to build calls from")
+    parser.add_argument("--calls", type=int, default=10, help="Number of calls (default: 10)")
+    parser.add_argument("--speed", type=float, default=1.0, help="Times real time to stream at (default: 1)")
+    parser.add_argument("--arrival", choices=ARRIVALS, default="poisson",
+                        help="Arrival process; burst starts every call at once (default: poisson)")
+    parser.add_argument("--calls-per-minute", type=float, default=6.0,
+                        help="Mean arrival rate for poisson/uniform arrivals (default: 6)")
+    parser.add_argument("--call-length", choices=CALL_LENGTHS, default="source",
+                        help="Call length distribution; source uses each WAV's own length (default: source)")
+    parser.add_argument("--mean-call-seconds", type=float, default=120.0, help="Mean call length (default: 120)")
+    parser.add_argument("--min-call-seconds", type=float, default=10.0, help="Shortest call (default: 10)")
+    parser.add_argument("--max-call-seconds", type=float, default=900.0, help="Longest call (default: 900)")
+    parser.add_argument("--call-length-sigma", type=float, default=0.8, help="Lognormal sigma (default: 0.8)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed, for replayable runs (default: 0)")
+    parser.add_argument("--host", default="127.0.0.1", help="Streaming server host (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=settings.streaming_port,
+                        help=f"Streaming server port (default: {settings.streaming_port})")
+    parser.add_argument("--start-server", action="store_true", help="Run AsteriskTCPServer in this process")
+    parser.add_argument("--redis-url", default=f"{redis_url.rsplit('/', 1)[0]}/{settings.redis_task_db}",
+                        help="Redis database holding call sessions (default: the task database)")
+    parser.add_argument("--broker-url", default=redis_url, help="Celery broker Redis (default: REDIS_URL)")
+    parser.add_argument("--sink-host", default="127.0.0.1", help="Notification sink host (default: 127.0.0.1)")
+    parser.add_argument("--sink-port", type=int, default=8399, help="Notification sink port (default: 8399)")
+    parser.add_argument("--no-sink", action="store_true", help="Do not run the notification sink")
+    parser.add_argument("--pace-ms", type=float, default=20.0, help="Send loop tick in ms (default: 20)")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="Queue sampling interval (default: 1s)")
+    parser.add_argument("--settle-seconds", type=float, default=3.0,
+                        help="Wait before checking the drain (default: 3)")
+    parser.add_argument("--drain-timeout", type=float, default=120.0,
+                        help="Longest wait for outstanding windows after the last call (default: 120)")
+    parser.add_argument("--max-p95-latency", type=float, default=10.0,
+                        help="Pass threshold for p95 end-to-end window latency in seconds (default: 10)")
+    parser.add_argument("--max-drop-rate", type=float, default=0.01,
+                        help="Pass threshold for the dropped window fraction (default: 0.01)")
+    parser.add_argument("--call-id-prefix", default="sim", help="Prefix for generated call ids (default: sim)")
+    parser.add_argument("--json", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    if args.speed <= 0 or args.calls < 1 or args.calls_per_minute <= 0:
+        parser.error("--speed, --calls and --calls-per-minute must be positive")
+
+    try:
+        report = asyncio.run(run(args))
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    except KeyboardInterrupt:
+        print("\n⏹️ Interrupted")
+        return 130
+
+    print_report(report)
+    if args.json:
+        Path(args.json).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report written to {args.json}")
+    return 0 if report["verdict"]["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+Equivalence tests for ai_streaming's batched ApplyTimestampRules
+
+The filter masks every row with tensor ops and tracks each row's last
+timestamp incrementally through update(). These tests run it side by side
+with the original per-row implementation over random logits, token
+histories and beam reorders, and require identical logits at every step.
+"""
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+torch = pytest.importorskip("torch")
+import numpy as np
+import torch.nn.functional as F
+
+AI_STREAMING_DIR = Path(__file__).resolve().parents[3] / "ai_streaming"
+
+# Small vocabulary with the same layout as Whisper's: text < eot < specials < timestamps
+N_VOCAB = 80
+TOKENIZER = SimpleNamespace(eot=50, no_timestamps=52, timestamp_begin=54)
+SAMPLE_BEGIN = 3
+
+
+@pytest.fixture(scope="module")
+def decoding():
+    """ai_streaming.decoding, imported the way its flat modules expect"""
+    flat_modules = ("decoding", "utils", "tokenizer", "mel")
+    saved = {name: sys.modules.pop(name) for name in flat_modules if name in sys.modules}
+    sys.path.insert(0, str(AI_STREAMING_DIR))
+    try:
+        import decoding
+    finally:
+        sys.path.remove(str(AI_STREAMING_DIR))
+        for name in flat_modules:
+            sys.modules.pop(name, None)
+        sys.modules.update(saved)
+    return decoding
+
+
+class ReferenceTimestampRules:
+    """ApplyTimestampRules as it was before batching: a Python loop over rows, rescanning tokens"""
+
+    def __init__(self, tokenizer, sample_begin, max_initial_timestamp_index):
+        self.tokenizer = tokenizer
+        self.sample_begin = sample_begin
+        self.max_initial_timestamp_index = max_initial_timestamp_index
+
+    def apply(self, logits, tokens):
+        if self.tokenizer.no_timestamps is not None:
+            logits[:, self.tokenizer.no_timestamps] = -np.inf
+
+        for k in range(tokens.shape[0]):
+            sampled_tokens = tokens[k, self.sample_begin:]
+            seq = [t for t in sampled_tokens.tolist()]
+            last_was_timestamp = (len(seq) >= 1 and seq[-1] >= self.tokenizer.timestamp_begin)
+            penultimate_was_timestamp = (len(seq) < 2 or seq[-2] >= self.tokenizer.timestamp_begin)
+
+            if last_was_timestamp:
+                if penultimate_was_timestamp:
+                    logits[k, self.tokenizer.timestamp_begin:] = -np.inf
+                else:
+                    logits[k, : self.tokenizer.eot] = -np.inf
+
+            timestamps = sampled_tokens[sampled_tokens.ge(self.tokenizer.timestamp_begin)]
+            if timestamps.numel() > 0:
+                if last_was_timestamp and not penultimate_was_timestamp:
+                    timestamp_last = timestamps[-1]
+                else:
+                    timestamp_last = timestamps[-1] + 1
+                logits[k, self.tokenizer.timestamp_begin: timestamp_last] = -np.inf
+
+        if tokens.shape[1] == self.sample_begin:
+            logits[:, : self.tokenizer.timestamp_begin] = -np.inf
+            if self.max_initial_timestamp_index is not None:
+                last_allowed = (self.tokenizer.timestamp_begin + self.max_initial_timestamp_index)
+                logits[:, last_allowed + 1:] = -np.inf
+
+        logprobs = F.log_softmax(logits.float(), dim=-1)
+        for k in range(tokens.shape[0]):
+            timestamp_logprob = logprobs[k, self.tokenizer.timestamp_begin:].logsumexp(dim=-1)
+            max_text_token_logprob = logprobs[k, : self.tokenizer.timestamp_begin].max()
+            if timestamp_logprob > max_text_token_logprob:
+                logits[k, : self.tokenizer.timestamp_begin] = -np.inf
+
+
+def run_side_by_side(decoding, generator, n_batch, n_steps, max_initial_timestamp_index, reorder):
+    reference = ReferenceTimestampRules(TOKENIZER, SAMPLE_BEGIN, max_initial_timestamp_index)
+    batched = decoding.ApplyTimestampRules(TOKENIZER, SAMPLE_BEGIN, max_initial_timestamp_index)
+    tokens = torch.randint(0, TOKENIZER.eot, (n_batch, SAMPLE_BEGIN), generator=generator)
+
+    for step in range(n_steps):
+        # Bias logits toward timestamps so pairs, repeats and decreases all occur
+        logits = torch.randn(n_batch, N_VOCAB, generator=generator) * 3
+        logits[:, TOKENIZER.timestamp_begin:] += torch.rand(n_batch, 1, generator=generator) * 4
+
+        expected, actual = logits.clone(), logits.clone()
+        reference.apply(expected, tokens)
+        batched.apply(actual, tokens)
+        assert torch.equal(expected, actual), f"step {step}: filters disagree"
+
+        # Any next token, not only allowed ones, so update() also sees histories the rules would forbid
+        next_tokens = torch.randint(0, N_VOCAB, (n_batch, 1), generator=generator)
+        source_indices = None
+        if reorder:
+            source_indices = torch.randint(0, n_batch, (n_batch,), generator=generator).tolist()
+            tokens = tokens[source_indices]
+        tokens = torch.cat([tokens, next_tokens], dim=-1)
+        batched.update(tokens, source_indices)
+
+
+class TestApplyTimestampRulesEquivalence:
+    """Test the batched filter matches the per-row reference exactly"""
+
+    @pytest.mark.parametrize("reorder", [False, True], ids=["greedy", "beam_reorder"])
+    def test_random_histories(self, decoding, reorder):
+        generator = torch.Generator().manual_seed(41 + reorder)
+        for _ in range(300):
+            run_side_by_side(
+                decoding,
+                generator,
+                n_batch=int(torch.randint(1, 6, (1,), generator=generator)),
+                n_steps=int(torch.randint(1, 12, (1,), generator=generator)),
+                max_initial_timestamp_index=[None, 0, 5][int(torch.randint(0, 3, (1,), generator=generator))],
+                reorder=reorder,
+            )
+
+    def test_last_timestamp_follows_reordered_beams(self, decoding):
+        ts = TOKENIZER.timestamp_begin
+        batched = decoding.ApplyTimestampRules(TOKENIZER, SAMPLE_BEGIN, None)
+        reference = ReferenceTimestampRules(TOKENIZER, SAMPLE_BEGIN, None)
+        prompt = torch.zeros(2, SAMPLE_BEGIN, dtype=torch.long)
+
+        batched.apply(torch.zeros(2, N_VOCAB), prompt)
+        # Row 0 samples timestamp ts+9, row 1 samples ts+2; then both beams continue row 1 and text follows
+        tokens = torch.cat([prompt, torch.tensor([[ts + 9], [ts + 2]])], dim=-1)
+        batched.update(tokens, None)
+        batched.apply(torch.zeros(2, N_VOCAB), tokens)
+        tokens = torch.cat([tokens[[1, 1]], torch.tensor([[7], [8]])], dim=-1)
+        batched.update(tokens, [1, 1])
+
+        assert batched.last_timestamp.tolist() == [ts + 2, ts + 2]
+        expected, actual = torch.zeros(2, N_VOCAB), torch.zeros(2, N_VOCAB)
+        reference.apply(expected, tokens)
+        batched.apply(actual, tokens)
+        assert torch.equal(expected, actual)
+        # Timestamps up to the last one are forbidden, later ones allowed
+        assert torch.isinf(actual[:, ts: ts + 3]).all()
+        assert not torch.isinf(actual[:, ts + 3:]).any()
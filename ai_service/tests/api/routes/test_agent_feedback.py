@@ -177,6 +177,25 @@ def test_get_feedback_statistics_success(client, mock_feedback_repo):
     assert data["period_days"] == 30
     assert "classification" in data["tasks"]
 
+def test_get_feedback_statistics_date_range(client, mock_feedback_repo):
+    """Test retrieving feedback statistics for an explicit day range."""
+    mock_feedback_repo.get_feedback_statistics.return_value = {
+        "period_days": 7, "tasks": {}, "start_date": "2026-01-01", "end_date": "2026-01-07"
+    }
+
+    response = client.get("/api/v1/agent-feedback/statistics?start_date=2026-01-01&end_date=2026-01-07")
+    assert response.status_code == 200
+    assert response.json()["start_date"] == "2026-01-01"
+    kwargs = mock_feedback_repo.get_feedback_statistics.call_args.kwargs
+    assert str(kwargs["start_date"]) == "2026-01-01"
+    assert str(kwargs["end_date"]) == "2026-01-07"
+
+def test_get_feedback_statistics_invalid_range(client, mock_feedback_repo):
+    """Test an end_date before start_date is rejected."""
+    response = client.get("/api/v1/agent-feedback/statistics?start_date=2026-01-07&end_date=2026-01-01")
+    assert response.status_code == 400
+    mock_feedback_repo.get_feedback_statistics.assert_not_called()
+
 def test_get_feedback_statistics_error(client, mock_feedback_repo):
     """Test retrieving feedback statistics when an error occurs."""
     mock_feedback_repo.get_feedback_statistics.return_value = {"error": "Database query failed"}
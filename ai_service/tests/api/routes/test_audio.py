@@ -11,6 +11,7 @@ from fastapi import UploadFile, File, Depends # Import File and Depends for patc
 # from app.api.audio_routes import process_audio_complete 
 import os
 import app.api.audio_routes
+from app.core.celery_monitor import CeleryEventMonitor
 from datetime import datetime, timedelta
 import asyncio # Import asyncio for mocking sleep
 import json # Import json for parsing streamed data
@@ -66,9 +67,11 @@ def mock_celery_tasks():
         mock_inspect.reserved.return_value = {"worker1": []}
         mock_celery_app.control.inspect.return_value = mock_inspect
 
-        # Mock celery_monitor
+        # Mock celery_monitor, serving cluster state from a real cache
         mock_celery_monitor.get_active_tasks.return_value = {"active_tasks": []}
         mock_celery_monitor.get_worker_stats.return_value = {}
+        cluster_cache = CeleryEventMonitor()
+        mock_celery_monitor.get_cluster_state.side_effect = cluster_cache.get_cluster_state
 
         # Mock health_check_models
         mock_health_check_models.return_value = {"status": "ok"}
@@ -89,9 +92,15 @@ def mock_celery_tasks():
             "audio_streaming": mock_audio_streaming,
             "mock_async_result": mock_async_result,
             "mock_inspect": mock_inspect,
+            "cluster_cache": cluster_cache,
             "mock_async_sleep": mock_async_sleep
         }
 
+def refresh_cluster_cache(mocks):
+    """Run one background inspect of the cluster-state cache against the mocked Celery app"""
+    with patch('app.core.celery_monitor.celery_app', mocks["celery_app"]):
+        return mocks["cluster_cache"].refresh_inspect()
+
 # Helper function to create a mock UploadFile
 def create_mock_upload_file(filename: str, content: bytes, content_type: str = "audio/wav"):
     return UploadFile(filename=filename, file=BytesIO(content))
@@ -613,6 +622,8 @@ def test_get_queue_status_success(mock_celery_tasks):
     mock_celery_tasks["mock_inspect"].reserved.return_value = {
         "worker2@host": [{"id": "reserved_task_1"}]
     }
+    refresh_cluster_cache(mock_celery_tasks)
+    mock_celery_tasks["cluster_cache"].queue_lengths = {"model_processing": 3}
 
     response = client.get("/audio/queue/status")
     assert response.status_code == 200
@@ -623,14 +634,14 @@ def test_get_queue_status_success(mock_celery_tasks):
     assert data["queue_stats"]["active_tasks"] == 2
     assert data["queue_stats"]["scheduled_tasks"] == 1
     assert data["queue_stats"]["reserved_tasks"] == 1
-    assert data["queue_stats"]["total_pending"] == 4
+    assert data["queue_stats"]["queued_tasks"] == 3
+    assert data["queue_stats"]["total_pending"] == 7
+    assert data["cache"]["inspect"]["stale"] is False
 
 def test_get_queue_status_no_workers(mock_celery_tasks):
     """Test getting queue status when no workers are running."""
     mock_celery_tasks["mock_inspect"].stats.return_value = None
-    mock_celery_tasks["mock_inspect"].active.return_value = None
-    mock_celery_tasks["mock_inspect"].scheduled.return_value = None
-    mock_celery_tasks["mock_inspect"].reserved.return_value = None
+    refresh_cluster_cache(mock_celery_tasks)
 
     response = client.get("/audio/queue/status")
     assert response.status_code == 200
@@ -638,25 +649,29 @@ def test_get_queue_status_no_workers(mock_celery_tasks):
     assert data["status"] == "no_workers"
     assert data["workers"] == 0
 
-def test_get_queue_status_inspection_timeout(mock_celery_tasks):
-    """Test getting queue status when inspection times out after retries."""
-    mock_celery_tasks["mock_inspect"].stats.side_effect = [Exception("Timeout"), Exception("Timeout"), Exception("Timeout") ]
-    
+def test_get_queue_status_served_from_cache(mock_celery_tasks):
+    """Test queue status keeps the last snapshot when a later inspect fails, and never inspects per request."""
+    refresh_cluster_cache(mock_celery_tasks)
+    mock_celery_tasks["mock_inspect"].stats.side_effect = Exception("Timeout")
+    assert refresh_cluster_cache(mock_celery_tasks) is False
+    mock_celery_tasks["celery_app"].control.inspect.reset_mock()
+
     response = client.get("/audio/queue/status")
     assert response.status_code == 200
     data = response.json()
-    assert data["status"] == "inspection_timeout"
-    assert "Workers busy" in data["message"]
+    assert data["status"] == "healthy"
+    assert data["workers"] == 1
+    mock_celery_tasks["celery_app"].control.inspect.assert_not_called()
 
 def test_get_queue_status_exception_handling(mock_celery_tasks):
     """Test /audio/queue/status when an unexpected exception occurs."""
-    mock_celery_tasks["celery_app"].control.inspect.side_effect = Exception("Celery inspect failed")
+    mock_celery_tasks["celery_monitor"].get_cluster_state.side_effect = Exception("Cluster state unavailable")
 
     response = client.get("/audio/queue/status")
     assert response.status_code == 200 # Endpoint returns 200 with error in body
     data = response.json()
     assert data["status"] == "error"
-    assert "Celery inspect failed" in data["message"]
+    assert "Cluster state unavailable" in data["message"]
 
 # --- Tests for GET /audio/workers/status ---
 def test_get_worker_status_success(mock_celery_tasks):
@@ -670,6 +685,7 @@ def test_get_worker_status_success(mock_celery_tasks):
     mock_celery_tasks["mock_inspect"].active.return_value = {
         "worker1@host": [{"id": "active_task_1"}]
     }
+    refresh_cluster_cache(mock_celery_tasks)
 
     response = client.get("/audio/workers/status")
     assert response.status_code == 200
@@ -679,15 +695,15 @@ def test_get_worker_status_success(mock_celery_tasks):
     assert data["celery_inspection"]["available"] is True
     assert data["celery_inspection"]["stats"]["worker1@host"]["total"]["task_name"] == 5
     assert data["celery_inspection"]["active"]["worker1@host"][0]["id"] == "active_task_1"
+    assert data["workers"][0]["status"] == "online"
 
 def test_get_worker_status_inspection_timeout(mock_celery_tasks):
-    """Test getting worker status when inspection times out."""
+    """Test getting worker status when the background inspection timed out."""
     mock_celery_tasks["celery_monitor"].get_worker_stats.return_value = {
         "worker1@host": {"status": "online", "tasks_processed": 10}
     }
-    # Mock the methods of the inspect object to raise exceptions
     mock_celery_tasks["mock_inspect"].stats.side_effect = Exception("Inspection timeout")
-    mock_celery_tasks["mock_inspect"].active.side_effect = Exception("Inspection timeout")
+    refresh_cluster_cache(mock_celery_tasks)
 
     response = client.get("/audio/workers/status")
     assert response.status_code == 200
@@ -695,6 +711,7 @@ def test_get_worker_status_inspection_timeout(mock_celery_tasks):
     assert data["celery_inspection"]["available"] is False
     assert data["celery_inspection"]["stats"] is None
     assert data["celery_inspection"]["active"] is None
+    assert data["cache"]["inspect"]["updated_at"] is None
     assert "explanation" in data
 
 def test_get_worker_status_exception_handling(mock_celery_tasks):
@@ -0,0 +1,57 @@
+import pytest
+from fastapi.testclient import TestClient
+from fastapi import FastAPI
+from unittest.mock import patch
+
+from app.api.debug_routes import router
+from app.core.tracing import RingBufferExporter, Tracer
+
+@pytest.fixture
+def tracer():
+    tracer = Tracer(ring_buffer=RingBufferExporter(100))
+    with patch('app.api.debug_routes.tracer', tracer):
+        yield tracer
+
+@pytest.fixture
+def client(tracer):
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+def test_get_call_trace(client, tracer):
+    with tracer.span("window", call_id="call-1"):
+        tracer.record_span("buffer_fill", 100.0, 100.5)
+    with tracer.span("window", call_id="call-1"):
+        pass
+    with tracer.span("window", call_id="call-2"):
+        pass
+
+    response = client.get("/debug/traces/call-1")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["call_id"] == "call-1"
+    assert data["span_count"] == 3
+    assert data["trace_count"] == 2
+    assert data["stages"]["window"]["count"] == 2
+    assert data["stages"]["buffer_fill"]["total_ms"] == 500.0
+    spans = data["traces"][0]["spans"]
+    assert [span["name"] for span in spans] == ["buffer_fill", "window"]
+    assert spans[0]["parent_id"] == spans[1]["span_id"]
+
+def test_get_call_trace_not_found(client):
+    response = client.get("/debug/traces/unknown")
+    assert response.status_code == 404
+
+def test_get_call_trace_error(client, tracer):
+    with patch.object(tracer, "get_trace", side_effect=Exception("Redis down")):
+        response = client.get("/debug/traces/call-1")
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Failed to load trace"
+
+def test_get_tracing_status(client, tracer):
+    with tracer.span("window", call_id="call-1"):
+        pass
+
+    response = client.get("/debug/traces")
+    assert response.status_code == 200
+    assert response.json()["spans"] == 1
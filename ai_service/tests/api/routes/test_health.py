@@ -1,7 +1,9 @@
 
 import pytest
+import json
 import sys
 import os
+import time
 from unittest.mock import MagicMock, patch
 from fastapi.testclient import TestClient
 from fastapi import FastAPI
@@ -11,6 +13,7 @@ from datetime import datetime
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from app.api.health_routes import router
+from app.core.celery_monitor import CeleryEventMonitor
 
 @pytest.fixture
 def mock_app():
@@ -31,7 +34,6 @@ def mock_dependencies():
     with patch('app.api.health_routes.settings') as mock_settings, \
          patch('app.api.health_routes.resource_manager') as mock_rm, \
          patch('app.api.health_routes.model_loader') as mock_ml, \
-         patch('app.api.health_routes.celery_app') as mock_ca, \
          patch('app.api.health_routes.celery_monitor') as mock_cm, \
          patch('app.api.health_routes.is_api_server_mode') as mock_is_api, \
          patch('app.api.health_routes.get_execution_mode') as mock_exec_mode:
@@ -52,10 +54,10 @@ def mock_dependencies():
         
         mock_cm.get_connection_status.return_value = {"is_monitoring": True}
         
-        mock_inspect = MagicMock()
-        mock_ca.control.inspect.return_value = mock_inspect
-        mock_inspect.stats.return_value = {"worker1": {}}
-        mock_inspect.ping.return_value = {"worker1": "pong"}
+        # Real cluster-state cache with one worker that just sent a heartbeat
+        monitor = CeleryEventMonitor()
+        monitor.record_worker_event({"hostname": "worker1", "timestamp": time.time()}, "online")
+        mock_cm.get_cluster_state.side_effect = monitor.get_cluster_state
         
         mock_is_api.return_value = False
         mock_exec_mode.return_value = "standalone"
@@ -64,7 +66,7 @@ def mock_dependencies():
             "settings": mock_settings,
             "rm": mock_rm,
             "ml": mock_ml,
-            "ca": mock_ca,
+            "monitor": monitor,
             "cm": mock_cm,
             "is_api": mock_is_api,
             "exec_mode": mock_exec_mode
@@ -98,27 +100,51 @@ def test_models_health_standalone(client, mock_dependencies):
     assert response.json()["mode"] == "standalone"
     assert "ready_models" in response.json()
 
-@patch('app.tasks.health_tasks.health_check_models')
-def test_models_health_api_mode(mock_health_task, client, mock_dependencies):
+def test_models_health_api_mode(client, mock_dependencies):
     mock_dependencies["is_api"].return_value = True
     mock_dependencies["exec_mode"].return_value = "api_server"
-    
-    # Mock celery task result
-    mock_task = MagicMock()
-    mock_task.get.return_value = {
-        "models_loaded": {
-            "qa": True, "classifier": True, "ner": True, 
-            "summarizer": True, "translator": True, "whisper": True
-        },
-        "total_ready_models": 6,
-        "worker_host": "test-host"
+    mock_dependencies["monitor"].worker_models = {
+        "worker1": {
+            "models_loaded": {
+                "qa": True, "classifier": True, "ner": True,
+                "summarizer": True, "translator": True, "whisper": True
+            },
+            "total_ready_models": 6,
+            "worker_host": "test-host"
+        }
     }
-    mock_health_task.delay.return_value = mock_task
     
-    response = client.get("/health/models")
+    with patch('app.tasks.health_tasks.health_check_models') as mock_health_task:
+        response = client.get("/health/models")
+        mock_health_task.delay.assert_not_called()
     assert response.status_code == 200
     assert response.json()["mode"] == "api_server"
+    assert response.json()["status"] == "healthy"
     assert response.json()["summary"]["total_ready_models"] == 6
+    assert "cache" in response.json()
+
+def test_models_health_api_mode_cache_disabled(client, mock_dependencies):
+    """With the cache disabled the endpoint inspects the workers itself"""
+    mock_dependencies["is_api"].return_value = True
+    mock_dependencies["exec_mode"].return_value = "api_server"
+    with patch('app.config.settings.settings.celery_state_cache_enabled', False):
+        monitor = CeleryEventMonitor()
+    mock_dependencies["cm"].get_cluster_state.side_effect = monitor.get_cluster_state
+
+    inspect = MagicMock()
+    inspect.stats.return_value = {"celery@w1": {"total": {}}}
+    broker = MagicMock()
+    broker.hgetall.return_value = {
+        "celery@w1": json.dumps({"models_loaded": {"ner": True}, "total_ready_models": 1, "worker_host": "w1"})
+    }
+    with patch('app.core.celery_monitor.celery_app') as celery_app, \
+            patch('app.core.celery_monitor.get_broker_redis', return_value=broker):
+        celery_app.control.inspect.return_value = inspect
+        response = client.get("/health/models")
+
+    assert response.json()["status"] == "healthy"
+    assert response.json()["celery_workers"] == ["celery@w1"]
+    assert response.json()["models"]["ner"] is True
 
 def test_celery_status_healthy(client, mock_dependencies):
     response = client.get("/health/celery/status")
@@ -126,8 +152,7 @@ def test_celery_status_healthy(client, mock_dependencies):
     assert response.json()["overall_status"] == "healthy"
 
 def test_celery_status_critical(client, mock_dependencies):
-    mock_dependencies["ca"].control.inspect.return_value.stats.return_value = None
-    mock_dependencies["ca"].control.inspect.return_value.ping.return_value = None
+    mock_dependencies["monitor"].worker_stats.clear()
     response = client.get("/health/celery/status")
     assert response.status_code == 200
     assert response.json()["overall_status"] == "critical"
@@ -187,16 +212,11 @@ def test_detailed_health_exception(client, mock_dependencies):
     assert response.status_code == 500
 
 
-@patch('app.tasks.health_tasks.health_check_models')
-def test_models_health_api_mode_no_workers(mock_health_task, client, mock_dependencies):
+def test_models_health_api_mode_no_workers(client, mock_dependencies):
     """Test models health in API mode when no workers are available"""
     mock_dependencies["is_api"].return_value = True
     mock_dependencies["exec_mode"].return_value = "api_server"
-
-    # Make inspect return no workers
-    mock_inspect = MagicMock()
-    mock_inspect.active.return_value = None
-    mock_dependencies["ca"].control.inspect.return_value = mock_inspect
+    mock_dependencies["monitor"].worker_stats.clear()
 
     response = client.get("/health/models")
     assert response.status_code == 200
@@ -205,26 +225,29 @@ def test_models_health_api_mode_no_workers(mock_health_task, client, mock_depend
     assert data["reason"] == "No Celery workers available"
 
 
-@patch('app.tasks.health_tasks.health_check_models')
-def test_models_health_api_mode_exception(mock_health_task, client, mock_dependencies):
-    """Test models health in API mode when an exception occurs"""
+def test_models_health_api_mode_not_published(client, mock_dependencies):
+    """Test models health in API mode before workers have published model status"""
     mock_dependencies["is_api"].return_value = True
     mock_dependencies["exec_mode"].return_value = "api_server"
 
-    # Make task.get() raise an exception
-    mock_inspect = MagicMock()
-    mock_inspect.active.return_value = {"worker1": []}
-    mock_dependencies["ca"].control.inspect.return_value = mock_inspect
+    response = client.get("/health/models")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "unknown"
+    assert data["celery_workers"] == ["worker1"]
+
 
-    mock_task = MagicMock()
-    mock_task.get.side_effect = Exception("Task failed")
-    mock_health_task.delay.return_value = mock_task
+def test_models_health_api_mode_exception(client, mock_dependencies):
+    """Test models health in API mode when an exception occurs"""
+    mock_dependencies["is_api"].return_value = True
+    mock_dependencies["exec_mode"].return_value = "api_server"
+    mock_dependencies["cm"].get_cluster_state.side_effect = Exception("Cache failed")
 
     response = client.get("/health/models")
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "error"
-    assert "Task failed" in data["error"]
+    assert "Cache failed" in data["error"]
 
 
 def test_celery_status_monitor_exception(client, mock_dependencies):
@@ -245,27 +268,29 @@ def test_celery_status_degraded_no_monitoring(client, mock_dependencies):
     assert data["overall_status"] == "degraded"
 
 
-def test_celery_status_ping_only(client, mock_dependencies):
-    """Test celery status when ping works but stats don't"""
-    mock_inspect = MagicMock()
-    mock_inspect.stats.return_value = None
-    mock_inspect.ping.return_value = {"worker1": "pong"}
-    mock_dependencies["ca"].control.inspect.return_value = mock_inspect
+def test_celery_status_stale_heartbeat_but_recent_inspect(client, mock_dependencies):
+    """Test a busy worker (no recent heartbeat) is still available if the last inspect saw it"""
+    monitor = mock_dependencies["monitor"]
+    monitor.worker_stats["worker1"]["heartbeat_ts"] = time.time() - 3600
+    monitor.inspect_snapshot = {"stats": {"worker1": {"total": {}}}, "active": None,
+                                "scheduled": None, "reserved": None, "error": None}
+    monitor.inspect_updated_at = time.time()
 
     response = client.get("/health/celery/status")
     assert response.status_code == 200
     data = response.json()
     assert data["celery_workers"]["available"] is True
-    assert "Workers responding but stats unavailable" in data["celery_workers"].get("note", "")
+    assert data["celery_workers"]["cache"]["inspect"]["stale"] is False
 
 
-def test_celery_status_inspect_exception(client, mock_dependencies):
-    """Test celery status when inspect raises exception"""
-    mock_dependencies["ca"].control.inspect.side_effect = Exception("Connection failed")
+def test_celery_status_cache_exception(client, mock_dependencies):
+    """Test celery status when the cluster-state cache raises"""
+    mock_dependencies["cm"].get_cluster_state.side_effect = Exception("Connection failed")
     response = client.get("/health/celery/status")
     assert response.status_code == 200
     data = response.json()
     assert data["celery_workers"]["error"] is not None
+    assert data["overall_status"] == "critical"
 
 
 def test_resources_health_exception(client, mock_dependencies):
@@ -276,4 +301,49 @@ def test_resources_health_exception(client, mock_dependencies):
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "error"
-        assert "Resource error" in data["error"]
\ No newline at end of file
+        assert "Resource error" in data["error"]
+def test_reload_model_standalone(client, mock_dependencies):
+    mock_dependencies["ml"].model_status = {"ner": MagicMock()}
+    mock_dependencies["ml"].reload_model.return_value = True
+
+    response = client.post("/health/models/ner/reload")
+
+    assert response.status_code == 200
+    assert response.json()["ready"] is True
+    mock_dependencies["ml"].reload_model.assert_called_once_with("ner")
+
+def test_reload_model_broadcasts_to_workers(client, mock_dependencies):
+    mock_dependencies["is_api"].return_value = True
+    mock_dependencies["exec_mode"].return_value = "api_server"
+    mock_dependencies["ml"].model_status = {"ner": MagicMock()}
+    mock_dependencies["settings"].model_reload_timeout_seconds = 30.0
+
+    with patch('app.api.health_routes.celery_app') as mock_celery:
+        mock_celery.control.broadcast.return_value = [
+            {"celery@worker1": {"ok": {"model": "ner", "ready": True}}}
+        ]
+        response = client.post("/health/models/ner/reload")
+
+    assert response.status_code == 200
+    assert response.json()["workers"] == {"celery@worker1": {"ok": {"model": "ner", "ready": True}}}
+    mock_celery.control.broadcast.assert_called_once_with(
+        "reload_model", arguments={"model_name": "ner"}, reply=True, timeout=30.0
+    )
+    mock_dependencies["ml"].reload_model.assert_not_called()
+
+def test_reload_model_no_worker_replies(client, mock_dependencies):
+    mock_dependencies["is_api"].return_value = True
+    mock_dependencies["ml"].model_status = {"ner": MagicMock()}
+
+    with patch('app.api.health_routes.celery_app') as mock_celery:
+        mock_celery.control.broadcast.return_value = []
+        response = client.post("/health/models/ner/reload")
+
+    assert response.status_code == 503
+
+def test_reload_unknown_model(client, mock_dependencies):
+    mock_dependencies["ml"].model_status = {"ner": MagicMock()}
+
+    response = client.post("/health/models/nope/reload")
+
+    assert response.status_code == 404
@@ -0,0 +1,112 @@
+"""
+Tests for the benchmark harness: registration, timing and the baseline regression gate
+"""
+import json
+import sys
+
+import pytest
+
+from benchmarks import harness
+from benchmarks.harness import Benchmark, calibrate, compare, load_results, run_benchmark, save_results
+
+
+def result(name: str, min_us: float) -> dict:
+    return {"name": name, "group": "g", "min_us": min_us}
+
+
+class TestCompare:
+    """Test regressions are judged against the baseline's fastest round"""
+
+    def test_statuses(self):
+        baseline = {"a": result("a", 100.0), "b": result("b", 100.0), "c": result("c", 100.0),
+                    "gone": result("gone", 5.0)}
+        current = {"a": result("a", 120.0), "b": result("b", 130.0), "c": result("c", 70.0),
+                   "added": result("added", 1.0)}
+
+        rows = {row["name"]: row for row in compare(baseline, current, threshold=0.25)}
+
+        assert rows["a"]["status"] == "ok"
+        assert rows["a"]["change"] == pytest.approx(0.2)
+        assert rows["b"]["status"] == "regressed"
+        assert rows["c"]["status"] == "improved"
+        assert rows["gone"] == {"name": "gone", "status": "missing", "baseline_us": 5.0, "current_us": None,
+                                "change": None}
+        assert rows["added"]["status"] == "new"
+
+    def test_threshold_is_exclusive(self):
+        rows = compare({"a": result("a", 100.0)}, {"a": result("a", 110.0)}, threshold=0.1)
+        assert rows[0]["status"] == "ok"
+
+    def test_results_round_trip(self, tmp_path):
+        path = tmp_path / "results" / "run.json"
+
+        save_results(str(path), [result("a", 12.5)], {"repeat": 3})
+
+        data = json.loads(path.read_text())
+        assert data["settings"] == {"repeat": 3}
+        assert "python" in data["environment"]
+        assert load_results(str(path)) == {"a": result("a", 12.5)}
+
+
+class TestTiming:
+    """Test calibration and per-call timing"""
+
+    def test_calibrate_reaches_min_time(self):
+        calls = []
+        number = calibrate(lambda: calls.append(1), min_time=0.01)
+        assert number > 1
+        assert len(calls) >= number
+
+    def test_calibrate_is_capped(self):
+        assert calibrate(lambda: None, min_time=10.0, max_number=64) == 64
+
+    def test_run_benchmark_reports_per_call_times(self):
+        bench = Benchmark("noop", "test", lambda: (lambda: sum(range(100))))
+
+        row = run_benchmark(bench, repeat=3, min_time=0.001)
+
+        assert row["name"] == "noop"
+        assert row["repeat"] == 3
+        assert 0 < row["min_us"] <= row["median_us"] <= row["max_us"]
+        assert row["ops_per_second"] == pytest.approx(1e6 / row["median_us"], rel=0.01)
+
+
+class TestRegistry:
+    """Test benchmark registration and selection"""
+
+    def test_duplicate_names_are_rejected(self, monkeypatch):
+        monkeypatch.setattr(harness, "BENCHMARKS", {})
+        harness.benchmark("x", group="g")(lambda: None)
+        with pytest.raises(ValueError, match="Duplicate benchmark name"):
+            harness.benchmark("x", group="g")(lambda: None)
+
+    def test_select_by_name_or_group(self, monkeypatch):
+        monkeypatch.setattr(harness, "BENCHMARKS", {})
+
+        @harness.benchmark("audio_buffer.add_chunk", group="streaming")
+        def first():
+            """First line
+
+            More detail"""
+
+        harness.benchmark("pii_filter.filter", group="logging")(lambda: None)
+
+        assert [b.name for b in harness.select(["streaming"])] == ["audio_buffer.add_chunk"]
+        assert [b.name for b in harness.select(["pii_*"])] == ["pii_filter.filter"]
+        assert len(harness.select()) == 2
+        assert harness.BENCHMARKS["audio_buffer.add_chunk"].description == "First line"
+
+
+def test_cli_compare_fails_on_regression(tmp_path, monkeypatch, capsys):
+    from benchmarks.__main__ import main
+
+    baseline, current = tmp_path / "baseline.json", tmp_path / "current.json"
+    save_results(str(baseline), [result("a", 100.0), result("b", 100.0)])
+    save_results(str(current), [result("a", 101.0), result("b", 150.0)])
+
+    monkeypatch.setattr(sys, "argv", ["benchmarks", "compare", str(baseline), str(current), "--threshold", "0.2"])
+    assert main() == 1
+    assert "1 benchmark(s) regressed" in capsys.readouterr().out
+
+    monkeypatch.setattr(sys, "argv", ["benchmarks", "compare", str(baseline), str(current), "--threshold", "0.6"])
+    assert main() == 0
@@ -45,6 +45,10 @@ class TestNotificationType:
         """Test STREAMING_TRANSCRIPTION_SEGMENT value"""
         assert NotificationType.STREAMING_TRANSCRIPTION_SEGMENT.value == "streaming_transcription_segment"
 
+    def test_streaming_transcription_interim(self):
+        """Test STREAMING_TRANSCRIPTION_INTERIM value"""
+        assert NotificationType.STREAMING_TRANSCRIPTION_INTERIM.value == "streaming_transcription_interim"
+
     def test_streaming_translation_progress(self):
         """Test STREAMING_TRANSLATION_PROGRESS value"""
         assert NotificationType.STREAMING_TRANSLATION_PROGRESS.value == "streaming_translation_progress"
@@ -148,7 +152,7 @@ class TestNotificationType:
     def test_notification_type_count(self):
         """Test all notification types are present"""
         notification_types = list(NotificationType)
-        assert len(notification_types) == 28
+        assert len(notification_types) == 29
 
 
 class TestProcessingMode:
@@ -0,0 +1,211 @@
+"""
+Tests for the Celery cluster-state cache in CeleryEventMonitor
+"""
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core.celery_monitor import (
+    CeleryEventMonitor,
+    PRIORITY_QUEUE_SUFFIXES,
+    WORKER_MODELS_KEY,
+    publish_worker_models,
+)
+
+
+@pytest.fixture
+def monitor():
+    monitor = CeleryEventMonitor()
+    monitor.monitored_queues = ["model_processing", "celery"]
+    yield monitor
+    monitor.stop_state_refresh(timeout=1)
+
+
+@pytest.fixture
+def broker():
+    redis_client = MagicMock()
+    with patch('app.core.celery_monitor.get_broker_redis', return_value=redis_client):
+        yield redis_client
+
+
+def inspect_mock(stats):
+    inspect = MagicMock()
+    inspect.stats.return_value = stats
+    inspect.active.return_value = {name: [{"id": "t1"}] for name in stats or {}}
+    inspect.scheduled.return_value = {}
+    inspect.reserved.return_value = {name: [{"id": "t2"}, {"id": "t3"}] for name in stats or {}}
+    return inspect
+
+
+class TestWorkerState:
+    """Test merging heartbeats, inspect replies and published model status"""
+
+    def test_heartbeat_marks_worker_online(self, monitor):
+        monitor.record_worker_event(
+            {"hostname": "celery@a", "timestamp": time.time(), "active": 1, "processed": 7}, "online"
+        )
+
+        worker = monitor.get_workers()[0]
+
+        assert worker["status"] == "online"
+        assert (worker["active"], worker["processed"]) == (1, 7)
+        assert monitor.get_freshness()["events"]["stale"] is False
+
+    def test_old_heartbeat_is_unresponsive(self, monitor):
+        monitor.record_worker_event({"hostname": "celery@a", "timestamp": time.time() - 600}, "online")
+
+        assert monitor.get_workers()[0]["status"] == "unresponsive"
+
+    def test_recent_inspect_reply_counts_as_online(self, monitor):
+        monitor.record_worker_event({"hostname": "celery@a", "timestamp": time.time() - 600}, "online")
+        with patch('app.core.celery_monitor.celery_app') as celery_app:
+            celery_app.control.inspect.return_value = inspect_mock({"celery@a": {"total": {}}})
+            assert monitor.refresh_inspect() is True
+
+        assert monitor.get_workers()[0]["status"] == "online"
+
+    def test_worker_offline_event(self, monitor):
+        monitor.record_worker_event({"hostname": "celery@a", "timestamp": time.time()}, "offline")
+
+        assert monitor.get_cluster_state()["workers_online"] == 0
+        assert monitor.get_workers()[0]["status"] == "offline"
+
+
+class TestInspectRefresh:
+    """Test the low-frequency background inspect"""
+
+    def test_snapshot_counts(self, monitor):
+        with patch('app.core.celery_monitor.celery_app') as celery_app:
+            celery_app.control.inspect.return_value = inspect_mock({"celery@a": {}, "celery@b": {}})
+            monitor.refresh_inspect()
+
+        tasks = monitor.get_cluster_state()["tasks"]
+
+        assert (tasks["active"], tasks["scheduled"], tasks["reserved"]) == (2, 0, 4)
+
+    def test_events_take_precedence_for_active_tasks(self, monitor):
+        with patch('app.core.celery_monitor.celery_app') as celery_app:
+            celery_app.control.inspect.return_value = inspect_mock({"celery@a": {}})
+            monitor.refresh_inspect()
+        monitor.is_monitoring = True
+        monitor.active_tasks = {}
+
+        assert monitor.get_cluster_state()["tasks"]["active"] == 0
+
+    def test_failure_keeps_previous_snapshot(self, monitor):
+        with patch('app.core.celery_monitor.celery_app') as celery_app:
+            celery_app.control.inspect.return_value = inspect_mock({"celery@a": {}})
+            monitor.refresh_inspect()
+            updated_at = monitor.inspect_updated_at
+            celery_app.control.inspect.side_effect = Exception("broker down")
+            assert monitor.refresh_inspect() is False
+
+        assert monitor.inspect_snapshot["stats"] == {"celery@a": {}}
+        assert monitor.inspect_snapshot["error"] == "broker down"
+        assert monitor.inspect_updated_at == updated_at
+
+
+class TestQueueSampling:
+    """Test LLEN sampling of the broker queues"""
+
+    def test_llen_per_queue_including_priorities(self, monitor, broker):
+        pipe = broker.pipeline.return_value
+        step = len(PRIORITY_QUEUE_SUFFIXES)
+        pipe.execute.return_value = [4] + [1] * (step - 1) + [0] * step + [2]
+
+        with patch('app.core.metrics.update_queue_metrics') as update_metrics:
+            assert monitor.sample_queue_lengths() is True
+
+        assert pipe.llen.call_count == 2 * step
+        pipe.llen.assert_any_call("model_processing")
+        assert monitor.queue_lengths == {"model_processing": 4 + step - 1, "celery": 0}
+        assert monitor.unacked_tasks == 2
+        assert monitor.get_cluster_state()["tasks"]["queued"] == 4 + step - 1
+        update_metrics.assert_any_call("celery", 0)
+
+    def test_redis_error_leaves_cache_untouched(self, monitor, broker):
+        broker.pipeline.return_value.execute.side_effect = ConnectionError("no redis")
+
+        assert monitor.sample_queue_lengths() is False
+        assert monitor.get_freshness()["queues"] == {"updated_at": None, "age_seconds": None, "stale": True}
+
+
+class TestWorkerModels:
+    """Test model status published by workers"""
+
+    def test_publish_and_read(self, monitor, broker):
+        status = {"worker_host": "a", "models_loaded": {"ner": True}, "total_ready_models": 1}
+        assert publish_worker_models("celery@a", status) is True
+
+        key, field, value = broker.hset.call_args[0]
+        assert (key, field) == (WORKER_MODELS_KEY, "celery@a")
+        broker.hgetall.return_value = {field: value, "celery@bad": "not json"}
+        monitor.refresh_worker_models()
+
+        assert list(monitor.worker_models) == ["celery@a"]
+        assert monitor.worker_models["celery@a"]["models_loaded"] == {"ner": True}
+        assert "published_at" in json.loads(value)
+
+
+class TestStateRefreshThread:
+    """Test the background refresh thread"""
+
+    def test_refresh_loop_runs_and_stops(self, monitor, broker):
+        monitor.sample_interval = 0.01
+        broker.pipeline.return_value.execute.return_value = [0] * (2 * len(PRIORITY_QUEUE_SUFFIXES) + 1)
+        broker.hgetall.return_value = {}
+
+        with patch('app.core.celery_monitor.celery_app') as celery_app:
+            celery_app.control.inspect.return_value = inspect_mock({})
+            monitor.start_state_refresh()
+            time.sleep(0.1)
+            monitor.stop_state_refresh()
+
+            # Inspect runs once per inspect_interval, queues every sample_interval
+            assert celery_app.control.inspect.call_count == 1
+        assert broker.pipeline.call_count > 1
+        assert monitor.refresh_thread is None
+
+
+class TestCacheDisabled:
+    """Test CELERY_STATE_CACHE_ENABLED=false, where no background thread refreshes the state"""
+
+    @pytest.fixture
+    def uncached_monitor(self):
+        with patch('app.config.settings.settings.celery_state_cache_enabled', False):
+            monitor = CeleryEventMonitor()
+        monitor.monitored_queues = ["model_processing"]
+        return monitor
+
+    def test_flag_read_from_settings(self, uncached_monitor, monitor):
+        assert uncached_monitor.cache_enabled is False
+        assert monitor.cache_enabled is True
+
+    def test_each_read_inspects_workers(self, uncached_monitor, broker):
+        step = len(PRIORITY_QUEUE_SUFFIXES)
+        broker.pipeline.return_value.execute.return_value = [3] + [0] * (step - 1) + [0]
+        broker.hgetall.return_value = {
+            "celery@a": json.dumps({"models_loaded": {"ner": True}, "total_ready_models": 1})
+        }
+
+        with patch('app.core.celery_monitor.celery_app') as celery_app, \
+                patch('app.core.metrics.update_queue_metrics'):
+            celery_app.control.inspect.return_value = inspect_mock({"celery@a": {"total": {}}})
+            state = uncached_monitor.get_cluster_state()
+            uncached_monitor.get_cluster_state()
+
+            assert celery_app.control.inspect.call_count == 2
+
+        assert uncached_monitor.refresh_thread is None
+        assert state["workers_online"] == 1
+        assert state["tasks"]["queued"] == 3
+        assert state["worker_models"]["celery@a"]["total_ready_models"] == 1
+        assert state["freshness"]["inspect"]["stale"] is False
+
+    def test_cached_reads_do_not_inspect(self, monitor):
+        with patch('app.core.celery_monitor.celery_app') as celery_app:
+            monitor.get_cluster_state()
+
+        celery_app.control.inspect.assert_not_called()
@@ -0,0 +1,158 @@
+"""
+Tests for the off-thread logging pipeline
+"""
+import io
+import logging
+import queue
+import threading
+
+import pytest
+
+from app.core.logging_pipeline import (
+    BatchingQueueListener,
+    BatchStreamHandler,
+    DroppingQueueHandler,
+    setup_logging_pipeline,
+)
+from app.security import PIISanitizingFilter
+
+
+class ThreadRecorder(logging.Filter):
+    """Remembers which thread ran the handler's filters"""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def filter(self, record):
+        self.threads.add(threading.current_thread().name)
+        return True
+
+
+class FlushCountingHandler(BatchStreamHandler):
+    def __init__(self, stream):
+        super().__init__(stream)
+        self.flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
+def make_pipeline(maxsize=100, batch_size=512, debug_drop_threshold=0.8, block_timeout=0.5):
+    stream = io.StringIO()
+    handler = FlushCountingHandler(stream)
+    handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+    log_queue = queue.Queue(maxsize=maxsize)
+    queue_handler = DroppingQueueHandler(log_queue, debug_drop_threshold, block_timeout)
+    listener = BatchingQueueListener(log_queue, handler, batch_size=batch_size)
+
+    logger = logging.getLogger(f"test.logging_pipeline.{id(stream)}")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(queue_handler)
+    return logger, queue_handler, listener, handler, stream
+
+
+class TestListenerThread:
+    """Test sanitizing and writing happen on the listener thread"""
+
+    def test_sanitized_and_written_off_thread(self):
+        logger, _, listener, handler, stream = make_pipeline()
+        recorder = ThreadRecorder()
+        handler.addFilter(PIISanitizingFilter())
+        handler.addFilter(recorder)
+        listener.start()
+
+        logger.info("Caller %s on %s", "Wanjiru", "+254712345678")
+        listener.stop()
+
+        assert stream.getvalue() == "INFO Caller [REDACTED-NAME] on [REDACTED-PHONE]\n"
+        assert threading.current_thread().name not in recorder.threads
+
+    def test_flushes_once_per_batch(self):
+        logger, _, listener, handler, stream = make_pipeline(maxsize=1000, batch_size=50)
+        for i in range(100):
+            logger.info(f"message {i}")
+
+        listener.start()
+        listener.stop()
+
+        assert stream.getvalue().count("\n") == 100
+        assert handler.flushes <= 3
+        assert listener.processed == 100
+
+    def test_mutable_args_rendered_at_call_time(self):
+        logger, _, listener, _, stream = make_pipeline()
+        items = ["first"]
+
+        logger.info("items=%s", items)
+        items.append("second")
+        listener.start()
+        listener.stop()
+
+        assert stream.getvalue() == "INFO items=['first']\n"
+
+
+class TestOverload:
+    """Test load shedding on a full queue"""
+
+    def test_debug_dropped_before_queue_blocks(self):
+        logger, queue_handler, _, _, _ = make_pipeline(maxsize=10, debug_drop_threshold=0.5)
+        for i in range(5):
+            logger.info(f"info {i}")
+
+        logger.debug("verbose packet dump")
+        logger.warning("still queued")
+
+        assert queue_handler.queue.qsize() == 6
+        assert queue_handler.dropped == {"DEBUG": 1}
+
+    def test_full_queue_drops_after_timeout(self):
+        logger, queue_handler, _, _, _ = make_pipeline(maxsize=3, block_timeout=0.01)
+        for i in range(5):
+            logger.error(f"error {i}")
+
+        assert queue_handler.queue.qsize() == 3
+        assert queue_handler.enqueued == 3
+        assert queue_handler.dropped == {"ERROR": 2}
+
+    def test_stop_with_full_queue_drains(self):
+        logger, _, listener, _, stream = make_pipeline(maxsize=5, block_timeout=0.01)
+        for i in range(5):
+            logger.info(f"info {i}")
+
+        listener.start()
+        listener.stop()
+
+        assert stream.getvalue().count("\n") == 5
+
+
+class TestSetupLoggingPipeline:
+    """Test root logger wiring"""
+
+    @pytest.fixture
+    def restore_root(self):
+        root = logging.getLogger()
+        handlers, level = list(root.handlers), root.level
+        yield root
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in handlers:
+            root.addHandler(handler)
+        root.setLevel(level)
+
+    def test_root_logs_through_queue_to_file(self, restore_root, tmp_path):
+        log_file = tmp_path / "service.log"
+        pipeline = setup_logging_pipeline(
+            level=logging.INFO, log_file=str(log_file), filters=[PIISanitizingFilter()]
+        )
+
+        assert restore_root.handlers == [pipeline.queue_handler]
+        logging.getLogger("test.root").info("Call from Otieno in Kisumu")
+        pipeline.stop()
+
+        assert "Call from [REDACTED-NAME] in [REDACTED-LOCATION]" in log_file.read_text()
+        stats = pipeline.get_stats()
+        assert stats["records_processed"] >= 1
+        assert stats["queue_depth"] == 0
@@ -0,0 +1,238 @@
+"""
+Tests for the progress hub: shared subscription fan-out, bounded client queues and replay
+"""
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.progress_hub import ProgressHub, ProgressSubscription
+from app.core.streaming import new_progress_update, publish_progress_sync
+
+
+def make_hub(history=(), **kwargs):
+    """Hub wired to a mocked Redis client, as if its pattern subscription were up"""
+    hub = ProgressHub(redis_url="redis://test", **kwargs)
+    hub._client = AsyncMock()
+    entries = [(f"{i}-0", {"data": json.dumps(update)}) for i, update in enumerate(history)]
+    # Like Redis XREVRANGE: newest first, at most count entries
+    hub._client.xrevrange.side_effect = lambda key, count=None: entries[::-1][:count]
+    hub._subscribed = asyncio.Event()
+    hub._subscribed.set()
+    return hub
+
+
+def publish(hub, update):
+    return hub.dispatch(f"audio_stream:{update['task_id']}", json.dumps(update))
+
+
+async def collect(generator, count):
+    updates = []
+    async for update in generator:
+        updates.append(update)
+        if len(updates) == count:
+            break
+    return updates
+
+
+class TestProgressSubscription:
+    """Test the per-client bounded queue"""
+
+    def test_drops_oldest_when_full(self):
+        subscription = ProgressSubscription("task1", max_queue_size=2)
+
+        assert subscription.offer({"n": 1}) is False
+        subscription.offer({"n": 2})
+        assert subscription.offer({"n": 3}) is True  # became lagging
+        subscription.offer({"n": 4})
+
+        assert subscription.dropped == 2
+        assert subscription.lagging
+        assert [subscription.queue.get_nowait()["n"] for _ in range(2)] == [3, 4]
+
+
+class TestFanOut:
+    """Test one published message reaches every client of its task"""
+
+    @pytest.mark.asyncio
+    async def test_fan_out_to_all_clients_of_task(self):
+        hub = make_hub()
+        clients = [hub.subscribe("task1", replay=False) for _ in range(3)]
+        other = hub.subscribe("task2", replay=False)
+        for client in clients + [other]:
+            assert (await client.__anext__())["status"] == "subscribed"
+
+        # Clients register on their first step; pull one update each concurrently
+        pending = [asyncio.ensure_future(client.__anext__()) for client in clients]
+        await asyncio.sleep(0)
+        delivered = publish(hub, new_progress_update("task1", "transcription", 30))
+        updates = await asyncio.gather(*pending)
+
+        assert delivered == 3
+        assert all(update["step"] == "transcription" for update in updates)
+        assert hub.get_stats()["clients"] == 4
+        for client in clients + [other]:
+            await client.aclose()
+        assert hub.get_stats()["clients"] == 0
+        assert hub.get_stats()["tasks"] == 0
+
+    @pytest.mark.asyncio
+    async def test_messages_without_clients_are_not_decoded(self):
+        hub = make_hub()
+
+        assert hub.dispatch("audio_stream:nobody", "not json") == 0
+        assert hub.get_stats()["messages_received"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_ends_on_terminal_step(self):
+        hub = make_hub()
+        stream = hub.subscribe("task1", replay=False)
+        await stream.__anext__()
+
+        async def produce():
+            await asyncio.sleep(0.01)
+            publish(hub, new_progress_update("task1", "transcription", 30))
+            publish(hub, new_progress_update("task1", "completed", 100))
+
+        producer = asyncio.create_task(produce())
+        updates = [update async for update in stream]
+        await producer
+
+        assert [update["step"] for update in updates] == ["transcription", "completed"]
+
+    @pytest.mark.asyncio
+    async def test_lagging_client_bounded(self):
+        hub = make_hub(client_queue_size=5)
+        stream = hub.subscribe("task1", replay=False)
+        await stream.__anext__()
+
+        with patch('app.core.progress_hub.update_progress_hub_clients') as update_metrics:
+            for i in range(20):
+                publish(hub, new_progress_update("task1", "transcription", i))
+
+        assert hub.get_stats()["lagging_clients"] == 1
+        update_metrics.assert_called_with(1, 1)
+        update = await stream.__anext__()
+        assert update["progress"] == 15  # oldest 15 dropped
+        await stream.aclose()
+        assert hub.get_stats()["lagging_clients"] == 0
+        assert hub.get_stats()["dropped_queue_full"] == 15
+
+    @pytest.mark.asyncio
+    async def test_too_many_clients(self):
+        hub = make_hub(max_clients=1)
+        first = hub.subscribe("task1", replay=False)
+        await first.__anext__()
+
+        updates = [update async for update in hub.subscribe("task1")]
+
+        assert updates[0]["status"] == "subscription_error"
+        assert hub.get_stats()["rejected_clients"] == 1
+        await first.aclose()
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        hub = make_hub()
+
+        updates = [update async for update in hub.subscribe("task1", timeout=0.05, replay=False)]
+
+        assert updates[-1]["status"] == "timeout"
+
+
+class TestReplay:
+    """Test late joiners receive history first, without duplicates"""
+
+    @pytest.mark.asyncio
+    async def test_late_joiner_gets_history_then_live(self):
+        history = [new_progress_update("task1", "started", 5), new_progress_update("task1", "transcription", 30)]
+        hub = make_hub(history=history)
+        stream = hub.subscribe("task1")
+
+        assert (await stream.__anext__())["status"] == "subscribed"
+        replayed = await collect(stream, 2)
+        # A replayed update arriving live as well is skipped
+        publish(hub, history[1])
+        publish(hub, new_progress_update("task1", "completed", 100))
+        rest = [update async for update in stream]
+
+        assert [u["step"] for u in replayed] == ["started", "transcription"]
+        assert [u["step"] for u in rest] == ["completed"]
+        hub._client.xrevrange.assert_awaited_once_with("audio_stream_log:task1", count=200)
+        assert hub.get_stats()["replayed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_finished_task_replays_and_ends(self):
+        history = [new_progress_update("task1", "transcription", 30), new_progress_update("task1", "completed", 100)]
+        hub = make_hub(history=history)
+
+        updates = [update async for update in hub.subscribe("task1")]
+
+        assert [u.get("step") for u in updates] == [None, "transcription", "completed"]
+
+    @pytest.mark.asyncio
+    async def test_untrimmed_log_replays_newest_events(self):
+        # Approximate trimming can leave more than replay_max_events entries in the log
+        history = [new_progress_update("task1", "transcription", i) for i in range(8)]
+        history.append(new_progress_update("task1", "completed", 100))
+        hub = make_hub(history=history, replay_max_events=5)
+
+        updates = [update async for update in hub.subscribe("task1")]
+
+        assert [u.get("progress") for u in updates[1:]] == [4, 5, 6, 7, 100]
+        assert updates[-1]["step"] == "completed"
+
+    @pytest.mark.asyncio
+    async def test_history_read_failure_is_not_fatal(self):
+        hub = make_hub()
+        hub._client.xrevrange.side_effect = ConnectionError("redis down")
+
+        assert await hub.read_history("task1") == []
+
+
+class TestLifecycle:
+    """Test start/stop and delegation from AudioStreamingService"""
+
+    @pytest.mark.asyncio
+    async def test_stop_ends_open_streams(self):
+        hub = make_hub()
+        hub._reader = asyncio.create_task(asyncio.sleep(3600))
+        hub._loop = asyncio.get_running_loop()
+        assert hub.is_active()
+        stream = hub.subscribe("task1", replay=False)
+        await stream.__anext__()
+        pending = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+
+        await hub.stop()
+
+        with pytest.raises(StopAsyncIteration):
+            await pending
+        assert not hub.is_active()
+
+    @pytest.mark.asyncio
+    async def test_streaming_service_uses_active_hub(self):
+        from app.core.streaming import AudioStreamingService
+
+        hub = make_hub(history=[new_progress_update("task1", "completed", 100)])
+        with patch('app.core.progress_hub.progress_hub', hub), \
+                patch.object(hub, 'is_active', return_value=True):
+            updates = [update async for update in AudioStreamingService().subscribe_to_task("task1")]
+
+        assert updates[-1]["step"] == "completed"
+
+
+class TestSyncPublisher:
+    """Test the Celery-side publisher"""
+
+    def test_appends_and_publishes_in_one_round_trip(self):
+        client = MagicMock()
+        client.pipeline.return_value.execute.return_value = ["1-0", True, 2]
+        update = new_progress_update("task1", "transcription", 30)
+
+        assert publish_progress_sync(client, "task1", update) == 2
+
+        pipe = client.pipeline.return_value
+        pipe.xadd.assert_called_once()
+        pipe.publish.assert_called_once_with("audio_stream:task1", json.dumps(update))
+        pipe.execute.assert_called_once()
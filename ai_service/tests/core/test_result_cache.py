@@ -0,0 +1,214 @@
+"""
+Tests for the content-addressed model result cache
+"""
+import os
+
+import pytest
+from unittest.mock import MagicMock
+
+from app.core import result_cache
+from app.core.result_cache import ModelResultCache, model_version_key, normalize_text
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the sync Redis client"""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.ttls[key] = ex
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key) or 0) + 1)
+        return int(self.data[key])
+
+
+def make_cache(redis_client=None, **kwargs):
+    cache = ModelResultCache(use_redis=redis_client is not None, **kwargs)
+    cache._redis = redis_client
+    return cache
+
+
+class TestKeying:
+    """Test cache key construction"""
+
+    def test_normalize_text_collapses_whitespace(self):
+        assert normalize_text("  Hello \n\t world  ") == "Hello world"
+
+    def test_normalize_text_unicode_forms_match(self):
+        assert normalize_text("café") == normalize_text("café")
+
+    def test_key_ignores_whitespace_differences(self):
+        cache = make_cache()
+        assert cache.make_key("ner", "v1", "John  works\nhere") == cache.make_key("ner", "v1", "John works here")
+
+    def test_key_depends_on_model_version_and_params(self):
+        cache = make_cache()
+        base = cache.make_key("summarizer", "v1", "text", {"max_length": 256})
+        assert base != cache.make_key("summarizer", "v2", "text", {"max_length": 256})
+        assert base != cache.make_key("summarizer", "v1", "text", {"max_length": 128})
+        assert base != cache.make_key("translator", "v1", "text", {"max_length": 256})
+
+    def test_model_version_key(self):
+        assert model_version_key({"hf_repo_id": "openchs/ner", "model_path": "/m"}) == "openchs/ner"
+        assert model_version_key({"model_path": "/models/ner"}) == "/models/ner"
+        assert model_version_key(MagicMock()) == "unknown"
+
+
+class TestWeightsRevision:
+    """Test the weights revision in the model identity"""
+
+    @pytest.fixture(autouse=True)
+    def fresh_revisions(self, monkeypatch):
+        monkeypatch.setattr(result_cache, "REVISION_REFRESH_SECONDS", 0)
+        monkeypatch.setattr(result_cache, "_revisions", {})
+
+    def test_redeployed_weights_change_the_key(self, tmp_path):
+        weights = tmp_path / "model.safetensors"
+        weights.write_bytes(b"old weights")
+        info = {"model_path": str(tmp_path), "details": {"model_backend": "pytorch"}}
+
+        before = model_version_key(info)
+        assert before == model_version_key(info)
+        assert before.startswith(f"{tmp_path}|pytorch|")
+
+        weights.write_bytes(b"new weights, same path")
+        os.utime(weights, ns=(1, 1))
+
+        assert model_version_key(info) != before
+
+    def test_revision_is_reused_within_refresh_window(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(result_cache, "REVISION_REFRESH_SECONDS", 60)
+        weights = tmp_path / "model.onnx"
+        weights.write_bytes(b"v1")
+        info = {"model_path": str(tmp_path)}
+
+        before = model_version_key(info)
+        weights.write_bytes(b"v2 weights")
+
+        assert model_version_key(info) == before
+
+    def test_hub_model_uses_cached_commit(self, tmp_path, monkeypatch):
+        import huggingface_hub.constants
+        monkeypatch.setattr(huggingface_hub.constants, "HF_HUB_CACHE", str(tmp_path))
+        refs = tmp_path / "models--openchs--ner" / "refs"
+        refs.mkdir(parents=True)
+        (refs / "main").write_text("0123456789abcdef0123")
+        info = {"hf_repo_id": "openchs/ner", "model_path": "/does/not/exist"}
+
+        assert model_version_key(info) == "openchs/ner|0123456789ab"
+
+        (refs / "main").write_text("fedcba98765432100000")
+        assert model_version_key(info) == "openchs/ner|fedcba987654"
+
+
+class TestModelResultCache:
+    """Test ModelResultCache lookups and invalidation"""
+
+    def test_miss_then_memory_hit(self):
+        cache = make_cache()
+        compute = MagicMock(return_value={"label": "abuse"})
+
+        first, first_hit = cache.get_or_compute("classifier_model", "v1", "text", None, compute)
+        second, second_hit = cache.get_or_compute("classifier_model", "v1", "text ", None, compute)
+
+        assert first == second == {"label": "abuse"}
+        assert (first_hit, second_hit) == (False, True)
+        compute.assert_called_once()
+        assert cache.stats["classifier_model"] == {"miss": 1, "hit_memory": 1}
+
+    def test_bypass_skips_lookup_and_store(self):
+        cache = make_cache()
+        compute = MagicMock(return_value="translated")
+
+        cache.get_or_compute("translator", "v1", "text", None, compute, use_cache=False)
+        _, hit = cache.get_or_compute("translator", "v1", "text", None, compute)
+
+        assert hit is False
+        assert compute.call_count == 2
+        assert cache.stats["translator"]["bypass"] == 1
+
+    def test_lru_evicts_oldest_entry(self):
+        cache = make_cache(max_entries=2)
+        for text in ("a", "b", "c"):
+            cache.get_or_compute("ner", "v1", text, None, lambda: [text])
+
+        _, hit_a = cache.get_or_compute("ner", "v1", "a", None, lambda: ["a"])
+        _, hit_c = cache.get_or_compute("ner", "v1", "c", None, lambda: ["c"])
+
+        assert hit_a is False
+        assert hit_c is True
+
+    def test_redis_tier_shared_between_workers(self):
+        shared = FakeRedis()
+        worker_a = make_cache(shared, ttl_seconds=60)
+        worker_b = make_cache(shared, ttl_seconds=60)
+
+        worker_a.get_or_compute("summarizer", "v1", "text", {"max_length": 256}, lambda: "summary")
+        result, hit = worker_b.get_or_compute(
+            "summarizer", "v1", "text", {"max_length": 256}, MagicMock(side_effect=AssertionError)
+        )
+
+        assert (result, hit) == ("summary", True)
+        assert worker_b.stats["summarizer"]["hit_redis"] == 1
+        assert 60 in shared.ttls.values()
+
+    def test_invalidate_model_reaches_other_workers(self):
+        shared = FakeRedis()
+        worker_a = make_cache(shared, generation_refresh_seconds=0)
+        worker_b = make_cache(shared, generation_refresh_seconds=0)
+
+        worker_a.get_or_compute("qa", "v1", "transcript", None, lambda: {"score": 1})
+        worker_b.get_or_compute("qa", "v1", "transcript", None, lambda: {"score": 1})
+        worker_a.get_or_compute("ner", "v1", "transcript", None, lambda: ["entity"])
+
+        worker_a.invalidate_model("qa")
+
+        _, qa_hit = worker_b.get_or_compute("qa", "v1", "transcript", None, lambda: {"score": 2})
+        _, ner_hit = worker_a.get_or_compute("ner", "v1", "transcript", None, lambda: ["entity"])
+        assert qa_hit is False
+        assert ner_hit is True
+
+    def test_redis_failure_falls_back_to_memory(self):
+        broken = MagicMock()
+        broken.get.side_effect = ConnectionError("down")
+        cache = make_cache(broken)
+
+        cache.get_or_compute("ner", "v1", "text", None, lambda: ["x"])
+        _, hit = cache.get_or_compute("ner", "v1", "text", None, lambda: ["x"])
+
+        assert hit is True
+        assert cache._get_redis() is None
+
+    def test_unserializable_results_are_not_cached(self):
+        cache = make_cache()
+        compute = MagicMock(return_value=object())
+
+        cache.get_or_compute("ner", "v1", "text", None, compute)
+        cache.get_or_compute("ner", "v1", "text", None, compute)
+
+        assert compute.call_count == 2
+
+    def test_disabled_cache_always_computes(self):
+        cache = make_cache(enabled=False)
+        compute = MagicMock(return_value="x")
+
+        cache.get_or_compute("ner", "v1", "text", None, compute)
+        cache.get_or_compute("ner", "v1", "text", None, compute)
+
+        assert compute.call_count == 2
+
+    def test_get_stats_reports_hit_rate(self):
+        cache = make_cache()
+        for _ in range(4):
+            cache.get_or_compute("ner", "v1", "text", None, lambda: ["x"])
+
+        stats = cache.get_stats()
+        assert stats["local_entries"] == 1
+        assert stats["models"]["ner"]["hit_rate"] == pytest.approx(0.75)
@@ -19,6 +19,11 @@ class TestAudioStreamingService:
             # publish returns number of subscribers (int)
             mock_client.publish.return_value = 1
             
+            # pipeline() is synchronous; commands are queued, execute() is awaited
+            mock_pipe = MagicMock()
+            mock_pipe.execute = AsyncMock(return_value=[])
+            mock_client.pipeline = MagicMock(return_value=mock_pipe)
+            
             # pubsub() is synchronous, returns a PubSub object
             mock_pubsub = MagicMock()
             mock_client.pubsub = MagicMock(return_value=mock_pubsub)
@@ -48,6 +53,22 @@ class TestAudioStreamingService:
         assert data["step"] == "step1"
         assert data["progress"] == 50
 
+    @pytest.mark.asyncio
+    async def test_publish_progress_appends_replay_stream(self, mock_redis):
+        service = AudioStreamingService()
+        
+        await service.publish_progress("task1", "step1", 50)
+        
+        pipe = mock_redis.pipeline.return_value
+        key, fields = pipe.xadd.call_args[0]
+        assert key == "audio_stream_log:task1"
+        assert pipe.xadd.call_args[1]["approximate"] is True
+        pipe.expire.assert_called_once()
+        pipe.execute.assert_awaited_once()
+        # The stream entry and the published message are the same update
+        assert fields["data"] == mock_redis.publish.call_args[0][1]
+        assert "event_id" in json.loads(fields["data"])
+
     @pytest.mark.asyncio
     async def test_publish_progress_error(self, mock_redis):
         mock_redis.publish.side_effect = Exception("Connection error")
@@ -0,0 +1,273 @@
+"""
+Tests for pipeline tracing: span nesting, Celery propagation and the exporters
+"""
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import fakeredis
+import pytest
+
+from app.core import tracing
+from app.core.tracing import (OTLPFileExporter, RedisSpanExporter, RingBufferExporter, Span, Tracer,
+                              summarize_trace)
+
+
+class ListExporter:
+    """Collects exported batches"""
+
+    def __init__(self):
+        self.batches = []
+
+    def export(self, spans):
+        self.batches.append(list(spans))
+
+
+@pytest.fixture
+def exporter():
+    return ListExporter()
+
+
+@pytest.fixture
+def tracer(exporter, monkeypatch):
+    tracer = Tracer(service_name="api", ring_buffer=RingBufferExporter(100), exporters=[exporter])
+    monkeypatch.setattr(tracing, "tracer", tracer)
+    return tracer
+
+
+class TestSpans:
+    """Test span nesting and timing"""
+
+    def test_nested_spans_share_the_trace(self, tracer):
+        with tracer.span("window", call_id="call-1") as root:
+            with tracer.span("enqueue", task="transcribe") as child:
+                pass
+
+        assert child.trace_id == root.trace_id
+        assert child.parent_id == root.span_id
+        assert child.call_id == "call-1"
+        assert child.attributes == {"task": "transcribe"}
+        assert root.parent_id is None
+        assert root.end_time >= child.end_time
+
+    def test_separate_spans_start_new_traces(self, tracer):
+        with tracer.span("window", call_id="call-1") as first:
+            pass
+        with tracer.span("window", call_id="call-1") as second:
+            pass
+
+        assert first.trace_id != second.trace_id
+
+    def test_error_is_recorded_and_reraised(self, tracer):
+        with pytest.raises(ValueError):
+            with tracer.span("transcription", call_id="call-1") as span:
+                raise ValueError("bad audio")
+
+        assert span.status == "error"
+        assert span.error == "ValueError: bad audio"
+        assert tracer.current_span() is None
+
+    def test_record_span_uses_given_timings(self, tracer):
+        with tracer.span("window", call_id="call-1") as root:
+            span = tracer.record_span("buffer_fill", 100.0, 105.0, window_id=3)
+
+        assert span.parent_id == root.span_id
+        assert span.duration_ms == 5000.0
+        assert span.attributes == {"window_id": 3}
+
+    def test_disabled_tracer_records_nothing(self, exporter):
+        tracer = Tracer(enabled=False, exporters=[exporter])
+
+        with tracer.span("window", call_id="call-1") as span:
+            pass
+
+        assert span is None
+        assert tracer.record_span("buffer_fill", 1.0) is None
+        assert tracer.ring_buffer.get_stats()["spans"] == 0
+
+    def test_summarize_trace_orders_stages_by_time(self):
+        spans = [
+            Span("ner", "t", "a", None, "c", "worker", 0.0, 0.2),
+            Span("transcription", "t", "b", None, "c", "worker", 0.0, 1.5),
+            Span("ner", "t", "c", None, "c", "worker", 0.0, 0.3, status="error"),
+        ]
+
+        stages = summarize_trace(spans)
+
+        assert list(stages) == ["transcription", "ner"]
+        assert stages["ner"] == {"count": 2, "total_ms": 500.0, "max_ms": 300.0, "errors": 1}
+
+
+class TestExportBatching:
+    """Test finished spans are handed to the exporters in batches"""
+
+    def test_root_span_flushes_its_children(self, tracer, exporter):
+        with tracer.span("window", call_id="call-1"):
+            with tracer.span("enqueue"):
+                pass
+            assert exporter.batches == []
+
+        assert [[span.name for span in batch] for batch in exporter.batches] == [["enqueue", "window"]]
+
+    def test_flush_size_bounds_waiting_spans(self, exporter):
+        tracer = Tracer(exporters=[exporter], flush_size=3)
+
+        with tracer.span("task"):
+            for i in range(7):
+                tracer.record_span("stage", time.time(), stage=i)
+
+        assert [len(batch) for batch in exporter.batches] == [3, 3, 2]
+
+    def test_exporter_failure_is_counted(self, tracer):
+        tracer.exporters.append(SimpleNamespace(export=lambda spans: 1 / 0))
+
+        with tracer.span("window", call_id="call-1"):
+            pass
+
+        assert tracer.get_stats()["export_errors"] == 1
+
+    def test_ring_buffer_keeps_the_newest_spans(self):
+        ring = RingBufferExporter(max_spans=2)
+        spans = [Span(f"s{i}", "t", str(i), None, "call-1", "api", float(i), float(i)) for i in range(3)]
+
+        ring.export(spans)
+
+        assert [span.name for span in ring.spans_for_call("call-1")] == ["s1", "s2"]
+
+
+class TestCeleryPropagation:
+    """Test the trace follows a task from publish to the worker"""
+
+    def test_worker_continues_the_publisher_trace(self, tracer):
+        headers = {}
+        with tracer.span("enqueue", call_id="call-1") as enqueue:
+            tracing.on_before_task_publish(headers=headers)
+        headers[tracing.TRACE_ENQUEUED_HEADER] = time.time() - 0.25
+
+        task = SimpleNamespace(name="process_streaming_audio_task", request=SimpleNamespace(**headers))
+        tracing.on_task_prerun(task_id="task-1", task=task, kwargs={})
+        with tracer.span("transcription") as transcription:
+            pass
+        tracing.on_task_postrun(task_id="task-1", state="SUCCESS")
+
+        spans = {span.name: span for span in tracer.get_trace("call-1")}
+        queue_wait = spans["queue_wait"]
+        task_span = spans["task:process_streaming_audio_task"]
+        assert queue_wait.parent_id == enqueue.span_id
+        assert queue_wait.duration_ms >= 250
+        assert task_span.parent_id == queue_wait.span_id
+        assert task_span.remote_parent
+        assert transcription.parent_id == task_span.span_id
+        assert {span.trace_id for span in spans.values()} == {enqueue.trace_id}
+        assert task_span.attributes["state"] == "SUCCESS"
+        assert tracer.current_span() is None
+
+    def test_headers_in_request_headers_dict(self, tracer):
+        headers = {}
+        with tracer.span("enqueue", call_id="call-1"):
+            tracing.on_before_task_publish(headers=headers)
+
+        task = SimpleNamespace(name="t", request=SimpleNamespace(headers=headers))
+        tracing.on_task_prerun(task_id="task-1", task=task, kwargs={})
+        tracing.on_task_postrun(task_id="task-1", state="FAILURE")
+
+        task_span = next(span for span in tracer.get_trace("call-1") if span.name == "task:t")
+        assert task_span.status == "error"
+
+    def test_untraced_task_is_traced_under_its_task_id(self, tracer):
+        task = SimpleNamespace(name="process_audio_task", request=SimpleNamespace())
+
+        tracing.on_task_prerun(task_id="task-9", task=task, kwargs={})
+        tracing.on_task_postrun(task_id="task-9", state="SUCCESS")
+
+        spans = tracer.get_trace("task-9")
+        assert [span.name for span in spans] == ["task:process_audio_task"]
+        assert spans[0].parent_id is None
+
+    def test_publish_without_span_adds_no_headers(self, tracer):
+        headers = {}
+        tracing.on_before_task_publish(headers=headers)
+        assert headers == {}
+
+
+class TestExporters:
+    """Test the Redis and OTLP file exporters"""
+
+    def test_redis_exporter_shares_spans_across_processes(self):
+        redis_client = fakeredis.FakeRedis()
+        worker = Tracer(service_name="worker", exporters=[RedisSpanExporter(redis_client=redis_client)])
+        api = Tracer(service_name="api", exporters=[RedisSpanExporter(redis_client=redis_client)])
+
+        with worker.span("task", call_id="call-1"):
+            worker.record_span("ner", time.time())
+        with api.span("window", call_id="call-1"):
+            pass
+
+        spans = api.get_trace("call-1")
+        assert sorted(span.name for span in spans) == ["ner", "task", "window"]
+        assert len({span.span_id for span in spans}) == 3
+        assert {span.service for span in spans} == {"api", "worker"}
+        assert redis_client.ttl("trace_spans:call-1") > 0
+
+    def test_redis_exporter_caps_spans_per_call(self):
+        redis_client = fakeredis.FakeRedis()
+        exporter = RedisSpanExporter(max_spans_per_call=2, redis_client=redis_client)
+
+        exporter.export([Span(f"s{i}", "t", str(i), None, "call-1", "api", float(i), float(i)) for i in range(5)])
+
+        assert [span.name for span in exporter.spans_for_call("call-1")] == ["s3", "s4"]
+
+    def test_otlp_file_exporter_writes_one_request_per_line(self, tmp_path):
+        path = tmp_path / "traces" / "spans.jsonl"
+        exporter = OTLPFileExporter(str(path))
+        span = Span("ner", "a" * 32, "b" * 16, "c" * 16, "call-1", "worker", 1.5, 2.0,
+                    attributes={"batch": 4, "cached": True}, status="error", error="boom")
+
+        exporter.export([span])
+        exporter.export([span])
+
+        lines = path.read_text().splitlines()
+        assert len(lines) == 2
+        resource_spans = json.loads(lines[0])["resourceSpans"][0]
+        assert resource_spans["resource"]["attributes"] == [{"key": "service.name", "value": {"stringValue": "worker"}}]
+        otlp = resource_spans["scopeSpans"][0]["spans"][0]
+        assert otlp["parentSpanId"] == "c" * 16
+        assert otlp["startTimeUnixNano"] == "1500000000"
+        assert otlp["endTimeUnixNano"] == "2000000000"
+        assert otlp["status"] == {"code": 2, "message": "boom"}
+        assert {"key": "batch", "value": {"intValue": "4"}} in otlp["attributes"]
+        assert {"key": "cached", "value": {"boolValue": True}} in otlp["attributes"]
+        assert {"key": "call_id", "value": {"stringValue": "call-1"}} in otlp["attributes"]
+
+
+class TestConfiguration:
+    """Test the global tracer reads its settings on first use"""
+
+    def test_settings_read_on_first_use(self):
+        from app.config.settings import Settings
+        test_settings = Settings(tracing_ring_buffer_size=500, tracing_redis_export=True)
+        tracer = Tracer.from_settings()
+
+        with patch('app.config.settings.settings', test_settings):
+            assert tracer.ring_buffer.get_stats()["max_spans"] == 500
+
+        assert [type(exporter).__name__ for exporter in tracer.exporters] == ["RedisSpanExporter"]
+
+    def test_invalid_settings_fall_back_to_ring_buffer(self):
+        tracer = Tracer.from_settings()
+
+        with patch('app.config.settings.settings', MagicMock()):
+            with tracer.span("window", call_id="call-1"):
+                pass
+
+        assert tracer.exporters == []
+        assert len(tracer.ring_buffer.spans_for_call("call-1")) == 1
+
+    def test_redis_export_off_by_default(self):
+        from app.config.settings import Settings
+        tracer = Tracer.from_settings()
+
+        with patch('app.config.settings.settings', Settings()):
+            assert tracer.enabled is True
+            assert tracer.exporters == []
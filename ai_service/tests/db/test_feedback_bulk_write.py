@@ -0,0 +1,272 @@
+"""
+Tests for bulk feedback writes and the write-behind buffer, against SQLite
+"""
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.feedback_writer import FeedbackWriteBuffer
+from app.db.models import AgentFeedback
+from app.db.repositories.feedback_repository import FeedbackRepository
+from app.db.session import Base, get_async_database_url
+
+
+def make_rows(call_id, tasks=("transcription", "classification", "ner")):
+    return [
+        FeedbackRepository.initial_feedback_row(call_id, task, {"task": task}, "post_call")
+        for task in tasks
+    ]
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    """File-backed SQLite database with sync and async session factories"""
+    url = f"sqlite:///{tmp_path / 'feedback.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    yield {
+        "url": url,
+        "Session": sessionmaker(bind=engine),
+        "statements": statements,
+    }
+    engine.dispose()
+
+
+def stored(sqlite_db):
+    with sqlite_db["Session"]() as db:
+        return db.execute(
+            select(AgentFeedback.call_id, AgentFeedback.task, AgentFeedback.feedback)
+            .order_by(AgentFeedback.call_id, AgentFeedback.task)
+        ).all()
+
+
+class TestBulkUpsert:
+    """Test FeedbackRepository.bulk_upsert_initial_feedback on SQLite"""
+
+    def test_all_tasks_in_one_insert(self, sqlite_db):
+        with sqlite_db["Session"]() as db:
+            inserted = FeedbackRepository.bulk_upsert_initial_feedback(db, make_rows("call_1"))
+
+        inserts = [s for s in sqlite_db["statements"] if s.startswith("INSERT INTO agent_feedback")]
+        assert inserted == 3
+        assert len(inserts) == 1
+        assert "ON CONFLICT" in inserts[0]
+        assert len(stored(sqlite_db)) == 3
+
+    def test_existing_rows_and_ratings_kept(self, sqlite_db):
+        with sqlite_db["Session"]() as db:
+            FeedbackRepository.bulk_upsert_initial_feedback(db, make_rows("call_1", ("ner",)))
+            FeedbackRepository.update_feedback(db, "call_1", "ner", 4)
+
+            inserted = FeedbackRepository.bulk_upsert_initial_feedback(db, make_rows("call_1"))
+
+        assert inserted == 2
+        assert ("call_1", "ner", 4) in stored(sqlite_db)
+        assert len(stored(sqlite_db)) == 3
+
+    def test_duplicate_keys_in_batch(self, sqlite_db):
+        rows = make_rows("call_1") + make_rows("call_1", ("ner",))
+        with sqlite_db["Session"]() as db:
+            inserted = FeedbackRepository.bulk_upsert_initial_feedback(db, rows)
+
+        assert inserted == 3
+
+    def test_large_batch_chunked(self, sqlite_db):
+        rows = [row for i in range(400) for row in make_rows(f"call_{i}")]
+        with sqlite_db["Session"]() as db:
+            inserted = FeedbackRepository.bulk_upsert_initial_feedback(db, rows)
+
+        inserts = [s for s in sqlite_db["statements"] if s.startswith("INSERT INTO agent_feedback")]
+        assert inserted == 1200
+        assert len(inserts) == 3
+
+    def test_mysql_statement_uses_on_duplicate_key(self):
+        from sqlalchemy.dialects import mysql
+
+        stmt = FeedbackRepository.build_bulk_insert("mysql", make_rows("call_1"))
+        sql = str(stmt.compile(dialect=mysql.dialect()))
+
+        assert "ON DUPLICATE KEY UPDATE" in sql
+
+    @pytest.mark.asyncio
+    async def test_async_session(self, sqlite_db):
+        engine = create_async_engine(get_async_database_url(sqlite_db["url"]))
+        try:
+            async with async_sessionmaker(engine)() as db:
+                inserted = await FeedbackRepository.async_bulk_upsert_initial_feedback(
+                    db, make_rows("call_1") + make_rows("call_2")
+                )
+        finally:
+            await engine.dispose()
+
+        assert inserted == 6
+        assert len(stored(sqlite_db)) == 6
+
+
+class TestAsyncDatabaseUrl:
+    """Test sync to async driver mapping"""
+
+    @pytest.mark.parametrize("url,expected", [
+        ("sqlite:///./ai_service.db", "sqlite+aiosqlite:///./ai_service.db"),
+        ("mysql+pymysql://u:p@db:3306/ai?charset=utf8mb4", "mysql+aiomysql://u:p@db:3306/ai?charset=utf8mb4"),
+        ("postgresql://u:p@db/ai", "postgresql+asyncpg://u:p@db/ai"),
+        ("sqlite+aiosqlite:///x.db", "sqlite+aiosqlite:///x.db"),
+        ("oracle://u:p@db/ai", None),
+    ])
+    def test_mapping(self, url, expected):
+        assert get_async_database_url(url) == expected
+
+
+class TestFeedbackWriteBuffer:
+    """Test batching feedback rows across calls"""
+
+    @pytest.mark.asyncio
+    async def test_calls_batched_into_one_transaction(self, sqlite_db):
+        buffer = FeedbackWriteBuffer(flush_interval=0.05)
+        with patch('app.db.feedback_writer.get_async_sessionmaker', return_value=None), \
+                patch('app.db.feedback_writer.SessionLocal', sqlite_db["Session"]):
+            await buffer.start()
+            for i in range(5):
+                await buffer.add(make_rows(f"call_{i}"))
+            await asyncio.sleep(0.2)
+            await buffer.stop()
+
+        inserts = [s for s in sqlite_db["statements"] if s.startswith("INSERT INTO agent_feedback")]
+        assert len(stored(sqlite_db)) == 15
+        assert len(inserts) == 1
+        assert buffer.get_stats()["rows_inserted"] == 15
+        assert buffer.get_stats()["flushes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_flush_early_at_max_rows(self):
+        buffer = FeedbackWriteBuffer(flush_interval=10, flush_max_rows=6)
+        written = []
+
+        async def fake_write(rows):
+            written.append(len(rows))
+            return len(rows)
+
+        with patch('app.db.feedback_writer.write_feedback_rows', side_effect=fake_write):
+            await buffer.start()
+            await buffer.add(make_rows("call_1"))
+            await buffer.add(make_rows("call_2"))
+            await asyncio.sleep(0.05)
+            assert written == [6]
+            await buffer.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_writes_remaining_rows(self):
+        buffer = FeedbackWriteBuffer(flush_interval=10)
+        written = []
+
+        async def fake_write(rows):
+            written.extend(rows)
+            return len(rows)
+
+        with patch('app.db.feedback_writer.write_feedback_rows', side_effect=fake_write):
+            await buffer.start()
+            await buffer.add(make_rows("call_1"))
+            await buffer.stop()
+
+        assert len(written) == 3
+        assert buffer.depth() == 0
+
+    @pytest.mark.asyncio
+    async def test_notification_service_uses_buffer(self):
+        from app.services.enhanced_notification_service import EnhancedNotificationService
+
+        service = EnhancedNotificationService()
+        service.feedback_buffer = FeedbackWriteBuffer(flush_interval=10)
+        with patch('app.db.feedback_writer.write_feedback_rows', new=AsyncMock(return_value=2)) as write:
+            await service.feedback_buffer.start()
+            await service.create_feedback_entries(
+                "call_1", {"transcript": "hello", "classification": {}, "summary": None}, "post_call"
+            )
+            assert service.feedback_buffer.depth() == 2
+            write.assert_not_called()
+            await service.feedback_buffer.stop()
+
+        rows = write.call_args[0][0]
+        assert [row["task"] for row in rows] == ["transcription", "classification"]
+
+    @pytest.mark.asyncio
+    async def test_failed_write_requeued_and_retried(self):
+        buffer = FeedbackWriteBuffer(flush_interval=0.01)
+        written = []
+        attempts = 0
+
+        async def flaky_write(rows):
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                raise ConnectionError("database went away")
+            written.extend(rows)
+            return len(rows)
+
+        with patch('app.db.feedback_writer.write_feedback_rows', side_effect=flaky_write):
+            await buffer.start()
+            await buffer.add(make_rows("call_1"))
+            assert await buffer.flush() == 0
+            assert buffer.depth() == 3
+
+            await buffer.add(make_rows("call_2", ("ner",)))
+            assert await buffer.flush() == 0  # still backing off
+            assert await buffer.flush(wait_for_backoff=True) == 4
+            await buffer.stop()
+
+        stats = buffer.get_stats()
+        assert [row["call_id"] for row in written] == ["call_1"] * 3 + ["call_2"]
+        assert (stats["flush_retries"], stats["rows_failed"], stats["rows_inserted"]) == (1, 0, 4)
+        assert stats["consecutive_failures"] == 0
+
+    @pytest.mark.asyncio
+    async def test_rows_dropped_after_max_retries(self):
+        buffer = FeedbackWriteBuffer(flush_interval=10, max_retries=2)
+
+        with patch('app.db.feedback_writer.write_feedback_rows',
+                   new=AsyncMock(side_effect=ConnectionError("down"))) as write:
+            await buffer.start()
+            await buffer.add(make_rows("call_1"))
+            for _ in range(3):
+                await buffer.flush(ignore_backoff=True)
+            await buffer.stop()
+
+        assert write.await_count == 3
+        assert buffer.depth() == 0
+        assert buffer.get_stats()["rows_failed"] == 3
+
+    @pytest.mark.asyncio
+    async def test_requeue_bounded_by_buffer_size(self):
+        buffer = FeedbackWriteBuffer(flush_interval=10, flush_max_rows=2, max_buffered_rows=4)
+
+        with patch('app.db.feedback_writer.write_feedback_rows',
+                   new=AsyncMock(side_effect=ConnectionError("down"))):
+            await buffer.start()
+            buffer._rows = make_rows("call_1") + make_rows("call_2")
+            await buffer.flush()
+
+            assert buffer.depth() == 4
+            assert buffer.get_stats()["rows_failed"] == 2
+            assert buffer._rows[0]["call_id"] == "call_1" and buffer._rows[0]["task"] == "ner"
+            await buffer.stop()
+
+    @pytest.mark.asyncio
+    async def test_unbuffered_path_uses_shared_writer(self):
+        from app.services.enhanced_notification_service import EnhancedNotificationService
+
+        service = EnhancedNotificationService()
+        service.feedback_buffer = None
+        with patch('app.services.enhanced_notification_service.write_feedback_rows_sync',
+                   return_value=1) as write:
+            await service.create_feedback_entries("call_1", {"transcript": "hello"}, "post_call")
+
+        assert [row["task"] for row in write.call_args[0][0]] == ["transcription"]
@@ -0,0 +1,176 @@
+"""
+Tests for the agent feedback daily rollups, against SQLite
+"""
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, event, select, update
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import AgentFeedback, FeedbackDailyRollup
+from app.db.repositories.feedback_repository import FeedbackRepository
+from app.db.repositories import feedback_rollup_repository
+from app.db.repositories.feedback_rollup_repository import FeedbackRollupRepository, utc_day
+from app.db.session import Base
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'rollups.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def rows_for(call_id, tasks=("classification", "ner", "summarization")):
+    return [FeedbackRepository.initial_feedback_row(call_id, task, {}) for task in tasks]
+
+
+def rollups(db):
+    return {
+        row.task: row for row in db.execute(select(FeedbackDailyRollup)).scalars().all()
+    }
+
+
+def both_statistics(db, **kwargs):
+    return (
+        FeedbackRepository.get_feedback_statistics(db, use_rollups=True, **kwargs),
+        FeedbackRepository.get_feedback_statistics(db, use_rollups=False, **kwargs),
+    )
+
+
+class TestRollupMaintenance:
+    """Test rollups are updated with every insert and rating change"""
+
+    def test_bulk_insert_counts_new_rows_only(self, db):
+        FeedbackRepository.bulk_upsert_initial_feedback(db, rows_for("call_1"))
+        FeedbackRepository.bulk_upsert_initial_feedback(db, rows_for("call_1") + rows_for("call_2", ("ner",)))
+
+        counts = rollups(db)
+        assert counts["classification"].total_count == 1
+        assert counts["ner"].total_count == 2
+        assert counts["ner"].rated_count == 0
+
+    def test_single_insert_counted(self, db):
+        FeedbackRepository.create_initial_feedback(db, "call_1", "qa", {})
+        FeedbackRepository.create_initial_feedback(db, "call_1", "qa", {})  # duplicate, rolled back
+
+        assert rollups(db)["qa"].total_count == 1
+
+    def test_rating_changes_move_buckets(self, db):
+        FeedbackRepository.bulk_upsert_initial_feedback(db, rows_for("call_1", ("ner",)))
+        FeedbackRepository.update_feedback(db, "call_1", "ner", 2)
+        FeedbackRepository.update_feedback(db, "call_1", "ner", 5)
+
+        ner = rollups(db)["ner"]
+        assert (ner.rated_count, ner.rating_sum) == (1, 5)
+        assert (ner.rating_2_count, ner.rating_5_count) == (0, 1)
+
+    def test_statistics_match_scan(self, db):
+        for i in range(10):
+            FeedbackRepository.bulk_upsert_initial_feedback(db, rows_for(f"call_{i}"))
+        for i, rating in enumerate([5, 4, 4, 1, 3]):
+            FeedbackRepository.update_feedback(db, f"call_{i}", "classification", rating)
+        FeedbackRepository.update_feedback(db, "call_0", "ner", 2)
+
+        from_rollups, from_scan = both_statistics(db, days=7)
+
+        assert from_rollups == from_scan
+        classification = from_rollups["tasks"]["classification"]
+        assert classification["total_predictions"] == 10
+        assert classification["rating_coverage"] == 50.0
+        assert classification["average_rating"] == 3.4
+        assert (classification["min_rating"], classification["max_rating"]) == (1, 5)
+
+    def test_task_filter(self, db):
+        FeedbackRepository.bulk_upsert_initial_feedback(db, rows_for("call_1"))
+
+        stats = FeedbackRepository.get_feedback_statistics(db, task="ner", use_rollups=True)
+
+        assert list(stats["tasks"]) == ["ner"]
+
+
+class TestUtcDays:
+    """Test rollup days and statistics windows use UTC, not the database clock"""
+
+    def test_inserts_bucket_under_python_utc_day(self, db):
+        late_evening = datetime(2026, 3, 1, 23, 30, tzinfo=timezone.utc)
+        with patch.object(feedback_rollup_repository, "datetime") as fake_datetime:
+            fake_datetime.now.return_value = late_evening
+            FeedbackRepository.bulk_upsert_initial_feedback(db, rows_for("call_1", ("ner",)))
+
+        assert rollups(db)["ner"].day == date(2026, 3, 1)
+
+    def test_rating_change_uses_utc_day_of_created_at(self):
+        # 01:00 in Nairobi is still the previous day in UTC
+        nairobi = timezone(timedelta(hours=3))
+        assert utc_day(datetime(2026, 3, 2, 1, 0, tzinfo=nairobi)) == date(2026, 3, 1)
+        assert utc_day(datetime(2026, 3, 2, 1, 0)) == date(2026, 3, 2)
+
+    def test_window_covers_days_calendar_days(self):
+        today = date(2026, 3, 10)
+        assert FeedbackRollupRepository.window_start(7, today) == date(2026, 3, 4)
+        assert FeedbackRollupRepository.window_start(1, today) == today
+
+    def test_window_excludes_day_before_range(self, db):
+        FeedbackRepository.bulk_upsert_initial_feedback(db, rows_for("call_1", ("ner",)))
+        FeedbackRollupRepository.apply_deltas(
+            db, {(utc_day() - timedelta(days=7), "ner"): {"total_count": 5}}
+        )
+        db.commit()
+
+        stats = FeedbackRepository.get_feedback_statistics(db, days=7, use_rollups=True)
+
+        assert stats["tasks"]["ner"]["total_predictions"] == 1
+
+    def test_rollups_off_by_default(self):
+        from app.config.settings import Settings
+        assert Settings().feedback_stats_use_rollups is False
+
+
+class TestRebuild:
+    """Test backfilling rollups from existing agent_feedback rows"""
+
+    def seed_history(self, db):
+        FeedbackRepository.bulk_upsert_initial_feedback(
+            db, [row for i in range(6) for row in rows_for(f"call_{i}")]
+        )
+        FeedbackRepository.update_feedback(db, "call_0", "ner", 3)
+        # Spread the rows over the last six days
+        for i in range(6):
+            db.execute(
+                update(AgentFeedback)
+                .where(AgentFeedback.call_id == f"call_{i}")
+                .values(created_at=datetime.utcnow() - timedelta(days=i))
+            )
+        db.commit()
+
+    def test_backfill_matches_scan_for_any_range(self, db):
+        self.seed_history(db)
+        written = FeedbackRollupRepository.rebuild(db)
+
+        today = datetime.utcnow().date()
+        assert written == 18
+        for start_days_ago, end_days_ago in [(5, 0), (3, 1), (0, 0)]:
+            from_rollups, from_scan = both_statistics(
+                db,
+                start_date=today - timedelta(days=start_days_ago),
+                end_date=today - timedelta(days=end_days_ago),
+            )
+            assert from_rollups == from_scan
+
+    def test_partial_rebuild_leaves_other_days(self, db):
+        self.seed_history(db)
+        FeedbackRollupRepository.rebuild(db)
+        yesterday = datetime.utcnow().date() - timedelta(days=1)
+
+        written = FeedbackRollupRepository.rebuild(db, yesterday, yesterday)
+
+        assert written == 3
+        assert db.query(FeedbackDailyRollup).count() == 18
+
+    def test_rebuild_on_empty_table(self, db):
+        assert FeedbackRollupRepository.rebuild(db, date(2026, 1, 1), date(2026, 1, 31)) == 0
@@ -0,0 +1,267 @@
+"""
+Tests for ModelLoader startup: concurrent loading, deferred models and load profiling
+"""
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.config.settings import Settings
+
+
+def make_settings(**overrides):
+    values = dict(
+        models_dir=tempfile.mkdtemp(),
+        enable_model_loading=True,
+        use_hf_models=False,
+        model_weights_mmap=False,
+    )
+    values.update(overrides)
+    return Settings(**values)
+
+
+def make_model(name, load_delay=0.0, tracker=None):
+    model = MagicMock()
+    model.error = None
+    model.get_model_info.return_value = {"name": name}
+
+    def load():
+        if tracker is not None:
+            with tracker["lock"]:
+                tracker["active"] += 1
+                tracker["max_active"] = max(tracker["max_active"], tracker["active"])
+        time.sleep(load_delay)
+        if tracker is not None:
+            with tracker["lock"]:
+                tracker["active"] -= 1
+        return True
+
+    model.load.side_effect = load
+    return model
+
+
+def make_loader(test_settings, models):
+    from app.model_scripts.model_loader import ModelLoader
+
+    loader = ModelLoader()
+    for status in loader.model_status.values():
+        status.dependencies_available = True
+        status.missing_dependencies = []
+        status.error = None
+    loader._get_model_instance = lambda name: models.get(name)
+    return loader
+
+
+class TestConcurrentLoading:
+    """Test that independent models load in parallel"""
+
+    @pytest.mark.asyncio
+    async def test_models_load_concurrently(self):
+        test_settings = make_settings(model_load_concurrency=3, model_warmup_on_load=False)
+        tracker = {"lock": threading.Lock(), "active": 0, "max_active": 0}
+        models = {name: make_model(name, 0.2, tracker)
+                  for name in ("whisper", "ner", "translator")}
+
+        with patch('app.config.settings.settings', test_settings):
+            loader = make_loader(test_settings, models)
+            await loader.load_all_models()
+
+        assert tracker["max_active"] == 3
+        assert set(loader.get_ready_models()) == {"whisper", "ner", "translator"}
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_respected(self):
+        test_settings = make_settings(model_load_concurrency=1, model_warmup_on_load=False)
+        tracker = {"lock": threading.Lock(), "active": 0, "max_active": 0}
+        models = {name: make_model(name, 0.05, tracker)
+                  for name in ("whisper", "ner", "translator")}
+
+        with patch('app.config.settings.settings', test_settings):
+            loader = make_loader(test_settings, models)
+            await loader.load_all_models()
+
+        assert tracker["max_active"] == 1
+
+
+class TestDeferredModels:
+    """Test deferring models until first use"""
+
+    @pytest.mark.asyncio
+    async def test_deferred_model_loaded_on_first_use(self):
+        test_settings = make_settings(deferred_models="summarizer, qa", model_warmup_on_load=False)
+        models = {name: make_model(name) for name in ("ner", "summarizer", "qa")}
+
+        with patch('app.config.settings.settings', test_settings):
+            loader = make_loader(test_settings, models)
+            await loader.load_all_models()
+
+            assert loader.get_model_status()["summarizer"]["deferred"] is True
+            assert not loader.is_model_ready("summarizer")
+            models["summarizer"].load.assert_not_called()
+
+            assert loader.ensure_models_loaded(["summarizer"]) is True
+
+        assert loader.is_model_ready("summarizer")
+        assert loader.get_model_status()["summarizer"]["deferred"] is False
+        assert models["summarizer"].load.call_count == 1
+        models["qa"].load.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_model_not_retried_per_task(self):
+        test_settings = make_settings(model_warmup_on_load=False)
+        broken = make_model("ner")
+        broken.load.side_effect = None
+        broken.load.return_value = False
+        broken.error = "weights missing"
+
+        with patch('app.config.settings.settings', test_settings):
+            loader = make_loader(test_settings, {"ner": broken})
+            await loader.load_all_models()
+
+            assert loader.ensure_models_loaded(["ner"]) is False
+
+        assert broken.load.call_count == 1
+        assert loader.model_status["ner"].error == "weights missing"
+
+    def test_all_defers_every_model(self):
+        test_settings = make_settings(deferred_models="all")
+        with patch('app.config.settings.settings', test_settings):
+            loader = make_loader(test_settings, {})
+        assert set(loader.deferred_models) == set(loader.model_status)
+
+    @patch('app.tasks.model_tasks.publish_model_status')
+    @patch('app.tasks.model_tasks.worker_model_loader')
+    def test_task_prerun_loads_required_models(self, mock_loader, mock_publish):
+        from app.tasks.model_tasks import load_deferred_models
+
+        mock_loader.get_ready_models.side_effect = [["ner"], ["ner", "summarizer"]]
+        load_deferred_models(sender=SimpleNamespace(name="summarization_summarize_task", __module__="app.tasks.model_tasks"))
+
+        mock_loader.ensure_models_loaded.assert_called_once_with(["summarizer"])
+        mock_publish.assert_called_once_with(mock_loader)
+
+    @patch('app.tasks.model_tasks.publish_model_status')
+    @patch('app.tasks.model_tasks.worker_model_loader')
+    @patch('app.tasks.audio_tasks.worker_model_loader')
+    def test_task_prerun_uses_audio_tasks_loader(self, audio_loader, model_loader, mock_publish):
+        from app.tasks.model_tasks import load_deferred_models
+
+        audio_loader.get_ready_models.side_effect = [[], ["whisper"]]
+        load_deferred_models(sender=SimpleNamespace(name="process_streaming_audio_task", __module__="app.tasks.audio_tasks"))
+
+        audio_loader.ensure_models_loaded.assert_called_once_with(["whisper"])
+        model_loader.ensure_models_loaded.assert_not_called()
+        mock_publish.assert_called_once_with(audio_loader)
+
+    @patch('app.tasks.model_tasks.publish_model_status')
+    @patch('app.tasks.model_tasks.worker_model_loader')
+    def test_task_prerun_publishes_only_on_change(self, mock_loader, mock_publish):
+        from app.tasks.model_tasks import load_deferred_models
+
+        mock_loader.get_ready_models.return_value = ["qa"]
+        load_deferred_models(sender=SimpleNamespace(name="qa_evaluate_task", __module__="app.tasks.model_tasks"))
+
+        mock_loader.ensure_models_loaded.assert_called_once_with(["qa"])
+        mock_publish.assert_not_called()
+
+
+class TestLoadProfiling:
+    """Test per-model load time, RSS and warmup reporting"""
+
+    @pytest.mark.asyncio
+    async def test_profile_reported_in_status(self):
+        test_settings = make_settings(model_warmup_on_load=True)
+        ner = make_model("ner", 0.05)
+        ner.extract_entities.side_effect = lambda *a, **k: time.sleep(0.02) or []
+
+        with patch('app.config.settings.settings', test_settings):
+            loader = make_loader(test_settings, {"ner": ner})
+            with patch('app.model_scripts.model_loader.record_model_load_profile') as record:
+                await loader._load_model("ner")
+
+        status = loader.get_model_status()["ner"]
+        assert status["loaded"] is True
+        assert status["load_seconds"] >= 0.05
+        assert status["peak_rss_mb"] > 0
+        assert status["warmup_seconds"] >= 0.02
+        record.assert_called_once()
+        assert record.call_args[0][0] == "ner"
+
+    @pytest.mark.asyncio
+    async def test_warmup_failure_does_not_fail_load(self):
+        test_settings = make_settings(model_warmup_on_load=True)
+        translator = make_model("translator")
+        translator.translate.side_effect = RuntimeError("cold start")
+
+        with patch('app.config.settings.settings', test_settings):
+            loader = make_loader(test_settings, {"translator": translator})
+            await loader._load_model("translator")
+
+        assert loader.is_model_ready("translator")
+        assert loader.get_model_status()["translator"]["warmup_seconds"] is None
+
+    @pytest.mark.asyncio
+    async def test_no_warmup_by_default(self):
+        test_settings = make_settings()
+        ner = make_model("ner")
+
+        with patch('app.config.settings.settings', test_settings):
+            loader = make_loader(test_settings, {"ner": ner})
+            await loader._load_model("ner")
+
+        assert test_settings.model_warmup_on_load is False
+        ner.extract_entities.assert_not_called()
+        assert loader.get_model_status()["ner"]["warmup_seconds"] is None
+
+
+class TestReload:
+    """Test reloading a model on a running worker"""
+
+    @pytest.mark.asyncio
+    async def test_reload_invalidates_cached_results(self):
+        test_settings = make_settings(model_warmup_on_load=False)
+        ner = make_model("ner")
+
+        with patch('app.config.settings.settings', test_settings):
+            loader = make_loader(test_settings, {"ner": ner})
+            await loader._load_model("ner")
+            with patch('app.core.result_cache.model_result_cache') as cache:
+                assert loader.reload_model("ner") is True
+
+        assert ner.load.call_count == 2
+        cache.invalidate_model.assert_called_once_with("ner")
+
+    def test_reload_unknown_model(self):
+        with patch('app.config.settings.settings', make_settings()):
+            loader = make_loader(None, {})
+            with pytest.raises(ValueError, match="Unknown model"):
+                loader.reload_model("nope")
+
+    @patch('app.tasks.model_tasks.publish_model_status')
+    @patch('app.tasks.model_tasks.worker_model_loader')
+    def test_control_command_reloads_worker_model(self, mock_loader, mock_publish):
+        from app.tasks.model_tasks import reload_model
+
+        mock_loader.reload_model.return_value = True
+
+        assert reload_model(None, "ner") == {"ok": {"model": "ner", "ready": True}}
+        mock_loader.reload_model.assert_called_once_with("ner")
+        mock_publish.assert_called_once()
+
+    @patch('app.tasks.model_tasks.worker_model_loader')
+    def test_control_command_reports_unknown_model(self, mock_loader):
+        from app.tasks.model_tasks import reload_model
+
+        mock_loader.reload_model.side_effect = ValueError("Unknown model: nope")
+
+        assert reload_model(None, "nope") == {"error": "Unknown model: nope"}
+
+    def test_control_command_registered_with_celery(self):
+        from celery.worker.control import Panel
+        import app.tasks.model_tasks  # noqa: F401
+
+        assert "reload_model" in Panel.meta
+        assert Panel.meta["reload_model"].type == "control"
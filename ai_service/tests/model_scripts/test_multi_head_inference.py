@@ -0,0 +1,147 @@
+"""
+Regression tests for shared classifier/QA DistilBERT inference: results must match the separate models
+"""
+from unittest.mock import patch
+
+import pytest
+import torch
+from transformers import DistilBertConfig, DistilBertTokenizer, DistilBertTokenizerFast
+
+from app.model_scripts.classifier_model import ClassifierModel, MultiTaskDistilBert
+from app.model_scripts.multi_head_inference import BATCHED, SEPARATE, SHARED, MultiHeadInference
+from app.model_scripts.qa_model import HEAD_SUBMETRIC_LABELS, MultiHeadQAClassifier, QAModel
+
+WORDS = ["the", "caller", "child", "is", "safe", "school", "police", "help", "thank", "you",
+         "please", "hold", "abuse", "home", "report", "mother", "we", "will", "follow", "up"]
+
+TEXTS = [
+    "Thank you, the caller reported abuse at home. We will follow up with the police!",
+    "the caller is safe",
+    "Please hold - the child's mother will report to the school.",
+]
+
+
+def write_vocab(path, words):
+    vocab_file = path / "vocab.txt"
+    vocab_file.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", ".", ",", "!", "-", "'", "s"] + words))
+    return str(vocab_file)
+
+
+@pytest.fixture
+def models(tmp_path):
+    torch.manual_seed(0)
+    vocab_file = write_vocab(tmp_path, WORDS)
+    config = DistilBertConfig(vocab_size=len(WORDS) + 11, dim=32, n_layers=2, n_heads=2, hidden_dim=64)
+
+    classifier = ClassifierModel(model_path=str(tmp_path))
+    classifier.device = torch.device("cpu")
+    classifier.tokenizer = DistilBertTokenizerFast(vocab_file=vocab_file)
+    classifier.main_categories = ["a", "b", "c"]
+    classifier.sub_categories = ["s1", "s2", "s3", "s4"]
+    classifier.interventions = ["i1", "i2"]
+    classifier.priorities = [1, 2, 3]
+    classifier.model = MultiTaskDistilBert(config, 3, 4, 2, 3).eval()
+    classifier.loaded = True
+
+    # QA backbone loaded from the classifier's encoder, as when both are fine-tuned from one checkpoint
+    encoder_dir = tmp_path / "encoder"
+    classifier.model.distilbert.save_pretrained(encoder_dir)
+    qa = QAModel(model_path=str(tmp_path))
+    qa.device = torch.device("cpu")
+    qa.tokenizer = DistilBertTokenizer(vocab_file=vocab_file)
+    qa.model = MultiHeadQAClassifier(model_name=str(encoder_dir)).eval()
+    qa.loaded = True
+    return classifier, qa
+
+
+def assert_same_results(classifier, qa, shared_results, text, threshold=0.5):
+    classification, qa_predictions = shared_results
+    expected_classification = classifier.classify(text)
+    expected_qa = qa.predict(text, threshold=threshold)
+
+    assert classification == expected_classification
+    assert qa_predictions.keys() == expected_qa.keys()
+    for head, submetrics in expected_qa.items():
+        assert [m["prediction"] for m in qa_predictions[head]] == [m["prediction"] for m in submetrics]
+        assert [m["submetric"] for m in qa_predictions[head]] == [m["submetric"] for m in submetrics]
+        for got, expected in zip(qa_predictions[head], submetrics):
+            assert got["probability"] == pytest.approx(expected["probability"], abs=1e-5)
+
+
+class TestModeDetection:
+    """Test which path a pair of models gets"""
+
+    def test_identical_encoders_share_one_pass(self, models):
+        classifier, qa = models
+
+        assert MultiHeadInference().mode(classifier, qa) == SHARED
+
+    def test_different_weights_are_batched(self, models):
+        classifier, qa = models
+        with torch.no_grad():
+            qa.model.bert.embeddings.word_embeddings.weight.add_(0.5)
+
+        assert MultiHeadInference().mode(classifier, qa) == BATCHED
+
+    def test_different_vocabularies_run_separately(self, models, tmp_path):
+        classifier, qa = models
+        other = tmp_path / "other"
+        other.mkdir()
+        qa.tokenizer = DistilBertTokenizer(vocab_file=write_vocab(other, list(reversed(WORDS))))
+
+        service = MultiHeadInference()
+
+        assert service.mode(classifier, qa) == SEPARATE
+        assert service.run(classifier, qa, TEXTS[0]) is None
+
+    def test_disabled_or_not_loaded_runs_separately(self, models):
+        classifier, qa = models
+
+        assert MultiHeadInference(enabled=False).run(classifier, qa, TEXTS[0]) is None
+        qa.loaded = False
+        assert MultiHeadInference().run(classifier, qa, TEXTS[0]) is None
+
+
+class TestRegression:
+    """Test shared results are identical to the separate models"""
+
+    @pytest.mark.parametrize("text", TEXTS)
+    def test_shared_matches_separate_models(self, models, text):
+        classifier, qa = models
+        service = MultiHeadInference()
+
+        results = service.run(classifier, qa, text, threshold=0.5)
+
+        assert_same_results(classifier, qa, results, text)
+        assert service.stats[SHARED] == 1
+
+    @pytest.mark.parametrize("text", TEXTS)
+    def test_batched_matches_separate_models(self, models, text):
+        classifier, qa = models
+        with torch.no_grad():
+            for param in qa.model.bert.parameters():
+                param.add_(torch.randn_like(param) * 0.1)
+        service = MultiHeadInference()
+
+        results = service.run(classifier, qa, text, threshold=0.4)
+
+        assert_same_results(classifier, qa, results, text, threshold=0.4)
+        assert service.stats[BATCHED] == 1
+
+    def test_long_text_keeps_chunked_classification(self, models):
+        classifier, qa = models
+        text = " ".join(WORDS * 40)  # 800 tokens: beyond one classifier window and the QA max_length
+        chunked = {"main_category": "a", "aggregation_info": {"chunks_processed": 2}}
+        service = MultiHeadInference()
+
+        with patch.object(classifier, "classify", return_value=chunked) as classify:
+            classification, qa_predictions = service.run(classifier, qa, text)
+
+        classify.assert_called_once_with(text)
+        assert classification == chunked
+        expected_qa = qa.predict(text)
+        assert set(qa_predictions) == set(HEAD_SUBMETRIC_LABELS)
+        for head, submetrics in expected_qa.items():
+            for got, expected in zip(qa_predictions[head], submetrics):
+                assert got["probability"] == pytest.approx(expected["probability"], abs=1e-5)
+        assert service.stats["chunked_classification"] == 1
@@ -0,0 +1,119 @@
+"""
+Tests for the NER micro-batcher: concurrent requests are grouped into extract_entities_batch() calls
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.model_scripts.ner_batcher import NERMicroBatcher
+
+
+class FakeNERModel:
+    """Records each batch and returns one entity per text"""
+
+    def __init__(self, fail: bool = False, bad_text: str = None):
+        self.batches = []
+        self.fail = fail
+        self.bad_text = bad_text
+
+    def extract_entities_batch(self, texts, flat=True):
+        self.batches.append((list(texts), flat))
+        if self.fail or self.bad_text in texts:
+            raise RuntimeError("NER processing failed")
+        if flat:
+            return [[{"text": text, "label": "PERSON"}] for text in texts]
+        return [{"PERSON": [text]} for text in texts]
+
+
+class TestBatching:
+    """Test requests are grouped"""
+
+    def test_concurrent_requests_share_a_batch(self):
+        batcher = NERMicroBatcher(batch_size=16, max_wait_ms=200)
+        model = FakeNERModel()
+
+        futures = [batcher.submit(model, f"text {i}") for i in range(5)]
+        results = [future.result(timeout=5) for future in futures]
+
+        assert results == [[{"text": f"text {i}", "label": "PERSON"}] for i in range(5)]
+        assert model.batches == [([f"text {i}" for i in range(5)], True)]
+        assert batcher.get_stats()["largest_batch"] == 5
+
+    def test_batch_size_caps_each_batch(self):
+        batcher = NERMicroBatcher(batch_size=2, max_wait_ms=200)
+        model = FakeNERModel()
+
+        futures = [batcher.submit(model, f"text {i}") for i in range(5)]
+        for future in futures:
+            future.result(timeout=5)
+
+        assert [len(texts) for texts, _ in model.batches] == [2, 2, 1]
+
+    def test_models_and_formats_batched_separately(self):
+        batcher = NERMicroBatcher(batch_size=16, max_wait_ms=200)
+        first, second = FakeNERModel(), FakeNERModel()
+
+        futures = [
+            batcher.submit(first, "a", flat=True),
+            batcher.submit(first, "b", flat=False),
+            batcher.submit(second, "c", flat=True),
+            batcher.submit(first, "d", flat=True),
+        ]
+        results = [future.result(timeout=5) for future in futures]
+
+        assert results[1] == {"PERSON": ["b"]}
+        assert sorted(first.batches) == [(["a", "d"], True), (["b"], False)]
+        assert second.batches == [(["c"], True)]
+
+    def test_model_error_reaches_every_caller(self):
+        batcher = NERMicroBatcher(batch_size=16, max_wait_ms=50)
+        model = FakeNERModel(fail=True)
+
+        futures = [batcher.submit(model, "a"), batcher.submit(model, "b")]
+
+        for future in futures:
+            with pytest.raises(RuntimeError, match="NER processing failed"):
+                future.result(timeout=5)
+
+    def test_failing_text_does_not_fail_its_neighbours(self):
+        batcher = NERMicroBatcher(batch_size=16, max_wait_ms=200)
+        model = FakeNERModel(bad_text="bad")
+
+        futures = [batcher.submit(model, text) for text in ("a", "bad", "c")]
+
+        assert futures[0].result(timeout=5) == [{"text": "a", "label": "PERSON"}]
+        assert futures[2].result(timeout=5) == [{"text": "c", "label": "PERSON"}]
+        with pytest.raises(RuntimeError, match="NER processing failed"):
+            futures[1].result(timeout=5)
+        assert model.batches == [(["a", "bad", "c"], True), (["a"], True), (["bad"], True), (["c"], True)]
+        assert batcher.get_stats()["failed_batches"] == 1
+
+    def test_request_without_wait_runs_at_once(self):
+        batcher = NERMicroBatcher(batch_size=16, max_wait_ms=5000)
+        model = FakeNERModel()
+
+        started = time.monotonic()
+        result = batcher.extract(model, "a", wait=False)
+
+        assert result == [{"text": "a", "label": "PERSON"}]
+        assert time.monotonic() - started < 1
+        assert model.batches == [(["a"], True)]
+
+    def test_mismatched_results_fail_instead_of_hanging(self):
+        batcher = NERMicroBatcher(batch_size=16, max_wait_ms=0)
+        model = FakeNERModel()
+        model.extract_entities_batch = lambda texts, flat=True: []
+
+        with pytest.raises(RuntimeError, match="0 results for 1 texts"):
+            batcher.extract(model, "a")
+
+    @pytest.mark.asyncio
+    async def test_async_callers_are_batched(self):
+        batcher = NERMicroBatcher(batch_size=16, max_wait_ms=200)
+        model = FakeNERModel()
+
+        results = await asyncio.gather(*(batcher.extract_async(model, f"window {i}", flat=False) for i in range(3)))
+
+        assert results == [{"PERSON": [f"window {i}"]} for i in range(3)]
+        assert len(model.batches) == 1
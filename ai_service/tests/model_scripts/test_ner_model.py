@@ -366,3 +366,70 @@ class TestDownloadSpacyFromHF:
         result = ner_model.download_spacy_from_hf()
 
         assert result is False
+
+
+class TestExtractEntitiesBatch:
+    """Tests for batched entity extraction"""
+
+    @pytest.fixture
+    def spacy_ner(self):
+        import spacy
+        from app.model_scripts.ner_model import NERModel
+
+        nlp = spacy.blank("en")
+        nlp.add_pipe("entity_ruler").add_patterns([
+            {"label": "PERSON", "pattern": "John"},
+            {"label": "GPE", "pattern": "Nairobi"},
+        ])
+        ner_model = NERModel()
+        ner_model.loaded = True
+        ner_model.use_hf = False
+        ner_model.nlp = nlp
+        return ner_model
+
+    def test_spacy_batch_uses_pipe(self, spacy_ner):
+        """Test several texts go through one nlp.pipe call with the same results as one at a time"""
+        texts = ["John lives in Nairobi", "", "  John called  ", "nobody here"]
+        expected = [spacy_ner.extract_entities(text, flat=False) for text in texts]
+
+        with patch.object(spacy_ner.nlp, "pipe", wraps=spacy_ner.nlp.pipe) as pipe:
+            results = spacy_ner.extract_entities_batch(texts, flat=False)
+
+        pipe.assert_called_once()
+        assert list(pipe.call_args.args[0]) == ["John lives in Nairobi", "John called", "nobody here"]
+        assert results == expected
+        assert results[0] == {"PERSON": ["John"], "GPE": ["Nairobi"]}
+        assert results[1] == {}
+
+    def test_long_hf_text_chunked_with_original_offsets(self, tmp_path):
+        """Test texts beyond the model input are chunked and entity positions refer to the full text"""
+        import re
+        import torch
+        from transformers import DistilBertConfig, DistilBertForTokenClassification, DistilBertTokenizerFast, pipeline
+        from app.model_scripts.ner_model import NERModel
+
+        words = ["the", "caller", "is", "safe", "mary", "lives", "in", "nairobi", "we", "will", "follow", "up"]
+        vocab_file = tmp_path / "vocab.txt"
+        vocab_file.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "."] + words))
+        tokenizer = DistilBertTokenizerFast(vocab_file=str(vocab_file), model_max_length=16)
+        config = DistilBertConfig(vocab_size=len(words) + 6, dim=16, n_layers=1, n_heads=2, hidden_dim=32,
+                                  id2label={0: "O", 1: "B-PER"}, label2id={"O": 0, "B-PER": 1})
+        model = DistilBertForTokenClassification(config).eval()
+        with torch.no_grad():
+            model.classifier.bias.copy_(torch.tensor([0.0, 10.0]))  # every token is an entity
+
+        ner_model = NERModel()
+        ner_model.loaded = True
+        ner_model.use_hf = True
+        ner_model.hf_pipeline = pipeline("token-classification", model=model, tokenizer=tokenizer,
+                                         aggregation_strategy="none", device="cpu")
+        long_text = "Mary lives in Nairobi.  The caller is safe.\nWe will follow up.   Mary is safe."
+
+        short, long = ner_model.extract_entities_batch(["the caller", long_text])
+
+        assert [e["text"] for e in short] == ["the", "caller"]
+        assert len(ner_model._chunker.chunk_transcript(long_text)) > 1
+        assert len(long) == len(re.findall(r"\w+|\.", long_text))
+        for entity in long:
+            assert long_text[entity["start"]:entity["end"]].lower() == entity["text"]
+        assert long[-2]["start"] == long_text.rindex("safe")
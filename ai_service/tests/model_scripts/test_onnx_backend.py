@@ -0,0 +1,211 @@
+"""
+Tests for the ONNX Runtime backend: exported models must give the PyTorch results, and exports are cached by weights
+"""
+import os
+from unittest.mock import patch
+
+import pytest
+import torch
+from transformers import (
+    DistilBertConfig,
+    DistilBertForTokenClassification,
+    DistilBertModel,
+    DistilBertTokenizer,
+    DistilBertTokenizerFast,
+    pipeline,
+)
+
+from app.model_scripts import onnx_backend
+from app.model_scripts.classifier_model import ClassifierModel, MultiTaskDistilBert
+from app.model_scripts.multi_head_inference import SEPARATE, MultiHeadInference
+from app.model_scripts.ner_model import NERModel
+from app.model_scripts.qa_model import QA_HEADS_CONFIG, MultiHeadQAClassifier, QAModel
+
+pytestmark = pytest.mark.skipif(not onnx_backend.ONNXRUNTIME_AVAILABLE, reason="onnxruntime not installed")
+
+WORDS = ["the", "caller", "child", "is", "safe", "school", "police", "help", "thank", "you",
+         "please", "hold", "abuse", "home", "report", "mother", "we", "will", "follow", "up", "nairobi", "mary"]
+
+TEXTS = [
+    "Thank you, the caller reported abuse at home. We will follow up with the police!",
+    "the caller is safe",
+    "Please hold - the child's mother will report to the school.",
+]
+
+
+def write_vocab(path, words):
+    vocab_file = path / "vocab.txt"
+    vocab_file.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", ".", ",", "!", "-", "'", "s"] + words))
+    return str(vocab_file)
+
+
+def tiny_config():
+    return DistilBertConfig(vocab_size=len(WORDS) + 11, dim=32, n_layers=2, n_heads=2, hidden_dim=64)
+
+
+@pytest.fixture
+def onnx_settings(tmp_path):
+    """Route the ONNX backend settings to a temporary cache"""
+    from app.config.settings import settings
+
+    cache_dir = tmp_path / "onnx"
+    with patch.object(settings, "onnx_backend_models", "all"), \
+         patch.object(settings, "onnx_cache_dir", str(cache_dir)), \
+         patch.object(settings, "onnx_intra_op_threads", 1):
+        yield cache_dir
+
+
+@pytest.fixture
+def classifier(tmp_path):
+    torch.manual_seed(0)
+    model = ClassifierModel(model_path=str(tmp_path))
+    model.device = torch.device("cpu")
+    model.tokenizer = DistilBertTokenizerFast(vocab_file=write_vocab(tmp_path, WORDS))
+    model.main_categories = ["a", "b", "c"]
+    model.sub_categories = ["s1", "s2", "s3", "s4"]
+    model.interventions = ["i1", "i2"]
+    model.priorities = [1, 2, 3]
+    model.model = MultiTaskDistilBert(tiny_config(), 3, 4, 2, 3).eval()
+    model.loaded = True
+    return model
+
+
+@pytest.fixture
+def qa(tmp_path):
+    torch.manual_seed(1)
+    encoder_dir = tmp_path / "encoder"
+    DistilBertModel(tiny_config()).save_pretrained(encoder_dir)
+    model = QAModel(model_path=str(tmp_path))
+    model.device = torch.device("cpu")
+    model.tokenizer = DistilBertTokenizer(vocab_file=write_vocab(tmp_path, WORDS))
+    model.model = MultiHeadQAClassifier(model_name=str(encoder_dir)).eval()
+    model.loaded = True
+    return model
+
+
+def assert_same_classification(got, expected):
+    for key in ("main_category", "sub_category", "sub_category_2", "intervention", "priority"):
+        assert got[key] == expected[key]
+    assert got["confidence"] == pytest.approx(expected["confidence"], abs=2e-3)
+
+
+class TestExportCache:
+    """Test exports are written once and keyed by the weights"""
+
+    def test_export_reused_from_cache(self, classifier, onnx_settings):
+        first = onnx_backend.export_onnx(classifier.model, "classifier", ["main", "sub", "interv", "priority"], lambda out: out)
+        with patch.object(onnx_backend, "_export") as export:
+            second = onnx_backend.export_onnx(classifier.model, "classifier", ["main", "sub", "interv", "priority"], lambda out: out)
+
+        export.assert_not_called()
+        assert first.path == second.path
+        assert os.listdir(onnx_settings) == [os.path.basename(first.path)]
+        assert second.intra_op_threads == 1
+
+    def test_changed_weights_get_new_export(self, classifier, onnx_settings):
+        first = onnx_backend.export_onnx(classifier.model, "classifier", ["main", "sub", "interv", "priority"], lambda out: out)
+        with torch.no_grad():
+            classifier.model.classifier_main.bias.add_(1.0)
+        second = onnx_backend.export_onnx(classifier.model, "classifier", ["main", "sub", "interv", "priority"], lambda out: out)
+
+        assert first.path != second.path
+        assert len(os.listdir(onnx_settings)) == 2
+
+    def test_export_keeps_training_flag(self, classifier, onnx_settings):
+        classifier.model.train()
+
+        onnx_backend.export_onnx(classifier.model, "classifier", ["main", "sub", "interv", "priority"], lambda out: out)
+
+        assert all(module.training for module in classifier.model.modules())
+
+    def test_missing_onnxruntime_keeps_pytorch(self, classifier, onnx_settings):
+        expected = classifier.classify(TEXTS[0])
+
+        with patch.object(onnx_backend, "ONNXRUNTIME_AVAILABLE", False):
+            classifier._enable_onnx_backend()
+
+        assert classifier.onnx_session is None
+        assert classifier.classify(TEXTS[0]) == expected
+
+    def test_failed_export_keeps_pytorch(self, classifier, onnx_settings):
+        with patch.object(onnx_backend, "_export", side_effect=RuntimeError("unsupported operator")):
+            classifier._enable_onnx_backend()
+
+        assert classifier.onnx_session is None
+
+    def test_backend_selected_per_model(self, classifier, qa, onnx_settings):
+        from app.config.settings import settings
+
+        with patch.object(settings, "onnx_backend_models", "qa"):
+            classifier._enable_onnx_backend()
+            qa._enable_onnx_backend()
+
+        assert classifier.onnx_session is None
+        assert qa.onnx_session is not None
+
+
+class TestParity:
+    """Test the ONNX backend gives the PyTorch results"""
+
+    @pytest.mark.parametrize("text", TEXTS)
+    def test_classifier_matches_pytorch(self, classifier, onnx_settings, text):
+        expected = classifier.classify(text)
+
+        classifier._enable_onnx_backend()
+
+        assert classifier.onnx_session is not None
+        assert_same_classification(classifier.classify(text), expected)
+        assert classifier.get_model_info()["backend"] == "onnxruntime"
+
+    def test_classifier_chunks_batched(self, classifier, onnx_settings):
+        texts = [classifier.preprocess_text(t) for t in TEXTS]
+        expected = [classifier._classify_single(t) for t in texts]
+
+        classifier._enable_onnx_backend()
+        results = classifier._classify_batch_onnx(texts)
+
+        for got, want in zip(results, expected):
+            assert_same_classification(got, want)
+
+    @pytest.mark.parametrize("text", TEXTS)
+    def test_qa_matches_pytorch(self, qa, onnx_settings, text):
+        expected = qa.predict(text)
+        expected_score = qa.score_transcript(text)
+
+        qa._enable_onnx_backend()
+
+        assert qa.onnx_session.output_names == list(QA_HEADS_CONFIG)
+        result = qa.predict(text)
+        for head, submetrics in expected.items():
+            assert [m["prediction"] for m in result[head]] == [m["prediction"] for m in submetrics]
+            for got, want in zip(result[head], submetrics):
+                assert got["probability"] == pytest.approx(want["probability"], abs=1e-4)
+        assert qa.score_transcript(text)["overall_qa_score"] == expected_score["overall_qa_score"]
+
+    def test_onnx_models_skip_shared_inference(self, classifier, qa, onnx_settings):
+        qa._enable_onnx_backend()
+
+        assert MultiHeadInference().mode(classifier, qa) == SEPARATE
+
+    def test_ner_pipeline_matches_pytorch(self, tmp_path, onnx_settings):
+        torch.manual_seed(2)
+        config = tiny_config()
+        config.id2label = {0: "O", 1: "B-PER", 2: "I-PER", 3: "B-LOC", 4: "I-LOC"}
+        config.label2id = {label: i for i, label in config.id2label.items()}
+        model = DistilBertForTokenClassification(config).eval()
+        tokenizer = DistilBertTokenizerFast(vocab_file=write_vocab(tmp_path, WORDS))
+
+        ner = NERModel(model_path=str(tmp_path))
+        ner.hf_pipeline = pipeline("token-classification", model=model, tokenizer=tokenizer,
+                                   aggregation_strategy="simple", device="cpu")
+        text = "mary called the police in nairobi about the child"
+        expected = ner.hf_pipeline(text)
+
+        ner._enable_onnx_backend()
+
+        assert ner.onnx_session is not None
+        got = ner.hf_pipeline(text)
+        assert [(e["entity_group"], e["word"], e["start"], e["end"]) for e in got] == \
+               [(e["entity_group"], e["word"], e["start"], e["end"]) for e in expected]
+        for a, b in zip(got, expected):
+            assert float(a["score"]) == pytest.approx(float(b["score"]), abs=1e-4)
@@ -247,6 +247,134 @@ class TestSummarizeHierarchical:
         assert result == "Hierarchical summary"
 
 
+class WordTokenizer:
+    """One token per word"""
+
+    def encode(self, text, add_special_tokens=True):
+        return text.split() + (["</s>"] if add_special_tokens else [])
+
+
+class FakeSummarizationPipeline:
+    """Records each call; summaries are the first max_length words of the input"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, inputs, max_length, min_length, **kwargs):
+        self.calls.append({"inputs": inputs, "max_length": max_length, "min_length": min_length, **kwargs})
+        texts = inputs if isinstance(inputs, list) else [inputs]
+        return [{"summary_text": " ".join(text.split()[:max_length])} for text in texts]
+
+
+def make_chunks(sizes):
+    from app.core.text_chunker import TextChunk
+    return [
+        TextChunk(text=" ".join([f"c{i}w{j}" for j in range(size)]), start_pos=0, end_pos=0,
+                  chunk_id=i, token_count=size, sentence_count=1)
+        for i, size in enumerate(sizes)
+    ]
+
+
+class TestBatchedMapReduce:
+    """Tests for batched map-reduce summarization"""
+
+    @pytest.fixture
+    def summarizer(self):
+        from app.model_scripts.summarizer_model import SummarizationModel
+
+        summarizer = SummarizationModel()
+        summarizer.loaded = True
+        summarizer.device = torch.device("cpu")
+        summarizer.pipeline = FakeSummarizationPipeline()
+        summarizer.tokenizer = WordTokenizer()
+        return summarizer
+
+    def summarize_chunks(self, summarizer, sizes, batch_size=4, max_generated_tokens=2048, max_reduce_levels=3, **kwargs):
+        from app.config.settings import settings
+
+        with patch('app.core.text_chunker.text_chunker.chunk_text', return_value=make_chunks(sizes)), \
+             patch.object(settings, "summarization_batch_size", batch_size), \
+             patch.object(settings, "summarization_max_generated_tokens", max_generated_tokens), \
+             patch.object(settings, "summarization_max_reduce_levels", max_reduce_levels):
+            return summarizer.summarize(" ".join(["word"] * sum(sizes)), **kwargs)
+
+    def test_chunks_summarized_in_padded_batches(self, summarizer):
+        """Test the map phase batches chunks of similar length"""
+        sizes = [400, 100, 300, 200, 450, 150]
+
+        self.summarize_chunks(summarizer, sizes, batch_size=4)
+
+        map_calls = summarizer.pipeline.calls[:-1]
+        assert [len(call["inputs"]) for call in map_calls] == [4, 2]
+        assert [call["batch_size"] for call in map_calls] == [4, 2]
+        first_batch_sizes = [len(text.split()) for text in map_calls[0]["inputs"]]
+        assert first_batch_sizes == [100, 150, 200, 300]
+        assert isinstance(summarizer.pipeline.calls[-1]["inputs"], str)  # final summary
+        assert summarizer.last_run_stats["batches"] == 3
+
+    def test_reduce_levels_adapt_to_summary_length(self, summarizer):
+        """Test long chunk summaries get reduce passes until they fit one input"""
+        self.summarize_chunks(summarizer, [480] * 40, batch_size=8, max_generated_tokens=100000)
+
+        stats = summarizer.last_run_stats
+        assert stats["reduce_levels"] >= 1
+        final_input = summarizer.pipeline.calls[-1]["inputs"]
+        assert len(final_input.split()) <= summarizer.max_length - 50
+
+    def test_short_chunk_summaries_need_no_reduce(self, summarizer):
+        """Test the final summary follows the map phase directly when summaries fit"""
+        self.summarize_chunks(summarizer, [460, 460])
+
+        assert summarizer.last_run_stats["reduce_levels"] == 0
+        assert summarizer.last_run_stats["generations"] == 3
+
+    def test_generated_tokens_are_bounded(self, summarizer):
+        """Test every pass together stays within the generated-token budget"""
+        budget = 600
+
+        self.summarize_chunks(summarizer, [480] * 40, batch_size=8, max_generated_tokens=budget, max_length=150)
+
+        assert summarizer.last_run_stats["generated_tokens"] <= budget
+        assert all(call["max_length"] <= 75 for call in summarizer.pipeline.calls[:-1])
+
+    def test_reduce_levels_limit_falls_back_to_merging(self, summarizer):
+        """Test summaries still too long after the allowed levels are merged extractively"""
+        with patch.object(summarizer, "_optimize_combined_summaries", return_value="merged") as merge:
+            result = self.summarize_chunks(summarizer, [480] * 40, batch_size=8, max_generated_tokens=100000,
+                                           max_reduce_levels=0)
+
+        assert result == "merged"
+        merge.assert_called_once()
+        assert summarizer.last_run_stats["reduce_levels"] == 0
+
+    def test_failed_batch_uses_fallback_summaries(self, summarizer):
+        """Test a failing batch falls back to extractive summaries for its chunks only"""
+        summarizer.pipeline = MagicMock(side_effect=RuntimeError("CUDA out of memory"))
+        summarizer._run_stats = {"generated_tokens": 0}
+
+        with patch.object(summarizer, "_create_fallback_summary", side_effect=lambda text: f"fallback {text}"):
+            summaries = summarizer._summarize_batch(["first chunk", "second chunk"], [200, 100], 150, 40, 1000)
+
+        assert summaries == ["fallback first chunk", "fallback second chunk"]
+
+    def test_one_cleanup_per_job(self, summarizer):
+        """Test memory is cleaned once per summary, not per chunk"""
+        with patch.object(summarizer, "_cleanup_memory") as cleanup:
+            self.summarize_chunks(summarizer, [300] * 12)
+
+        cleanup.assert_called_once()
+
+    def test_reports_throughput_and_peak_memory(self, summarizer):
+        """Test tokens per second and peak memory are recorded for the last run"""
+        self.summarize_chunks(summarizer, [300, 300, 300])
+
+        stats = summarizer.last_run_stats
+        assert stats["generated_tokens"] > 0
+        assert stats["tokens_per_second"] > 0
+        assert "peak_memory_mb" in stats
+        assert summarizer.get_model_info()["loaded"] is True
+
+
 class TestFallbackSummary:
     """Tests for fallback summary creation"""
 
@@ -669,18 +797,20 @@ class TestSummarizeHierarchicalFullFlow:
         with patch('app.core.text_chunker.text_chunker') as mock_chunker:
             mock_chunker.chunk_text.return_value = [mock_chunk1, mock_chunk2, mock_chunk3]
 
-            with patch.object(summarizer, '_summarize_single') as mock_single:
-                mock_single.side_effect = [
+            with patch.object(summarizer, '_summarize_batch') as mock_batch, \
+                 patch.object(summarizer, '_summarize_single', return_value="Final combined summary") as mock_single:
+                mock_batch.return_value = [
                     "Summary of first chunk",
                     "Summary of second chunk",
-                    "Summary of third chunk",
-                    "Final combined summary"
+                    "Summary of third chunk"
                 ]
 
                 with patch.object(summarizer, '_cleanup_memory'):
                     result = summarizer._summarize_hierarchical("Very long text", 150, 40)
 
         assert result == "Final combined summary"
+        assert mock_batch.call_args[0][0] == ["First chunk of text", "Second chunk of text", "Third chunk of text"]
+        assert mock_single.call_args[0][0] == "Summary of first chunk Summary of second chunk Summary of third chunk"
 
     @patch('app.model_scripts.summarizer_model.torch.cuda.is_available')
     def test_hierarchical_handles_chunk_failure(self, mock_cuda):
@@ -735,15 +865,8 @@ class TestSummarizeHierarchicalFullFlow:
         with patch('app.core.text_chunker.text_chunker') as mock_chunker:
             mock_chunker.chunk_text.return_value = [mock_chunk]
 
-            call_count = [0]
-            def side_effect(*args, **kwargs):
-                call_count[0] += 1
-                if call_count[0] == 1:
-                    return "Chunk summary"
-                else:
-                    raise Exception("Final summarization failed")
-
-            with patch.object(summarizer, '_summarize_single', side_effect=side_effect):
+            with patch.object(summarizer, '_summarize_batch', return_value=["Chunk summary"]), \
+                 patch.object(summarizer, '_summarize_single', side_effect=Exception("Final summarization failed")):
                 with patch.object(summarizer, '_cleanup_memory'):
                     with patch.object(summarizer, '_optimize_combined_summaries', return_value="Optimized"):
                         result = summarizer._summarize_hierarchical("Long text", 150, 40)
@@ -787,8 +910,8 @@ class TestSummarizeHierarchicalFullFlow:
         assert result == "Optimized combined"
 
     @patch('app.model_scripts.summarizer_model.torch.cuda.is_available')
-    def test_cleanup_called_every_three_chunks(self, mock_cuda):
-        """Test cleanup is called at regular intervals during hierarchical summarization"""
+    def test_no_cleanup_between_chunks(self, mock_cuda):
+        """Test hierarchical summarization leaves memory cleanup to the end of the job"""
         from app.model_scripts.summarizer_model import SummarizationModel
 
         mock_cuda.return_value = False
@@ -815,12 +938,10 @@ class TestSummarizeHierarchicalFullFlow:
                 mock_single.return_value = "Summary"
 
                 with patch.object(summarizer, '_cleanup_memory') as mock_cleanup:
-                    try:
+                    with patch.object(summarizer, '_summarize_batch', side_effect=lambda texts, *args: ["Summary"] * len(texts)):
                         summarizer._summarize_hierarchical("Long text", 150, 40)
-                    except:
-                        pass
 
-                assert mock_cleanup.call_count >= 2
+                mock_cleanup.assert_not_called()
 
 
 class TestCreateFallbackSummaryTruncation:
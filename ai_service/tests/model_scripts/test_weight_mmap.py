@@ -0,0 +1,116 @@
+"""
+Tests for app/model_scripts/weight_mmap.py
+Remapping loaded model weights onto shared mmapped safetensors files
+"""
+import os
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+safetensors_torch = pytest.importorskip("safetensors.torch")
+
+from app.model_scripts.weight_mmap import (
+    find_safetensors_files,
+    load_safetensors_mmap,
+    remap_weights_to_mmap,
+    share_model_weights,
+)
+
+
+class TinyModel(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.embed = torch.nn.Embedding(10, 4)
+        self.proj = torch.nn.Linear(4, 3)
+
+    def forward(self, ids):
+        return self.proj(self.embed(ids))
+
+
+def save_model(model, directory):
+    path = os.path.join(directory, "model.safetensors")
+    safetensors_torch.save_file({k: v.contiguous() for k, v in model.state_dict().items()}, path)
+    return path
+
+
+class TestLoadSafetensorsMmap:
+    """Test mapping safetensors files"""
+
+    def test_tensors_match_file(self, tmp_path):
+        model = TinyModel()
+        path = save_model(model, tmp_path)
+
+        tensors = load_safetensors_mmap(path)
+
+        for name, tensor in model.state_dict().items():
+            assert torch.equal(tensors[name], tensor)
+
+    def test_bfloat16_round_trip(self, tmp_path):
+        original = torch.randn(3, 5).to(torch.bfloat16)
+        path = str(tmp_path / "bf16.safetensors")
+        safetensors_torch.save_file({"w": original}, path)
+
+        tensor = load_safetensors_mmap(path)["w"]
+
+        assert tensor.dtype == torch.bfloat16
+        assert torch.equal(tensor, original)
+
+
+class TestRemapWeights:
+    """Test pointing module parameters at the mapping"""
+
+    def test_outputs_unchanged_and_weights_file_backed(self, tmp_path):
+        model = TinyModel().eval()
+        path = save_model(model, tmp_path)
+        ids = torch.tensor([[1, 2, 3]])
+        expected = model(ids)
+
+        remapped = remap_weights_to_mmap(model, [path])
+
+        assert remapped == sum(t.numel() * t.element_size() for t in model.state_dict().values())
+        assert torch.equal(model(ids), expected)
+        assert isinstance(model.proj.weight, torch.nn.Parameter)
+        # Parameters now alias the mapping rather than a private copy
+        mapping = np.memmap(path, dtype=np.uint8, mode="r")
+        file_bytes = mapping.tobytes()
+        assert model.proj.weight.detach().numpy().tobytes() in file_bytes
+
+    def test_mismatched_dtype_kept_in_memory(self, tmp_path):
+        model = TinyModel()
+        path = save_model(model, tmp_path)
+        model.proj.to(torch.float64)
+        before = model.proj.weight.data_ptr()
+
+        remap_weights_to_mmap(model, [path])
+
+        assert model.proj.weight.data_ptr() == before
+        assert model.proj.weight.dtype == torch.float64
+
+
+class TestShareModelWeights:
+    """Test the model-wrapper entry point"""
+
+    def test_wrapper_without_torch_module_skipped(self):
+        class Wrapper:
+            model = object()
+
+        assert share_model_weights(Wrapper()) == 0
+
+    def test_local_directory_resolved(self, tmp_path):
+        model = TinyModel()
+        save_model(model, tmp_path)
+        model.name_or_path = str(tmp_path)
+
+        class Wrapper:
+            pass
+
+        wrapper = Wrapper()
+        wrapper.model = model
+
+        assert find_safetensors_files(str(tmp_path)) == [str(tmp_path / "model.safetensors")]
+        assert share_model_weights(wrapper) > 0
+
+    def test_missing_weights_skipped(self, tmp_path):
+        assert find_safetensors_files(str(tmp_path)) == []
+        assert find_safetensors_files(None) == []
@@ -397,3 +397,53 @@ class TestTranscribePCMAudio:
         except (RuntimeError, Exception):
             # Some implementations may raise on empty audio
             pass
+
+
+class TestReducedEncoderContext:
+    """Tests for encoding only the audio present in short streaming windows"""
+
+    @pytest.fixture
+    def whisper(self):
+        from types import SimpleNamespace
+        from transformers import WhisperConfig, WhisperForConditionalGeneration
+        from app.model_scripts.whisper_model import WhisperModel
+
+        config = WhisperConfig(
+            d_model=32, encoder_layers=1, decoder_layers=1, encoder_attention_heads=2,
+            decoder_attention_heads=2, encoder_ffn_dim=64, decoder_ffn_dim=64
+        )
+        whisper = WhisperModel()
+        whisper.model = WhisperForConditionalGeneration(config).eval()
+        whisper.settings = SimpleNamespace(
+            streaming_reduced_encoder_context=True, streaming_encoder_bucket_seconds=2.0
+        )
+        return whisper
+
+    def test_context_rounded_up_to_bucket(self, whisper):
+        assert whisper._encoder_context_frames(5 * 16000) == 600
+        assert whisper._encoder_context_frames(100) == 200
+        assert whisper._encoder_context_frames(30 * 16000) is None
+
+    def test_disabled_uses_full_padding(self, whisper):
+        whisper.settings.streaming_reduced_encoder_context = False
+
+        inputs = whisper._generate_inputs(torch.zeros(1, 80, 3000), 5 * 16000)
+
+        assert set(inputs) == {"input_features", "attention_mask"}
+
+    def test_matches_encoder_at_full_length(self, whisper):
+        features = torch.randn(1, 80, 3000)
+
+        with torch.no_grad():
+            expected = whisper.model.get_encoder()(features).last_hidden_state
+            reduced = whisper._encode_reduced_context(features, 3000).last_hidden_state
+
+        assert torch.allclose(expected, reduced, atol=1e-5)
+
+    def test_generate_cross_attends_to_shorter_features(self, whisper):
+        with torch.no_grad():
+            inputs = whisper._generate_inputs(torch.randn(1, 80, 3000), 5 * 16000)
+            predicted_ids = whisper.model.generate(**inputs, max_length=8, num_beams=1)
+
+        assert inputs["encoder_outputs"].last_hidden_state.shape[1] == 300
+        assert predicted_ids.shape[0] == 1
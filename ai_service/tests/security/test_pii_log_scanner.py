@@ -1148,3 +1148,119 @@ class TestSpaCyIntegration:
         # Should fall back to regex
         assert scanner.use_spacy is False
         assert hasattr(scanner, 'regex_patterns')
+
+
+class TestScanLogFileFrom:
+    """Test offset-based incremental scanning"""
+
+    def test_resumes_from_offset(self, temp_log_file):
+        scanner = PIILogScanner(use_presidio=False, use_spacy=False)
+        full_lines, full_pii = scanner.scan_log_file(temp_log_file)
+
+        first_line_bytes = len(temp_log_file.read_bytes().split(b"\n")[0]) + 1
+        scanner.detections.clear()
+        lines, with_pii, offset = scanner.scan_log_file_from(temp_log_file, first_line_bytes, start_line=1)
+
+        assert lines == full_lines - 1
+        assert offset == temp_log_file.stat().st_size
+        assert min(d.line_number for d in scanner.detections) >= 2
+
+    def test_small_chunks_match_whole_file(self, temp_log_file):
+        scanner = PIILogScanner(use_presidio=False, use_spacy=False)
+        expected = scanner.scan_log_file(temp_log_file)
+
+        lines, with_pii, _ = scanner.scan_log_file_from(temp_log_file, chunk_size=7)
+
+        assert (lines, with_pii) == expected
+
+
+class TestBatchedAnalysis:
+    """Test batched line analysis and the NER pre-filter"""
+
+    def test_batched_matches_per_line(self, temp_log_file):
+        scanner = PIILogScanner(use_presidio=False, use_spacy=False)
+        lines = temp_log_file.read_text().splitlines(keepends=True)
+
+        assert scanner.analyze_lines(lines) == [scanner.analyze_line(line) for line in lines]
+
+    def test_small_batches_match_whole_file(self, temp_log_file):
+        expected_scanner = PIILogScanner(use_presidio=False, use_spacy=False, batch_size=1000)
+        expected = expected_scanner.scan_log_file(temp_log_file)
+
+        scanner = PIILogScanner(use_presidio=False, use_spacy=False, batch_size=3)
+
+        assert scanner.scan_log_file(temp_log_file) == expected
+        assert [(d.line_number, d.entity_text) for d in scanner.detections] == \
+            [(d.line_number, d.entity_text) for d in expected_scanner.detections]
+
+    def test_prefilter_skips_lines_without_content(self):
+        scanner = PIILogScanner(use_presidio=False, use_spacy=False)
+
+        assert scanner._content_for_ner("2026-01-30 10:00:05 - INFO - Processing completed") == ""
+        assert scanner._content_for_ner("celery task received {'transcript': 'Wanjiru called from Kibera'}") == ""
+        assert scanner._content_for_ner(
+            "{'task': 'transcription', 'prediction': '\"Wanjiru called today\"'}"
+        ) == "Wanjiru called today"
+
+    def test_presidio_batch_only_analyzes_candidates(self, temp_log_file):
+        scanner = PIILogScanner(use_presidio=False, use_spacy=False)
+        mock_result = MagicMock(entity_type="PERSON", start=0, end=7, score=0.85)
+        scanner.analyzer = MagicMock()
+        scanner.analyzer.analyze.return_value = [mock_result]
+        scanner.use_presidio = True
+        lines = temp_log_file.read_text().splitlines(keepends=True)
+
+        results = scanner.analyze_lines(lines)
+
+        # 7 of the 10 lines carry a prediction field
+        assert scanner.analyzer.analyze.call_count == 7
+        assert results[5] == []
+        assert results[0][0]['text'] == "Process"
+        assert results == [scanner._analyze_line_presidio(line) for line in lines]
+
+
+class TestParallelScanning:
+    """Test sharded scanning across a process pool"""
+
+    def make_log(self, tmp_path, name="big.log", repeat=40):
+        lines = []
+        for i in range(repeat):
+            lines.append(f"2026-01-30 10:00:{i % 60:02d} - INFO - request {i} handled\n")
+            lines.append(f"{{'prediction': '\"Caller Wanjiru Kamau phone 0712{i:06d}\"'}}\n")
+        path = tmp_path / name
+        path.write_text("".join(lines) + "trailing line from Mombasa")
+        return path
+
+    def test_plan_shards_align_to_lines(self, tmp_path):
+        from app.security.pii_log_scanner import _plan_shards
+
+        log_file = self.make_log(tmp_path)
+        data = log_file.read_bytes()
+        shards = _plan_shards(log_file, 500)
+
+        assert shards[0][0] == 0 and shards[-1][1] == len(data)
+        assert all(prev[1] == nxt[0] for prev, nxt in zip(shards, shards[1:]))
+        assert all(data[end - 1:end] == b"\n" for _, end in shards[:-1])
+
+    def test_sharded_scan_matches_sequential(self, tmp_path):
+        log_file = self.make_log(tmp_path)
+        sequential = PIILogScanner(use_presidio=False, use_spacy=False)
+        expected = sequential.scan_log_file(log_file)
+
+        scanner = PIILogScanner(use_presidio=False, use_spacy=False, n_workers=2, shard_bytes=500)
+        result = scanner.scan_log_file(log_file)
+
+        assert result == expected
+        key = lambda d: (d.line_number, d.entity_type, d.entity_text, d.context)
+        assert [key(d) for d in scanner.detections] == [key(d) for d in sequential.detections]
+
+    def test_parallel_directory_scan(self, tmp_path):
+        for i in range(3):
+            self.make_log(tmp_path, f"app{i}.log", repeat=10 + i)
+        sequential = PIILogScanner(use_presidio=False, use_spacy=False).scan_directory(tmp_path)
+
+        result = PIILogScanner(use_presidio=False, use_spacy=False, n_workers=3).scan_directory(tmp_path)
+
+        assert (result.total_lines, result.lines_with_pii, result.total_detections) == \
+            (sequential.total_lines, sequential.lines_with_pii, sequential.total_detections)
+        assert result.detections_by_type == sequential.detections_by_type
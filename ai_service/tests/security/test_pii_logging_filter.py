@@ -604,3 +604,126 @@ class TestPIISanitizingFilterDictArgsNonString:
         assert "[REDACTED-NAME]" in record.args
         assert 42 in record.args
         assert 3.14 in record.args
+
+
+class TestCombinedPattern:
+    """Test the single-pass combined redaction pattern"""
+
+    def test_lexicon_regex_matches_same_words(self):
+        """Test the trie regex accepts exactly the lexicon words"""
+        import re
+        from app.security.pii_logging_filter import _lexicon_regex, KENYAN_LOCATIONS
+
+        pattern = re.compile(r'\b(' + _lexicon_regex(KENYAN_LOCATIONS) + r')\b', re.IGNORECASE)
+
+        for location in KENYAN_LOCATIONS:
+            assert pattern.fullmatch(location)
+        assert pattern.fullmatch("Kamukunji")
+        assert not pattern.search("Kamuk and Nairobian")
+
+    def test_single_pass_redacts_all_categories(self):
+        """Test one pass redacts every category in order"""
+        filter_instance = PIISanitizingFilter()
+
+        result = filter_instance._sanitize_text(
+            "Wanjiru (12 years old) from Homa Bay, +254 712 345 678, wanjiru@gmail.com"
+        )
+
+        assert result == ("[REDACTED-NAME] ([REDACTED-AGE]) from [REDACTED-LOCATION], "
+                          "[REDACTED-PHONE], [REDACTED-EMAIL]")
+
+    def test_redaction_next_to_phone(self):
+        """Test a name glued to a phone number is still redacted"""
+        filter_instance = PIISanitizingFilter()
+
+        assert filter_instance._sanitize_text("+254712345678Wanjiru") == "[REDACTED-PHONE][REDACTED-NAME]"
+
+    def test_redaction_counted_once_per_message(self):
+        """Test stats count messages with redactions, not matches"""
+        filter_instance = PIISanitizingFilter()
+
+        filter_instance._sanitize_text("Wanjiru Kamau, 0722123456")
+
+        assert filter_instance.redaction_count == 1
+
+
+class TestFormattedMessageSanitization:
+    """Test the formatted message is sanitized once"""
+
+    def make_record(self, msg, args):
+        return logging.LogRecord("test", logging.INFO, __file__, 1, msg, args, None)
+
+    def test_args_folded_into_sanitized_message(self):
+        """Test %-args are formatted, sanitized and cleared"""
+        filter_instance = PIISanitizingFilter()
+        record = self.make_record("Caller: %s, Phone: %s, Count: %d", ("Wanjiru", "+254712345678", 3))
+
+        filter_instance.filter(record)
+
+        assert record.args is None
+        assert record.getMessage() == "Caller: [REDACTED-NAME], Phone: [REDACTED-PHONE], Count: 3"
+        assert filter_instance.messages_with_pii == 1
+
+    def test_pii_split_across_msg_and_args(self):
+        """Test PII only visible after formatting is redacted"""
+        filter_instance = PIISanitizingFilter()
+        record = self.make_record("Call +254%s", ("712345678",))
+
+        filter_instance.filter(record)
+
+        assert record.getMessage() == "Call [REDACTED-PHONE]"
+
+    def test_dict_args(self):
+        """Test mapping args are formatted before sanitizing"""
+        filter_instance = PIISanitizingFilter()
+        record = self.make_record("User %(name)s in %(place)s", ({"name": "Otieno", "place": "Kisumu"},))
+
+        filter_instance.filter(record)
+
+        assert record.getMessage() == "User [REDACTED-NAME] in [REDACTED-LOCATION]"
+
+    def test_bad_format_args_do_not_raise(self):
+        """Test a formatting error falls back to sanitizing msg and args apart"""
+        filter_instance = PIISanitizingFilter()
+        record = self.make_record("Caller %s %s", ("Wanjiru",))
+
+        assert filter_instance.filter(record) is True
+        assert record.args == ("[REDACTED-NAME]",)
+
+
+class TestBoundedCache:
+    """Test the per-filter bounded cache"""
+
+    def test_cache_is_per_instance(self):
+        """Test filters do not share cache entries"""
+        first = PIISanitizingFilter()
+        second = PIISanitizingFilter()
+
+        first._sanitize_text("Call from Wanjiru")
+
+        assert first.get_stats()['cache_size'] == 1
+        assert second.get_stats()['cache_size'] == 0
+
+    def test_cache_evicts_least_recently_used(self):
+        """Test the cache stays within its bound"""
+        filter_instance = PIISanitizingFilter(cache_size=2)
+
+        filter_instance._sanitize_text("message one")
+        filter_instance._sanitize_text("message two")
+        filter_instance._sanitize_text("message one")
+        filter_instance._sanitize_text("message three")
+
+        stats = filter_instance.get_stats()
+        assert stats['cache_size'] == 2
+        assert stats['cache_maxsize'] == 2
+        filter_instance._sanitize_text("message one")
+        assert filter_instance.get_stats()['cache_hits'] == 2
+
+    def test_long_messages_not_cached(self):
+        """Test messages over cache_max_length bypass the cache"""
+        filter_instance = PIISanitizingFilter(cache_max_length=10)
+
+        result = filter_instance._sanitize_text("Caller Wanjiru phoned about a case")
+
+        assert result == "Caller [REDACTED-NAME] phoned about a case"
+        assert filter_instance.get_stats()['cache_size'] == 0
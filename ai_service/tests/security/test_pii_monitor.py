@@ -7,11 +7,13 @@ import pytest
 import json
 import tempfile
 import os
+import sys
 import time
 from pathlib import Path
 from datetime import datetime, timedelta
 from unittest.mock import MagicMock, patch, PropertyMock
 
+from app.security.pii_log_scanner import PIILogScanner
 from app.security.pii_monitor import PIIMonitorService
 
 
@@ -1098,3 +1100,162 @@ class TestSlackWebhookCall:
         call_args = mock_post.call_args
         assert call_args[0][0] == "https://hooks.slack.com/services/test"
         assert "text" in call_args[1]["json"]
+
+
+class TestIncrementalScanning:
+    """Test checkpointed scanning of appended lines"""
+
+    PII_LINE = "2026-01-30 10:00:05 - INFO - {'task': 'transcription', 'prediction': '\"Call from Wanjiru on +254712345678\"'}\n"
+    CLEAN_LINE = "2026-01-30 10:00:06 - INFO - Processing completed\n"
+
+    def _monitor(self, watch_dir, **kwargs):
+        return PIIMonitorService(watch_dir=watch_dir, use_presidio=False, **kwargs)
+
+    def test_only_appended_lines_scanned(self, temp_log_dir):
+        log_file = temp_log_dir / "app.log"
+        monitor = self._monitor(temp_log_dir)
+
+        monitor._scan_file(log_file)
+        assert monitor.total_lines_scanned == 3
+
+        with open(log_file, "a") as f:
+            f.write(self.CLEAN_LINE * 2)
+        result = monitor._scan_file(log_file)
+
+        assert result is None
+        assert monitor.total_lines_scanned == 5
+        assert monitor.checkpoints[str(log_file)].line_number == 5
+
+    def test_scanner_reused_across_scans(self, temp_log_dir):
+        monitor = self._monitor(temp_log_dir)
+
+        with patch('app.security.pii_monitor.PIILogScanner', wraps=PIILogScanner) as factory:
+            monitor._scan_file(temp_log_dir / "app.log")
+            monitor._scan_file(temp_log_dir / "system.log")
+
+        assert factory.call_count == 1
+
+    def test_detections_reported_per_scan(self, temp_log_dir):
+        log_file = temp_log_dir / "app.log"
+        monitor = self._monitor(temp_log_dir)
+        monitor._scan_file(log_file)
+
+        with open(log_file, "a") as f:
+            f.write(self.PII_LINE)
+        result = monitor._scan_file(log_file)
+
+        assert result.total_lines == 1
+        assert result.lines_with_pii == 1
+        assert len(monitor.scanner.detections) == result.total_detections
+        assert all(d.line_number == 4 for d in monitor.scanner.detections)
+
+    def test_partial_line_waits_for_newline(self, temp_log_dir):
+        log_file = temp_log_dir / "app.log"
+        monitor = self._monitor(temp_log_dir)
+        monitor._scan_file(log_file)
+
+        with open(log_file, "a") as f:
+            f.write("2026-01-30 10:00:07 - INFO - half written")
+        monitor._scan_file(log_file)
+        assert monitor.total_lines_scanned == 3
+
+        with open(log_file, "a") as f:
+            f.write(" line\n")
+        monitor._scan_file(log_file)
+        assert monitor.total_lines_scanned == 4
+
+    def test_truncation_restarts_from_beginning(self, temp_log_dir):
+        log_file = temp_log_dir / "app.log"
+        monitor = self._monitor(temp_log_dir)
+        monitor._scan_file(log_file)
+
+        log_file.write_text(self.PII_LINE)
+
+        assert monitor._should_scan_file(log_file) is True
+        result = monitor._scan_file(log_file)
+        assert result.total_lines == 1
+        assert monitor.checkpoints[str(log_file)].offset == len(self.PII_LINE.encode())
+
+    def test_rotation_finishes_old_file_then_scans_new(self, temp_log_dir):
+        log_file = temp_log_dir / "app.log"
+        monitor = self._monitor(temp_log_dir)
+        monitor._scan_file(log_file)
+
+        # Lines written just before logrotate renames the file
+        with open(log_file, "a") as f:
+            f.write(self.PII_LINE)
+        log_file.rename(temp_log_dir / "app.log.1")
+        log_file.write_text(self.CLEAN_LINE * 2)
+
+        assert monitor._should_scan_file(log_file) is True
+        result = monitor._scan_file(log_file)
+
+        assert result.total_lines == 3
+        assert result.lines_with_pii == 1
+        assert monitor.checkpoints[str(log_file)].line_number == 2
+
+    def test_checkpoints_persist_across_restarts(self, temp_log_dir):
+        log_file = temp_log_dir / "app.log"
+        checkpoint_file = temp_log_dir / "checkpoints.json"
+
+        self._monitor(temp_log_dir, checkpoint_file=checkpoint_file)._scan_file(log_file)
+        assert checkpoint_file.exists()
+
+        with open(log_file, "a") as f:
+            f.write(self.CLEAN_LINE)
+        restarted = self._monitor(temp_log_dir, checkpoint_file=checkpoint_file)
+        restarted._scan_file(log_file)
+
+        assert restarted.total_lines_scanned == 1
+
+    def test_corrupt_checkpoint_file_ignored(self, temp_log_dir):
+        checkpoint_file = temp_log_dir / "checkpoints.json"
+        checkpoint_file.write_text("{not json")
+
+        monitor = self._monitor(temp_log_dir, checkpoint_file=checkpoint_file)
+
+        assert monitor.checkpoints == {}
+
+    def test_stats_report_lines_per_second(self, temp_log_dir):
+        monitor = self._monitor(temp_log_dir)
+        monitor._scan_file(temp_log_dir / "app.log")
+
+        stats = monitor.get_stats()
+
+        assert stats["total_lines_scanned"] == 3
+        assert stats["lines_per_second"] > 0
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+class TestInotifyWakeups:
+    """Test inotify-driven wakeups"""
+
+    def test_watcher_wakes_on_append(self, temp_log_dir):
+        from app.security.pii_monitor import _InotifyWatcher
+
+        watcher = _InotifyWatcher(temp_log_dir, debounce=0.05)
+        try:
+            assert watcher.wait(0.05) is False
+            with open(temp_log_dir / "app.log", "a") as f:
+                f.write("new line\n")
+            assert watcher.wait(1.0) is True
+        finally:
+            watcher.close()
+
+    def test_run_uses_watcher_instead_of_sleep(self, temp_log_dir):
+        monitor = PIIMonitorService(
+            watch_dir=temp_log_dir, check_interval=60, use_presidio=False, use_inotify=True
+        )
+
+        def stop(timeout):
+            assert timeout == 60
+            monitor.running = False
+            return True
+
+        with patch('app.security.pii_monitor._InotifyWatcher') as watcher_cls:
+            watcher_cls.return_value.wait.side_effect = stop
+            with patch('time.sleep') as mock_sleep:
+                monitor.run()
+
+        mock_sleep.assert_not_called()
+        watcher_cls.return_value.close.assert_called_once()
@@ -150,6 +150,20 @@ async def test_send_streaming_transcription(notification_service):
         assert payload["payload"]["segment_text"] == "segment text"
         assert payload["payload"]["cumulative_transcript"] == "cumulative text"
         assert payload["ui_metadata"]["display_panel"] == "transcript"
+        assert payload["payload"]["is_final"] is True
+
+@pytest.mark.asyncio
+async def test_send_streaming_interim_transcription(notification_service):
+    """Test send_streaming_interim_transcription method."""
+    with patch.object(notification_service, '_send_notification', new=AsyncMock()) as mock_send:
+        await notification_service.send_streaming_interim_transcription(
+            "call_id_st", "partial text", 3, audio_seconds=2.0
+        )
+        payload = mock_send.call_args[0][0]
+        assert payload["notification_type"] == NotificationType.STREAMING_TRANSCRIPTION_INTERIM.value
+        assert payload["payload"]["segment_text"] == "partial text"
+        assert payload["payload"]["window_id"] == 3
+        assert payload["payload"]["is_final"] is False
 
 @pytest.mark.asyncio
 async def test_send_postcall_complete(notification_service):
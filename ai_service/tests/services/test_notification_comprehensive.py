@@ -1264,7 +1264,7 @@ class TestPostcallNotifications:
 
     @pytest.mark.asyncio
     @patch('app.services.enhanced_notification_service.settings')
-    @patch('app.services.enhanced_notification_service.SessionLocal')
+    @patch('app.db.feedback_writer.SessionLocal')
     async def test_send_postcall_complete(self, mock_session, mock_settings):
         """Test sending postcall complete"""
         mock_settings.notification_endpoint_url = "http://localhost"
@@ -1418,7 +1418,7 @@ class TestCreateFeedbackEntries:
 
     @pytest.mark.asyncio
     @patch('app.services.enhanced_notification_service.settings')
-    @patch('app.services.enhanced_notification_service.SessionLocal')
+    @patch('app.db.feedback_writer.SessionLocal')
     @patch('app.services.enhanced_notification_service.FeedbackRepository')
     async def test_create_feedback_entries_success(self, mock_feedback_repo, mock_session, mock_settings):
         """Test creating feedback entries"""
@@ -1449,7 +1449,7 @@ class TestCreateFeedbackEntries:
 
     @pytest.mark.asyncio
     @patch('app.services.enhanced_notification_service.settings')
-    @patch('app.services.enhanced_notification_service.SessionLocal')
+    @patch('app.db.feedback_writer.SessionLocal')
     async def test_create_feedback_entries_error(self, mock_session, mock_settings):
         """Test creating feedback entries with error"""
         mock_settings.notification_endpoint_url = "http://localhost"
@@ -1614,7 +1614,7 @@ class TestErrorPaths:
 
     @pytest.mark.asyncio
     @patch('app.services.enhanced_notification_service.settings')
-    @patch('app.services.enhanced_notification_service.SessionLocal')
+    @patch('app.db.feedback_writer.SessionLocal')
     @patch('app.services.enhanced_notification_service.FeedbackRepository')
     async def test_create_feedback_entries_none_result(self, mock_feedback_repo, mock_session, mock_settings):
         """Test creating feedback when repository returns None"""
@@ -0,0 +1,220 @@
+"""
+Tests for the outbound notification delivery queue and payload log writer
+"""
+import asyncio
+import json
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.notification_delivery import (
+    NotificationDeliveryQueue,
+    PayloadLogWriter,
+    COALESCIBLE_TYPES,
+)
+
+
+def make_payload(call_id, notification_type, message_id, **payload):
+    return {
+        "message_id": message_id,
+        "timestamp": "2025-01-01T00:00:00+00:00",
+        "notification_type": notification_type,
+        "call_metadata": {"call_id": call_id},
+        "payload": payload,
+    }
+
+
+class RecordingService:
+    """Stand-in for EnhancedNotificationService that records delivered payloads"""
+
+    def __init__(self, delay=0.0, result=True):
+        self.delivered = []
+        self.delay = delay
+        self.result = result
+        self.release = None
+
+    async def _deliver_notification(self, data, client=None):
+        if self.release is not None:
+            await self.release.wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.delivered.append(data)
+        return self.result
+
+
+class TestNotificationDeliveryQueue:
+    """Test NotificationDeliveryQueue"""
+
+    @pytest.mark.asyncio
+    async def test_enqueue_returns_before_delivery(self):
+        service = RecordingService()
+        service.release = asyncio.Event()
+        delivery = NotificationDeliveryQueue(service, num_senders=2)
+        await delivery.start()
+        try:
+            queued = await delivery.enqueue(make_payload("call-1", "postcall_summary", "m1"))
+
+            assert queued is True
+            assert service.delivered == []
+            assert delivery.is_active() is True
+
+            service.release.set()
+            await delivery.stop(timeout=2)
+        finally:
+            service.release.set()
+            await delivery.stop(timeout=1)
+
+        assert [d["message_id"] for d in service.delivered] == ["m1"]
+        assert delivery.stats["delivered"] == 1
+
+    @pytest.mark.asyncio
+    async def test_per_call_ordering(self):
+        service = RecordingService(delay=0.001)
+        delivery = NotificationDeliveryQueue(service, num_senders=3)
+        await delivery.start()
+
+        for i in range(10):
+            for call_id in ("call-a", "call-b", "call-c"):
+                await delivery.enqueue(make_payload(call_id, "postcall_transcription", f"{call_id}-{i}"))
+        await delivery.stop(timeout=5)
+
+        for call_id in ("call-a", "call-b", "call-c"):
+            delivered = [d["message_id"] for d in service.delivered if d["call_metadata"]["call_id"] == call_id]
+            assert delivered == [f"{call_id}-{i}" for i in range(10)]
+
+    @pytest.mark.asyncio
+    async def test_superseded_progress_updates_are_coalesced(self):
+        service = RecordingService()
+        service.release = asyncio.Event()
+        delivery = NotificationDeliveryQueue(service, num_senders=1)
+        await delivery.start()
+
+        # First item is picked up by the sender and blocks on release
+        await delivery.enqueue(make_payload("call-1", "postcall_transcription", "t1"))
+        await asyncio.sleep(0)
+        for percent in (10, 50, 90):
+            await delivery.enqueue(
+                make_payload("call-1", "system_processing_progress", f"p{percent}", progress_percent=percent)
+            )
+        await delivery.enqueue(make_payload("call-1", "postcall_summary", "s1"))
+
+        service.release.set()
+        await delivery.stop(timeout=2)
+
+        assert [d["message_id"] for d in service.delivered] == ["t1", "p90", "s1"]
+        assert delivery.stats["coalesced"] == 2
+
+    @pytest.mark.asyncio
+    async def test_in_flight_update_is_not_coalesced(self):
+        service = RecordingService()
+        service.release = asyncio.Event()
+        delivery = NotificationDeliveryQueue(service, num_senders=1)
+        await delivery.start()
+
+        # p10 is picked up by the sender and blocks on release; it cannot be dropped any more
+        await delivery.enqueue(make_payload("call-1", "system_processing_progress", "p10", progress_percent=10))
+        await asyncio.sleep(0)
+        for percent in (50, 90):
+            await delivery.enqueue(
+                make_payload("call-1", "system_processing_progress", f"p{percent}", progress_percent=percent)
+            )
+
+        service.release.set()
+        await delivery.stop(timeout=2)
+
+        assert [d["message_id"] for d in service.delivered] == ["p10", "p90"]
+        assert delivery.stats["coalesced"] == 1
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_coalescible_updates_only(self):
+        service = RecordingService()
+        service.release = asyncio.Event()
+        delivery = NotificationDeliveryQueue(service, num_senders=1, max_queue_size=1)
+        await delivery.start()
+
+        await delivery.enqueue(make_payload("call-1", "postcall_transcription", "t1"))
+        await asyncio.sleep(0)
+        await delivery.enqueue(make_payload("call-1", "postcall_translation", "t2"))
+
+        dropped = await delivery.enqueue(make_payload("call-2", "streaming_entities", "e1"))
+
+        assert dropped is False
+        assert delivery.stats["dropped_queue_full"] == 1
+
+        service.release.set()
+        await delivery.stop(timeout=2)
+        assert [d["message_id"] for d in service.delivered] == ["t1", "t2"]
+
+    @pytest.mark.asyncio
+    async def test_failed_delivery_is_counted(self):
+        service = RecordingService(result=False)
+        delivery = NotificationDeliveryQueue(service, num_senders=1)
+        await delivery.start()
+
+        await delivery.enqueue(make_payload("call-1", "postcall_summary", "s1"))
+        await delivery.stop(timeout=2)
+
+        assert delivery.stats["failed"] == 1
+        assert delivery.stats["delivered"] == 0
+
+    @pytest.mark.asyncio
+    async def test_inactive_on_other_loop(self):
+        delivery = NotificationDeliveryQueue(RecordingService(), num_senders=1)
+        assert delivery.is_active() is False
+
+    @pytest.mark.asyncio
+    async def test_journal_replay(self):
+        service = RecordingService()
+        delivery = NotificationDeliveryQueue(service, num_senders=1, redis_backed=True)
+
+        journal = {
+            "m2": json.dumps(make_payload("call-1", "postcall_summary", "m2") | {"timestamp": "2025-01-01T00:00:02"}),
+            "m1": json.dumps(make_payload("call-1", "postcall_transcription", "m1") | {"timestamp": "2025-01-01T00:00:01"}),
+        }
+        fake_redis = MagicMock()
+        fake_redis.hgetall = AsyncMock(return_value=journal)
+        fake_redis.hset = AsyncMock()
+        fake_redis.hdel = AsyncMock()
+        fake_redis.aclose = AsyncMock()
+
+        async def connect():
+            delivery._redis = fake_redis
+
+        delivery._connect_journal = connect
+        await delivery.start()
+        await delivery.stop(timeout=2)
+
+        assert [d["message_id"] for d in service.delivered] == ["m1", "m2"]
+        assert delivery.stats["replayed"] == 2
+        assert fake_redis.hdel.await_count == 2
+
+    def test_coalescible_types_exclude_final_results(self):
+        assert "system_processing_progress" in COALESCIBLE_TYPES
+        assert "postcall_complete" not in COALESCIBLE_TYPES
+        assert "streaming_transcription" not in COALESCIBLE_TYPES
+
+
+class TestPayloadLogWriter:
+    """Test PayloadLogWriter"""
+
+    def test_writes_batched_jsonl(self, tmp_path):
+        path = tmp_path / "payloads.jsonl"
+        writer = PayloadLogWriter(str(path), batch_size=10, flush_interval=0.05)
+
+        for i in range(25):
+            writer.write({"notification_type": "test", "index": i})
+        assert writer.flush(timeout=5) is True
+        writer.close()
+
+        lines = path.read_text().strip().splitlines()
+        assert [json.loads(line)["index"] for line in lines] == list(range(25))
+        assert writer.entries_written == 25
+
+    def test_drops_when_saturated(self, tmp_path):
+        writer = PayloadLogWriter(str(tmp_path / "payloads.jsonl"), max_pending=1)
+        writer._ensure_thread = lambda: None  # Keep the writer idle so the queue fills
+
+        writer.write({"notification_type": "test"})
+        writer.write({"notification_type": "test"})
+
+        assert writer.entries_dropped == 1
@@ -109,7 +109,10 @@ class TestAsteriskAudioBuffer:
             "buffer_size_bytes": 0,
             "buffer_duration_seconds": 0.0,
             "chunks_received": 0,
-            "window_ready": False
+            "window_ready": False,
+            "windows_emitted": 0,
+            "adaptive": False,
+            "last_window": None
         }
         
         for _ in range(250):
@@ -159,4 +162,148 @@ class TestAsteriskAudioBuffer:
         for _ in range(499):
             audio_buffer.add_chunk(create_mock_chunk(320))
         audio_array = audio_buffer.add_chunk(min_negative)
-        assert np.isclose(audio_array[-1], -1.0, atol=1e-5)
\ No newline at end of file
+        assert np.isclose(audio_array[-1], -1.0, atol=1e-5)
+
+class FixedTarget:
+    """Stand-in for the window controller with a constant target"""
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+
+    def update(self) -> float:
+        return self.window_seconds
+
+
+def speech(seconds: float, level: int = 8000) -> bytes:
+    """Constant-level 'speech' as 16-bit little-endian samples"""
+    return np.full(int(seconds * 16000), level, dtype=np.int16).tobytes()
+
+
+def silence(seconds: float) -> bytes:
+    return b'\x00\x00' * int(seconds * 16000)
+
+
+def feed(audio_buffer, audio: bytes, chunk_size: int = 320):
+    """Feed audio in Asterisk-sized chunks, returning the emitted windows"""
+    windows = []
+    for start in range(0, len(audio), chunk_size):
+        window = audio_buffer.add_chunk(audio[start:start + chunk_size])
+        if window is not None:
+            windows.append((window, dict(audio_buffer.last_window)))
+    return windows
+
+
+class TestAdaptiveWindows:
+    """Tests for min/max windows cut at low-energy points"""
+
+    def make_buffer(self, target=None, **kwargs):
+        options = {"min_window_seconds": 2.0, "max_window_seconds": 8.0, "silence_rms": 0.01}
+        options.update(kwargs)
+        return AsteriskAudioBuffer(controller=FixedTarget(target) if target else None, **options)
+
+    def test_cuts_at_pause_after_target(self):
+        audio_buffer = self.make_buffer(target=3.0)
+
+        windows = feed(audio_buffer, speech(3.5) + silence(0.1) + speech(2.0))
+
+        assert len(windows) == 1
+        window, info = windows[0]
+        assert info["cut_reason"] == "pause"
+        # Cut inside the pause, not in the speech either side
+        assert 3.5 < len(window) / 16000 <= 3.6
+        assert info["duration_seconds"] == pytest.approx(len(window) / 16000)
+
+    def test_pause_before_minimum_is_ignored(self):
+        audio_buffer = self.make_buffer(target=3.0)
+
+        windows = feed(audio_buffer, speech(1.0) + silence(0.1) + speech(7.0))
+
+        assert len(windows) == 1
+        assert windows[0][1]["cut_reason"] == "max_length"
+        assert len(windows[0][0]) == 8 * 16000
+
+    def test_continuous_speech_cut_at_quietest_frame_by_max(self):
+        audio_buffer = self.make_buffer(target=3.0)
+        # Quieter stretch (above the silence threshold) between min and max
+        audio = speech(4.0) + speech(0.1, level=1000) + speech(5.0)
+
+        windows = feed(audio_buffer, audio)
+
+        window, info = windows[0]
+        assert info["cut_reason"] == "max_length"
+        assert 4.0 < len(window) / 16000 <= 4.1
+
+    def test_waits_for_target_before_cutting(self):
+        audio_buffer = self.make_buffer(target=5.0)
+
+        windows = feed(audio_buffer, speech(3.0) + silence(0.1) + speech(2.5) + silence(0.1) + speech(1.0))
+
+        assert len(windows) == 1
+        # Both pauses are candidates once the target is reached; the quietest wins
+        assert len(windows[0][0]) / 16000 > 3.0
+
+    def test_overlap_repeats_end_of_previous_window(self):
+        audio_buffer = self.make_buffer(max_window_seconds=2.0, min_window_seconds=2.0, overlap_seconds=0.2)
+        audio = np.arange(6 * 16000, dtype=np.int64).astype(np.int16).tobytes()
+
+        windows = feed(audio_buffer, audio)
+
+        (first, first_info), (second, second_info) = windows[:2]
+        assert first_info["overlap_seconds"] == 0.0
+        assert second_info["overlap_seconds"] == pytest.approx(0.2)
+        assert second_info["new_audio_seconds"] == pytest.approx(len(second) / 16000 - 0.2)
+        np.testing.assert_array_equal(second[:3200], first[-3200:])
+
+    def test_compaction_keeps_frame_energies_aligned(self):
+        audio_buffer = self.make_buffer(target=2.0, max_window_seconds=3.0)
+        utterance = speech(2.5) + silence(0.1)
+
+        windows = feed(audio_buffer, utterance * 20)
+
+        assert all(info["cut_reason"] == "pause" for _, info in windows)
+        assert len(windows) == 20
+        audio_buffer._measure_frames()
+        frames = np.frombuffer(audio_buffer.buffer, np.int16).reshape(-1, 320).astype(np.float32) / 32768.0
+        np.testing.assert_allclose(audio_buffer._frame_rms, np.sqrt(np.mean(frames * frames, axis=1)))
+
+    def test_stream_position_survives_compaction(self):
+        audio_buffer = self.make_buffer(target=2.0, max_window_seconds=3.0, overlap_seconds=0.2)
+        utterance = speech(2.5) + silence(0.1)
+
+        windows = feed(audio_buffer, utterance * 20)
+
+        assert audio_buffer.compacted_bytes > 0
+        ends = [info["stream_end_seconds"] for _, info in windows]
+        # Each window ends inside the pause that follows its utterance
+        for i, end in enumerate(ends):
+            assert (i + 1) * 2.6 - 0.1 < end <= (i + 1) * 2.6
+
+    def test_stats_report_adaptive_mode(self):
+        audio_buffer = self.make_buffer(target=3.0)
+        feed(audio_buffer, speech(3.5) + silence(0.1) + speech(0.5))
+
+        stats = audio_buffer.get_stats()
+
+        assert stats["adaptive"] is True
+        assert stats["windows_emitted"] == 1
+        assert stats["last_window"]["cut_reason"] == "pause"
+
+
+class TestPartialWindow:
+    """Tests for the window still being recorded (interim transcripts)"""
+
+    def test_partial_window_tracks_current_window(self):
+        audio_buffer = AsteriskAudioBuffer(min_window_seconds=1.0, max_window_seconds=1.0)
+        feed(audio_buffer, speech(1.5))
+
+        assert audio_buffer.window_count == 1
+        assert audio_buffer.last_window["window_id"] == 0
+        assert audio_buffer.pending_seconds() == pytest.approx(0.5)
+        assert audio_buffer.partial_window() == speech(0.5)
+        assert audio_buffer.window_started_at == audio_buffer.last_window["end_time"]
+
+    def test_partial_window_drops_odd_byte(self):
+        audio_buffer = AsteriskAudioBuffer()
+        audio_buffer.add_chunk(b'\x01\x00\x02')
+
+        assert audio_buffer.partial_window() == b'\x01\x00'
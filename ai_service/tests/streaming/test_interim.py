@@ -0,0 +1,138 @@
+"""
+Tests for interim (is_final=false) transcript scheduling
+"""
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+
+from app.streaming.audio_buffer import AsteriskAudioBuffer
+from app.streaming.interim import InterimScheduler
+from app.streaming.tcp_server import AsteriskTCPServer
+
+
+def make_scheduler(queue_depth=0, **kwargs):
+    controller = Mock()
+    controller.queue_depth.return_value = queue_depth
+    options = {"enabled": True, "interval_seconds": 1.0, "max_age_seconds": 2.0}
+    options.update(kwargs)
+    return InterimScheduler(controller=controller, **options)
+
+
+def finished_result(ready=True):
+    result = Mock()
+    result.ready.return_value = ready
+    return result
+
+
+class TestInterimScheduler:
+    """Test the per-call throttle"""
+
+    def test_disabled(self):
+        scheduler = make_scheduler(enabled=False)
+
+        assert scheduler.should_submit("call_1", 0, 5.0, now=0.0) is False
+
+    def test_once_per_interval_of_new_audio(self):
+        scheduler = make_scheduler()
+
+        assert scheduler.should_submit("call_1", 0, 0.5, now=0.0) is False
+        assert scheduler.should_submit("call_1", 0, 1.0, now=0.5) is True
+        scheduler.submitted("call_1", finished_result(), 1.0, now=0.5)
+
+        assert scheduler.should_submit("call_1", 0, 1.5, now=1.0) is False
+        assert scheduler.should_submit("call_1", 0, 2.0, now=1.5) is True
+
+    def test_one_in_flight_per_call(self):
+        scheduler = make_scheduler()
+        scheduler.should_submit("call_1", 0, 1.0, now=0.0)
+        scheduler.submitted("call_1", finished_result(ready=False), 1.0, now=0.0)
+
+        assert scheduler.should_submit("call_1", 0, 2.0, now=1.0) is False
+        assert scheduler.stats["skipped_inflight"] == 1
+        # Past max_age the previous interim has expired
+        assert scheduler.should_submit("call_1", 0, 3.0, now=2.5) is True
+
+    def test_skipped_while_queue_has_work(self):
+        scheduler = make_scheduler(queue_depth=3)
+
+        assert scheduler.should_submit("call_1", 0, 1.0, now=0.0) is False
+        assert scheduler.stats["skipped_busy"] == 1
+
+    def test_unknown_queue_depth_allows_interim(self):
+        scheduler = make_scheduler(queue_depth=None)
+
+        assert scheduler.should_submit("call_1", 0, 1.0, now=0.0) is True
+
+    def test_new_window_resets_progress(self):
+        scheduler = make_scheduler()
+        scheduler.should_submit("call_1", 0, 3.0, now=0.0)
+        scheduler.submitted("call_1", finished_result(ready=False), 3.0, now=0.0)
+
+        # The final of window 0 has been cut; window 1 starts from zero
+        assert scheduler.should_submit("call_1", 1, 1.0, now=0.5) is True
+
+    def test_forget(self):
+        scheduler = make_scheduler()
+        scheduler.should_submit("call_1", 0, 1.0, now=0.0)
+        scheduler.forget("call_1")
+
+        assert scheduler.get_stats()["calls"] == 0
+
+
+class TestInterimSubmission:
+    """Test the TCP server submits interim decodes between windows"""
+
+    @pytest.mark.asyncio
+    async def test_interim_submitted_with_expiry(self):
+        server = AsteriskTCPServer()
+        audio_buffer = AsteriskAudioBuffer()
+        scheduler = make_scheduler()
+        session = Mock()
+        session.processing_plan = {"realtime_processing": {"enabled": True}}
+
+        reader = AsyncMock()
+        reader.read.side_effect = [b"call_1\r"] + [b'\x01\x00' * 160] * 150 + [b'']
+        writer = Mock()
+        writer.get_extra_info.return_value = ('192.168.1.100', 12345)
+        writer.wait_closed = AsyncMock()
+
+        with patch('app.streaming.tcp_server.call_session_manager') as session_manager, \
+                patch('app.streaming.tcp_server.AsteriskAudioBuffer', return_value=audio_buffer), \
+                patch('app.streaming.tcp_server.interim_scheduler', scheduler), \
+                patch('app.streaming.tcp_server.process_streaming_interim_task') as interim_task:
+            session_manager.start_session = AsyncMock(return_value=session)
+            session_manager.end_session = AsyncMock(return_value=session)
+            interim_task.apply_async.return_value = finished_result()
+
+            await server.handle_connection(reader, writer)
+
+        # 1.5s of audio: one interim at 1.0s
+        interim_task.apply_async.assert_called_once()
+        call = interim_task.apply_async.call_args
+        assert call.kwargs["expires"] == 2.0
+        assert call.kwargs["kwargs"]["call_id"] == "call_1"
+        assert call.kwargs["kwargs"]["window_id"] == 0
+        assert len(call.kwargs["kwargs"]["audio_bytes"]) == 32000
+
+    @pytest.mark.asyncio
+    async def test_no_interim_without_realtime_processing(self):
+        server = AsteriskTCPServer()
+        scheduler = make_scheduler()
+        session = Mock()
+        session.processing_plan = {"realtime_processing": {"enabled": False}}
+
+        reader = AsyncMock()
+        reader.read.side_effect = [b"call_1\r"] + [b'\x01\x00' * 160] * 150 + [b'']
+        writer = Mock()
+        writer.get_extra_info.return_value = ('192.168.1.100', 12345)
+        writer.wait_closed = AsyncMock()
+
+        with patch('app.streaming.tcp_server.call_session_manager') as session_manager, \
+                patch('app.streaming.tcp_server.interim_scheduler', scheduler), \
+                patch('app.streaming.tcp_server.process_streaming_interim_task') as interim_task:
+            session_manager.start_session = AsyncMock(return_value=session)
+            session_manager.end_session = AsyncMock(return_value=session)
+
+            await server.handle_connection(reader, writer)
+
+        interim_task.apply_async.assert_not_called()
@@ -58,7 +58,8 @@ def mock_models():
     
     # Configure mock methods
     models_mock.models["translator"].translate.return_value = "Translated text"
-    models_mock.models["ner"].extract_entities.return_value = {"PERSON": ["John"]}
+    # Windows reach NER through the micro-batcher's extract_entities_batch()
+    models_mock.models["ner"].extract_entities_batch.side_effect = lambda texts, flat=True: [{"PERSON": ["John"]} for _ in texts]
     models_mock.models["classifier_model"].classify.return_value = {"main_category": "test", "confidence": 0.9}
     models_mock.models["summarizer"].summarize.return_value = "Test summary"
     
@@ -312,6 +313,9 @@ class TestProgressiveProcessor:
             processing_stats={}
         )
         processor.call_analyses[call_id] = analysis
+        processor._get_translation_memo(call_id).update(
+            sample_processing_window.text_content, lambda sentence: sample_processing_window.translation
+        )
         
         await processor._update_cumulative_analysis(call_id, sample_processing_window)
         
@@ -323,35 +327,6 @@ class TestProgressiveProcessor:
         assert len(analysis.classification_evolution) == 1
         assert 'total_windows' in analysis.processing_stats
 
-    def test_merge_translation_no_existing(self, processor):
-        """Test merging translation with no existing translation"""
-        result = processor._merge_translation("", "New translation", False)
-        assert result == "New translation"
-
-    def test_merge_translation_no_new(self, processor):
-        """Test merging translation with no new translation"""
-        result = processor._merge_translation("Existing translation", "", False)
-        assert result == "Existing translation"
-
-    def test_merge_translation_no_overlap(self, processor):
-        """Test merging translation without overlap"""
-        result = processor._merge_translation("Existing translation", "New translation", False)
-        assert result == "Existing translation New translation"
-
-    def test_merge_translation_with_overlap(self, processor):
-        """Test merging translation with overlap"""
-        existing = "Hello world how are"
-        new_translation = "are you doing today"
-        result = processor._merge_translation(existing, new_translation, True)
-        assert result == "Hello world how are you doing today"
-
-    def test_merge_translation_full_overlap(self, processor):
-        """Test merging translation with complete overlap"""
-        existing = "Hello world"
-        new_translation = "world"
-        result = processor._merge_translation(existing, new_translation, True)
-        assert result == "Hello world"
-
     @pytest.mark.asyncio
     async def test_process_if_ready_should_process(self, processor, mock_models):
         """Test process_if_ready when processing should occur"""
@@ -371,7 +346,7 @@ class TestProgressiveProcessor:
         
         assert result == mock_window
         mock_create.assert_called_once_with(call_id, transcript)
-        mock_process.assert_called_once_with(call_id, mock_window)
+        mock_process.assert_called_once_with(call_id, mock_window, transcript)
 
     @pytest.mark.asyncio
     async def test_process_if_ready_should_not_process(self, processor):
@@ -856,7 +831,7 @@ class TestProgressiveProcessorAdditional:
         mock_models.models["translator"].translate.return_value = "Translated text"
         
         # NER fails - this will cause the entire processing to stop
-        mock_models.models["ner"].extract_entities.side_effect = Exception("NER failed")
+        mock_models.models["ner"].extract_entities_batch.side_effect = Exception("NER failed")
         
         # Classifier works (but won't be reached due to NER failure)
         mock_models.models["classifier_model"].classify.return_value = {"main_category": "test"}
@@ -878,44 +853,85 @@ class TestProgressiveProcessorAdditional:
             # Processing duration should still be recorded
             assert result.processing_duration > 0
 
-# Add this to handle edge cases in translation merging
-class TestTranslationMerging:
-    """Additional tests for translation merging edge cases"""
-    
-    def test_merge_translation_large_overlap(self, processor):
-        """Test merging with large overlap (up to max_overlap limit)"""
-        existing = "This is a long sentence with many words that might overlap significantly"
-        new_translation = "words that might overlap significantly with new content added here"
-        
-        result = processor._merge_translation(existing, new_translation, True)
-        
-        # Should merge correctly without duplicating the overlapping part
-        assert "words that might overlap significantly" in result
-        assert "with new content added here" in result
-        # Should not duplicate the overlapping words
-        overlap_count = result.count("words that might overlap significantly")
-        assert overlap_count == 1
 
-    def test_merge_translation_no_similarity(self, processor):
-        """Test merging with overlap flag but no actual word overlap"""
-        existing = "Completely different content"
-        new_translation = "Totally unrelated text"
-        
-        result = processor._merge_translation(existing, new_translation, True)
-        
-        # Should concatenate with separator when no overlap found
-        assert result == "Completely different content Totally unrelated text"
+class TestProgressiveTranslationMemo:
+    """Tests for sentence-level translation across overlapping windows"""
 
-    def test_merge_translation_empty_after_overlap_removal(self, processor):
-        """Test merging when new translation becomes empty after overlap removal"""
-        existing = "Hello world test"
-        new_translation = "test"  # Complete overlap
-        
-        result = processor._merge_translation(existing, new_translation, True)
-        
-        # Should return existing when new becomes empty
-        assert result == "Hello world test"
+    @pytest.fixture
+    def translator_models(self):
+        models = Mock()
+        models.models = {"translator": Mock()}
+        models.models["translator"].translate.side_effect = lambda sentence: f"<{sentence}>"
+        return models
 
+    async def _process(self, processor, models, call_id, transcript):
+        window = processor.create_processing_window(call_id, transcript)
+        with patch.object(processor, '_get_models_async', return_value=models), \
+             patch.object(processor, '_send_agent_notifications'):
+            return await processor.process_window(call_id, window, transcript)
+
+    @pytest.mark.asyncio
+    async def test_overlap_is_not_retranslated(self, processor, translator_models):
+        """Test each sentence goes to the translator once although windows overlap"""
+        call_id = "memo_call"
+        first = "Habari. " * 20 + "Mtoto yuko shuleni. " * 4
+        transcript = first + "Mama yake anafanya kazi mjini. " * 6
+
+        await self._process(processor, translator_models, call_id, first)
+        window = await self._process(processor, translator_models, call_id, transcript)
+
+        translated = [c.args[0] for c in translator_models.models["translator"].translate.call_args_list]
+        assert translated == ["Habari.", "Mtoto yuko shuleni.", "Mama yake anafanya kazi mjini."]
+        assert window.start_position < processor.call_analyses[call_id].windows[0].end_position
+        assert "<Mtoto yuko shuleni.>" in window.translation
+        analysis = processor.call_analyses[call_id]
+        assert analysis.cumulative_translation.count("<Habari.>") == 20
+        assert analysis.cumulative_translation.endswith("<Mama yake anafanya kazi mjini.>")
+
+    @pytest.mark.asyncio
+    async def test_incomplete_sentence_waits(self, processor, translator_models):
+        """Test the open sentence at the end of a window is not translated yet"""
+        call_id = "memo_call"
+        transcript = "Nimepiga simu kuripoti. " * 8 + "Mtoto ana miaka kumi na"
+
+        window = await self._process(processor, translator_models, call_id, transcript)
+
+        assert translator_models.models["translator"].translate.call_count == 1
+        assert "kumi na" not in window.translation
+
+    @pytest.mark.asyncio
+    async def test_finalize_translates_tail_and_releases_memo(self, processor, translator_models):
+        """Test finalizing translates the open sentence and frees the call's memo"""
+        call_id = "memo_call"
+        transcript = "Nimepiga simu kuripoti. " * 8 + "Mtoto ana miaka kumi na mbili"
+        await self._process(processor, translator_models, call_id, transcript[:processor.target_window_chars])
+
+        with patch.object(processor, '_get_models_async', return_value=translator_models), \
+             patch.object(processor, '_store_final_report'):
+            processor.call_transcripts[call_id] = transcript
+            report = await processor.finalize_call_analysis(call_id)
+
+        assert report["final_translation_length"] == len(
+            " ".join(["<Nimepiga simu kuripoti.>"] * 8 + ["<Mtoto ana miaka kumi na mbili>"]))
+        assert call_id not in processor.translation_memos
+        assert call_id not in processor.call_transcripts
+
+    @pytest.mark.asyncio
+    async def test_translation_failure_retries_sentence(self, processor, translator_models):
+        """Test a sentence whose translation failed is sent again with the next window"""
+        call_id = "memo_call"
+        translator = translator_models.models["translator"]
+        transcript = "Nimepiga simu kuripoti. " * 8
+        translator.translate.side_effect = RuntimeError("Translation failed")
+        await self._process(processor, translator_models, call_id, transcript)
+
+        translator.translate.side_effect = lambda sentence: f"<{sentence}>"
+        processor.call_analyses[call_id].windows[-1].timestamp -= processor.processing_interval
+        transcript += "Asante. " * 20
+        window = await self._process(processor, translator_models, call_id, transcript)
+
+        assert window.translation.startswith("<Nimepiga simu kuripoti.>")
+        assert processor.call_analyses[call_id].cumulative_translation.count("<Asante.>") == 20
 
 class TestProgressiveProcessor100Percent:
     """Final tests to achieve 100% coverage - targeting the last 10 missing lines"""
@@ -1,6 +1,7 @@
 # tests/test_streaming_components.py
 import pytest
 import asyncio
+import time
 import sys
 import os
 import numpy as np
@@ -419,6 +420,35 @@ class TestCallSessionManager:
         result = await session_manager.add_transcription("nonexistent", "test text", 1.0)
         assert result is None  # Should return None for non-existent session
 
+    @pytest.mark.asyncio
+    async def test_add_transcription_records_commit_time(self, session_manager):
+        """Test segments carry the wall-clock time they were stored"""
+        call_id = "test_call_001"
+        await session_manager.start_session(call_id, {})
+
+        before = time.time()
+        session = await session_manager.add_transcription(call_id, "Hello world", 5.0, {"window_id": 0})
+
+        segment = session.transcript_segments[-1]
+        assert before <= segment["committed_at"] <= time.time()
+        assert segment["metadata"]["window_id"] == 0
+
+    def test_count_window(self):
+        """Test window counters are incremented on the session hash"""
+        redis_client = MagicMock()
+        session_manager = CallSessionManager(redis_client=redis_client)
+
+        session_manager.count_window("call_001", "windows_submitted")
+
+        redis_client.hincrby.assert_called_once_with("call_session:call_001", "windows_submitted", 1)
+
+    def test_count_window_tolerates_redis_errors(self):
+        """Test a failed counter update does not raise"""
+        redis_client = MagicMock()
+        redis_client.hincrby.side_effect = Exception("Redis down")
+
+        CallSessionManager(redis_client=redis_client).count_window("call_001", "windows_empty")
+
     @pytest.mark.asyncio
     async def test_end_session(self, session_manager):
         """Test ending a session"""
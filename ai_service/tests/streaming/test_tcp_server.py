@@ -135,7 +135,7 @@ class TestAsteriskTCPServer:
         mock_audio_buffer.add_chunk.assert_called_once_with(audio_data)
         
         # Verify transcription was submitted
-        mock_submit.assert_called_once_with(audio_array, call_id)
+        mock_submit.assert_called_once_with(audio_array, call_id, mock_audio_buffer.last_window)
 
     @pytest.mark.asyncio
     async def test_handle_connection_session_start_failure(self, tcp_server, mock_reader, mock_writer):
@@ -172,11 +172,29 @@ class TestAsteriskTCPServer:
             
             await tcp_server.handle_connection(mock_reader, mock_writer)
         
-        # Verify header inspection logging occurred
-        header_log_calls = [call for call in mock_logger.info.call_args_list 
+        # Verify header inspection logging occurred (at debug level)
+        header_log_calls = [call for call in mock_logger.debug.call_args_list 
                            if 'header' in str(call) and 'Packet' in str(call)]
         assert len(header_log_calls) >= 10  # Should log first 10 packets total
 
+    @pytest.mark.asyncio
+    async def test_header_inspection_skipped_above_debug(self, tcp_server, mock_reader, mock_writer):
+        """Test packet dumps are not built when debug logging is off"""
+        mock_reader.read.side_effect = [b'CALL123\r'] + [b'\x00' * 640] * 3 + [b'']
+
+        with patch('app.streaming.tcp_server.call_session_manager') as mock_session_manager, \
+             patch('app.streaming.tcp_server.AsteriskAudioBuffer') as mock_buffer_class, \
+             patch('app.streaming.tcp_server.logger') as mock_logger:
+
+            mock_logger.isEnabledFor.return_value = False
+            mock_session_manager.start_session = AsyncMock(return_value=Mock())
+            mock_session_manager.end_session = AsyncMock(return_value=Mock())
+            mock_buffer_class.return_value.add_chunk.return_value = None
+
+            await tcp_server.handle_connection(mock_reader, mock_writer)
+
+        assert not [call for call in mock_logger.debug.call_args_list if 'header' in str(call)]
+
     @pytest.mark.asyncio
     async def test_submit_transcription_success(self, tcp_server, mock_call_session):
         """Test successful transcription submission"""
@@ -202,13 +220,35 @@ class TestAsteriskTCPServer:
         assert call_kwargs['connection_id'] == call_id
         assert call_kwargs['language'] == "sw"
         assert call_kwargs['sample_rate'] == 16000
-        assert call_kwargs['duration_seconds'] == 5.0
+        assert call_kwargs['duration_seconds'] == len(audio_array) / 16000
         assert call_kwargs['is_streaming'] is True
 
         # Verify audio conversion
         expected_audio_bytes = (audio_array * 32768.0).astype(np.int16).tobytes()
         assert call_kwargs['audio_bytes'] == expected_audio_bytes
 
+    @pytest.mark.asyncio
+    async def test_submit_transcription_passes_stream_position(self, tcp_server):
+        """Test the window's stream position is sent with the task and the window is counted"""
+        call_id = "test_call_123"
+        session = Mock()
+        session.processing_plan = {"realtime_processing": {"enabled": True}}
+        window = {"window_id": 3, "start_time": 100.0, "end_time": 105.0, "duration_seconds": 5.0,
+                  "new_audio_seconds": 5.0, "cut_reason": "pause", "stream_end_seconds": 20.0}
+
+        with patch('app.streaming.tcp_server.process_streaming_audio_task') as mock_task_func, \
+             patch('app.streaming.tcp_server.call_session_manager') as mock_session_manager:
+
+            mock_session_manager.get_session = AsyncMock(return_value=session)
+            mock_task_func.delay.return_value = Mock(id="task_123")
+
+            await tcp_server._submit_transcription(np.zeros(80000, dtype=np.float32), call_id, window)
+
+        call_kwargs = mock_task_func.delay.call_args.kwargs
+        assert call_kwargs['window_id'] == 3
+        assert call_kwargs['stream_end_seconds'] == 20.0
+        mock_session_manager.count_window.assert_called_once_with(call_id, "windows_submitted")
+
     @pytest.mark.asyncio
     async def test_submit_transcription_failure(self, tcp_server, mock_call_session):
         """Test transcription submission failure handling"""
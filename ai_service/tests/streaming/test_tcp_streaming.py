@@ -203,7 +203,7 @@ class TestTCPProtocol:
                 # Verify audio was processed
                 mock_buffer.add_chunk.assert_called_once_with(b'\x00' * 640)
                 # Call_id is 'test_uid' extracted from the UID line
-                mock_submit.assert_called_once_with(mock_audio_array, 'test_uid')
+                mock_submit.assert_called_once_with(mock_audio_array, 'test_uid', mock_buffer.last_window)
 
 
 if __name__ == "__main__":
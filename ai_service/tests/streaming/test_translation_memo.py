@@ -0,0 +1,103 @@
+"""
+Tests for the per-call sentence translation memo
+"""
+from unittest.mock import Mock
+
+from app.streaming.translation_memo import TranslationMemo, normalize_sentence
+
+
+def make_translator():
+    return Mock(side_effect=lambda sentence: f"<{sentence}>")
+
+
+class TestSentences:
+    """Test how the transcript is split into sentences"""
+
+    def test_only_completed_sentences_translated(self):
+        memo = TranslationMemo()
+        translate = make_translator()
+
+        new = memo.update("Habari yako. Mimi ni mwalimu! Naishi", translate)
+
+        assert new == ["<Habari yako.>", "<Mimi ni mwalimu!>"]
+        assert memo.position == len("Habari yako. Mimi ni mwalimu!")
+
+    def test_growing_transcript_translates_new_sentences_only(self):
+        memo = TranslationMemo()
+        translate = make_translator()
+
+        memo.update("Habari yako. Mimi ni", translate)
+        new = memo.update("Habari yako. Mimi ni mwalimu. Naishi Nairobi.", translate)
+
+        assert new == ["<Mimi ni mwalimu.>", "<Naishi Nairobi.>"]
+        assert translate.call_count == 3
+        assert memo.cumulative_translation == "<Habari yako.> <Mimi ni mwalimu.> <Naishi Nairobi.>"
+
+    def test_final_takes_open_sentence(self):
+        memo = TranslationMemo()
+
+        new = memo.update("Habari yako. Asante sana", make_translator(), final=True)
+
+        assert new == ["<Habari yako.>", "<Asante sana>"]
+
+    def test_unpunctuated_text_cut_at_word_boundary(self):
+        memo = TranslationMemo(max_sentence_chars=20)
+        translate = make_translator()
+
+        memo.update("neno " * 10, translate)
+
+        assert all(len(c.args[0]) <= 20 for c in translate.call_args_list)
+        assert translate.call_count == 2
+        assert 0 < len("neno " * 10) - memo.position <= 20
+
+    def test_decimal_point_is_not_a_boundary(self):
+        memo = TranslationMemo()
+
+        new = memo.update("Ana miaka 3.5 tu. Sawa", make_translator())
+
+        assert new == ["<Ana miaka 3.5 tu.>"]
+
+
+class TestMemo:
+    """Test each sentence is translated once"""
+
+    def test_repeated_sentence_reuses_translation(self):
+        memo = TranslationMemo()
+        translate = make_translator()
+
+        memo.update("Sawa. Habari? sawa.  Sawa. ", translate)
+
+        assert [c.args[0] for c in translate.call_args_list] == ["Sawa.", "Habari?"]
+        assert memo.cumulative_translation == "<Sawa.> <Habari?> <Sawa.> <Sawa.>"
+        assert memo.get_stats()["reused"] == 2
+
+    def test_memo_is_bounded(self):
+        memo = TranslationMemo(max_entries=2)
+        translate = make_translator()
+
+        memo.update("Moja. Mbili. Tatu. Moja.", translate)
+
+        assert memo.get_stats()["memo_entries"] == 2
+        assert translate.call_count == 4
+        assert memo.cumulative_translation == "<Moja.> <Mbili.> <Tatu.> <Moja.>"
+
+    def test_failed_translation_is_retried(self):
+        memo = TranslationMemo()
+
+        try:
+            memo.update("Moja. Mbili.", Mock(side_effect=RuntimeError("Translation failed")))
+        except RuntimeError:
+            pass
+
+        assert memo.update("Moja. Mbili.", make_translator()) == ["<Moja.>", "<Mbili.>"]
+
+    def test_translation_for_range(self):
+        memo = TranslationMemo()
+        transcript = "Moja. Mbili. Tatu."
+        memo.update(transcript, make_translator())
+
+        assert memo.translation_for(transcript.index("Mbili")) == "<Mbili.> <Tatu.>"
+        assert memo.translation_for(0, transcript.index("Mbili")) == "<Moja.>"
+
+    def test_normalize_sentence(self):
+        assert normalize_sentence("  Habari   Yako? ") == "habari yako?"
@@ -243,7 +243,7 @@ class TestAsteriskWebSocketManager:
         assert call_kwargs['connection_id'] == connection_id
         assert call_kwargs['language'] == "sw"
         assert call_kwargs['sample_rate'] == 16000
-        assert call_kwargs['duration_seconds'] == 5.0
+        assert call_kwargs['duration_seconds'] == len(audio_array) / 16000
         assert call_kwargs['is_streaming'] is True
         
         # Verify audio conversion
@@ -0,0 +1,121 @@
+"""
+Tests for the queue-depth feedback controller of live transcription windows
+"""
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.core.celery_monitor import CeleryEventMonitor
+from app.streaming.window_controller import WindowController, STREAMING_TASK_NAME
+
+
+def make_monitor(queued=None, runtime=None):
+    """Cluster-state cache with a fresh queue sample (None leaves queues unsampled)"""
+    monitor = SimpleNamespace(
+        queue_lengths={"model_processing": queued} if queued is not None else {},
+        queues_updated_at=time.time() if queued is not None else None,
+        stale_after=60,
+        sample_interval=5,
+        task_runtimes={STREAMING_TASK_NAME: runtime} if runtime is not None else {},
+    )
+    return monitor
+
+
+def make_controller(monitor, **kwargs):
+    options = {
+        "min_window_seconds": 2.0,
+        "max_window_seconds": 8.0,
+        "target_latency_seconds": 6.0,
+        "high_watermark": 4,
+        "update_interval": 0.0,
+    }
+    options.update(kwargs)
+    return WindowController(monitor=monitor, **options)
+
+
+def run(controller, steps):
+    for step in range(steps):
+        controller.update(now=float(step))
+    return controller.window_seconds
+
+
+class TestWindowController:
+    """Test widening under load, narrowing when idle and holding otherwise"""
+
+    def test_starts_at_target_latency_minus_default_service_time(self):
+        controller = make_controller(make_monitor())
+
+        assert controller.window_seconds == pytest.approx(5.0)
+
+    def test_deep_queue_widens_up_to_max(self):
+        controller = make_controller(make_monitor(queued=10))
+
+        assert run(controller, 20) == pytest.approx(8.0)
+        assert controller.stats["widened"] > 0
+
+    def test_idle_narrows_towards_latency_budget(self):
+        monitor = make_monitor(queued=0, runtime=2.5)
+        controller = make_controller(monitor)
+
+        # target 6s - 2.5s processing = 3.5s windows
+        assert run(controller, 50) == pytest.approx(3.5)
+
+    def test_idle_with_slow_worker_stays_at_min(self):
+        controller = make_controller(make_monitor(queued=0, runtime=10.0))
+
+        assert run(controller, 50) == pytest.approx(2.0)
+
+    def test_recovers_after_backlog_clears(self):
+        monitor = make_monitor(queued=10, runtime=1.0)
+        controller = make_controller(monitor)
+        run(controller, 20)
+
+        monitor.queue_lengths = {"model_processing": 0}
+        assert run(controller, 50) == pytest.approx(5.0)
+
+    def test_moderate_queue_holds(self):
+        controller = make_controller(make_monitor(queued=2))
+
+        assert run(controller, 10) == pytest.approx(5.0)
+        assert controller.stats["held"] == 10
+
+    @pytest.mark.parametrize("monitor", [
+        make_monitor(),
+        SimpleNamespace(queue_lengths={"model_processing": 10}, queues_updated_at=time.time() - 600,
+                        stale_after=60, sample_interval=5, task_runtimes={}),
+    ])
+    def test_unknown_or_stale_queue_holds(self, monitor):
+        controller = make_controller(monitor)
+
+        assert run(controller, 10) == pytest.approx(5.0)
+        assert controller.last_queue_depth is None
+
+    def test_rate_limited(self):
+        controller = make_controller(make_monitor(queued=10), update_interval=1.0)
+
+        for step in range(10):
+            controller.update(now=step * 0.1)
+
+        assert controller.stats["updates"] == 1
+
+    def test_publishes_target_gauge(self):
+        controller = make_controller(make_monitor(queued=10))
+
+        with patch('app.streaming.window_controller.update_streaming_window_target') as update_gauge:
+            controller.update(now=0.0)
+
+        update_gauge.assert_called_once_with(controller.window_seconds)
+
+
+class TestTaskRuntimes:
+    """Test the runtime EWMA fed from task-succeeded events"""
+
+    def test_ewma(self):
+        monitor = CeleryEventMonitor()
+
+        monitor.record_task_runtime(STREAMING_TASK_NAME, 2.0)
+        monitor.record_task_runtime(STREAMING_TASK_NAME, 4.0)
+
+        assert monitor.task_runtimes[STREAMING_TASK_NAME] == pytest.approx(2.4)
@@ -291,3 +291,18 @@ def patch_async_fixtures():
 
     yield  # Tests run here
     # Cleanup is not needed for this patch
+
+
+# ===== MODEL RESULT CACHE =====
+
+@pytest.fixture(autouse=True)
+def isolated_model_result_cache():
+    """Keep model task tests from serving each other's cached results"""
+    from app.core.result_cache import model_result_cache
+    
+    use_redis = model_result_cache.use_redis
+    model_result_cache.use_redis = False
+    model_result_cache.clear()
+    yield model_result_cache
+    model_result_cache.clear()
+    model_result_cache.use_redis = use_redis
@@ -11,6 +11,8 @@ from app.tasks.audio_tasks import (
     process_audio_task,
     process_audio_quick_task,
     process_streaming_audio_task,
+    process_streaming_interim_task,
+    _mark_first_word,
 )
 
 
@@ -198,6 +200,144 @@ class TestProcessStreamingAudioTask:
             pass
 
 
+class FakeRedis:
+    """Minimal SET NX / GET store for the first-word keys"""
+
+    def __init__(self):
+        self.values = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    def get(self, key):
+        return self.values.get(key)
+
+
+class TestProcessStreamingInterimTask:
+    """Tests for interim (is_final=false) transcripts and time to first word"""
+
+    @pytest.fixture
+    def whisper(self):
+        whisper = MagicMock()
+        models = MagicMock()
+        models.models = {"whisper": whisper}
+        with patch('app.tasks.audio_tasks.get_worker_models', return_value=models):
+            yield whisper
+
+    @pytest.fixture
+    def fake_redis(self):
+        fake = FakeRedis()
+        with patch('app.tasks.audio_tasks._get_progress_redis', return_value=fake):
+            yield fake
+
+    def test_greedy_decode_sent_as_interim(self, whisper, fake_redis):
+        whisper.transcribe_pcm_audio.return_value = "habari yako"
+        service = MagicMock()
+        service.send_streaming_interim_transcription = AsyncMock(return_value=True)
+
+        with patch('app.services.enhanced_notification_service.notification_service', service), \
+                patch('app.tasks.audio_tasks.record_time_to_first_word') as record_ttfw:
+            result = process_streaming_interim_task(
+                audio_bytes=b'\x01\x00' * 16000, call_id="call_1", window_id=2,
+                window_start_time=1.0
+            )
+
+        assert whisper.transcribe_pcm_audio.call_args.kwargs["num_beams"] == 1
+        service.send_streaming_interim_transcription.assert_awaited_once_with(
+            "call_1", "habari yako", 2, audio_seconds=1.0
+        )
+        assert result["notification_sent"] is True
+        assert record_ttfw.call_args[0][0] == "interim"
+        assert fake_redis.get("streaming_first_word:call_1:2") == "interim"
+
+    def test_empty_decode_sends_nothing(self, whisper, fake_redis):
+        whisper.transcribe_pcm_audio.return_value = ""
+        service = MagicMock()
+        service.send_streaming_interim_transcription = AsyncMock(return_value=True)
+
+        with patch('app.services.enhanced_notification_service.notification_service', service):
+            result = process_streaming_interim_task(audio_bytes=b'\x00' * 640, call_id="call_1", window_id=0)
+
+        assert result["transcript"] == ""
+        service.send_streaming_interim_transcription.assert_not_awaited()
+
+    def test_first_word_recorded_once_per_window(self, fake_redis):
+        with patch('app.tasks.audio_tasks.record_time_to_first_word') as record_ttfw:
+            assert _mark_first_word("call_1", 0, 100.0, "interim") is True
+            assert _mark_first_word("call_1", 0, 100.0, "final") is False
+            assert _mark_first_word("call_1", 1, 100.0, "final") is True
+            assert _mark_first_word("call_1", None, 100.0, "final") is False
+
+        assert [c[0][0] for c in record_ttfw.call_args_list] == ["interim", "final"]
+
+    def test_final_window_records_latency_after_commit(self, whisper, fake_redis):
+        whisper.transcribe_pcm_audio.return_value = "habari yako"
+        session_manager = MagicMock()
+        session_manager.add_transcription = AsyncMock(return_value=MagicMock(cumulative_transcript="habari yako"))
+        window_end_time = datetime.now().timestamp()
+
+        with patch('app.streaming.call_session_manager.call_session_manager', session_manager), \
+                patch('app.tasks.audio_tasks.record_streaming_latency') as record_latency:
+            result = process_streaming_audio_task(
+                audio_bytes=b'\x01\x00' * 80000, filename="call_1.wav", connection_id="call_1",
+                duration_seconds=5.0, window_end_time=window_end_time, window_id=4
+            )
+
+        assert result["session_updated"] is True
+        session_manager.add_transcription.assert_awaited_once()
+        name, latency = record_latency.call_args[0]
+        assert name == "asterisk_window"
+        # Cut-to-commit time plus the window's own audio
+        assert 5.0 <= latency < 5.0 + datetime.now().timestamp() - window_end_time + 0.01
+
+
+class TestProcessStreamingWindowTask:
+    """Tests for final window transcripts committed to the call session"""
+
+    @pytest.fixture
+    def whisper(self):
+        whisper = MagicMock()
+        models = MagicMock()
+        models.models = {"whisper": whisper}
+        with patch('app.tasks.audio_tasks.get_worker_models', return_value=models), \
+                patch('app.tasks.audio_tasks._get_progress_redis', return_value=FakeRedis()):
+            yield whisper
+
+    @pytest.fixture
+    def session_manager(self):
+        manager = MagicMock()
+        manager.add_transcription = AsyncMock(return_value=MagicMock(segment_count=1, total_audio_duration=5.0))
+        with patch('app.streaming.call_session_manager.call_session_manager', manager):
+            yield manager
+
+    def run_window(self):
+        return process_streaming_audio_task(
+            audio_bytes=b'\x01\x00' * 80000, filename="call_1.wav", connection_id="call_1",
+            duration_seconds=5.0, window_id=4, stream_end_seconds=25.0
+        )
+
+    def test_window_committed_with_stream_position(self, whisper, session_manager):
+        whisper.transcribe_pcm_audio.return_value = "habari yako"
+
+        result = self.run_window()
+
+        assert result["session_updated"] is True
+        metadata = session_manager.add_transcription.call_args[0][3]
+        assert metadata["window_id"] == 4
+        assert metadata["stream_end_seconds"] == 25.0
+
+    def test_empty_window_counted(self, whisper, session_manager):
+        whisper.transcribe_pcm_audio.return_value = ""
+
+        self.run_window()
+
+        session_manager.add_transcription.assert_not_awaited()
+        session_manager.count_window.assert_called_once_with("call_1", "windows_empty")
+
+
 class TestAudioTasksWithRealFixtures:
     """Tests using comprehensive fixtures from conftest"""
 
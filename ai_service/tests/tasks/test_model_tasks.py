@@ -68,7 +68,7 @@ class TestNERExtractTask:
         mock_model_loader.is_model_ready.return_value = True
 
         ner_model = MagicMock()
-        ner_model.extract_entities.return_value = {"PERSON": ["John"], "ORG": ["Acme"]}
+        ner_model.extract_entities_batch.return_value = [{"PERSON": ["John"], "ORG": ["Acme"]}]
         ner_model.get_model_info.return_value = {
             "model_type": "spacy",
             "model_name": "en_core_web_lg",
@@ -114,7 +114,7 @@ class TestNERExtractTask:
         mock_model_loader.is_model_ready.return_value = True
 
         ner_model = MagicMock()
-        ner_model.extract_entities.return_value = {"PERSON": ["John"], "ORG": ["Acme"]}
+        ner_model.extract_entities_batch.return_value = [{"PERSON": ["John"], "ORG": ["Acme"]}]
         ner_model.get_model_info.return_value = {"model_type": "spacy"}
         mock_model_loader.models = {"ner": ner_model}
 
@@ -124,7 +124,7 @@ class TestNERExtractTask:
             result = ner_extract_task("Test text", flat=False)
 
         assert result is not None
-        ner_model.extract_entities.assert_called_with("Test text", flat=False)
+        ner_model.extract_entities_batch.assert_called_with(["Test text"], flat=False)
 
 
 class TestClassifierClassifyTask:
@@ -492,7 +492,7 @@ class TestTaskErrorHandling:
         mock_model_loader.is_model_ready.return_value = True
 
         ner_model = MagicMock()
-        ner_model.extract_entities.side_effect = Exception("Model error")
+        ner_model.extract_entities_batch.side_effect = Exception("Model error")
         mock_model_loader.models = {"ner": ner_model}
 
         with patch.object(ner_extract_task, 'update_state'):
@@ -629,32 +629,22 @@ class TestChunkedProcessing:
     """Tests for chunked text processing paths"""
 
     @patch('app.tasks.model_tasks.get_worker_model_loader')
-    @patch('app.tasks.model_tasks.NERChunker')
-    def test_ner_extract_with_chunking(self, mock_chunker_class, mock_get_loader, mock_model_loader):
-        """Test NER extraction with long text requiring chunking"""
+    def test_ner_extract_with_chunking(self, mock_get_loader, mock_model_loader):
+        """Test long text goes to the NER model whole (the model chunks it)"""
         mock_get_loader.return_value = mock_model_loader
         mock_model_loader.is_model_ready.return_value = True
 
         ner_model = MagicMock()
-        ner_model.extract_entities.return_value = [{"text": "John", "label": "PERSON"}]
+        ner_model.extract_entities_batch.return_value = [[{"text": "John", "label": "PERSON"}]]
         ner_model.get_model_info.return_value = {"model_type": "spacy"}
         mock_model_loader.models = {"ner": ner_model}
-
-        # Mock chunker
-        mock_chunker = MagicMock()
-        mock_chunker.count_tokens.return_value = 600  # > 512 threshold
-        mock_chunker.chunk_transcript.return_value = [
-            {"text": "First chunk", "chunk_index": 0},
-            {"text": "Second chunk", "chunk_index": 1}
-        ]
-        mock_chunker.reconstruct_entities.return_value = [{"text": "John", "label": "PERSON"}]
-        mock_chunker_class.return_value = mock_chunker
+        text = "Very long text " * 100
 
         with patch.object(ner_extract_task, 'update_state'):
-            result = ner_extract_task("Very long text " * 100, flat=True)
+            result = ner_extract_task(text, flat=True)
 
-        assert result is not None
-        assert "entities" in result
+        assert result["entities"] == [{"text": "John", "label": "PERSON"}]
+        ner_model.extract_entities_batch.assert_called_once_with([text], flat=True)
 
     @patch('app.tasks.model_tasks.get_worker_model_loader')
     @patch('app.tasks.model_tasks.ClassificationChunker')
@@ -731,32 +721,23 @@ class TestChunkedProcessing:
         assert "translated" in result
 
     @patch('app.tasks.model_tasks.get_worker_model_loader')
-    @patch('app.tasks.model_tasks.SummarizationChunker')
-    def test_summarization_with_chunking(self, mock_chunker_class, mock_get_loader, mock_model_loader):
-        """Test summarization with long text requiring chunking"""
+    def test_summarization_with_chunking(self, mock_get_loader, mock_model_loader):
+        """Test long text goes to the summarizer whole (the model map-reduces it)"""
         mock_get_loader.return_value = mock_model_loader
         mock_model_loader.is_model_ready.return_value = True
 
         summarizer = MagicMock()
-        summarizer.summarize.return_value = "Chunk summary"
+        summarizer.summarize.return_value = "Full summary of all chunks"
+        summarizer.last_run_stats = {"generated_tokens": 120, "tokens_per_second": 40.0}
         summarizer.get_model_info.return_value = {}
         mock_model_loader.models = {"summarizer": summarizer}
-
-        # Mock chunker
-        mock_chunker = MagicMock()
-        mock_chunker.count_tokens.return_value = 600  # > 512 threshold
-        mock_chunker.chunk_transcript.return_value = [
-            {"text": "First chunk"},
-            {"text": "Second chunk"}
-        ]
-        mock_chunker.reconstruct_summary.return_value = "Full summary of all chunks"
-        mock_chunker_class.return_value = mock_chunker
+        text = "Very long text " * 100
 
         with patch.object(summarization_summarize_task, 'update_state'):
-            result = summarization_summarize_task("Very long text " * 100)
+            result = summarization_summarize_task(text)
 
-        assert result is not None
-        assert "summary" in result
+        assert result["summary"] == "Full summary of all chunks"
+        summarizer.summarize.assert_called_once_with(text, max_length=256)
 
 
 class TestModelNotAvailable:
@@ -794,3 +775,64 @@ class TestModelNotAvailable:
         with patch.object(whisper_transcribe_task, 'update_state'):
             with pytest.raises(RuntimeError, match="Whisper model not available"):
                 whisper_transcribe_task(audio_bytes=b'audio', filename="test.wav")
+
+
+class TestModelResultCaching:
+    """Tests for result cache integration in model tasks"""
+
+    @patch('app.tasks.model_tasks.get_worker_model_loader')
+    @patch('app.tasks.model_tasks.TranslationChunker')
+    def test_repeated_translation_served_from_cache(self, mock_chunker_class, mock_get_loader, mock_model_loader):
+        """Test identical text is translated once"""
+        mock_chunker_class.return_value.count_tokens.return_value = 10
+        mock_get_loader.return_value = mock_model_loader
+        mock_model_loader.is_model_ready.return_value = True
+
+        translator = MagicMock()
+        translator.translate.return_value = "Hello world"
+        translator.get_model_info.return_value = {"hf_repo_id": "openchs/sw-en-opus-mt-mul-en-v1"}
+        mock_model_loader.models = {"translator": translator}
+
+        with patch.object(translation_translate_task, 'update_state'):
+            first = translation_translate_task("Habari dunia")
+            second = translation_translate_task("Habari   dunia ")
+
+        assert first["translated"] == second["translated"] == "Hello world"
+        assert (first["cached"], second["cached"]) == (False, True)
+        translator.translate.assert_called_once()
+
+    @patch('app.tasks.model_tasks.get_worker_model_loader')
+    def test_use_cache_false_bypasses_cache(self, mock_get_loader, mock_model_loader):
+        """Test per-request cache bypass"""
+        mock_get_loader.return_value = mock_model_loader
+        mock_model_loader.is_model_ready.return_value = True
+
+        summarizer = MagicMock()
+        summarizer.summarize.return_value = "Summary"
+        summarizer.get_model_info.return_value = {}
+        mock_model_loader.models = {"summarizer": summarizer}
+
+        with patch.object(summarization_summarize_task, 'update_state'):
+            summarization_summarize_task("Test text")
+            result = summarization_summarize_task("Test text", use_cache=False)
+
+        assert result["cached"] is False
+        assert summarizer.summarize.call_count == 2
+
+    @patch('app.tasks.model_tasks.get_worker_model_loader')
+    def test_params_are_part_of_cache_key(self, mock_get_loader, mock_model_loader):
+        """Test NER flat and grouped output are cached separately"""
+        mock_get_loader.return_value = mock_model_loader
+        mock_model_loader.is_model_ready.return_value = True
+
+        ner_model = MagicMock()
+        ner_model.extract_entities_batch.return_value = [[{"text": "John", "label": "PERSON"}]]
+        ner_model.get_model_info.return_value = {}
+        mock_model_loader.models = {"ner": ner_model}
+
+        with patch.object(ner_extract_task, 'update_state'):
+            ner_extract_task("John works here", flat=True)
+            result = ner_extract_task("John works here", flat=False)
+
+        assert result["cached"] is False
+        assert ner_model.extract_entities_batch.call_count == 2
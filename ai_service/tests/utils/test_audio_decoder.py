@@ -0,0 +1,145 @@
+"""
+Tests for app/utils/audio_decoder.py
+In-process decoding of PBX recordings to 16 kHz int16 PCM
+"""
+
+import io
+import wave
+
+import numpy as np
+import pytest
+from unittest.mock import patch, MagicMock
+
+sf = pytest.importorskip("soundfile")
+
+from app.utils.audio_decoder import (
+    AudioDecodeError,
+    decode_audio,
+    decode_audio_native,
+    detect_audio_format,
+    encode_wav,
+    resample_pcm16,
+)
+
+
+def make_tone(sample_rate, seconds=1.0, frequency=440.0):
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    return (0.3 * np.sin(2 * np.pi * frequency * t) * 32767).astype(np.int16)
+
+
+def encode(samples, sample_rate, **kwargs):
+    buffer = io.BytesIO()
+    sf.write(buffer, samples, sample_rate, **kwargs)
+    return buffer.getvalue()
+
+
+def dominant_frequency(samples, sample_rate):
+    spectrum = np.abs(np.fft.rfft(samples.astype(np.float32)))
+    return np.argmax(spectrum) * sample_rate / len(samples)
+
+
+class TestFormatDetection:
+    """Test recording format detection"""
+
+    def test_detects_wav_header(self):
+        wav_bytes = encode(make_tone(16000, 0.1), 16000, format="WAV", subtype="PCM_16")
+        assert detect_audio_format(wav_bytes, "gsm") == "wav"
+
+    def test_detects_raw_gsm_frames(self):
+        gsm_bytes = encode(make_tone(8000, 0.5), 8000, format="RAW", subtype="GSM610")
+        assert detect_audio_format(gsm_bytes) == "gsm"
+
+    def test_hint_used_for_headerless_pcm(self):
+        assert detect_audio_format(b"\x00\x01" * 100, "sln") == "slin"
+        assert detect_audio_format(b"\x00\x01" * 100, "wav16") == "slin16"
+
+    def test_unknown_without_header_or_hint(self):
+        assert detect_audio_format(b"\x00\x01\x02\x03" * 1000) == "unknown"
+
+
+class TestNativeDecoding:
+    """Test in-process decoding to 16 kHz int16"""
+
+    def test_gsm_decoded_and_upsampled(self):
+        gsm_bytes = encode(make_tone(8000, 1.0), 8000, format="RAW", subtype="GSM610")
+
+        pcm = decode_audio_native(gsm_bytes, "gsm")
+
+        assert pcm.dtype == np.int16
+        assert len(pcm) == 16000
+        assert dominant_frequency(pcm, 16000) == pytest.approx(440, abs=5)
+
+    def test_wav16_passes_through_at_16k(self):
+        tone = make_tone(16000, 0.5)
+        wav_bytes = encode(tone, 16000, format="WAV", subtype="PCM_16")
+
+        pcm = decode_audio_native(wav_bytes, "wav16")
+
+        np.testing.assert_array_equal(pcm, tone)
+
+    def test_stereo_wav_mixed_to_mono(self):
+        tone = make_tone(16000, 0.1)
+        wav_bytes = encode(np.stack([tone, tone], axis=1), 16000, format="WAV", subtype="PCM_16")
+
+        pcm = decode_audio_native(wav_bytes)
+
+        assert pcm.ndim == 1
+        assert len(pcm) == len(tone)
+
+    def test_slin_8k_resampled(self):
+        tone = make_tone(8000, 0.5, frequency=300)
+
+        pcm = decode_audio_native(tone.astype("<i2").tobytes(), "sln")
+
+        assert len(pcm) == 8000
+        assert dominant_frequency(pcm, 16000) == pytest.approx(300, abs=5)
+
+    def test_unknown_format_raises(self):
+        with pytest.raises(AudioDecodeError):
+            decode_audio_native(b"\x00\x01\x02\x03" * 1000)
+
+    def test_resample_clips_to_int16(self):
+        loud = np.full(800, 32767, dtype=np.int16)
+        resampled = resample_pcm16(loud, 8000)
+        assert resampled.dtype == np.int16
+        assert len(resampled) == 1600
+
+
+class TestFFmpegFallback:
+    """Test piped ffmpeg fallback"""
+
+    @patch('app.utils.audio_decoder.subprocess.run')
+    def test_unknown_format_uses_piped_ffmpeg(self, mock_run):
+        pcm = np.arange(100, dtype=np.int16)
+        mock_run.return_value = MagicMock(returncode=0, stdout=pcm.tobytes(), stderr=b"")
+
+        result = decode_audio(b"ID3-mp3-bytes", "mp3")
+
+        np.testing.assert_array_equal(result, pcm)
+        cmd = mock_run.call_args[0][0]
+        assert cmd[0] == "ffmpeg"
+        assert "pipe:0" in cmd and "pipe:1" in cmd
+        assert mock_run.call_args[1]["input"] == b"ID3-mp3-bytes"
+
+    @patch('app.utils.audio_decoder.subprocess.run', side_effect=FileNotFoundError("ffmpeg"))
+    def test_missing_ffmpeg_raises_decode_error(self, mock_run):
+        with pytest.raises(AudioDecodeError, match="not installed"):
+            decode_audio(b"ID3-mp3-bytes")
+
+    @patch('app.utils.audio_decoder.subprocess.run')
+    def test_native_formats_skip_ffmpeg(self, mock_run):
+        gsm_bytes = encode(make_tone(8000, 0.2), 8000, format="RAW", subtype="GSM610")
+        decode_audio(gsm_bytes, "gsm")
+        mock_run.assert_not_called()
+
+
+class TestEncodeWav:
+    """Test in-memory WAV encoding"""
+
+    def test_round_trip(self):
+        tone = make_tone(16000, 0.1)
+        with wave.open(io.BytesIO(encode_wav(tone)), "rb") as wav_file:
+            assert wav_file.getframerate() == 16000
+            assert wav_file.getnchannels() == 1
+            frames = np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype="<i2")
+        np.testing.assert_array_equal(frames, tone)
@@ -117,67 +117,60 @@ class TestGSMConversion:
     """Test GSM to WAV conversion"""
 
     @pytest.mark.asyncio
-    @patch('app.utils.scp_audio_downloader.asyncio.create_subprocess_exec')
-    async def test_convert_gsm_to_wav_success(self, mock_create_subprocess_exec):
-        """Test successful GSM to WAV conversion"""
-        # Setup mock process
-        mock_process = AsyncMock()
-        mock_process.communicate.return_value = (b"", b"")
-        mock_process.returncode = 0
-        mock_create_subprocess_exec.return_value = mock_process
+    async def test_convert_gsm_to_wav_success(self):
+        """Test GSM is decoded in-process to a 16kHz WAV"""
+        import io
+        import wave
+        import numpy as np
+        sf = pytest.importorskip("soundfile")
 
-        gsm_bytes = b"mock_gsm_audio"
-        wav_content = b"mock_wav_audio_with_wav_header"
+        tone = (0.3 * np.sin(2 * np.pi * 440 * np.arange(8000) / 8000) * 32767).astype(np.int16)
+        buffer = io.BytesIO()
+        sf.write(buffer, tone, 8000, format="RAW", subtype="GSM610")
 
         from app.utils.scp_audio_downloader import convert_gsm_to_wav
 
-        with patch('app.utils.scp_audio_downloader.tempfile.NamedTemporaryFile') as mock_temp, \
-             patch('app.utils.scp_audio_downloader.os.path.exists', return_value=True), \
-             patch('app.utils.scp_audio_downloader.os.path.getsize', return_value=len(wav_content)), \
-             patch('builtins.open', create=True) as mock_open:
-
-            mock_temp.return_value.__enter__.return_value.name = "/tmp/temp_file"
-            mock_open.return_value.__enter__.return_value.read.return_value = wav_content
+        with patch('app.utils.audio_decoder.subprocess.run') as mock_run:
+            result = await convert_gsm_to_wav(buffer.getvalue())
 
-            result = await convert_gsm_to_wav(gsm_bytes)
+            # No ffmpeg process for a native format
+            mock_run.assert_not_called()
 
-            assert result == wav_content
-            # Verify ffmpeg command was called
-            mock_create_subprocess_exec.assert_called_once()
-            call_args = mock_create_subprocess_exec.call_args
-            assert 'ffmpeg' in call_args[0][0]
+        with wave.open(io.BytesIO(result), "rb") as wav_file:
+            assert wav_file.getframerate() == 16000
+            assert wav_file.getnchannels() == 1
+            assert wav_file.getnframes() == 16000
 
     @pytest.mark.asyncio
-    @patch('app.utils.scp_audio_downloader.asyncio.create_subprocess_exec')
-    async def test_convert_gsm_to_wav_failure(self, mock_create_subprocess_exec):
+    @patch('app.utils.audio_decoder.subprocess.run')
+    async def test_convert_gsm_to_wav_failure(self, mock_run):
         """Test GSM to WAV conversion failure"""
-        mock_process = AsyncMock()
-        mock_process.communicate.return_value = (b"", b"ffmpeg error")
-        mock_process.returncode = 1
-        mock_create_subprocess_exec.return_value = mock_process
+        mock_run.return_value = MagicMock(returncode=1, stdout=b"", stderr=b"ffmpeg error")
 
         gsm_bytes = b"mock_gsm_audio"
 
         from app.utils.scp_audio_downloader import convert_gsm_to_wav
+        from app.utils.audio_decoder import AudioDecodeError
 
-        with patch('app.utils.scp_audio_downloader.tempfile.NamedTemporaryFile') as mock_temp, \
-             patch('app.utils.scp_audio_downloader.os.path.exists', return_value=False):
-
-            mock_temp.return_value.__enter__.return_value.name = "/tmp/temp_file"
-
+        with patch('app.utils.audio_decoder.decode_audio_native', side_effect=AudioDecodeError("bad")):
             result = await convert_gsm_to_wav(gsm_bytes)
 
-            assert result is None
+        assert result is None
+        # Fallback ffmpeg reads from stdin and writes to stdout
+        cmd = mock_run.call_args[0][0]
+        assert 'ffmpeg' in cmd
+        assert 'pipe:0' in cmd
 
     @pytest.mark.asyncio
     async def test_convert_gsm_to_wav_ffmpeg_not_installed(self):
-        """Test conversion fails when ffmpeg is not installed"""
+        """Test conversion fails when data is not native and ffmpeg is not installed"""
         gsm_bytes = b"mock_gsm_audio"
 
         from app.utils.scp_audio_downloader import convert_gsm_to_wav
+        from app.utils.audio_decoder import AudioDecodeError
 
-        with patch('app.utils.scp_audio_downloader.asyncio.create_subprocess_exec',
-                   side_effect=FileNotFoundError("ffmpeg not found")):
+        with patch('app.utils.audio_decoder.decode_audio_native', side_effect=AudioDecodeError("bad")), \
+             patch('app.utils.audio_decoder.subprocess.run', side_effect=FileNotFoundError("ffmpeg not found")):
 
             result = await convert_gsm_to_wav(gsm_bytes)
 
@@ -390,6 +383,7 @@ class TestDownloadByMethod:
     async def test_download_audio_by_method_scp(self, mock_settings):
         """Test download with SCP method"""
         mock_settings.mock_enabled = False
+        mock_settings.scp_use_connection_pool = False
 
         from app.utils.scp_audio_downloader import download_audio_by_method
 
@@ -405,6 +399,26 @@ class TestDownloadByMethod:
             mock_scp.assert_called_once()
             assert download_info['method'] == "scp"
 
+    @pytest.mark.asyncio
+    @patch('app.config.settings.settings')
+    async def test_download_audio_by_method_scp_uses_connection_pool(self, mock_settings):
+        """Test SCP method downloads over the pooled SFTP connection when enabled"""
+        mock_settings.mock_enabled = False
+        mock_settings.scp_use_connection_pool = True
+
+        from app.utils.scp_audio_downloader import download_audio_by_method
+
+        with patch('app.utils.scp_audio_downloader.ASYNCSSH_AVAILABLE', True), \
+             patch('app.utils.scp_audio_downloader.download_audio_via_sftp',
+                   return_value=(b"test_audio", {'success': True, 'method': 'sftp'})) as mock_sftp, \
+             patch('app.utils.scp_audio_downloader.download_audio_via_scp') as mock_scp:
+
+            audio_bytes, download_info = await download_audio_by_method("test_call_123", method="scp")
+
+            mock_sftp.assert_called_once()
+            mock_scp.assert_not_called()
+            assert download_info['method'] == "sftp"
+
     @pytest.mark.asyncio
     async def test_download_audio_by_method_local(self):
         """Test download with local method"""
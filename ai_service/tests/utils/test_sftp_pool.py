@@ -0,0 +1,265 @@
+"""
+Tests for app/utils/sftp_pool.py
+Runs the pool against a local in-process SFTP server stand-in for the PBX
+"""
+
+import asyncio
+import io
+from contextlib import asynccontextmanager
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+asyncssh = pytest.importorskip("asyncssh")
+
+from app.utils.sftp_pool import SFTPConnectionPool
+from app.utils.scp_audio_downloader import download_audio_via_sftp
+
+
+USERNAME = "helpline"
+PASSWORD = "secret"
+
+
+class _PasswordServer(asyncssh.SSHServer):
+    def begin_auth(self, username):
+        return True
+
+    def password_auth_supported(self):
+        return True
+
+    def validate_password(self, username, password):
+        return username == USERNAME and password == PASSWORD
+
+
+class _FlakySFTPServer(asyncssh.SFTPServer):
+    """Chrooted SFTP server that fails the first `failures` opens"""
+
+    failures = 0
+    opens = 0
+
+    def __init__(self, chan, root):
+        super().__init__(chan, chroot=root)
+
+    def open(self, path, pflags, attrs):
+        type(self).opens += 1
+        if type(self).failures > 0:
+            type(self).failures -= 1
+            raise asyncssh.SFTPFailure("transient failure")
+        return super().open(path, pflags, attrs)
+
+
+@asynccontextmanager
+async def local_sftp_server(tmp_path):
+    """Local SFTP server serving files from tmp_path/calls"""
+    calls_dir = tmp_path / "calls"
+    calls_dir.mkdir()
+    _FlakySFTPServer.failures = 0
+    _FlakySFTPServer.opens = 0
+
+    server = await asyncssh.listen(
+        "127.0.0.1", 0,
+        server_host_keys=[asyncssh.generate_private_key("ssh-ed25519")],
+        server_factory=_PasswordServer,
+        sftp_factory=lambda chan: _FlakySFTPServer(chan, str(tmp_path)),
+    )
+    port = server.sockets[0].getsockname()[1]
+    yield {"port": port, "calls_dir": calls_dir}
+    server.close()
+    await server.wait_closed()
+
+
+def make_pool(port, **kwargs):
+    return SFTPConnectionPool(
+        host="127.0.0.1",
+        port=port,
+        username=USERNAME,
+        password=PASSWORD,
+        connect_timeout=5,
+        retry_base_delay=0.01,
+        **kwargs
+    )
+
+
+class TestSFTPConnectionPool:
+    """Test pooled SFTP downloads"""
+
+    @pytest.mark.asyncio
+    async def test_fetch_reuses_connection(self, tmp_path):
+        async with local_sftp_server(tmp_path) as sftp_server:
+            (sftp_server["calls_dir"] / "1.gsm").write_bytes(b"gsm-audio-1")
+            (sftp_server["calls_dir"] / "2.gsm").write_bytes(b"gsm-audio-2")
+            pool = make_pool(sftp_server["port"])
+            try:
+                assert await pool.fetch("/calls/1.gsm") == b"gsm-audio-1"
+                assert await pool.fetch("/calls/2.gsm") == b"gsm-audio-2"
+            finally:
+                await pool.close()
+
+            assert pool.stats["connections_opened"] == 1
+            assert pool.stats["connections_reused"] == 1
+            assert pool.stats["bytes_downloaded"] == 22
+
+    @pytest.mark.asyncio
+    async def test_large_file_streamed_in_blocks(self, tmp_path):
+        async with local_sftp_server(tmp_path) as sftp_server:
+            payload = bytes(range(256)) * 4096  # 1 MiB
+            (sftp_server["calls_dir"] / "big.wav16").write_bytes(payload)
+            pool = make_pool(sftp_server["port"], read_block_size=64 * 1024)
+            try:
+                sink = io.BytesIO()
+                size = await pool.fetch_into("/calls/big.wav16", sink)
+            finally:
+                await pool.close()
+
+            assert size == len(payload)
+            assert sink.getvalue() == payload
+
+    @pytest.mark.asyncio
+    async def test_parallel_downloads_bounded_by_pool(self, tmp_path):
+        async with local_sftp_server(tmp_path) as sftp_server:
+            for i in range(6):
+                (sftp_server["calls_dir"] / f"{i}.gsm").write_bytes(f"audio-{i}".encode())
+            pool = make_pool(sftp_server["port"], max_connections=2, max_parallel_downloads=3)
+            try:
+                results = await asyncio.gather(*(pool.fetch(f"/calls/{i}.gsm") for i in range(6)))
+            finally:
+                stats = pool.get_stats()
+                await pool.close()
+
+            assert results == [f"audio-{i}".encode() for i in range(6)]
+            assert pool.stats["connections_opened"] <= 2
+            assert stats["open_connections"] <= 2
+
+    @pytest.mark.asyncio
+    async def test_transient_failure_retried(self, tmp_path):
+        async with local_sftp_server(tmp_path) as sftp_server:
+            (sftp_server["calls_dir"] / "1.gsm").write_bytes(b"audio")
+            _FlakySFTPServer.failures = 2
+            pool = make_pool(sftp_server["port"], retries=3)
+            try:
+                assert await pool.fetch("/calls/1.gsm") == b"audio"
+            finally:
+                await pool.close()
+
+            assert pool.stats["retries"] == 2
+            assert pool.stats["connections_opened"] == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_file_not_retried(self, tmp_path):
+        async with local_sftp_server(tmp_path) as sftp_server:
+            pool = make_pool(sftp_server["port"], retries=3)
+            try:
+                with pytest.raises(asyncssh.SFTPNoSuchFile):
+                    await pool.fetch("/calls/missing.gsm")
+            finally:
+                await pool.close()
+
+            assert _FlakySFTPServer.opens == 1
+            assert pool.stats["failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_bad_credentials_fail_fast(self, tmp_path):
+        async with local_sftp_server(tmp_path) as sftp_server:
+            pool = SFTPConnectionPool(
+                host="127.0.0.1", port=sftp_server["port"], username=USERNAME,
+                password="wrong", connect_timeout=5, retries=3, retry_base_delay=0.01
+            )
+            with pytest.raises(asyncssh.PermissionDenied):
+                await pool.fetch("/calls/1.gsm")
+            assert pool.stats["retries"] == 0
+            assert pool.get_stats()["open_connections"] == 0
+
+    @pytest.mark.asyncio
+    async def test_prefetch_claimed_once(self, tmp_path):
+        async with local_sftp_server(tmp_path) as sftp_server:
+            (sftp_server["calls_dir"] / "1.gsm").write_bytes(b"audio")
+            pool = make_pool(sftp_server["port"])
+            try:
+                task = pool.prefetch("call-1", "/calls/1.gsm")
+                assert pool.prefetch("call-1", "/calls/1.gsm") is task
+
+                claimed = pool.claim_prefetched("call-1")
+                assert await claimed == b"audio"
+                assert pool.claim_prefetched("call-1") is None
+            finally:
+                await pool.close()
+
+
+class TestDownloadAudioViaSFTP:
+    """Test the downloader entry point on top of the pool"""
+
+    def _config(self):
+        return {
+            "user": USERNAME,
+            "server": "127.0.0.1",
+            "password": PASSWORD,
+            "remote_path_template": "/calls/{call_id}.gsm",
+            "timeout_seconds": 5
+        }
+
+    @pytest.mark.asyncio
+    async def test_download_uses_prefetched_recording(self, tmp_path):
+        async with local_sftp_server(tmp_path) as sftp_server:
+            (sftp_server["calls_dir"] / "1755070077.79708.gsm").write_bytes(b"gsm-audio")
+            pool = make_pool(sftp_server["port"])
+            try:
+                pool.prefetch("1755070077.79708", "/calls/1755070077.79708.gsm")
+                with patch("app.utils.scp_audio_downloader.get_sftp_pool", return_value=pool):
+                    audio_bytes, info = await download_audio_via_sftp("1755070077.79708", self._config())
+            finally:
+                await pool.close()
+
+            assert audio_bytes == b"gsm-audio"
+            assert info["success"] is True
+            assert info["method"] == "sftp"
+            assert info["format"] == "gsm"
+            assert info["prefetched"] is True
+
+    def _pool_with_prefetch(self, prefetch_task):
+        pool = MagicMock()
+        pool.claim_prefetched.return_value = prefetch_task
+        pool.fetch = AsyncMock(return_value=b"direct-audio")
+        return pool
+
+    @pytest.mark.asyncio
+    async def test_cancelled_prefetch_falls_back_to_direct_download(self):
+        prefetch_task = asyncio.ensure_future(asyncio.sleep(10))
+        pool = self._pool_with_prefetch(prefetch_task)
+        asyncio.get_running_loop().call_later(0.01, prefetch_task.cancel)
+
+        with patch("app.utils.scp_audio_downloader.get_sftp_pool", return_value=pool):
+            audio_bytes, info = await download_audio_via_sftp("call_1", self._config())
+
+        assert audio_bytes == b"direct-audio"
+        assert info["prefetched"] is True
+        pool.fetch.assert_awaited_once_with("/calls/call_1.gsm")
+
+    @pytest.mark.asyncio
+    async def test_cancelling_download_is_not_retried(self):
+        prefetch_task = asyncio.ensure_future(asyncio.sleep(10))
+        pool = self._pool_with_prefetch(prefetch_task)
+
+        with patch("app.utils.scp_audio_downloader.get_sftp_pool", return_value=pool):
+            download = asyncio.ensure_future(download_audio_via_sftp("call_1", self._config()))
+            await asyncio.sleep(0.01)
+            download.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await download
+
+        await asyncio.sleep(0)
+        assert prefetch_task.cancelled()
+        pool.fetch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_download_missing_recording_reports_error(self, tmp_path):
+        async with local_sftp_server(tmp_path) as sftp_server:
+            pool = make_pool(sftp_server["port"])
+            try:
+                with patch("app.utils.scp_audio_downloader.get_sftp_pool", return_value=pool):
+                    audio_bytes, info = await download_audio_via_sftp("missing", self._config())
+            finally:
+                await pool.close()
+
+            assert audio_bytes is None
+            assert info["success"] is False
+            assert info["error"].startswith("SFTP error")
@@ -581,3 +581,30 @@ class TestClassificationAggregator:
         assert result['sub_category'] == 'physical'
         assert result['sub_category_2'] is None
         assert result['sub_category_2_confidence'] == 0.0
+
+
+class TestNERChunkerOffsets:
+    """Test entity positions map back to the unnormalized transcript"""
+
+    @patch('app.utils.text_utils.AutoTokenizer')
+    def test_reconstruct_entities_with_transcript(self, mock_tokenizer_class):
+        """Test positions refer to the transcript when it has irregular whitespace"""
+        mock_tokenizer = MagicMock()
+        mock_tokenizer.encode.side_effect = lambda text, **kwargs: text.split()
+        mock_tokenizer_class.from_pretrained.return_value = mock_tokenizer
+
+        from app.utils.text_utils import NERChunker
+
+        chunker = NERChunker(max_tokens=4)
+        transcript = "  John  called.\n\nMary lives   in Nairobi."
+        chunks = chunker.chunk_transcript(transcript)
+        chunk_entities = [
+            [{'text': 'John', 'label': 'PERSON', 'start': 0, 'end': 4}],
+            [{'text': 'Mary', 'label': 'PERSON', 'start': 0, 'end': 4},
+             {'text': 'Nairobi', 'label': 'GPE', 'start': 14, 'end': 22}],
+        ]
+
+        entities = chunker.reconstruct_entities(chunk_entities, chunks, flat=True, transcript=transcript)
+
+        assert len(chunks) == 2
+        assert [transcript[e['start']:e['end']] for e in entities] == ["John", "Mary", "Nairobi."]
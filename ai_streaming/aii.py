@@ -6,7 +6,7 @@ from typing import Optional, Union, Tuple, List # , TYPE_CHECKING
 from utils import exact_div #, format_timestamp, get_end, get_writer, make_safe, optional_float, optional_int, str2bool,
 from tokenizer import get_tokenizer, LANGUAGES, TO_LANGUAGE_CODE
 from decoding import DecodingOptions, DecodingResult, DecodingTask
-from mel import log_mel_spectrogram, FRAMES_PER_SECOND, HOP_LENGTH, N_FRAMES, N_SAMPLES, SAMPLE_RATE
+from mel import log_mel_spectrogram, bucket_frames, ENCODER_BUCKET_FRAMES, FRAMES_PER_SECOND, HOP_LENGTH, N_FRAMES, N_SAMPLES, SAMPLE_RATE
 from model import Whisper, ModelDimensions
 
 # model_name = "large-v3.pt" 
@@ -20,7 +20,7 @@ def new_segment(tokenizer, *, start: float, end: float, tokens: torch.Tensor): #
 	text_tokens = [token for token in tokens if token < tokenizer.eot]
 	return { "start": start, "end": end, "text": tokenizer.decode(text_tokens), "tokens": tokens }
 
-def segments(model, tokenizer, tokens, result):
+def segments(model, tokenizer, tokens, result, n_frames: int = N_FRAMES):
 	#if no_speech_threshold is not None:    # no voice activity check
 	#	should_skip = result.no_speech_prob > no_speech_threshold
 	#	if (logprob_threshold is not None and result.avg_logprob > logprob_threshold):
@@ -32,7 +32,7 @@ def segments(model, tokenizer, tokens, result):
 	content_frames 		= 0 # mel.shape[-1] - N_FRAMES
 	input_stride 		= exact_div(N_FRAMES, model.dims.n_audio_ctx)  # mel frames per output token: 2
 	time_precision 		= (input_stride * HOP_LENGTH / SAMPLE_RATE)  # time per output token: 0.02 (seconds)
-	segment_size 		= N_FRAMES # min(N_FRAMES, content_frames - seek, seek_clip_end - seek)
+	segment_size 		= n_frames # min(N_FRAMES, content_frames - seek, seek_clip_end - seek)
 	segment_duration 	= segment_size * HOP_LENGTH / SAMPLE_RATE
 	time_offset 		= float(seek * HOP_LENGTH / SAMPLE_RATE)
 	current_segments 	= []
@@ -119,14 +119,17 @@ def transcribe(model, tokenizer, options, decode_options, audio: bytearray):
 	else:
 		decode_options["prompt"] = all_tokens[prompt_reset_since:]
 
-	mel = log_mel_spectrogram(model.device, audio, model.dims.n_mels)
+	n_frames = N_FRAMES
+	if options["encoder_bucket_frames"]:	# reduced-context encoder: only the frames present, rounded up to a bucket
+		n_frames = bucket_frames(len(audio), options["encoder_bucket_frames"])
+	mel = log_mel_spectrogram(model.device, audio, model.dims.n_mels, n_frames)
 	mel.to(model.device).to(options["dtype"])
 	mel = mel.unsqueeze(0)		# add batch dimension
 
 	result: DecodingResult = decode_with_fallback(model, tokenizer, options, decode_options, mel)
 	tokens = torch.tensor(result.tokens)
 
-	current_segments = segments(model, tokenizer, tokens, result) 		# splits to sentences based on predicted timestamps ?
+	current_segments = segments(model, tokenizer, tokens, result, n_frames) 		# splits to sentences based on predicted timestamps ?
 	all_tokens = tokens # .extend([token for segment in current_segments for token in segment["tokens"]])
 
 	if not options["condition_on_previous_text"] or result.temperature > 0.5:
@@ -171,6 +174,7 @@ def load_model():
 	options["compression_ratio_threshold"]: float 		= 2.4
 	options["logprob_threshold"]: float 			= -1.0
 	options["no_speech_threshold"]: float 			= 0.6
+	options["encoder_bucket_frames"]: int 			= 0		# 0 pads every window to 30s; ENCODER_BUCKET_FRAMES encodes only the audio present
 
 	decode_options = {}
 	decode_options["language"]: str				= "en"		# but model is multiligual so it will detect?
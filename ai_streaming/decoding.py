@@ -40,6 +40,11 @@ if TYPE_CHECKING:
 #    print(f" >>>  attention weights: ", f"{hook_attn.shape}" if hook_attn is not None else f"{hook_attn}")
 
 
+def is_audio_features(model: "Whisper", x: Tensor) -> bool:
+    """True if x is encoder output rather than a mel spectrogram; reduced-context features have fewer than n_audio_ctx rows"""
+    return x.shape[-2] != model.dims.n_mels and x.shape[-1] == model.dims.n_audio_state and x.shape[-2] <= model.dims.n_audio_ctx
+
+
 @torch.no_grad()
 def detect_language(model: "Whisper", mel: Tensor, tokenizer: Tokenizer = None) -> Tuple[Tensor, List[dict]]:
     """
@@ -64,7 +69,7 @@ def detect_language(model: "Whisper", mel: Tensor, tokenizer: Tokenizer = None)
         mel = mel.unsqueeze(0)
 
     # skip encoder forward pass if already-encoded audio features were given
-    if mel.shape[-2:] != (model.dims.n_audio_ctx, model.dims.n_audio_state):
+    if not is_audio_features(model, mel):
         mel = model.encoder(mel)
 
     # forward pass using a single token, startoftranscript
@@ -242,6 +247,9 @@ class MaximumLikelihoodRanker(SequenceRanker):
 
 
 class TokenDecoder:
+    # rows of the previous tokens that each row of the latest update continues, or None if unchanged
+    source_indices: Optional[List[int]] = None
+
     def name(self):
         raise NotImplementedError
 
@@ -357,6 +365,7 @@ class BeamSearchDecoder(TokenDecoder):
 
     def reset(self):
         self.finished_sequences = None
+        self.source_indices = None
 
     def update(
         self, tokens: Tensor, logits: Tensor, sum_logprobs: Tensor
@@ -401,6 +410,7 @@ class BeamSearchDecoder(TokenDecoder):
 
         tokens = torch.tensor(next_tokens, device=tokens.device)
         self.inference.rearrange_kv_cache(source_indices)
+        self.source_indices = source_indices
 
         # add newly finished sequences to self.finished_sequences
         assert len(self.finished_sequences) == len(finished_sequences)
@@ -457,75 +467,123 @@ class LogitFilter:
         """
         raise NotImplementedError
 
+    def update(self, tokens: Tensor, source_indices: Optional[List[int]]) -> None:
+        """Advance any per-sequence state once the decoder has appended the next tokens
+
+        Parameters
+        ----------
+        tokens : Tensor, shape = (n_batch, current_sequence_length)
+            all tokens in the context so far, ending with the tokens just selected
+
+        source_indices : List[int], optional
+            for each row, the row of the previous step it continues (beam search reorders rows)
+
+        """
+
+
+def _index_tensor(indices: Sequence[int], device: torch.device) -> Tensor:
+    return torch.tensor(list(indices), dtype=torch.long, device=device)
+
 
 class SuppressBlank(LogitFilter):
     def __init__(self, tokenizer: Tokenizer, sample_begin: int):
         self.tokenizer = tokenizer
         self.sample_begin = sample_begin
+        self.blank_tokens = tokenizer.encode(" ") + [tokenizer.eot]  # encoded once per DecodingTask
+        self._index: Optional[Tensor] = None
 
     def apply(self, logits: Tensor, tokens: Tensor):
         if tokens.shape[1] == self.sample_begin:
-            logits[:, self.tokenizer.encode(" ") + [self.tokenizer.eot]] = -np.inf
+            if self._index is None or self._index.device != logits.device:
+                self._index = _index_tensor(self.blank_tokens, logits.device)
+            logits.index_fill_(1, self._index, -np.inf)
 
 
 class SuppressTokens(LogitFilter):
     def __init__(self, suppress_tokens: Sequence[int]):
         self.suppress_tokens = list(suppress_tokens)
+        self._mask: Optional[Tensor] = None
 
     def apply(self, logits: Tensor, tokens: Tensor):
-        logits[:, self.suppress_tokens] = -np.inf
+        if self._mask is None or self._mask.device != logits.device or self._mask.shape[0] != logits.shape[-1]:
+            self._mask = torch.zeros(logits.shape[-1], dtype=torch.bool, device=logits.device)
+            self._mask[self.suppress_tokens] = True
+        logits.masked_fill_(self._mask, -np.inf)
 
 
 class ApplyTimestampRules(LogitFilter):
+    """
+    Batched timestamp rules: every mask is one tensor op over (n_batch, vocab).
+
+    The last sampled timestamp of each row is tracked incrementally in `last_timestamp`
+    (reordered along with the beams) instead of rescanning the sampled tokens each step;
+    the last two tokens are read from the end of `tokens` directly.
+    """
+
     def __init__(self, tokenizer: Tokenizer, sample_begin: int, max_initial_timestamp_index: Optional[int],):
         self.tokenizer = tokenizer
         self.sample_begin = sample_begin
         self.max_initial_timestamp_index = max_initial_timestamp_index
+        self.last_timestamp: Optional[Tensor] = None  # (n_batch,), -1 until a row samples a timestamp
+        self._timestamp_ids: Optional[Tensor] = None
 
     def apply(self, logits: Tensor, tokens: Tensor):
+        timestamp_begin = self.tokenizer.timestamp_begin
+        n_batch = tokens.shape[0]
+        n_sampled = tokens.shape[1] - self.sample_begin
+
+        if self._timestamp_ids is None or self._timestamp_ids.device != logits.device:
+            self._timestamp_ids = torch.arange(timestamp_begin, logits.shape[-1], device=logits.device)
+        if n_sampled == 0 or self.last_timestamp is None:
+            self.last_timestamp = torch.full((n_batch,), -1, dtype=torch.long, device=tokens.device)
+
         # suppress <|notimestamps|> which is handled by without_timestamps
         if self.tokenizer.no_timestamps is not None:
             logits[:, self.tokenizer.no_timestamps] = -np.inf
 
         # timestamps have to appear in pairs, except directly before EOT; mask logits accordingly
-        for k in range(tokens.shape[0]):
-            sampled_tokens = tokens[k, self.sample_begin :]
-            seq = [t for t in sampled_tokens.tolist()]
-            last_was_timestamp = (len(seq) >= 1 and seq[-1] >= self.tokenizer.timestamp_begin)
-            penultimate_was_timestamp = (len(seq) < 2 or seq[-2] >= self.tokenizer.timestamp_begin)
-
-            if last_was_timestamp:
-                if penultimate_was_timestamp:  # has to be non-timestamp
-                    logits[k, self.tokenizer.timestamp_begin :] = -np.inf
-                else:  # cannot be normal text tokens
-                    logits[k, : self.tokenizer.eot] = -np.inf
-
-            timestamps = sampled_tokens[sampled_tokens.ge(self.tokenizer.timestamp_begin)]
-            if timestamps.numel() > 0:
-                # timestamps shouldn't decrease; forbid timestamp tokens smaller than the last
-                # also force each segment to have a nonzero length, to prevent infinite looping
-                if last_was_timestamp and not penultimate_was_timestamp:
-                    timestamp_last = timestamps[-1]
-                else:
-                    timestamp_last = timestamps[-1] + 1
-                logits[k, self.tokenizer.timestamp_begin : timestamp_last] = -np.inf
-
-        if tokens.shape[1] == self.sample_begin:
+        if n_sampled >= 1:
+            last_was_timestamp = tokens[:, -1] >= timestamp_begin
+            if n_sampled >= 2:
+                penultimate_was_timestamp = tokens[:, -2] >= timestamp_begin
+            else:
+                penultimate_was_timestamp = torch.ones_like(last_was_timestamp)
+
+            # has to be non-timestamp
+            logits[:, timestamp_begin:].masked_fill_((last_was_timestamp & penultimate_was_timestamp)[:, None], -np.inf)
+            # cannot be normal text tokens
+            closing_pair = last_was_timestamp & ~penultimate_was_timestamp
+            logits[:, : self.tokenizer.eot].masked_fill_(closing_pair[:, None], -np.inf)
+
+            # timestamps shouldn't decrease; forbid timestamp tokens smaller than the last
+            # also force each segment to have a nonzero length, to prevent infinite looping
+            has_timestamp = self.last_timestamp >= timestamp_begin
+            timestamp_last = torch.where(closing_pair, self.last_timestamp, self.last_timestamp + 1)
+            timestamp_last = torch.where(has_timestamp, timestamp_last, torch.full_like(timestamp_last, timestamp_begin))
+            logits[:, timestamp_begin:].masked_fill_(self._timestamp_ids[None, :] < timestamp_last[:, None], -np.inf)
+
+        if n_sampled == 0:
             # suppress generating non-timestamp tokens at the beginning
-            logits[:, : self.tokenizer.timestamp_begin] = -np.inf
+            logits[:, : timestamp_begin] = -np.inf
 
             # apply the `max_initial_timestamp` option
             if self.max_initial_timestamp_index is not None:
-                last_allowed = (self.tokenizer.timestamp_begin + self.max_initial_timestamp_index)
+                last_allowed = (timestamp_begin + self.max_initial_timestamp_index)
                 logits[:, last_allowed + 1 :] = -np.inf
 
         # if sum of probability over timestamps is above any other token, sample timestamp
         logprobs = F.log_softmax(logits.float(), dim=-1)
-        for k in range(tokens.shape[0]):
-            timestamp_logprob = logprobs[k, self.tokenizer.timestamp_begin :].logsumexp(dim=-1)
-            max_text_token_logprob = logprobs[k, : self.tokenizer.timestamp_begin].max()
-            if timestamp_logprob > max_text_token_logprob:
-                logits[k, : self.tokenizer.timestamp_begin] = -np.inf
+        timestamp_logprob = logprobs[:, timestamp_begin:].logsumexp(dim=-1)
+        max_text_token_logprob = logprobs[:, : timestamp_begin].max(dim=-1).values
+        logits[:, : timestamp_begin].masked_fill_((timestamp_logprob > max_text_token_logprob)[:, None], -np.inf)
+
+    def update(self, tokens: Tensor, source_indices: Optional[List[int]]):
+        if self.last_timestamp is None:
+            return
+        if source_indices is not None:
+            self.last_timestamp = self.last_timestamp[_index_tensor(source_indices, self.last_timestamp.device)]
+        next_tokens = tokens[:, -1]
+        self.last_timestamp = torch.where(next_tokens >= self.tokenizer.timestamp_begin, next_tokens, self.last_timestamp)
 
 
 class DecodingTask:
@@ -652,7 +710,7 @@ class DecodingTask:
         if self.options.fp16:
             mel = mel.half()
 
-        if mel.shape[-2:] == (self.model.dims.n_audio_ctx, self.model.dims.n_audio_state):
+        if is_audio_features(self.model, mel):
             # encoded audio features are given; skip audio encoding
             audio_features = mel
         else:
@@ -703,6 +761,9 @@ class DecodingTask:
 
                 tokens, completed = self.decoder.update(tokens, logits, sum_logprobs)  # expand the tokens tensor with the selected next tokens
 
+                for logit_filter in self.logit_filters:                    # carry per-sequence filter state over to the new (possibly reordered) rows
+                    logit_filter.update(tokens, self.decoder.source_indices)
+
                 if completed or tokens.shape[-1] > self.n_ctx:
                     break
         finally:
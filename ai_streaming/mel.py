@@ -14,6 +14,12 @@ N_FRAMES = exact_div(N_SAMPLES, HOP_LENGTH)  			# 3000 frames in a mel spectrogr
 N_SAMPLES_PER_TOKEN = HOP_LENGTH * 2  				# the initial convolutions has stride 2
 FRAMES_PER_SECOND = exact_div(SAMPLE_RATE, HOP_LENGTH)  	# 10ms per audio frame
 TOKENS_PER_SECOND = exact_div(SAMPLE_RATE, N_SAMPLES_PER_TOKEN)	# 20ms per audio token
+ENCODER_BUCKET_FRAMES = 200					# reduced-context encoder input is a multiple of 2 seconds
+
+def bucket_frames(n_bytes: int, bucket: int = ENCODER_BUCKET_FRAMES) -> int:
+	"""mel frames covering n_bytes of 16-bit audio, rounded up to a bucket (at most N_FRAMES)"""
+	frames = -(-(n_bytes // 2) // HOP_LENGTH)
+	return min(max(-(-frames // bucket), 1) * bucket, N_FRAMES)
 
 @lru_cache(maxsize=None)
 def mel_filters(device, n_mels: int) -> torch.Tensor:
@@ -31,8 +37,9 @@ def mel_filters(device, n_mels: int) -> torch.Tensor:
 	with np.load(filters_path, allow_pickle=False) as f:
 		return torch.from_numpy(f[f"mel_{n_mels}"]).to(device)
 
-def log_mel_spectrogram(device, audio: bytearray, n_mels: int = 80):  
-	padding = N_SAMPLES - (len(audio)//2)
+def log_mel_spectrogram(device, audio: bytearray, n_mels: int = 80, n_frames: int = N_FRAMES):
+	# n_frames < N_FRAMES pads only to that many frames, for the reduced-context encoder (see bucket_frames)
+	padding = n_frames * HOP_LENGTH - (len(audio)//2)
 	audio = np.frombuffer(audio, np.int16).flatten().astype(np.float32) / 32768.0
 	audio = torch.from_numpy (audio)  	# NumPy array into a PyTorch tensor (using same memory)
 	audio = audio.to(device)
@@ -123,8 +123,9 @@ class AudioEncoder(torch.nn.Module):
 
 	def forward(self, x: torch.Tensor):
 		"""
-		x : torch.Tensor, shape = (batch_size, n_mels, n_ctx)
-		the mel spectrogram of the audio
+		x : torch.Tensor, shape = (batch_size, n_mels, n_frames)
+		the mel spectrogram of the audio; n_frames may be shorter than the full 30 seconds
+		(reduced-context mode), the positional embedding is then sliced to match
 		"""
 
 		# print(f"AudioEncoder: {x.shape} {self.positional_embedding.shape}----------------------------------")
@@ -133,8 +134,8 @@ class AudioEncoder(torch.nn.Module):
 		x = torch.nn.functional.gelu(self.conv2(x))
 		x = x.permute(0, 2, 1)
 
-		assert x.shape[1:] == self.positional_embedding.shape, "incorrect audio shape"
-		x = (x + self.positional_embedding).to(x.dtype)
+		assert x.shape[1] <= self.positional_embedding.shape[0] and x.shape[2] == self.positional_embedding.shape[1], "incorrect audio shape"
+		x = (x + self.positional_embedding[: x.shape[1]]).to(x.dtype)
 
 		for block in self.blocks:
 			x = block(x)